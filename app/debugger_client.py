@@ -1,41 +1,284 @@
+import os
+import time
+from threading import Event, Lock
+
 from PyQt5.QtCore import QObject, pyqtSignal
 
-from .debugging import Debugger, DebugCommand, DebuggerExit
+from .debugging import (
+    Debugger, DebuggerServer, DebugCommand, DebuggerExit, CodeCache,
+    InvalidHandle, InvalidBreakpointCondition, RenderPolicy, Rendered)
 from .utils import RunnableMixin
 
 
 class DebuggerClient(RunnableMixin, QObject):
+    # интервал (секунды) выгрузки записей точек логирования,
+    # пока программа выполняется без остановок
+    LOGS_INTERVAL = 0.2
+    # максимальное количество записей в одном сигнале
+    LOGS_BATCH = 500
+    # максимальное время ожидания repr значения (секунды), больше бюджета
+    # времени политики
+    RENDER_TIMEOUT = 2.0
+    # записывать историю выполнения для шагов назад по умолчанию: отладчик
+    # вызывается на каждой строке, поэтому continue и step over медленнее
+    # в десятки раз (см. `set_record_history`)
+    RECORD_HISTORY = False
+    # интервал (секунды) между шагами режима анимации по умолчанию
+    ANIMATE_INTERVAL = 0.1
+    # исполнять программу в дочернем процессе (см. `DebuggerServer`), а не
+    # в потоке процесса интерфейса
+    OUT_OF_PROCESS = True
+
     debugging_finished = pyqtSignal()
-    update = pyqtSignal(dict, dict, int)
+    # отладка не запущена, текст ошибки
+    start_failed = pyqtSignal(str)
+    update = pyqtSignal(dict)
+    logs = pyqtSignal(list)
 
     def __init__(self):
         super(DebuggerClient, self).__init__()
 
-        self._debugger = Debugger()
+        self._render_policy = RenderPolicy()
+        debugger_class = DebuggerServer if self.OUT_OF_PROCESS else Debugger
+        self._debugger = debugger_class(
+            code_cache=CodeCache(), lazy=True,
+            render_policy=self._render_policy, record=self.RECORD_HISTORY)
+
+        # команда режима анимации, `None` - режим выключен
+        self._animate_command = None
+        self._animate_interval = self.ANIMATE_INTERVAL
+        self._last_step = 0.0
+        # программа остановлена и ждёт команды
+        self._stopped = False
+        # интерфейс показал последний отправленный снимок
+        self._shown = Event()
+        self._shown.set()
+        # команды пользователя и режима анимации не отправляются вместе
+        self._command_lock = Lock()
+
+    def start(
+            self, source, filename='<string>', breakpoints=(),
+            conditions=None, logpoints=None):
+        # модули из каталога открытого файла отлаживаются вместе с ним
+        project_paths = None
+        if os.path.isfile(filename):
+            project_paths = [os.path.dirname(os.path.abspath(filename))]
+
+        try:
+            self._debugger.start(
+                source, filename, breakpoints, conditions, logpoints,
+                project_paths)
+        except InvalidBreakpointCondition as e:
+            # исключение в слоте Qt завершило бы приложение
+            self.start_failed.emit(
+                'Invalid breakpoint condition or logpoint message: '
+                '{}'.format(e))
+
+    def set_record_history(self, record):
+        """Записывать ли историю выполнения со следующего запуска"""
+        self._debugger.set_record(record)
+
+    def add_breakpoint(self, line_no):
+        self._debugger.add_breakpoint(line_no)
+
+    def remove_breakpoint(self, line_no):
+        self._debugger.remove_breakpoint(line_no)
+
+    def add_logpoint(self, line_no, message):
+        """
+        Ставит точку логирования, с некорректным шаблоном игнорируется:
+        исключение в слоте Qt завершило бы приложение
+        """
+        try:
+            self._debugger.add_logpoint(line_no, message)
+        except InvalidBreakpointCondition:
+            pass
+
+    def remove_logpoint(self, line_no):
+        self._debugger.remove_logpoint(line_no)
+
+    def add_watch(self, expression):
+        """
+        Добавляет выражение наблюдения, некорректное игнорируется: его
+        результата не будет в снимках
+        """
+        try:
+            self._debugger.add_watch(expression)
+        except InvalidBreakpointCondition:
+            pass
 
-    def start(self, source, filename='<string>'):
-        self._debugger.start(source, filename)
+    def remove_watch(self, expression):
+        self._debugger.remove_watch(expression)
 
     def step_over(self):
-        self._debugger.send_command(DebugCommand.STEP_OVER)
+        self._send_command(DebugCommand.STEP_OVER)
 
     def step_in(self):
-        self._debugger.send_command(DebugCommand.STEP_IN)
+        self._send_command(DebugCommand.STEP_IN)
 
     def step_out(self):
-        self._debugger.send_command(DebugCommand.STEP_OUT)
+        self._send_command(DebugCommand.STEP_OUT)
+
+    def continue_(self):
+        self._send_command(DebugCommand.CONTINUE)
+
+    def animate(self, interval=None, command=DebugCommand.STEP_IN):
+        """
+        Включает режим анимации: команда отправляется автоматически после
+        каждой остановки
+
+        Следующая команда отправляется не раньше, чем через `interval`
+        после предыдущей, и только после того, как интерфейс показал снимок
+        (`snapshot_shown`), поэтому программа не опережает отрисовку
+
+        :param interval: интервал между шагами (секунды), `None` -
+            `ANIMATE_INTERVAL`
+        :param command: `DebugCommand.STEP_IN` или `DebugCommand.STEP_OVER`
+        """
+        self._animate_interval = (
+            self.ANIMATE_INTERVAL if interval is None else interval)
+        self._animate_command = command
+
+    def stop_animation(self):
+        self._animate_command = None
+
+    def snapshot_shown(self):
+        """Вызывается интерфейсом, когда снимок показан"""
+        self._shown.set()
+
+    def resync(self):
+        self._debugger.resync()
+
+    def render(self, handle, expanded=False):
+        """
+        repr значения переменной по описанию из снимка
+
+        Вызывается из потока интерфейса, пока программа остановлена
+
+        :param expanded: с увеличенными ограничениями, когда пользователь
+            запросил сокращённое значение целиком
+        :return: `Rendered`
+        """
+        if handle.preview is not None:
+            return Rendered(handle.preview, False)
+
+        policy = self._render_policy.expanded() if expanded else None
+        try:
+            rendered = self._debugger.render(
+                handle.id, policy, self.RENDER_TIMEOUT)
+        except InvalidHandle:
+            return Rendered('<{}>'.format(handle.type_name), False)
+
+        return Rendered('<...>', True) if rendered is None else rendered
+
+    def children(self, handle, offset=0, limit=100):
+        """
+        Страница дочерних значений переменной (см. `Debugger.children`)
+
+        Вызывается из потока интерфейса, пока программа остановлена
+
+        :return: `Children`, `None` - значение недоступно или время
+            ожидания истекло
+        """
+        try:
+            return self._debugger.children(
+                handle.id, offset, limit, self.RENDER_TIMEOUT)
+        except InvalidHandle:
+            return None
+
+    def frame_variables(self, depth):
+        """
+        Переменные кадра стека вызовов (см. `Debugger.frame_variables`)
+
+        Вызывается из потока интерфейса, пока программа остановлена
+
+        :return: имя -> `Handle`, `None` - кадр недоступен или время
+            ожидания истекло
+        """
+        try:
+            return self._debugger.frame_variables(depth, self.RENDER_TIMEOUT)
+        except InvalidHandle:
+            return None
+
+    def history_state(self, step):
+        """
+        Записанное состояние прошлого шага (см. `Debugger.history_state`)
+
+        Вызывается из потока интерфейса, пока программа остановлена
+
+        :return: `HistoryState`, `None` - шаг не записан или время ожидания
+            истекло
+        """
+        try:
+            return self._debugger.history_state(step, self.RENDER_TIMEOUT)
+        except InvalidHandle:
+            return None
 
     def finish(self):
+        self.stop_animation()
         self._debugger.finish()
 
     def run(self):
         while True:
             try:
-                snapshot = self._debugger.get_snapshot()
+                if self._stopped and self._animate_command is not None:
+                    self._animate_step()
+                    self._emit_logs()
+                    continue
 
-                self.update.emit(
-                    snapshot['global_variables'],
-                    snapshot['local_variables'],
-                    snapshot['line_no'])
+                snapshot = self._debugger.get_snapshot(
+                    timeout=self.LOGS_INTERVAL)
+                self._emit_logs()
+
+                if snapshot is None:
+                    continue
+
+                self._stopped = True
+                self._shown.clear()
+                self.update.emit(snapshot)
             except DebuggerExit:
+                self._stopped = False
+                self._animate_command = None
+                self._shown.set()
+                self._emit_logs()
                 self.debugging_finished.emit()
+
+    def _send_command(self, command):
+        """Команда пользователя, выключает режим анимации"""
+        with self._command_lock:
+            self.stop_animation()
+            self._stopped = False
+            self._debugger.send_command(command)
+
+    def _animate_step(self):
+        """
+        Отправляет команду режима анимации, если интерфейс показал снимок и
+        интервал прошёл; иначе ждёт не дольше `LOGS_INTERVAL`, чтобы
+        записи точек логирования выгружались
+        """
+        if not self._shown.wait(self.LOGS_INTERVAL):
+            return
+
+        delay = self._last_step + self._animate_interval - time.perf_counter()
+        if delay > self.LOGS_INTERVAL:
+            time.sleep(self.LOGS_INTERVAL)
+            return
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._command_lock:
+            command = self._animate_command
+            if command is None or not self._stopped:
+                return
+
+            self._stopped = False
+            self._last_step = time.perf_counter()
+            self._debugger.send_command(command)
+
+    def _emit_logs(self):
+        while True:
+            records = self._debugger.drain_logs(self.LOGS_BATCH)
+            if not records:
+                break
+
+            self.logs.emit(records)
@@ -1,3 +1,23 @@
 from .debugger import Debugger, DebugCommand, DebuggerExit
+from .async_debugger import AsyncDebugger
+from .code_cache import CodeCache
+from .dap import DapError, DapServer
+from .engines import (
+    ENGINES, Engine, BytecodeEngine, SettraceEngine, MonitoringEngine)
+from .common import (
+    Children, EngineNotAvailable, Handle, HistoryState,
+    InvalidBreakpointCondition, InvalidHandle, Rendered, SessionStats,
+    StackFrame, TooManySessions, UnknownSession, UnknownThread,
+    WireFormatError)
+from .history import History
+from .rendering import RenderPolicy
+from .server import DebuggerServer
+from .sessions import SessionManager
 
-__all__ = [Debugger, DebugCommand, DebuggerExit]
+__all__ = [
+    Debugger, AsyncDebugger, DebuggerServer, DebugCommand, DebuggerExit,
+    CodeCache, DapError, DapServer, ENGINES, Engine, BytecodeEngine,
+    SettraceEngine, MonitoringEngine, EngineNotAvailable, Children, Handle,
+    History, HistoryState, InvalidBreakpointCondition, InvalidHandle,
+    Rendered, RenderPolicy, SessionManager, SessionStats, StackFrame,
+    TooManySessions, UnknownSession, UnknownThread, WireFormatError]
@@ -0,0 +1,195 @@
+"""Интерфейс отладчика для asyncio"""
+
+import asyncio
+from functools import partial
+from typing import AsyncIterator, Text, Iterable, Mapping, Dict, Optional
+
+from .common import (
+    Children, DebugCommand, DebuggerExit, Handle, HistoryState, Rendered)
+from .debugger import Debugger
+from .rendering import RenderPolicy
+
+
+class AsyncDebugger:
+    """
+    Отладчик с сопрограммами вместо блокирующих вызовов
+
+    Оборачивает `Debugger` или `DebuggerServer`. Снимки не ждут в
+    отдельном потоке: поток отладки уведомляет цикл событий (см.
+    `Debugger.set_snapshot_listener`), после чего снимок забирается без
+    ожидания. Поэтому один цикл событий обслуживает много отладчиков, а
+    отмена задачи, которая ждёт снимок, ничего не теряет: снимок остаётся
+    в очереди отладчика.
+
+    Запросы к остановленной программе (`render`, `children`, ...), выбор
+    потока и `start` выполняются в пуле потоков цикла событий: у
+    `DebuggerServer` это обмен с дочерним процессом. Ожидание ответа на
+    запрос ограничено (`REQUEST_TIMEOUT`): отмена задачи не прерывает
+    поток пула, и без ограничения он остался бы занят, пока программа не
+    ответит. Неблокирующие методы (точки остановки, выражения наблюдения,
+    `drain_logs`) вызываются у `debugger`
+    """
+
+    # время (секунды) ожидания ответа на запрос, если не задано другое
+    REQUEST_TIMEOUT = 10.0
+
+    def __init__(self, debugger=None):
+        """
+        :param debugger: `Debugger` или `DebuggerServer`, `None` - новый
+            `Debugger` с параметрами по умолчанию
+        """
+        self._debugger = Debugger() if debugger is None else debugger
+        # цикл событий и событие появления снимка создаются при первом
+        # ожидании, в цикле, который ждёт
+        self._loop = None
+        self._ready = None
+        # отладка запущена, и её завершение ещё не получено
+        self._running = False
+        self._debugger.set_snapshot_listener(self._on_snapshot)
+
+    @property
+    def debugger(self):
+        """Обёрнутый отладчик"""
+        return self._debugger
+
+    async def __aenter__(self) -> 'AsyncDebugger':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.finish()
+
+    async def start(
+            self, source: Text, filename: Text,
+            breakpoints: Iterable[int] = (),
+            conditions: Mapping[int, Text] = None,
+            logpoints: Mapping[int, Text] = None,
+            project_paths: Iterable[Text] = None):
+        """
+        Запускает отладку (см. `Debugger.start`)
+
+        :raise EmptySourceCode: пустой исходный код
+        :raise InvalidBreakpointCondition: некорректное условие или
+            сообщение точки логирования
+        """
+        await self._call(
+            self._debugger.start, source, filename, breakpoints, conditions,
+            logpoints, project_paths)
+        self._running = True
+
+    async def send_command(
+            self, command: DebugCommand, thread_id: int = None):
+        self._debugger.send_command(command, thread_id)
+
+    async def select_thread(self, thread_id: int):
+        """:raise UnknownThread: поток не остановлен"""
+        await self._call(self._debugger.select_thread, thread_id)
+
+    async def stopped_threads(self) -> Dict[int, Text]:
+        return await self._call(self._debugger.stopped_threads)
+
+    async def get_snapshot(self) -> dict:
+        """
+        Ждёт следующий снимок состояния (см. `Debugger.get_snapshot`)
+
+        :raise DebuggerExit: отладка закончена
+        """
+        if self._ready is None:
+            self._loop = asyncio.get_event_loop()
+            self._ready = asyncio.Event()
+
+        while True:
+            # уведомление после проверки очереди не потеряется
+            self._ready.clear()
+            try:
+                snapshot = self._debugger.get_snapshot(timeout=0)
+            except DebuggerExit:
+                self._running = False
+                raise
+            if snapshot is not None:
+                return snapshot
+
+            await self._ready.wait()
+
+    async def snapshots(self) -> AsyncIterator[dict]:
+        """Снимки состояния до завершения отладки"""
+        while True:
+            try:
+                snapshot = await self.get_snapshot()
+            except DebuggerExit:
+                return
+
+            yield snapshot
+
+    async def render(
+            self, handle_id: int, policy: RenderPolicy = None,
+            timeout: float = None) -> Optional[Rendered]:
+        """
+        :param timeout: `None` - `REQUEST_TIMEOUT`
+        :raise InvalidHandle: значения нет в текущей остановке
+        """
+        return await self._request(
+            self._debugger.render, handle_id, policy, timeout)
+
+    async def children(
+            self, handle_id: int, offset: int = 0, limit: int = 100,
+            timeout: float = None) -> Optional[Children]:
+        """
+        :param timeout: `None` - `REQUEST_TIMEOUT`
+        :raise InvalidHandle: значения нет в текущей остановке
+        """
+        return await self._request(
+            self._debugger.children, handle_id, offset, limit, timeout)
+
+    async def frame_variables(
+            self, depth: int,
+            timeout: float = None) -> Optional[Dict[str, Handle]]:
+        """
+        :param timeout: `None` - `REQUEST_TIMEOUT`
+        :raise InvalidHandle: кадра нет в текущей остановке
+        """
+        return await self._request(
+            self._debugger.frame_variables, depth, timeout)
+
+    async def history_state(
+            self, step: int, timeout: float = None) -> Optional[HistoryState]:
+        """
+        :param timeout: `None` - `REQUEST_TIMEOUT`
+        :raise InvalidHandle: шаг не записан
+        """
+        return await self._request(
+            self._debugger.history_state, step, timeout)
+
+    async def finish(self):
+        """
+        Завершает отладку и дожидается её окончания
+
+        Снимки, которые никто не забрал, отбрасываются
+        """
+        if not self._running:
+            return
+
+        self._debugger.finish()
+        try:
+            while True:
+                await self.get_snapshot()
+        except DebuggerExit:
+            pass
+
+    def _on_snapshot(self):
+        """Вызывается потоком отладки"""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._ready.set)
+
+    async def _call(self, function, *args):
+        loop = asyncio.get_event_loop()
+
+        return await loop.run_in_executor(None, partial(function, *args))
+
+    async def _request(self, function, *args):
+        """Запрос с ограниченным ожиданием, последний аргумент - timeout"""
+        *args, timeout = args
+        if timeout is None:
+            timeout = self.REQUEST_TIMEOUT
+
+        return await self._call(function, *args, timeout)
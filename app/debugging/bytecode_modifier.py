@@ -1,45 +1,120 @@
 """Модифицирует байткод"""
 
+import inspect
 import types
 
-from bytecode import Bytecode, Instr, Label, Compare
+from bytecode import Bytecode, Instr, Label, Compare, CellVar, FreeVar
 
-from .common import DebugCommand
+from .common import InvalidBreakpointCondition
 
 
 class BytecodeModifier:
-    def __init__(self, trace_func, command):
+    # увеличивается при каждом изменении генерируемого байткода,
+    # чтобы не использовать устаревший кэш
+    VERSION = 6
+
+    def __init__(
+            self, trace_func, trace_return, lazy_bind=None, lazy_load=None,
+            stop_lines='stop_lines', breakpoint_lines='breakpoint_lines',
+            step='__step__'):
+        """
+        :param trace_func: имя глобальной функции отладки
+        :param trace_return: имя глобальной функции, которую вызывает кадр
+            с шагом отладки при возврате (или yield)
+        :param lazy_bind: имя глобальной функции, которая получает каждую
+            созданную функцию в ленивом режиме
+        :param lazy_load: имя глобальной функции, которую вызывает заглушка
+            ленивой функции при первом вызове
+        :param stop_lines: имя глобальной таблицы флагов строк, на которых
+            нужно вызвать функцию отладки (индекс - номер строки)
+        :param breakpoint_lines: имя глобальной таблицы флагов строк с точками
+            остановки
+        :param step: имя локальной переменной кадра с шагом отладки
+        """
         self._trace_func = trace_func
-        self._command = command
+        self._trace_return = trace_return
+        self._lazy_bind = lazy_bind
+        self._lazy_load = lazy_load
+        self._stop_lines = stop_lines
+        self._breakpoint_lines = breakpoint_lines
+        self._step = step
+
+    def modify(self, code, *, inner=False, lazy=False, conditions=None):
+        """
+        Вставляет вызовы функции отладки перед каждой строкой
+
+        Перед каждой строкой проверяется флаг строки в таблице `stop_lines`.
+        Таблица принадлежит отладчику: во время continue и step over в ней
+        отмечены только точки остановки, во время step in - все строки.
+        Поэтому точки остановки можно ставить и снимать без перекомпиляции,
+        а строка без точки остановки стоит одного индексированного чтения
+
+        Step over и step out решаются по кадрам: каждый кадр хранит шаг
+        отладки в своей локальной переменной `step`. Функция отладки получает
+        шаг кадра и возвращает новый: ненулевой у кадра, над которым
+        выполняется step over/out, нулевой у остальных. Поэтому вызовы,
+        через которые перешагивают, не вызывают функцию отладки вообще, а
+        рекурсия не разделяет общий флаг. Кадр с ненулевым шагом при возврате
+        вызывает `trace_return`, чтобы остановиться в вызывающем кадре. Тело
+        кадра обёрнуто в обработчик исключений, который так же вызывает
+        `trace_return` при выходе из кадра с исключением и пробрасывает его
+        дальше
+
+        Условия точек остановки встраиваются в байткод строки и вычисляются
+        в кадре отлаживаемой программы, функция отладки вызывается только
+        если условие истинно (или его вычисление завершилось исключением)
+
+        В ленивом режиме вложенные функции не модифицируются: после создания
+        каждой функции вызывается `lazy_bind`, а модификация откладывается до
+        первого вызова (см. `make_lazy_stub`). Тела классов модифицируются
+        сразу, так как исполняются ровно один раз при создании класса
+
+        :param code: объект кода
+        :param inner: вложенный ли объект кода (функция, класс и т.п)
+        :param lazy: откладывать ли модификацию вложенных функций
+        :param conditions: номер строки -> объект кода условия
+            (см. `compile_condition`)
+        :return: модифицированный объект кода
+        """
+        conditions = conditions or {}
 
-    def modify(self, code, *, inner=False):
         initial_bytecode = Bytecode.from_code(code)
 
         modified_bytecode = Bytecode()
         modified_bytecode.first_lineno = initial_bytecode.first_lineno
         modified_bytecode.argcount = code.co_argcount
+        modified_bytecode.kwonlyargcount = code.co_kwonlyargcount
         modified_bytecode.argnames = initial_bytecode.argnames
         modified_bytecode.name = initial_bytecode.name
+        modified_bytecode.filename = initial_bytecode.filename
+        modified_bytecode.docstring = initial_bytecode.docstring
+        modified_bytecode.flags = code.co_flags
         modified_bytecode.freevars = code.co_freevars
         modified_bytecode.cellvars = code.co_cellvars
 
         first_line_no = initial_bytecode.first_lineno
+        is_function = self._is_function(code)
 
-        if inner:
+        # код без проверок строк (lambda, генераторы в одну строку) никогда
+        # не вызывает функцию отладки, поэтому шаг отладки ему не нужен
+        has_line_checks = not inner or self._has_line_checks(
+            initial_bytecode, first_line_no)
+
+        unwind = Label()
+        if has_line_checks:
             modified_bytecode.extend([
-                Instr('LOAD_NAME', arg=self._command, lineno=first_line_no),
-                Instr(
-                    'LOAD_CONST',
-                    arg=DebugCommand.STEP_OVER, lineno=first_line_no),
-                Instr('COMPARE_OP', arg=Compare.EQ, lineno=first_line_no),
-                Instr('STORE_NAME', arg='is_over', lineno=first_line_no),
+                Instr('LOAD_CONST', arg=0, lineno=first_line_no),
+                self._store_step(is_function, first_line_no),
+                Instr('SETUP_EXCEPT', arg=unwind, lineno=first_line_no)
             ])
 
         # добавляем инструкции отладки перед первой строкой модуля
         if not inner:
             modified_bytecode.extend(
-                self._get_trace_func_call_instructions(first_line_no))
+                self._get_trace_func_call_instructions(
+                    first_line_no, is_function))
 
+        bind_pending = False
         previous_line_no = first_line_no
         for instr in initial_bytecode:
             if not isinstance(instr, Instr):
@@ -47,48 +122,373 @@ class BytecodeModifier:
                 continue
 
             if isinstance(instr.arg, types.CodeType):
-                old_instr_name = instr.name
-                new_co = self.modify(instr.arg, inner=True)
-                instr.set(old_instr_name, new_co)
+                if lazy and self.is_lazy_candidate(instr.arg):
+                    bind_pending = True
+                else:
+                    old_instr_name = instr.name
+                    new_co = self.modify(
+                        instr.arg, inner=True,
+                        lazy=lazy, conditions=conditions)
+                    instr.set(old_instr_name, new_co)
 
-            skip = Label()
             if instr.lineno != previous_line_no:
-                if inner:
-                    modified_bytecode.extend([
-                        Instr(
-                            'LOAD_NAME', arg='is_over', lineno=instr.lineno),
-                        Instr(
-                            'POP_JUMP_IF_TRUE', arg=skip, lineno=instr.lineno)
-                    ])
-                    modified_bytecode.extend([
-                        Instr(
-                            'LOAD_NAME',
-                            arg=self._command, lineno=instr.lineno),
-                        Instr(
-                            'LOAD_CONST',
-                            arg=DebugCommand.STEP_OUT, lineno=instr.lineno),
-                        Instr(
-                            'COMPARE_OP', arg=Compare.EQ, lineno=instr.lineno),
-                        Instr(
-                            'POP_JUMP_IF_TRUE', arg=skip, lineno=instr.lineno)
-                    ])
-
-                modified_bytecode.extend(
-                    self._get_trace_func_call_instructions(instr.lineno))
-
-                if inner:
-                    modified_bytecode.append(skip)
+                modified_bytecode.extend(self._get_line_check_instructions(
+                    instr.lineno, code, conditions.get(instr.lineno)))
                 previous_line_no = instr.lineno
 
+            if has_line_checks and instr.name in (
+                    'RETURN_VALUE', 'YIELD_VALUE'):
+                modified_bytecode.extend(self._get_return_instructions(
+                    instr.lineno, is_function,
+                    instr.name == 'RETURN_VALUE'))
+
             modified_bytecode.append(instr)
 
+            if bind_pending and instr.name == 'MAKE_FUNCTION':
+                modified_bytecode.extend(
+                    self._get_lazy_bind_instructions(instr.lineno))
+                bind_pending = False
+
+        if has_line_checks:
+            modified_bytecode.append(unwind)
+            modified_bytecode.extend(self._get_unwind_instructions(
+                previous_line_no, is_function))
+
         code = modified_bytecode.to_code()
 
         return code
 
-    def _get_trace_func_call_instructions(self, line_no):
+    @staticmethod
+    def compile_condition(expression):
+        """
+        Компилирует условие точки остановки
+
+        :param expression: python выражение, например `i == 99_999`
+        :return: объект кода выражения
+        :raise InvalidBreakpointCondition: синтаксическая ошибка или
+            выражение создаёт вложенный код (lambda, генераторы)
+        """
+        try:
+            condition = compile(expression, '<condition>', 'eval')
+        except (SyntaxError, ValueError) as e:
+            raise InvalidBreakpointCondition(expression) from e
+
+        if any(isinstance(c, types.CodeType) for c in condition.co_consts):
+            raise InvalidBreakpointCondition(expression)
+
+        return condition
+
+    @staticmethod
+    def is_lazy_candidate(code):
+        """
+        Можно ли отложить модификацию объекта кода до первого вызова
+
+        Только функции со своим пространством имён: тело класса исполняется
+        в пространстве имён класса и не может быть вызвано через заглушку
+        """
+        return bool(
+            code.co_flags & inspect.CO_OPTIMIZED
+            and code.co_flags & inspect.CO_NEWLOCALS)
+
+    def make_lazy_stub(self, code):
+        """
+        Создаёт заглушку для ленивой модификации функции
+
+        Заглушка имеет ту же сигнатуру и свободные переменные, что и `code`.
+        При вызове она передаёт исходный объект кода и замыкание в
+        `lazy_load`, получает функцию с модифицированным кодом и вызывает её
+        с теми же аргументами
+
+        :param code: исходный объект кода функции
+        :return: объект кода заглушки
+        """
+        line_no = code.co_firstlineno
+        total_args = code.co_argcount + code.co_kwonlyargcount
+        has_varargs = bool(code.co_flags & inspect.CO_VARARGS)
+        has_varkw = bool(code.co_flags & inspect.CO_VARKEYWORDS)
+
+        stub = Bytecode()
+        stub.first_lineno = line_no
+        stub.name = code.co_name
+        stub.filename = code.co_filename
+        stub.argcount = code.co_argcount
+        stub.kwonlyargcount = code.co_kwonlyargcount
+        stub.argnames = list(
+            code.co_varnames[:total_args + has_varargs + has_varkw])
+        stub.freevars = code.co_freevars
+        stub.flags = code.co_flags & (
+            inspect.CO_OPTIMIZED | inspect.CO_NEWLOCALS | inspect.CO_VARARGS
+            | inspect.CO_VARKEYWORDS | inspect.CO_NESTED)
+        if not code.co_freevars:
+            stub.flags |= inspect.CO_NOFREE
+
+        def instr(name, *args):
+            return Instr(name, *args, lineno=line_no)
+
+        stub.extend([
+            instr('LOAD_GLOBAL', self._lazy_load),
+            instr('LOAD_CONST', code)
+        ])
+        if code.co_freevars:
+            stub.extend(
+                instr('LOAD_CLOSURE', FreeVar(name))
+                for name in code.co_freevars)
+            stub.append(instr('BUILD_TUPLE', len(code.co_freevars)))
+        else:
+            stub.append(instr('LOAD_CONST', None))
+        stub.append(instr('CALL_FUNCTION', 2))
+
+        positional = code.co_varnames[:code.co_argcount]
+        stub.extend(instr('LOAD_FAST', name) for name in positional)
+        stub.append(instr('BUILD_TUPLE', len(positional)))
+        if has_varargs:
+            stub.append(instr('LOAD_FAST', code.co_varnames[total_args]))
+            stub.append(instr('BUILD_TUPLE_UNPACK_WITH_CALL', 2))
+
+        keywords = code.co_varnames[code.co_argcount:total_args]
+        if keywords or has_varkw:
+            for name in keywords:
+                stub.extend([
+                    instr('LOAD_CONST', name),
+                    instr('LOAD_FAST', name)
+                ])
+            stub.append(instr('BUILD_MAP', len(keywords)))
+            if has_varkw:
+                stub.append(instr(
+                    'LOAD_FAST', code.co_varnames[total_args + has_varargs]))
+                stub.append(instr('BUILD_MAP_UNPACK_WITH_CALL', 2))
+
+        stub.extend([
+            instr('CALL_FUNCTION_EX', int(bool(keywords or has_varkw))),
+            instr('RETURN_VALUE')
+        ])
+
+        return stub.to_code()
+
+    def _get_lazy_bind_instructions(self, line_no):
+        # на вершине стека только что созданная функция:
+        # func -> lazy_bind(func)
+        return [
+            Instr('LOAD_GLOBAL', arg=self._lazy_bind, lineno=line_no),
+            Instr('ROT_TWO', lineno=line_no),
+            Instr('CALL_FUNCTION', arg=1, lineno=line_no)
+        ]
+
+    @staticmethod
+    def _is_function(code):
+        # у функций собственное пространство имён и быстрые локальные
+        # переменные, у модуля и тела класса - словарь имён
+        return bool(code.co_flags & inspect.CO_NEWLOCALS)
+
+    @staticmethod
+    def _has_line_checks(bytecode, first_line_no):
+        previous_line_no = first_line_no
+        for instr in bytecode:
+            if isinstance(instr, Instr) and instr.lineno != previous_line_no:
+                return True
+
+        return False
+
+    def _load_step(self, is_function, line_no):
+        return Instr(
+            'LOAD_FAST' if is_function else 'LOAD_NAME',
+            arg=self._step, lineno=line_no)
+
+    def _store_step(self, is_function, line_no):
+        return Instr(
+            'STORE_FAST' if is_function else 'STORE_NAME',
+            arg=self._step, lineno=line_no)
+
+    def _get_line_check_instructions(self, line_no, code, condition=None):
+        """
+        Инструкции проверки строки перед её исполнением
+
+        Функция отладки вызывается, если у кадра ненулевой шаг отладки или
+        строка отмечена в `stop_lines`. Условие точки остановки проверяется
+        только когда отмечены лишь точки остановки (не step in); если оно
+        ложно, а шаг кадра ненулевой, функция отладки вызывается без учёта
+        точки остановки на строке
+        """
+        is_function = self._is_function(code)
+        call = Label()
+        skip = Label()
+
+        if condition is None:
+            instructions = [
+                self._load_step(is_function, line_no),
+                Instr('POP_JUMP_IF_TRUE', arg=call, lineno=line_no),
+                Instr('LOAD_GLOBAL', arg=self._stop_lines, lineno=line_no),
+                Instr('LOAD_CONST', arg=line_no, lineno=line_no),
+                Instr('BINARY_SUBSCR', lineno=line_no),
+                Instr('POP_JUMP_IF_FALSE', arg=skip, lineno=line_no),
+                call
+            ]
+            instructions.extend(
+                self._get_trace_func_call_instructions(line_no, is_function))
+            instructions.append(skip)
+
+            return instructions
+
+        flagged = Label()
+        is_false = Label()
+        instructions = [
+            Instr('LOAD_GLOBAL', arg=self._stop_lines, lineno=line_no),
+            Instr('LOAD_CONST', arg=line_no, lineno=line_no),
+            Instr('BINARY_SUBSCR', lineno=line_no),
+            Instr('POP_JUMP_IF_TRUE', arg=flagged, lineno=line_no),
+            self._load_step(is_function, line_no),
+            Instr('POP_JUMP_IF_TRUE', arg=call, lineno=line_no),
+            Instr('JUMP_ABSOLUTE', arg=skip, lineno=line_no),
+            flagged,
+            Instr('LOAD_GLOBAL', arg=self._stop_lines, lineno=line_no),
+            Instr('LOAD_GLOBAL', arg=self._breakpoint_lines, lineno=line_no),
+            Instr('COMPARE_OP', arg=Compare.IS, lineno=line_no),
+            Instr('POP_JUMP_IF_FALSE', arg=call, lineno=line_no)
+        ]
+        instructions.extend(self._get_condition_instructions(
+            condition, code, line_no, call, is_false))
+        instructions.extend([
+            is_false,
+            self._load_step(is_function, line_no),
+            Instr('POP_JUMP_IF_FALSE', arg=skip, lineno=line_no)
+        ])
+        instructions.extend(self._get_trace_func_call_instructions(
+            line_no, is_function, breakpoint=False))
+        instructions.extend([
+            Instr('JUMP_ABSOLUTE', arg=skip, lineno=line_no),
+            call
+        ])
+        instructions.extend(
+            self._get_trace_func_call_instructions(line_no, is_function))
+        instructions.append(skip)
+
+        return instructions
+
+    def _get_return_instructions(self, line_no, is_function, is_return):
+        """
+        Инструкции перед выходом из кадра (return или yield)
+
+        Если у кадра ненулевой шаг отладки, то сообщает отладчику о выходе,
+        чтобы остановиться в вызывающем кадре. Тело класса при возврате
+        удаляет шаг отладки из пространства имён класса
+        """
+        leave = Label()
+        instructions = [
+            self._load_step(is_function, line_no),
+            Instr('POP_JUMP_IF_FALSE', arg=leave, lineno=line_no),
+            Instr('LOAD_GLOBAL', arg=self._trace_return, lineno=line_no),
+            self._load_step(is_function, line_no),
+            Instr('CALL_FUNCTION', arg=1, lineno=line_no),
+            Instr('POP_TOP', lineno=line_no),
+            leave
+        ]
+
+        if is_return and not is_function:
+            instructions.append(
+                Instr('DELETE_NAME', arg=self._step, lineno=line_no))
+
+        return instructions
+
+    def _get_unwind_instructions(self, line_no, is_function):
+        """
+        Обработчик выхода из кадра с исключением
+
+        Если у кадра ненулевой шаг отладки, то сообщает отладчику о выходе,
+        как и при возврате. Исключение пробрасывается дальше с исходной
+        трассировкой стека
+        """
+        reraise = Label()
+
         return [
+            self._load_step(is_function, line_no),
+            Instr('POP_JUMP_IF_FALSE', arg=reraise, lineno=line_no),
+            Instr('LOAD_GLOBAL', arg=self._trace_return, lineno=line_no),
+            self._load_step(is_function, line_no),
+            Instr('CALL_FUNCTION', arg=1, lineno=line_no),
+            Instr('POP_TOP', lineno=line_no),
+            reraise,
+            Instr('END_FINALLY', lineno=line_no)
+        ]
+
+    @staticmethod
+    def _get_condition_instructions(condition, code, line_no, true, false):
+        """
+        Встраивает байткод условия в код `code`
+
+        Имена выражения переводятся в локальные, замыкания или глобальные
+        переменные кода, как если бы выражение было написано в его теле.
+        Исключение при вычислении условия считается истинным условием.
+        Значение условия проверяется внутри блока try, так как POP_BLOCK
+        очищает стек до уровня блока
+
+        :param true: метка перехода, если условие истинно
+        :param false: метка перехода, если условие ложно
+        """
+        is_function = BytecodeModifier._is_function(code)
+
+        def resolve(name):
+            if not is_function:
+                return Instr('LOAD_NAME', arg=name, lineno=line_no)
+            if name in code.co_cellvars:
+                return Instr('LOAD_DEREF', arg=CellVar(name), lineno=line_no)
+            if name in code.co_freevars:
+                return Instr('LOAD_DEREF', arg=FreeVar(name), lineno=line_no)
+            if name in code.co_varnames:
+                return Instr('LOAD_FAST', arg=name, lineno=line_no)
+            return Instr('LOAD_GLOBAL', arg=name, lineno=line_no)
+
+        handler = Label()
+        evaluated = Label()
+        is_false = Label()
+        instructions = [Instr('SETUP_EXCEPT', arg=handler, lineno=line_no)]
+
+        for instr in Bytecode.from_code(condition):
+            if isinstance(instr, Instr):
+                if instr.name == 'RETURN_VALUE':
+                    instr = Instr(
+                        'JUMP_ABSOLUTE', arg=evaluated, lineno=line_no)
+                elif instr.name == 'LOAD_NAME':
+                    instr = resolve(instr.arg)
+                else:
+                    instr.lineno = line_no
+            instructions.append(instr)
+
+        instructions.extend([
+            evaluated,
+            Instr('POP_JUMP_IF_FALSE', arg=is_false, lineno=line_no),
+            Instr('POP_BLOCK', lineno=line_no),
+            Instr('JUMP_ABSOLUTE', arg=true, lineno=line_no),
+            is_false,
+            Instr('POP_BLOCK', lineno=line_no),
+            Instr('JUMP_ABSOLUTE', arg=false, lineno=line_no),
+            handler,
+            Instr('POP_TOP', lineno=line_no),
+            Instr('POP_TOP', lineno=line_no),
+            Instr('POP_TOP', lineno=line_no),
+            Instr('POP_EXCEPT', lineno=line_no),
+            Instr('JUMP_ABSOLUTE', arg=true, lineno=line_no)
+        ])
+
+        return instructions
+
+    def _get_trace_func_call_instructions(
+            self, line_no, is_function, *, breakpoint=True):
+        # step = trace(step) или step = trace(step, False), если точку
+        # остановки на строке нужно игнорировать
+        instructions = [
             Instr('LOAD_GLOBAL', arg=self._trace_func, lineno=line_no),
-            Instr('CALL_FUNCTION', arg=0, lineno=line_no),
-            Instr('POP_TOP', lineno=line_no)
+            self._load_step(is_function, line_no)
         ]
+
+        if breakpoint:
+            instructions.append(
+                Instr('CALL_FUNCTION', arg=1, lineno=line_no))
+        else:
+            instructions.extend([
+                Instr('LOAD_CONST', arg=False, lineno=line_no),
+                Instr('CALL_FUNCTION', arg=2, lineno=line_no)
+            ])
+
+        instructions.append(self._store_step(is_function, line_no))
+
+        return instructions
@@ -0,0 +1,173 @@
+"""Кэширует модифицированный байткод в памяти и на диске"""
+
+import hashlib
+import marshal
+import os
+import sys
+from collections import OrderedDict
+from importlib.util import MAGIC_NUMBER
+from types import CodeType
+from typing import Optional, Text
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser('~'), '.cache', 'poson')
+
+
+class CodeCache:
+    """
+    Двухуровневый кэш модифицированных объектов кода
+
+    Первый уровень - LRU в памяти, второй - файлы с marshal-представлением
+    кода в директории `directory` (по аналогии с `__pycache__`).
+    Ключ учитывает хэш исходного кода, имя файла, версию интерпретатора и
+    параметры модификации байткода. Каждая правка программы и набор
+    условий дают новый файл, поэтому после записи удаляются файлы сверх
+    `max_files`, давнее всего использованные (по времени изменения,
+    которое обновляется при чтении)
+    """
+    _SUFFIX = '.poson'
+
+    def __init__(
+            self, directory: Optional[Text] = DEFAULT_CACHE_DIR,
+            maxsize: int = 32, max_files: int = 256):
+        """
+        :param directory: директория дискового кэша, `None` - только память
+        :param maxsize: максимальное число объектов кода в памяти
+        :param max_files: максимальное число файлов на диске
+        """
+        self._directory = directory
+        self._maxsize = maxsize
+        self._max_files = max_files
+        self._memory = OrderedDict()
+
+    @staticmethod
+    def make_key(source: Text, filename: Text, **options) -> Text:
+        """
+        Вычисляет ключ кэша
+
+        :param source: исходный код программы
+        :param filename: название файла откуда был прочитан исходный код
+        :param options: параметры модификации байткода
+        :return: hex-строка ключа
+        """
+        key = hashlib.sha256()
+        key.update(sys.implementation.cache_tag.encode())
+        key.update(MAGIC_NUMBER)
+        key.update(filename.encode('utf-8', 'surrogatepass'))
+        key.update(b'\0')
+        key.update(source.encode('utf-8', 'surrogatepass'))
+        key.update(b'\0')
+        key.update(repr(sorted(options.items())).encode())
+
+        return key.hexdigest()
+
+    def get(self, key: Text) -> Optional[CodeType]:
+        """
+        Возвращает объект кода по ключу или `None`, если его нет в кэше
+        """
+        try:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        except KeyError:
+            pass
+
+        code = self._load(key)
+        if code is not None:
+            self._remember(key, code)
+            self._touch(key)
+
+        return code
+
+    def put(self, key: Text, code: CodeType):
+        """Сохраняет объект кода в памяти и на диске"""
+        self._remember(key, code)
+        self._dump(key, code)
+
+    def clear(self):
+        """Очищает кэш в памяти, файлы на диске не удаляются"""
+        self._memory.clear()
+
+    def _remember(self, key, code):
+        self._memory[key] = code
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self._maxsize:
+            self._memory.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self._directory, key + self._SUFFIX)
+
+    def _load(self, key):
+        if self._directory is None:
+            return None
+
+        try:
+            with open(self._path(key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        if data[:len(MAGIC_NUMBER)] != MAGIC_NUMBER:
+            return None
+
+        try:
+            code = marshal.loads(data[len(MAGIC_NUMBER):])
+        except (EOFError, ValueError, TypeError):
+            return None
+
+        return code if isinstance(code, CodeType) else None
+
+    def _dump(self, key, code):
+        if self._directory is None:
+            return
+
+        path = self._path(key)
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+
+        # ошибки записи не критичны: кэш лишь ускоряет повторный запуск
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(MAGIC_NUMBER)
+                f.write(marshal.dumps(code))
+            os.replace(tmp_path, path)
+        except (OSError, ValueError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        self._evict()
+
+    def _touch(self, key):
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Удаляет давно использованные файлы сверх `max_files`"""
+        files = []
+        try:
+            with os.scandir(self._directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(self._SUFFIX):
+                        try:
+                            files.append(
+                                (entry.stat().st_mtime, entry.path))
+                        except OSError:
+                            # удалён параллельно
+                            continue
+        except OSError:
+            return
+
+        if len(files) <= self._max_files:
+            return
+
+        files.sort()
+        for _, path in files[:len(files) - self._max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
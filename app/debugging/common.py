@@ -1,4 +1,5 @@
-from enum import Enum, auto
+from collections import namedtuple
+from enum import IntEnum, auto
 
 
 class DebuggerExit(Exception):
@@ -13,10 +14,125 @@ class EmptySourceCode(Exception):
     pass
 
 
-class DebugCommand(Enum):
+class InvalidBreakpointCondition(Exception):
+    pass
+
+
+class EngineNotAvailable(Exception):
+    pass
+
+
+class InvalidHandle(Exception):
+    pass
+
+
+class WireFormatError(Exception):
+    pass
+
+
+class UnknownSession(Exception):
+    pass
+
+
+class TooManySessions(Exception):
+    pass
+
+
+class UnknownThread(Exception):
+    pass
+
+
+class DebugCommand(IntEnum):
     """
     Команды отладки
+
+    IntEnum, чтобы команды можно было передавать и сравнивать как
+    обычные числа
     """
     STEP_OVER = auto()
     STEP_IN = auto()
     STEP_OUT = auto()
+    CONTINUE = auto()
+
+
+class LineFlag(IntEnum):
+    """
+    Флаги строки в таблице точек остановки отладчика
+    """
+    BREAKPOINT = 1
+    LOGPOINT = 2
+
+
+LineTables = namedtuple(
+    'LineTables', ['breakpoint_lines', 'all_lines', 'hit_counts'])
+LineTables.__doc__ = '''
+Таблицы строк одного файла программы, индекс - номер строки
+
+breakpoint_lines - флаги точек (см. `LineFlag`), all_lines - флаги всех
+строк (для step in), hit_counts - счётчики срабатываний
+'''
+
+LogRecord = namedtuple('LogRecord', ['line_no', 'hit_count', 'message'])
+LogRecord.__doc__ = '''
+Запись точки логирования
+
+line_no - номер строки, hit_count - номер срабатывания строки,
+message - отформатированное сообщение
+'''
+
+Handle = namedtuple(
+    'Handle', ['name', 'type_name', 'id', 'size', 'preview'])
+Handle.__doc__ = '''
+Описание значения переменной в снимке состояния без его repr
+
+name - имя переменной, type_name - имя типа, id - идентификатор значения
+для `Debugger.render`, size - длина встроенной коллекции или строки (иначе
+`None`), preview - строка для чисел, `None` и коротких строк (иначе `None`)
+'''
+
+Rendered = namedtuple('Rendered', ['text', 'truncated'])
+Rendered.__doc__ = '''
+repr значения, вычисленный по `rendering.RenderPolicy`
+
+text - repr, truncated - сокращён ли он по ограничениям политики (полный
+можно запросить с увеличенными ограничениями)
+'''
+
+Children = namedtuple('Children', ['handles', 'total'])
+Children.__doc__ = '''
+Страница дочерних значений контейнера (см. `Debugger.children`)
+
+handles - описания (`Handle`) элементов списка, записей словаря или
+атрибутов объекта, total - их общее количество
+'''
+
+StackFrame = namedtuple('StackFrame', ['name', 'filename', 'line_no'])
+StackFrame.__doc__ = '''
+Кадр стека вызовов в снимке состояния
+
+name - имя функции (`<module>` для модуля), filename - файл,
+line_no - номер выполняемой строки
+'''
+
+HistoryState = namedtuple(
+    'HistoryState',
+    ['step', 'line_no', 'filename', 'global_variables', 'local_variables'])
+HistoryState.__doc__ = '''
+Записанное состояние прошлого шага программы (см. `History`)
+
+step - номер шага, line_no - номер строки, filename - файл строки,
+global_variables, local_variables - имя -> repr значения на момент шага
+'''
+
+SessionStats = namedtuple(
+    'SessionStats',
+    ['created', 'idle', 'snapshots', 'calls', 'cpu_time', 'memory'])
+SessionStats.__doc__ = '''
+Ресурсы сеанса отладки (см. `SessionManager.stats`)
+
+created - время создания (`time.monotonic`), idle - секунды без вызовов и
+снимков, snapshots - количество снимков, calls - количество вызовов,
+cpu_time - процессорное время дочернего процесса (секунды), memory - его
+резидентная память (байты); `None` - сеанс в процессе менеджера или
+данные недоступны
+'''
@@ -0,0 +1,633 @@
+"""
+Сервер отладки по сети: подмножество Debug Adapter Protocol
+
+Сообщение - заголовок `Content-Length: <длина>\\r\\n\\r\\n` и JSON. Команды:
+initialize, launch, attach, setBreakpoints, configurationDone, threads,
+stackTrace, scopes, variables, next, stepIn, stepOut, continue, disconnect
+"""
+
+import asyncio
+import json
+import os
+from collections import namedtuple
+from itertools import count
+from typing import Optional, Tuple, Text
+
+from .async_debugger import AsyncDebugger
+from .common import (
+    DebugCommand, DebuggerExit, EmptySourceCode, InvalidBreakpointCondition,
+    UnknownThread)
+from .debugger import Debugger
+
+# поток, о котором сообщается до первой остановки программы; после неё
+# номера потоков - `thread_id` снимков. Запрос с неизвестным потоком
+# относится к последней остановке
+THREAD_ID = 1
+
+_CONTENT_LENGTH = b'content-length'
+_HEADER_END = b'\r\n\r\n'
+_STEP_COMMANDS = {
+    'next': DebugCommand.STEP_OVER,
+    'stepIn': DebugCommand.STEP_IN,
+    'stepOut': DebugCommand.STEP_OUT,
+    'continue': DebugCommand.CONTINUE,
+}
+# причина остановки (`stopped`) по последней команде потока
+_STOP_REASONS = {
+    DebugCommand.STEP_OVER: 'step',
+    DebugCommand.STEP_IN: 'step',
+    DebugCommand.STEP_OUT: 'step',
+    DebugCommand.CONTINUE: 'breakpoint',
+}
+
+
+# остановленный поток: снимок, переменные на момент остановки и причина
+_ThreadStop = namedtuple(
+    '_ThreadStop',
+    ['snapshot', 'global_variables', 'local_variables', 'reason'])
+
+
+class DapError(Exception):
+    """Ошибка запроса, текст попадает в ответ клиенту"""
+    pass
+
+
+class DapServer:
+    """
+    Сервер подмножества Debug Adapter Protocol поверх TCP или Unix сокета
+
+    Ввод-вывод неблокирующий (asyncio), сообщения одной итерации цикла
+    событий записываются в сокет одним вызовом. Сеанс отладки
+    принадлежит серверу, а не соединению: после отключения без
+    `terminateDebuggee` программа остаётся остановленной, и новый клиент
+    продолжает отладку командой `attach`. Одновременно подключён один
+    клиент, новое соединение закрывает прежнее.
+
+    Остановки потоков программы хранятся отдельно: команды, стек и
+    переменные относятся к потоку `threadId` запроса (в режиме non-stop
+    остановлено может быть несколько потоков)
+    """
+
+    # интервал (секунды) отправки записей точек логирования, пока программа
+    # выполняется без остановок
+    LOGS_INTERVAL = 0.1
+    # максимальное время ожидания repr значения (секунды)
+    RENDER_TIMEOUT = 2.0
+
+    def __init__(self, debugger=None):
+        """
+        :param debugger: `Debugger` или `DebuggerServer`, `None` - новый
+            `Debugger`
+        """
+        self._debugger = AsyncDebugger(
+            Debugger(lazy=True) if debugger is None else debugger)
+        self._servers = []
+        self._writer = None
+        self._outgoing = []
+        self._flush_scheduled = False
+        self._seq = count(1)
+
+        self._session = None
+        self._filename = None
+        # файл -> номер строки -> (условие, сообщение точки логирования)
+        self._breakpoints = {}
+        # условия, встроенные в байткод при запуске: номер строки -> условие
+        self._conditions = {}
+        # первая остановка сеанса - `entry`
+        self._entry = True
+        # поток -> последняя команда
+        self._last_commands = {}
+        # поток -> `_ThreadStop`
+        self._stops = {}
+        # снимок последней остановки, `None` - ни один поток не остановлен
+        self._snapshot = None
+        # переменные по отличиям всех снимков
+        self._globals = {}
+        self._locals = {}
+        # id кадра или variablesReference -> (что показать, поток, ...),
+        # действительны до команды потоку
+        self._references = {}
+        self._next_reference = count(1)
+
+    async def serve_tcp(
+            self, host: Text = '127.0.0.1',
+            port: int = 0) -> Tuple[Text, int]:
+        """
+        Принимает соединения по TCP
+
+        :param port: порт, 0 - любой свободный
+        :return: адрес сервера
+        """
+        server = await asyncio.start_server(self._serve_client, host, port)
+        self._servers.append(server)
+
+        return server.sockets[0].getsockname()[:2]
+
+    async def serve_unix(self, path: Text):
+        """Принимает соединения через Unix сокет `path`"""
+        server = await asyncio.start_unix_server(self._serve_client, path)
+        self._servers.append(server)
+
+    async def close(self):
+        """Закрывает сокеты, соединение и завершает отладку"""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+
+        await self._stop_session()
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+
+    async def _serve_client(self, reader, writer):
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+        self._writer = writer
+        self._outgoing = []
+
+        try:
+            while True:
+                try:
+                    message = await _read_message(reader)
+                except ValueError:
+                    # повреждённое сообщение: соединение не восстановить
+                    break
+                if message is None or writer is not self._writer:
+                    break
+
+                if (isinstance(message, dict)
+                        and message.get('type') == 'request'):
+                    await self._dispatch(message)
+                    if message.get('command') == 'disconnect':
+                        break
+        finally:
+            if writer is self._writer:
+                self._flush()
+                self._writer = None
+            writer.close()
+
+    async def _dispatch(self, request):
+        command = request.get('command')
+        handler = getattr(self, '_on_' + str(command), None)
+        if handler is None:
+            self._respond(
+                request, success=False,
+                message='Неподдерживаемая команда: {}'.format(command))
+            return
+
+        try:
+            body = await handler(request.get('arguments') or {})
+        except EmptySourceCode:
+            self._respond(
+                request, success=False, message='Пустой исходный код')
+            return
+        except InvalidBreakpointCondition as e:
+            self._respond(
+                request, success=False,
+                message='Некорректное условие или сообщение точки '
+                        'логирования: {}'.format(e))
+            return
+        except (
+                DapError, OSError, KeyError, TypeError, ValueError,
+                AttributeError, SyntaxError, UnknownThread) as e:
+            self._respond(request, success=False, message=str(e))
+            return
+
+        self._respond(request, body)
+        if command == 'initialize':
+            self._send_event('initialized')
+        elif command == 'attach':
+            for stop in list(self._stops.values()):
+                self._send_stopped(stop)
+
+    async def _on_initialize(self, arguments):
+        return {
+            'supportsConfigurationDoneRequest': True,
+            'supportsConditionalBreakpoints': True,
+            'supportsLogPoints': True,
+        }
+
+    async def _on_launch(self, arguments):
+        program = arguments.get('program')
+        source = arguments.get('source')
+        if source is None:
+            if program is None:
+                raise DapError('Нужен program или source')
+            source = await asyncio.get_event_loop().run_in_executor(
+                None, _read_source, program)
+
+        filename = program or '<string>'
+        project_paths = None
+        if os.path.isfile(filename):
+            project_paths = [os.path.dirname(os.path.abspath(filename))]
+
+        await self._stop_session()
+
+        lines = self._breakpoints.get(filename, {})
+        self._conditions = {
+            line_no: condition
+            for line_no, (condition, log_message) in lines.items()
+            if condition and not log_message}
+        await self._debugger.start(
+            source, filename,
+            breakpoints=[
+                line_no for line_no, (_, log_message) in lines.items()
+                if not log_message],
+            conditions=self._conditions,
+            logpoints={
+                line_no: log_message
+                for line_no, (_, log_message) in lines.items()
+                if log_message},
+            project_paths=project_paths)
+
+        self._filename = filename
+        # точки в модулях проекта ставятся при их импорте
+        for path, lines in self._breakpoints.items():
+            if path != filename:
+                for line_no in lines:
+                    self._debugger.debugger.add_breakpoint(line_no, path)
+
+        self._entry = True
+        self._last_commands = {}
+        self._session = asyncio.ensure_future(self._pump())
+
+    async def _on_attach(self, arguments):
+        if self._session is None:
+            raise DapError('Нет сеанса отладки')
+
+    async def _on_configurationDone(self, arguments):
+        pass
+
+    async def _on_setBreakpoints(self, arguments):
+        path = arguments['source'].get('path') or '<string>'
+        lines = {
+            breakpoint['line']: (
+                breakpoint.get('condition'), breakpoint.get('logMessage'))
+            for breakpoint in arguments.get('breakpoints', ())}
+        old_lines = self._breakpoints.get(path, {})
+        self._breakpoints[path] = lines
+
+        if self._session is None:
+            return {'breakpoints': [
+                {'verified': True, 'line': line_no} for line_no in lines]}
+
+        debugger = self._debugger.debugger
+        is_main = path == self._filename
+        for line_no in old_lines:
+            debugger.remove_breakpoint(line_no, None if is_main else path)
+            if is_main:
+                debugger.remove_logpoint(line_no)
+
+        breakpoints = []
+        for line_no, (condition, log_message) in lines.items():
+            message = None
+            if log_message:
+                if not is_main:
+                    message = 'Точки логирования только в основном файле'
+                else:
+                    try:
+                        debugger.add_logpoint(line_no, log_message)
+                    except InvalidBreakpointCondition:
+                        message = 'Некорректное сообщение точки логирования'
+            elif condition and (
+                    not is_main or self._conditions.get(line_no) != condition):
+                message = 'Условия задаются до запуска (launch)'
+            else:
+                debugger.add_breakpoint(line_no, None if is_main else path)
+
+            breakpoint = {'verified': message is None, 'line': line_no}
+            if message is not None:
+                breakpoint['message'] = message
+            breakpoints.append(breakpoint)
+
+        return {'breakpoints': breakpoints}
+
+    async def _on_threads(self, arguments):
+        if self._snapshot is None:
+            return {'threads': [{'id': THREAD_ID, 'name': 'main'}]}
+
+        threads = await self._debugger.stopped_threads()
+        for thread_id, stop in list(self._stops.items()):
+            threads[thread_id] = stop.snapshot['thread_name']
+
+        return {'threads': [
+            {'id': thread_id, 'name': name}
+            for thread_id, name in sorted(threads.items())]}
+
+    async def _on_stackTrace(self, arguments):
+        thread_id, stop = self._thread_stop(arguments)
+        stack = stop.snapshot['stack']
+        start = arguments.get('startFrame', 0)
+        levels = arguments.get('levels') or len(stack)
+
+        frames = [
+            {
+                'id': self._reference(('frame', thread_id, depth)),
+                'name': frame.name,
+                'source': {
+                    'name': os.path.basename(frame.filename),
+                    'path': frame.filename,
+                },
+                'line': frame.line_no,
+                'column': 1,
+            }
+            for depth, frame in enumerate(stack)
+            if start <= depth < start + levels]
+
+        return {'stackFrames': frames, 'totalFrames': len(stack)}
+
+    async def _on_scopes(self, arguments):
+        target = self._references.get(arguments['frameId'])
+        if target is None or target[0] != 'frame':
+            raise DapError('Неизвестный кадр')
+        thread_id = target[1]
+
+        return {'scopes': [
+            {
+                'name': 'Locals',
+                'variablesReference': self._reference(target),
+                'expensive': False,
+            },
+            {
+                'name': 'Globals',
+                'variablesReference': self._reference(
+                    ('globals', thread_id)),
+                'expensive': False,
+            },
+        ]}
+
+    async def _on_variables(self, arguments):
+        target = self._references.get(arguments['variablesReference'])
+        if target is None:
+            raise DapError('Неизвестная ссылка на переменные')
+
+        kind, thread_id = target[:2]
+        stop = self._stops.get(thread_id)
+        if stop is None:
+            raise DapError('Поток не остановлен')
+
+        if kind == 'globals':
+            handles = list(stop.global_variables.values())
+        elif kind == 'frame' and target[2] == 0:
+            handles = list(stop.local_variables.values())
+        elif kind == 'frame':
+            variables = await self._thread_call(
+                thread_id, self._debugger.frame_variables, target[2],
+                self.RENDER_TIMEOUT)
+            handles = list((variables or {}).values())
+        else:
+            children = await self._thread_call(
+                thread_id, self._debugger.children, target[2],
+                arguments.get('start', 0), arguments.get('count') or 100,
+                self.RENDER_TIMEOUT)
+            handles = [] if children is None else children.handles
+
+        variables = []
+        for handle in handles:
+            value = handle.preview
+            if value is None:
+                rendered = await self._thread_call(
+                    thread_id, self._debugger.render, handle.id, None,
+                    self.RENDER_TIMEOUT)
+                value = '<недоступно>' if rendered is None else rendered.text
+            variables.append({
+                'name': handle.name,
+                'value': value,
+                'type': handle.type_name,
+                'variablesReference': (
+                    0 if handle.preview is not None
+                    else self._reference(
+                        ('children', thread_id, handle.id))),
+            })
+
+        return {'variables': variables}
+
+    async def _on_next(self, arguments):
+        await self._resume('next', arguments)
+
+    async def _on_stepIn(self, arguments):
+        await self._resume('stepIn', arguments)
+
+    async def _on_stepOut(self, arguments):
+        await self._resume('stepOut', arguments)
+
+    async def _on_continue(self, arguments):
+        await self._resume('continue', arguments)
+        return {'allThreadsContinued': not self._stops}
+
+    async def _on_disconnect(self, arguments):
+        if arguments.get('terminateDebuggee'):
+            await self._stop_session()
+
+    async def _resume(self, command, arguments):
+        thread_id, _ = self._thread_stop(arguments)
+        self._forget(thread_id)
+        self._last_commands[thread_id] = _STEP_COMMANDS[command]
+        await self._debugger.send_command(
+            _STEP_COMMANDS[command], thread_id)
+
+    def _thread_stop(self, arguments) -> Tuple[int, _ThreadStop]:
+        """
+        Остановка потока `threadId` запроса
+
+        :raise DapError: программа не остановлена
+        """
+        if self._snapshot is None:
+            raise DapError('Программа не остановлена')
+
+        thread_id = arguments.get('threadId')
+        if thread_id not in self._stops:
+            thread_id = self._snapshot['thread_id']
+
+        return thread_id, self._stops[thread_id]
+
+    def _forget(self, thread_id):
+        """Поток продолжает выполнение: его остановка и ссылки забываются"""
+        del self._stops[thread_id]
+        for reference, target in list(self._references.items()):
+            if target[1] == thread_id:
+                del self._references[reference]
+
+        self._snapshot = None
+        if self._stops:
+            self._snapshot = list(self._stops.values())[-1].snapshot
+
+    async def _thread_call(self, thread_id, method, *args):
+        """Запрос к остановке потока (см. `Debugger.select_thread`)"""
+        await self._debugger.select_thread(thread_id)
+
+        return await method(*args)
+
+    def _reference(self, target) -> int:
+        reference = next(self._next_reference)
+        self._references[reference] = target
+
+        return reference
+
+    async def _stop_session(self):
+        """Завершает программу и дожидается окончания её сеанса"""
+        session = self._session
+        if session is None:
+            return
+
+        # снимки забирает `finish`
+        session.cancel()
+        try:
+            await session
+        except asyncio.CancelledError:
+            pass
+
+        await self._debugger.finish()
+        self._finish_session()
+
+    def _finish_session(self):
+        self._session = None
+        self._snapshot = None
+        self._stops = {}
+        self._references.clear()
+        self._emit_logs()
+        self._send_event('terminated')
+        self._send_event('exited', {'exitCode': 0})
+
+    async def _pump(self):
+        """Сеанс: снимки становятся событиями `stopped`"""
+        while True:
+            try:
+                snapshot = await asyncio.wait_for(
+                    self._debugger.get_snapshot(), self.LOGS_INTERVAL)
+            except asyncio.TimeoutError:
+                # отмена ожидания не теряет снимок
+                self._emit_logs()
+                continue
+            except DebuggerExit:
+                break
+
+            thread_id = snapshot['thread_id']
+            if self._entry:
+                reason = 'entry'
+                self._entry = False
+            else:
+                reason = _STOP_REASONS[self._last_commands.pop(
+                    thread_id, DebugCommand.CONTINUE)]
+
+            self._apply(snapshot, reason)
+            self._emit_logs()
+            self._send_stopped(self._stops[thread_id])
+
+        self._finish_session()
+
+    def _apply(self, snapshot, reason):
+        """Переменные остановки из отличий снимка от предыдущего"""
+        if snapshot['full']:
+            self._globals = {}
+            self._locals = {}
+
+        self._globals.update(snapshot['global_variables'])
+        for name in snapshot['removed_global_variables']:
+            self._globals.pop(name, None)
+        self._locals.update(snapshot['local_variables'])
+        for name in snapshot['removed_local_variables']:
+            self._locals.pop(name, None)
+
+        thread_id = snapshot['thread_id']
+        if thread_id in self._stops:
+            self._forget(thread_id)
+        self._stops[thread_id] = _ThreadStop(
+            snapshot, dict(self._globals), dict(self._locals), reason)
+        self._snapshot = snapshot
+
+    def _emit_logs(self):
+        for record in self._debugger.debugger.drain_logs():
+            self._send_event('output', {
+                'category': 'console',
+                'output': record.message + '\n',
+                'line': record.line_no,
+            })
+
+    def _send_stopped(self, stop):
+        self._send_event('stopped', {
+            'reason': stop.reason,
+            'threadId': stop.snapshot['thread_id'],
+        })
+
+    def _respond(self, request, body=None, success=True, message=None):
+        response = {
+            'type': 'response',
+            'request_seq': request.get('seq', 0),
+            'command': request.get('command'),
+            'success': success,
+        }
+        if message is not None:
+            response['message'] = message
+        if body is not None:
+            response['body'] = body
+
+        self._send(response)
+
+    def _send_event(self, event, body=None):
+        message = {'type': 'event', 'event': event}
+        if body is not None:
+            message['body'] = body
+
+        self._send(message)
+
+    def _send(self, message):
+        """
+        Ставит сообщение в очередь; очередь записывается в сокет одним
+        вызовом в конце итерации цикла событий
+        """
+        if self._writer is None:
+            return
+
+        message['seq'] = next(self._seq)
+        self._outgoing.append(encode_message(message))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_event_loop().call_soon(self._flush)
+
+    def _flush(self):
+        self._flush_scheduled = False
+        if self._outgoing and self._writer is not None:
+            self._writer.write(b''.join(self._outgoing))
+        self._outgoing = []
+
+
+def encode_message(message: dict) -> bytes:
+    """Сообщение протокола: заголовок и JSON"""
+    body = json.dumps(message, ensure_ascii=False).encode('utf-8')
+
+    return b'Content-Length: ' + str(len(body)).encode() + _HEADER_END + body
+
+
+def _read_source(path: Text) -> Text:
+    with open(path) as f:
+        return f.read()
+
+
+async def _read_message(reader) -> Optional[dict]:
+    """
+    :return: сообщение, `None` - соединение закрыто
+    :raise ValueError: нет заголовка `Content-Length` или не JSON
+    """
+    try:
+        header = await reader.readuntil(_HEADER_END)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+    length = None
+    for line in header.split(b'\r\n'):
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == _CONTENT_LENGTH:
+            length = int(value)
+    if length is None:
+        raise ValueError('Нет заголовка Content-Length')
+
+    try:
+        body = await reader.readexactly(length)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+    return json.loads(body.decode('utf-8'))
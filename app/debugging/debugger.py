@@ -1,33 +1,214 @@
 """Исполняет модифицированный байткод"""
 
+import os
 import sys
+import time
+from array import array
+from collections import deque, defaultdict, namedtuple
+from contextlib import contextmanager
+from itertools import islice
 from enum import Enum, auto
-from threading import Thread, Event
-from typing import Text
-from types import CodeType
-from queue import Queue
+from threading import Thread, Event, Lock, current_thread, get_ident
+from typing import (
+    Callable, Text, Iterable, Mapping, List, Dict, Optional, Tuple)
+from types import (
+    CodeType, FunctionType, BuiltinFunctionType, ModuleType)
+from queue import Queue, Empty
 
 from .bytecode_modifier import BytecodeModifier
+from .code_cache import CodeCache
+from .engines import ENGINES
+from .history import History
+from .import_hook import ProjectImporter
+from .rendering import RenderPolicy, RenderWorker
 from .common import (
-    DebugCommand, DebuggerExit, DebuggerNotStarted, EmptySourceCode)
+    DebugCommand, DebuggerExit, DebuggerNotStarted, EmptySourceCode,
+    Children, Handle, HistoryState, InvalidBreakpointCondition,
+    InvalidHandle, LineFlag, LineTables, LogRecord, Rendered, StackFrame,
+    UnknownThread)
+
+
+# неизменяемые значения, у которых repr не меняется, пока это тот же объект
+_STABLE_REPR_TYPES = frozenset([
+    int, float, complex, bool, str, bytes, type(None), type,
+    FunctionType, BuiltinFunctionType, ModuleType])
+# встроенные типы, длину которых можно узнать без побочных эффектов
+_SIZED_TYPES = frozenset([
+    str, bytes, bytearray, list, tuple, dict, set, frozenset, deque, range])
+# типы, repr которых дешёвый и сразу попадает в снимок
+_PREVIEW_TYPES = frozenset([
+    int, float, complex, bool, str, bytes, type(None)])
+_PREVIEW_LIMIT = 100
+# неизменяемые данные: пока выражение наблюдения читает только такие
+# объекты и те же самые, его результат прежний. Классы и функции не
+# подходят: атрибуты класса меняются, а вызов может вернуть новое значение
+_WATCH_CACHE_TYPES = _PREVIEW_TYPES
+# имя, которого нет в пространствах имён кадра
+_MISSING = object()
+
+# ограничения repr ключей словарей в именах дочерних значений
+_KEY_POLICY = RenderPolicy(
+    max_string=_PREVIEW_LIMIT, max_items=10, max_depth=1,
+    max_length=_PREVIEW_LIMIT)
+# встроенные коллекции, элементы которых нумеруются
+_INDEXED_TYPES = (list, tuple, range)
+_ITERABLE_TYPES = (set, frozenset, deque)
+
+_RenderRequest = namedtuple(
+    '_RenderRequest', ['handle_id', 'policy', 'reply'])
+_ChildrenRequest = namedtuple(
+    '_ChildrenRequest', ['handle_id', 'offset', 'limit', 'reply'])
+_FrameRequest = namedtuple('_FrameRequest', ['depth', 'reply'])
+_HistoryRequest = namedtuple('_HistoryRequest', ['step', 'reply'])
+
+# кадры отладчика и механизма импорта не показываются в стеке вызовов
+_HIDDEN_FILENAME_PREFIXES = (
+    os.path.dirname(os.path.abspath(__file__)) + os.sep,
+    '<frozen importlib')
+
+
+def _code_names(code) -> set:
+    """Имена, которые читает объект кода, в том числе вложенный код"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names.update(_code_names(const))
+
+    return names
+
+
+def _base_type(value, types):
+    """Встроенный тип из `types`, наследником которого является `value`"""
+    for base in types:
+        if isinstance(value, base):
+            return base
+
+
+class _Stop:
+    """Остановка потока программы: значения, доступные до его команды"""
+
+    def __init__(self, name):
+        # имя потока
+        self.name = name
+        # значения переменных остановки: id -> значение
+        self.handles = {}
+        # кадры стека вызовов остановки, первый - текущий
+        self.frames = []
+        # позиции обхода словарей и множеств, чтобы следующая страница не
+        # перебирала предыдущие: id -> (позиция, итератор)
+        self.cursors = {}
 
 
 class Debugger:
     """Отладчик"""
-    _TRACE_FUNC = 'trace'
-    _COMMAND = 'command'
 
-    def __init__(self):
+    def __init__(
+            self, code_cache: CodeCache = None, lazy: bool = False,
+            log_size: int = 10000, engine: Text = 'bytecode',
+            render_policy: RenderPolicy = None, record: bool = False,
+            history_memory: int = 64 * 2 ** 20,
+            watch_budget: float = 0.5, non_stop: bool = False):
+        """
+        :param code_cache: кэш модифицированного байткода, `None` - без кэша
+        :param lazy: модифицировать функции при первом вызове, а не при
+            запуске отладки
+        :param log_size: размер кольцевого буфера точек логирования,
+            при переполнении старые записи вытесняются
+        :param engine: движок трассировки (см. `engines.ENGINES`),
+            `code_cache` и `lazy` используются только движком `bytecode`
+        :param render_policy: ограничения repr значений для `render`,
+            `None` - ограничения по умолчанию
+        :param record: записывать историю выполнения (строки и значения
+            переменных на каждом шаге, см. `history_state`). Замедляет
+            программу: отладчик вызывается на каждой строке
+        :param history_memory: память (байты) под записанную историю,
+            более старые шаги выгружаются во временный файл
+        :param watch_budget: время (секунды) на вычисление всех выражений
+            наблюдения при одной остановке
+        :param non_stop: режим потоков программы. В режиме all-stop
+            (по умолчанию) остановка одного потока останавливает остальные
+            на их следующей строке до команды остановленному потоку, и
+            одновременно остановлен только один поток. В режиме non-stop
+            остальные потоки выполняются, каждый останавливается на своих
+            точках остановки и ждёт своей команды (см. `send_command`)
+        :raise EngineNotAvailable: движок не поддерживается интерпретатором
+        """
+        # флаги строк с точками остановки и флаги всех строк, индекс - номер
+        # строки; движок `bytecode` читает одну из них из модифицированного
+        # кода (см. `BytecodeEngine._trace`). Атрибуты - таблицы основного
+        # файла, таблицы всех файлов программы хранятся в `_line_tables`
+        self._breakpoint_lines = bytearray()
+        self._all_lines = bytearray()
+        self._hit_counts = array('L')
+        self._filename = None
+        self._line_tables = {}
+        # точки остановки в модулях проекта, которые ещё не импортированы
+        self._pending_breakpoints = defaultdict(set)
+        self._project_paths = ()
+        self._logpoints = {}
+        self._logs = deque(maxlen=log_size)
+        self._dropped_logs = 0
+        # команды и запросы основного потока программы, у остальных
+        # потоков свои очереди: поток -> очередь (см. `_channel`)
         self._commands = Queue()
+        self._channels = {}
+        self._main_thread = None
+        # поток, которому отправляются команды и запросы без номера потока
+        self._selected_thread = None
+        # остановленные потоки: поток -> `_Stop`
+        self._stops = {}
+        self._exiting = False
         self._snapshots = Queue()
+        # снимки потоков, остановившихся одновременно, создаются по очереди:
+        # они сравниваются с одними и теми же отправленными переменными
+        self._snapshot_lock = Lock()
         self._finished = Event()
+        # режим all-stop: пока поток остановлен, остальные ждут
+        # `_resumed` на следующей строке (см. `_wait_resumed`)
+        self._non_stop = non_stop
+        self._halting = False
+        self._halting_thread = None
+        self._resumed = Event()
+        self._resumed.set()
+        self._all_stop_lock = Lock()
 
-        self._bytecode_modifier = BytecodeModifier(
-            self._TRACE_FUNC, self._COMMAND)
+        self._engine = ENGINES[engine](
+            self, code_cache=code_cache, lazy=lazy, record=record)
         self._globals_ = {}
-        self._debug_variables = [self._TRACE_FUNC, self._COMMAND, 'is_over']
+        self._debug_variables = self._engine.DEBUG_VARIABLES
+        # переменные, отправленные в последнем снимке: имя -> (значение,
+        # описание); снимки содержат только отличия от них (см. `_diff`)
+        self._sent_globals = {}
+        self._sent_locals = {}
+        self._resync = True
+        # объект кода -> (имя, файл) или `None` для скрытых кадров
+        self._code_info = {}
+        self._render_policy = render_policy or RenderPolicy()
+        self._render_worker = RenderWorker()
+        # количество выполняющихся вызовов кода программы по запросу
+        # отладчика (repr, точки логирования, выражения наблюдения) и их
+        # потоки: движки не останавливаются на их строках (см.
+        # `_is_evaluating`). Брошенное по таймауту вычисление не мешает
+        # потоку программы
+        self._evaluating = 0
+        self._evaluating_threads = {}
+        self._evaluating_lock = Lock()
+        self._record = record
+        self._history_memory = history_memory
+        self._history = None
+        # выражение наблюдения -> (объект кода, читаемые имена)
+        self._watches = {}
+        # выражение -> (прочитанные значения, результат, ошибка ли)
+        self._watch_cache = {}
+        self._watch_budget = watch_budget
+        self._snapshot_listener = None
 
-    def start(self, source: Text, filename: Text):
+    def start(
+            self, source: Text, filename: Text,
+            breakpoints: Iterable[int] = (),
+            conditions: Mapping[int, Text] = None,
+            logpoints: Mapping[int, Text] = None,
+            project_paths: Iterable[Text] = None):
         """
         Запускает отладчик
 
@@ -36,44 +217,391 @@ class Debugger:
 
         :param source: исходный код программы
         :param filename: название файла откуда был прочитан исходный код
+        :param breakpoints: номера строк (с единицы) с точками остановки
+        :param conditions: номер строки -> условие точки остановки (python
+            выражение). Условия встраиваются в байткод, поэтому задаются
+            только при запуске; строки с условием тоже точки остановки
+        :param logpoints: номер строки -> сообщение точки логирования
+            (см. `add_logpoint`)
+        :param project_paths: каталоги проекта; модули из них, импортируемые
+            программой, тоже отлаживаются (см. `ProjectImporter`), остальные
+            исполняются без отладки. `None` - отлаживается только `source`
         :raise EmptySourceCode: пустой исходный код
+        :raise InvalidBreakpointCondition: некорректное условие или
+            сообщение точки логирования
         """
         if not source:
             raise EmptySourceCode()
 
         if not self._commands.empty():
             self._commands = Queue()
+        self._channels = {}
+        self._main_thread = None
+        self._selected_thread = None
+        self._exiting = False
 
         if not self._snapshots.empty():
             self._snapshots = Queue()
 
-        modified_code = self._compile(source, filename)
+        conditions = dict(conditions or {})
+        compiled_conditions = {
+            line_no: BytecodeModifier.compile_condition(expression)
+            for line_no, expression in conditions.items()}
+
+        self._engine.set_record(self._record)
+        self._engine.prepare(filename, compiled_conditions)
+        modified_code = self._compile(
+            source, filename, conditions, compiled_conditions)
+
+        self._filename = filename
+        self._project_paths = tuple(project_paths or ())
+        self._line_tables = {}
+        self._pending_breakpoints.clear()
+        self._breakpoint_lines, self._all_lines, self._hit_counts = (
+            self._make_line_tables(source, filename))
+        self._logpoints = {}
+        self._logs.clear()
+        self._dropped_logs = 0
+        self._sent_globals = {}
+        self._sent_locals = {}
+        self._resync = True
+        if self._history is not None:
+            self._history.close()
+        self._history = None
+        if self._record:
+            self._history = History(
+                ignored=self._debug_variables,
+                max_memory=self._history_memory)
+        for line_no in set(breakpoints) | set(conditions):
+            self.add_breakpoint(line_no)
+        for line_no, message in (logpoints or {}).items():
+            self.add_logpoint(line_no, message)
 
         t = Thread(target=self._bootstrap, args=(modified_code, ), daemon=True)
         t.start()
 
-    def send_command(self, command: DebugCommand):
+    def add_breakpoint(self, line_no: int, filename: Text = None):
+        """
+        Ставит точку остановки, в том числе во время отладки
+
+        Номера строк вне исходного кода игнорируются. Точка в модуле
+        проекта, который ещё не импортирован, ставится при импорте
+
+        :param line_no: номер строки (с единицы)
+        :param filename: файл модуля проекта (как в `co_filename`),
+            `None` - основной файл
+        """
+        tables = self._line_tables.get(filename or self._filename)
+        if tables is None:
+            if filename is not None:
+                self._pending_breakpoints[filename].add(line_no)
+            return
+
+        if 0 < line_no < len(tables.breakpoint_lines):
+            tables.breakpoint_lines[line_no] |= LineFlag.BREAKPOINT
+            self._engine.update_breakpoints()
+
+    def remove_breakpoint(self, line_no: int, filename: Text = None):
+        """
+        Снимает точку остановки, в том числе во время отладки
+
+        :param line_no: номер строки (с единицы)
+        :param filename: файл модуля проекта, `None` - основной файл
+        """
+        tables = self._line_tables.get(filename or self._filename)
+        if tables is None:
+            if filename is not None:
+                self._pending_breakpoints[filename].discard(line_no)
+            return
+
+        if 0 < line_no < len(tables.breakpoint_lines):
+            tables.breakpoint_lines[line_no] &= ~LineFlag.BREAKPOINT
+
+    def add_logpoint(self, line_no: int, message: Text):
+        """
+        Ставит точку логирования, в том числе во время отладки
+
+        Точка логирования не останавливает программу: при исполнении строки
+        сообщение форматируется как f-строка в кадре программы и попадает в
+        кольцевой буфер (см. `drain_logs`)
+
+        :param line_no: номер строки (с единицы)
+        :param message: шаблон сообщения, например `i = {i}, s = {s[:10]}`
+        :raise InvalidBreakpointCondition: некорректный шаблон
+        """
+        template = BytecodeModifier.compile_condition('f' + repr(message))
+
+        if 0 < line_no < len(self._breakpoint_lines):
+            self._logpoints[line_no] = template
+            self._breakpoint_lines[line_no] |= LineFlag.LOGPOINT
+            self._engine.update_breakpoints()
+
+    def remove_logpoint(self, line_no: int):
+        """
+        Снимает точку логирования, в том числе во время отладки
+
+        :param line_no: номер строки (с единицы)
+        """
+        if 0 < line_no < len(self._breakpoint_lines):
+            self._breakpoint_lines[line_no] &= ~LineFlag.LOGPOINT
+        self._logpoints.pop(line_no, None)
+
+    def add_watch(self, expression: Text):
+        """
+        Добавляет выражение наблюдения, в том числе во время отладки
+
+        Выражение вычисляется в текущем кадре при каждой следующей
+        остановке, результат попадает в снимок (`watches`). Результат
+        переиспользуется, пока выражение читает те же неизменяемые значения
+
+        :param expression: python выражение, например `len(items)`
+        :raise InvalidBreakpointCondition: некорректное выражение
+        """
+        try:
+            code = compile(expression, '<watch>', 'eval')
+        except (SyntaxError, ValueError) as e:
+            raise InvalidBreakpointCondition(expression) from e
+
+        self._watches[expression] = (code, tuple(_code_names(code)))
+
+    def remove_watch(self, expression: Text):
+        """Удаляет выражение наблюдения"""
+        self._watches.pop(expression, None)
+        self._watch_cache.pop(expression, None)
+
+    def drain_logs(self, limit: int = None) -> List[LogRecord]:
+        """
+        Забирает записи точек логирования из кольцевого буфера
+
+        Не блокирует вызывающий поток
+
+        :param limit: максимальное количество записей, `None` - все
+        :return: записи в порядке их появления
+        """
+        records = []
+
+        while limit is None or len(records) < limit:
+            try:
+                records.append(self._logs.popleft())
+            except IndexError:
+                break
+
+        return records
+
+    @property
+    def dropped_logs(self) -> int:
+        """Количество записей, вытесненных из переполненного буфера"""
+        return self._dropped_logs
+
+    def get_hit_counts(self, filename: Text = None) -> Dict[int, int]:
+        """
+        Счётчики срабатываний строк с точками остановки и логирования
+
+        :param filename: файл модуля проекта, `None` - основной файл
+        :return: номер строки -> количество срабатываний
+        """
+        tables = self._line_tables.get(filename or self._filename)
+        if tables is None:
+            return {}
+
+        return {
+            line_no: count
+            for line_no, count in enumerate(tables.hit_counts) if count}
+
+    def set_record(self, record: bool):
+        """
+        Включает или выключает запись истории выполнения (см. параметр
+        `record`) со следующего запуска отладки
+        """
+        self._record = record
+
+    def set_snapshot_listener(self, listener: Optional[Callable[[], None]]):
+        """
+        :param listener: функция без аргументов, которая вызывается потоком
+            отладки после каждого снимка и завершения отладки, чтобы
+            забрать их `get_snapshot` без ожидания; должна быть быстрой и
+            потокобезопасной. `None` - без уведомлений
+        """
+        self._snapshot_listener = listener
+
+    def send_command(self, command: DebugCommand, thread_id: int = None):
         """
         Отправляет команду отладчику
 
+        :param thread_id: поток программы (`thread_id` снимка), который
+            получит команду, `None` - выбранный поток (см. `select_thread`)
         :raise DebuggerNotStarted: отладчик не запущен
         """
-        self._commands.put(command)
+        self._channel(
+            self._selected_thread if thread_id is None else thread_id
+        ).put(command)
+
+    def select_thread(self, thread_id: int):
+        """
+        Выбирает остановленный поток, которому отправляются команды без
+        номера потока и запросы (`render`, `children`, ...)
+
+        Каждая остановка выбирает свой поток сама
+
+        :raise UnknownThread: поток не остановлен
+        """
+        if thread_id not in self._stops:
+            raise UnknownThread(thread_id)
+
+        self._selected_thread = thread_id
+
+    def stopped_threads(self) -> Dict[int, Text]:
+        """
+        Остановленные потоки программы, которые ждут команды
+
+        :return: `thread_id` -> имя потока
+        """
+        return {
+            ident: stop.name for ident, stop in list(self._stops.items())}
+
+    def resync(self):
+        """
+        Запрашивает полный снимок состояния
+
+        Следующий снимок будет содержать все переменные, а не отличия от
+        предыдущего, например, если клиент потерял своё состояние
+        """
+        self._resync = True
+
+    def render(
+            self, handle_id: int, policy: RenderPolicy = None,
+            timeout: float = None) -> Optional[Rendered]:
+        """
+        Вычисляет repr значения по описанию из снимка состояния
+
+        repr вычисляется, пока программа остановлена; описания
+        действительны до следующей команды. Исключение repr возвращается
+        как строка `<тип: сообщение>`. Сокращённый по ограничениям политики
+        repr помечается `Rendered.truncated`: полный можно запросить с
+        `policy.expanded()`
+
+        :param handle_id: `Handle.id`
+        :param policy: ограничения repr, `None` - политика отладчика
+        :param timeout: максимальное время ожидания в секундах,
+            `None` - без ограничения. По истечении возвращается `None`
+        :raise InvalidHandle: значения нет в текущей остановке
+        """
+        return self._request(
+            _RenderRequest(handle_id, policy or self._render_policy, Queue()),
+            timeout)
+
+    def children(
+            self, handle_id: int, offset: int = 0, limit: int = 100,
+            timeout: float = None) -> Optional[Children]:
+        """
+        Страница дочерних значений: элементов списка, кортежа, множества,
+        записей словаря или атрибутов объекта
+
+        Контейнер не копируется и repr его элементов не вычисляется:
+        описания дочерних значений можно передать в `render` и `children`
+        до следующей команды. Страницы словаря и множества, запрошенные по
+        порядку, не перебирают предыдущие
+
+        :param handle_id: `Handle.id`
+        :param offset: номер первого дочернего значения
+        :param limit: максимальное количество дочерних значений
+        :param timeout: максимальное время ожидания в секундах,
+            `None` - без ограничения. По истечении возвращается `None`
+        :raise InvalidHandle: значения нет в текущей остановке
+        """
+        return self._request(
+            _ChildrenRequest(handle_id, offset, limit, Queue()), timeout)
+
+    def frame_variables(
+            self, depth: int,
+            timeout: float = None) -> Optional[Dict[str, Handle]]:
+        """
+        Локальные переменные кадра стека вызовов текущей остановки
+
+        Снимок содержит переменные только текущего кадра, переменные
+        остальных загружаются при выборе кадра. Описания значений можно
+        передать в `render` и `children` до следующей команды
+
+        :param depth: номер кадра в `stack` снимка, 0 - текущий кадр
+        :param timeout: максимальное время ожидания в секундах,
+            `None` - без ограничения. По истечении возвращается `None`
+        :return: имя -> `Handle`
+        :raise InvalidHandle: кадра нет в текущей остановке
+        """
+        return self._request(_FrameRequest(depth, Queue()), timeout)
 
-    def get_snapshot(self) -> dict:
+    def history_state(
+            self, step: int, timeout: float = None) -> Optional[HistoryState]:
+        """
+        Записанное состояние прошлого шага программы
+
+        Доступно, пока программа остановлена, если отладчик создан с
+        `record`. Значения переменных - сокращённые repr на момент шага,
+        repr объектов невстроенных типов не вызывается
+
+        :param step: номер шага, от 0 до `step` снимка текущей остановки
+        :param timeout: максимальное время ожидания в секундах,
+            `None` - без ограничения. По истечении возвращается `None`
+        :raise InvalidHandle: шаг не записан
+        """
+        return self._request(_HistoryRequest(step, Queue()), timeout)
+
+    def _request(self, request, timeout):
+        """Отправляет запрос к остановленной программе и ждёт ответа"""
+        self._channel(self._selected_thread).put(request)
+
+        try:
+            result = request.reply.get(timeout=timeout)
+        except Empty:
+            return None
+
+        if isinstance(result, InvalidHandle):
+            raise result
+
+        return result
+
+    def get_snapshot(self, timeout: float = None) -> Optional[dict]:
         """
         Блокирует вызывающий поток до тех пор, пока не появится новое состояние
-        (команды step over, step in, step out) или отладка не завершится
-        (команда stop)
+        (команды step over, step in, step out, continue) или отладка не
+        завершится (команда stop)
+
+        :param timeout: максимальное время ожидания в секундах,
+            `None` - без ограничения. По истечении возвращается `None`
+
+        Снимок содержит отличия переменных от предыдущего снимка, чтобы не
+        передавать неизменившиеся значения. Первый снимок сеанса и снимок
+        после `resync` полные: клиент должен очистить своё состояние
 
         Структура:
-            - словарь глобальных переменных
-            - словарь локальных переменных
-            - номер отлаживаемой строки
+            - `global_variables` - добавленные и изменившиеся глобальные
+              переменные (имя -> `Handle`, см. `render`). Значения
+              изменяемых типов считаются изменившимися при каждой
+              остановке
+            - `removed_global_variables` - имена удалённых глобальных
+              переменных
+            - `local_variables`, `removed_local_variables` - то же для
+              локальных переменных
+            - `full` - полный ли снимок
+            - `line_no` - номер отлаживаемой строки
+            - `filename` - файл отлаживаемой строки
+            - `stack` - стек вызовов (`StackFrame`), первый - текущий
+              кадр (см. `frame_variables`)
+            - `step` - номер текущего шага в истории выполнения (см.
+              `history_state`), `None` - история не записывается
+            - `watches` - результаты выражений наблюдения (выражение ->
+              `Handle`, см. `add_watch`); ошибка вычисления - описание
+              исключения с текстом ошибки в `preview`
+            - `thread_id` - номер остановленного потока (`get_ident`),
+              после снимка он выбран (см. `select_thread`)
+            - `thread_name` - имя остановленного потока
         :return: данные о текущем состояний отлаживаемой программы
         :raise DebuggingFinished: при завершении отладки
         """
-        snapshot = self._snapshots.get()
+        try:
+            snapshot = self._snapshots.get(timeout=timeout)
+        except Empty:
+            return None
 
         if snapshot is DebuggerExit:
             raise DebuggerExit('Отладка закончена')
@@ -87,8 +615,13 @@ class Debugger:
         Вызов данного метода не завершает отладку сразу, а
         отправляет потоку отладки команду завершения.
         Чтобы дождаться полного завершения используйте вызов метода `join`
+
+        Остальные потоки программы продолжают выполняться без остановок
         """
+        self._exiting = True
         self._commands.put(DebuggerExit)
+        for channel in list(self._channels.values()):
+            channel.put(DebuggerExit)
 
     def join(self):
         """
@@ -98,58 +631,621 @@ class Debugger:
         """
         self._finished.wait()
 
-    def _compile(self, source: Text, filename: Text) -> CodeType:
-        """Компилирует исходный код программы в модифицированный байткод"""
-        try:
-            code = compile(source, filename, 'exec')
-        except (SyntaxError, ValueError) as e:
-            raise e
+    def _channel(self, thread_id) -> Queue:
+        """Очередь команд и запросов потока программы"""
+        if (thread_id is None or thread_id == self._main_thread
+                or self._main_thread is None):
+            return self._commands
+
+        channel = self._channels.get(thread_id)
+        if channel is None:
+            channel = self._channels.setdefault(thread_id, Queue())
+
+        return channel
+
+    def _compile(
+            self, source: Text, filename: Text,
+            conditions: Mapping[int, Text] = None,
+            compiled_conditions: Mapping[int, CodeType] = None) -> CodeType:
+        """Компилирует исходный код программы движком трассировки"""
+        return self._engine.compile(
+            source, filename, conditions, compiled_conditions)
 
-        modified_code = self._bytecode_modifier.modify(code)
+    def _make_line_tables(self, source: Text, filename: Text) -> LineTables:
+        """Создаёт таблицы строк файла и ставит отложенные точки остановки"""
+        lines_count = source.count('\n') + 2
+        tables = LineTables(
+            bytearray(lines_count),
+            bytearray(b'\x01') * lines_count,
+            array('L', [0]) * lines_count)
+        self._line_tables[filename] = tables
 
-        return modified_code
+        for line_no in self._pending_breakpoints.pop(filename, ()):
+            self.add_breakpoint(line_no, filename)
+
+        return tables
 
     # все методы ниже выполняются в другом потоке
     # в потоке отладки
     def _bootstrap(self, code):
+        self._main_thread = get_ident()
         try:
             self._run(code)
         except DebuggerExit:
             pass
         finally:
+            self._render_worker.stop()
+            if self._history is not None:
+                self._history.close()
             self._snapshots.put(DebuggerExit)
             self ._finished.set()
+            self._notify_snapshot()
 
     def _run(self, code):
-        self._globals_ = {
-            self._TRACE_FUNC: self._trace,
-            self._COMMAND: None
-        }
-        exec(code, self._globals_)
+        self._globals_ = {}
 
-    def _trace(self):
-        frame = sys._getframe(1)
-        snapshot = {
-            'global_variables': self._sanitize(frame.f_globals),
-            'local_variables': self._sanitize(frame.f_locals),
-            'line_no': frame.f_lineno
-        }
-        self._snapshots.put(snapshot)
+        if not self._project_paths:
+            self._engine.run(code, self._globals_)
+            return
 
-        command = self._commands.get()
+        # как интерпретатор для скрипта: импорт модулей рядом с программой
+        directory = os.path.dirname(os.path.abspath(self._filename))
+        importer = ProjectImporter(self._project_paths, self._run_module)
+        sys.path.insert(0, directory)
+        importer.install()
+        try:
+            self._engine.run(code, self._globals_)
+        finally:
+            importer.uninstall()
+            sys.path.remove(directory)
 
-        if command is DebuggerExit:
-            raise DebuggerExit()
+    def _run_module(self, source, filename, namespace):
+        """Исполняет импортированный модуль проекта (см. `ProjectImporter`)"""
+        if filename not in self._line_tables:
+            self._make_line_tables(source, filename)
 
-        self._globals_[self._COMMAND] = command
+        code = self._engine.compile(source, filename)
+        self._engine.run_module(code, namespace)
+
+    def _line_tables_of(self, frame) -> Optional[LineTables]:
+        return self._line_tables.get(frame.f_code.co_filename)
+
+    def _hit(self, frame) -> int:
+        """
+        Учитывает срабатывание строки кадра: записывает шаг истории,
+        увеличивает счётчик и записывает сообщение точки логирования
+
+        :return: флаги строки
+        """
+        tables = self._line_tables_of(frame)
+        if tables is None:
+            return 0
+
+        if self._history is not None:
+            # безопасная политика истории не вызывает repr программы, но
+            # строки кода, выполненного при записи, не должны записываться
+            with self._evaluation():
+                self._history.record(frame)
+
+        flags = tables.breakpoint_lines[frame.f_lineno]
+        if flags:
+            tables.hit_counts[frame.f_lineno] += 1
+
+            if flags & LineFlag.LOGPOINT:
+                self._log(frame)
+
+        return flags
+
+    def _pause(self, frame) -> DebugCommand:
+        """
+        Останавливает поток программы: отправляет снимок состояния кадра и
+        дожидается команды потоку
+
+        В режиме all-stop остальные потоки останавливаются на следующей
+        строке, пока поток не получит команду
+
+        :raise DebuggerExit: получена команда завершения
+        """
+        ident = get_ident()
+        is_main = ident == self._main_thread or self._main_thread is None
+        # очередь создаётся до проверки `_exiting`: `finish` либо уже
+        # отправил в неё команду завершения, либо отладка не завершается
+        channel = self._channel(ident)
+        if self._exiting and not is_main:
+            return DebugCommand.CONTINUE
+
+        if not self._non_stop:
+            self._all_stop_lock.acquire()
+            self._halting_thread = ident
+            self._resumed.clear()
+            self._halting = True
+            self._engine.update_threads()
+
+        stop = self._stops[ident] = _Stop(current_thread().name)
+        try:
+            self._send_snapshot(frame, stop, ident)
+
+            while True:
+                command = channel.get()
+
+                if command is DebuggerExit:
+                    if is_main:
+                        raise DebuggerExit()
+                    # остальные потоки программы выполняются до конца
+                    command = DebugCommand.CONTINUE
+                    break
+
+                if isinstance(command, _RenderRequest):
+                    command.reply.put(self._render(command, stop))
+                elif isinstance(command, _ChildrenRequest):
+                    command.reply.put(self._children(command, stop))
+                elif isinstance(command, _FrameRequest):
+                    command.reply.put(self._frame_variables(command, stop))
+                elif isinstance(command, _HistoryRequest):
+                    command.reply.put(self._history_state(command))
+                else:
+                    break
+        finally:
+            del self._stops[ident]
+            if not self._non_stop:
+                self._halting = False
+                self._resumed.set()
+                self._all_stop_lock.release()
+
+        return command
+
+    def _send_snapshot(self, frame, stop, ident):
+        """Отправляет снимок состояния кадра и выбирает поток остановки"""
+        with self._snapshot_lock:
+            # клиент не забрал предыдущие снимки: они заменяются одним
+            # полным, чтобы очередь не росла без ограничения
+            if self._discard_snapshots(ident):
+                self._resync = True
+
+            full = self._resync
+            if full:
+                self._resync = False
+                self._sent_globals = {}
+                self._sent_locals = {}
+
+            global_variables, removed_global_variables = self._diff(
+                frame.f_globals, self._sent_globals, stop.handles)
+            local_variables, removed_local_variables = self._diff(
+                frame.f_locals, self._sent_locals, stop.handles)
+            history = self._history
+            snapshot = {
+                'global_variables': global_variables,
+                'removed_global_variables': removed_global_variables,
+                'local_variables': local_variables,
+                'removed_local_variables': removed_local_variables,
+                'full': full,
+                'line_no': frame.f_lineno,
+                'filename': frame.f_code.co_filename,
+                'stack': self._capture_stack(frame, stop.frames),
+                'step': None if history is None else len(history) - 1,
+                'watches': self._evaluate_watches(frame, stop.handles),
+                'thread_id': ident,
+                'thread_name': stop.name
+            }
+            self._selected_thread = ident
+            self._snapshots.put(snapshot)
+
+        self._notify_snapshot()
+
+    def _wait_resumed(self):
+        """
+        Режим all-stop: поток ждёт, пока остановленный поток не получит
+        команду
+
+        Вызывается движком перед строкой, пока установлен `_halting`
+        """
+        if get_ident() != self._halting_thread:
+            self._resumed.wait()
+
+    def _notify_snapshot(self):
+        listener = self._snapshot_listener
+        if listener is not None:
+            listener()
+
+    def _discard_snapshots(self, ident) -> bool:
+        """
+        Отбрасывает снимки, которые клиент не забрал
+
+        Если среди них есть снимок другого потока, который ещё ждёт команды
+        (режим non-stop), снимки остаются: клиент должен узнать об остановке
+
+        :param ident: поток, который сейчас останавливается
+        :return: были ли снимки отброшены
+        """
+        snapshots = []
+        while True:
+            try:
+                snapshots.append(self._snapshots.get_nowait())
+            except Empty:
+                break
+
+        if any(
+                snapshot['thread_id'] != ident
+                and snapshot['thread_id'] in self._stops
+                for snapshot in snapshots):
+            for snapshot in snapshots:
+                self._snapshots.put(snapshot)
+            return False
+
+        return bool(snapshots)
+
+    def _capture_stack(self, frame, frames) -> List[StackFrame]:
+        """
+        Стек вызовов от `frame` до кадра запуска программы, кадры
+        добавляются в `frames`
+
+        Обходит `f_back` и не обращается к переменным кадров
+        """
+        stack = []
+        code_info = self._code_info
+        bottom = Debugger._run.__code__
+
+        while frame is not None:
+            code = frame.f_code
+            if code is bottom:
+                break
+
+            try:
+                info = code_info[code]
+            except KeyError:
+                info = code_info[code] = self._make_code_info(code)
+
+            if info is not None:
+                frames.append(frame)
+                stack.append(StackFrame(info[0], info[1], frame.f_lineno))
+
+            frame = frame.f_back
+
+        return stack
+
+    def _make_code_info(self, code) -> Optional[Tuple[Text, Text]]:
+        if (code.co_filename.startswith(_HIDDEN_FILENAME_PREFIXES)
+                or self._engine.is_internal_code(code)):
+            return None
+
+        return code.co_name, code.co_filename
+
+    def _frame_variables(self, request, stop):
+        if not 0 <= request.depth < len(stop.frames):
+            return InvalidHandle(request.depth)
+
+        frame = stop.frames[request.depth]
+
+        return self._diff(frame.f_locals, {}, stop.handles)[0]
+
+    def _history_state(self, request):
+        if self._history is None:
+            return InvalidHandle(request.step)
+
+        try:
+            return self._history.state(request.step)
+        except IndexError:
+            return InvalidHandle(request.step)
+
+    def _evaluate_watches(self, frame, handles) -> Dict[str, Handle]:
+        """
+        Результаты выражений наблюдения в кадре, значения добавляются в
+        `handles`
+
+        Выражения вычисляются в потоке вычисления (см. `RenderWorker`) с
+        общим бюджетом времени: не вычисленные вовремя получают описание
+        с ошибкой, а остановка не задерживается
+        """
+        watches = list(self._watches.items())
+        if not watches:
+            return {}
+
+        f_globals = frame.f_globals
+        f_locals = frame.f_locals
+        builtins = f_globals.get('__builtins__', {})
+        if isinstance(builtins, ModuleType):
+            builtins = builtins.__dict__
+        namespaces = (f_locals, f_globals, builtins)
+        cache = self._watch_cache
+        results = {}
+
+        def read(name):
+            for namespace in namespaces:
+                value = namespace.get(name, _MISSING)
+                if value is not _MISSING:
+                    return value
+
+            return _MISSING
+
+        def evaluate(deadline):
+            with self._evaluation():
+                for expression, (code, names) in watches:
+                    if time.perf_counter() > deadline:
+                        return
+
+                    values = tuple(read(name) for name in names)
+                    cached = cache.get(expression)
+                    if cached is not None and all(
+                            value is previous
+                            for value, previous in zip(values, cached[0])):
+                        results[expression] = cached[1:]
+                        continue
+
+                    try:
+                        result = eval(code, f_globals, f_locals), False
+                    except Exception as e:
+                        result = e, True
+
+                    results[expression] = result
+                    if all(
+                            value is _MISSING
+                            or type(value) in _WATCH_CACHE_TYPES
+                            for value in values):
+                        cache[expression] = (values, ) + result
+                    else:
+                        cache.pop(expression, None)
+
+        budget = self._watch_budget
+        self._render_worker.call(
+            evaluate, time.perf_counter() + budget, budget * 2)
+        # поток вычисления, не уложившийся в бюджет, мог не завершиться
+        results = dict(results)
+
+        watch_handles = {}
+        for expression, _ in watches:
+            if expression not in results:
+                watch_handles[expression] = Handle(
+                    expression, 'TimeoutError', 0, None,
+                    '<превышено время вычисления>')
+                continue
+
+            value, is_error = results[expression]
+            handles[id(value)] = value
+            if is_error:
+                message = '<{}: {}>'.format(type(value).__name__, value)
+                if len(message) > _PREVIEW_LIMIT:
+                    message = message[:_PREVIEW_LIMIT] + '...'
+                watch_handles[expression] = Handle(
+                    expression, type(value).__name__, id(value), None,
+                    message)
+            else:
+                watch_handles[expression] = self._make_handle(
+                    expression, value)
+
+        return watch_handles
+
+    def _render(self, request, stop):
+        try:
+            value = stop.handles[request.handle_id]
+        except KeyError:
+            return InvalidHandle(request.handle_id)
+
+        policy = request.policy
+
+        def render(value):
+            with self._evaluation():
+                return policy.render(value)
+
+        # бюджет политики проверяется между элементами коллекций, а
+        # зависший repr одного объекта прерывается ожиданием потока
+        rendered = self._render_worker.call(
+            render, value, policy.time_budget * 2)
+        if rendered is None:
+            rendered = Rendered(
+                '<{}: превышено время вычисления>'.format(
+                    type(value).__name__),
+                True)
+
+        return rendered
+
+    def _children(self, request, stop):
+        try:
+            value = stop.handles[request.handle_id]
+        except KeyError:
+            return InvalidHandle(request.handle_id)
+
+        def children(value):
+            with self._evaluation():
+                return self._list_children(
+                    stop, request.handle_id, value, request.offset,
+                    request.limit)
+
+        # имена ключей и атрибуты объектов могут выполнять код программы
+        return self._render_worker.call(
+            children, value, self._render_policy.time_budget * 2)
+
+    def _list_children(
+            self, stop, handle_id, value, offset, limit) -> Children:
+        # методы встроенных типов вызываются напрямую, чтобы не выполнять
+        # переопределённые в наследниках
+        if isinstance(value, _INDEXED_TYPES):
+            base = _base_type(value, _INDEXED_TYPES)
+            total = base.__len__(value)
+            page = base.__getitem__(value, slice(offset, offset + limit))
+            items = (
+                ('[{}]'.format(i), item)
+                for i, item in enumerate(page, offset))
+        elif isinstance(value, dict):
+            total = dict.__len__(value)
+            items = (
+                ('[{}]'.format(_KEY_POLICY.render(key).text), item)
+                for key, item in self._page(
+                    stop, handle_id, lambda: dict.items(value), offset,
+                    limit))
+        elif isinstance(value, _ITERABLE_TYPES):
+            base = _base_type(value, _ITERABLE_TYPES)
+            total = base.__len__(value)
+            items = (
+                ('[{}]'.format(i), item)
+                for i, item in enumerate(self._page(
+                    stop, handle_id, lambda: base.__iter__(value), offset,
+                    limit),
+                    offset))
+        else:
+            attributes = self._attributes(value)
+            total = len(attributes)
+            items = attributes[offset:offset + limit]
+
+        handles = []
+        for name, item in items:
+            stop.handles[id(item)] = item
+            handles.append(self._make_handle(name, item))
+
+        return Children(handles, total)
+
+    def _page(self, stop, handle_id, make_iterable, offset, limit):
+        """
+        Элементы итератора с `offset` по `offset + limit`
+
+        Итератор запоминается до следующей команды: если следующая страница
+        начинается там, где закончилась предыдущая, он продолжается
+        """
+        position, iterator = stop.cursors.get(handle_id, (0, None))
+        if iterator is None or position > offset:
+            position, iterator = 0, iter(make_iterable())
+
+        skip = offset - position
+        page = list(islice(iterator, skip, skip + limit))
+        stop.cursors[handle_id] = (offset + len(page), iterator)
+
+        return page
+
+    @staticmethod
+    def _attributes(value) -> List[Tuple[Text, object]]:
+        """
+        Атрибуты объекта из `__dict__` и `__slots__`
+
+        Свойства и `__getattr__` не вызываются
+        """
+        try:
+            namespace = object.__getattribute__(value, '__dict__')
+        except AttributeError:
+            namespace = {}
+        attributes = list(namespace.items())
+
+        for cls in type(value).__mro__:
+            slots = cls.__dict__.get('__slots__', ())
+            if isinstance(slots, str):
+                slots = (slots, )
+
+            for name in slots:
+                if name in ('__dict__', '__weakref__'):
+                    continue
+                if name.startswith('__') and not name.endswith('__'):
+                    name = '_{}{}'.format(cls.__name__.lstrip('_'), name)
+
+                try:
+                    attributes.append(
+                        (name, object.__getattribute__(value, name)))
+                except AttributeError:
+                    pass
+
+        return attributes
+
+    @contextmanager
+    def _evaluation(self):
+        """Выполнение кода программы по запросу отладчика"""
+        ident = get_ident()
+        threads = self._evaluating_threads
+        with self._evaluating_lock:
+            self._evaluating += 1
+            threads[ident] = threads.get(ident, 0) + 1
+        try:
+            yield
+        finally:
+            with self._evaluating_lock:
+                self._evaluating -= 1
+                threads[ident] -= 1
+                if not threads[ident]:
+                    del threads[ident]
+
+    def _is_evaluating(self) -> bool:
+        """
+        Выполняет ли текущий поток код программы по запросу отладчика
+
+        Движки сначала проверяют `_evaluating`, чтобы не вызывать метод
+        на каждой строке
+        """
+        return get_ident() in self._evaluating_threads
+
+    def _log(self, frame):
+        line_no = frame.f_lineno
+        template = self._logpoints.get(line_no)
+        if template is None:
+            return
+
+        try:
+            with self._evaluation():
+                message = eval(template, frame.f_globals, frame.f_locals)
+        except Exception as e:
+            message = '<{}: {}>'.format(type(e).__name__, e)
+
+        if len(self._logs) == self._logs.maxlen:
+            self._dropped_logs += 1
+
+        self._logs.append(
+            LogRecord(line_no, self._hit_counts[line_no], message))
 
     def _sanitize(self, variables):
-        sanitized = {}
+        return self._diff(variables, {}, {})[0]
+
+    def _diff(
+            self, variables, sent,
+            handles) -> Tuple[Dict[str, Handle], List[str]]:
+        """
+        Отличия переменных от отправленных ранее, обновляет `sent`
+
+        Тот же объект неизменяемого типа считается неизменившимся без
+        сравнения. Описания значений не вызывают repr (см. `Handle`)
+
+        :param handles: id -> значение для всех переменных, заполняется
+        :return: добавленные и изменившиеся переменные (имя -> описание),
+            имена удалённых переменных
+        """
+        changed = {}
+        names = set()
 
-        for k, v in variables.copy().items():
-            if k in self._debug_variables:
+        for name, value in list(variables.items()):
+            if name in self._debug_variables:
                 continue
 
-            sanitized[k] = v if isinstance(v, str) else repr(v)
+            names.add(name)
+            handles[id(value)] = value
+            previous = sent.get(name)
+            if (previous is not None and previous[0] is value
+                    and type(value) in _STABLE_REPR_TYPES):
+                continue
+
+            handle = self._make_handle(name, value)
+            sent[name] = (value, handle)
+            if previous is None or previous[1] != handle or (
+                    type(value) not in _STABLE_REPR_TYPES):
+                changed[name] = handle
+
+        removed = [name for name in sent if name not in names]
+        for name in removed:
+            del sent[name]
+
+        return changed, removed
+
+    @staticmethod
+    def _make_handle(name, value) -> Handle:
+        value_type = type(value)
+
+        size = None
+        if value_type in _SIZED_TYPES:
+            size = len(value)
+
+        preview = None
+        # длинные значения не сокращаются здесь, а вычисляются через
+        # `render`, который сообщает о сокращении
+        if value_type is str:
+            if len(value) <= _PREVIEW_LIMIT:
+                preview = value
+        elif value_type in _PREVIEW_TYPES:
+            preview = repr(value)
+            if len(preview) > _PREVIEW_LIMIT:
+                preview = None
 
-        return sanitized
+        return Handle(
+            name, value_type.__name__, id(value), size, preview)
@@ -0,0 +1,620 @@
+"""Способы вызова отладчика перед строками отлаживаемой программы"""
+
+import sys
+import threading
+from itertools import count
+from threading import Lock, get_ident
+from types import CodeType
+from typing import Text, Mapping
+
+from .bytecode_modifier import BytecodeModifier
+from .code_cache import CodeCache
+from .lazy import LazyInstrumenter
+from .common import DebugCommand, EngineNotAvailable, LineFlag
+
+
+class _ThreadStep:
+    """Пошаговое выполнение одного потока программы"""
+    __slots__ = ('command', 'generation', 'frame')
+
+    def __init__(self, command: DebugCommand):
+        # последняя команда потока
+        self.command = command
+        # шаг отладки потока (движок `bytecode`, см. `BytecodeEngine._trace`)
+        self.generation = 0
+        # кадр, в котором получена команда step over или step out (движки
+        # событий)
+        self.frame = None
+
+
+class Engine:
+    """
+    Движок трассировки
+
+    Движок компилирует исходный код и исполняет его так, чтобы перед
+    строками вызывался отладчик. Решение об остановке и состояние
+    пошагового выполнения принадлежат движку, а снимок состояния, счётчики
+    срабатываний и точки логирования - отладчику (см. `Debugger._hit` и
+    `Debugger._pause`)
+
+    Состояние пошагового выполнения у каждого потока программы своё (см.
+    `_thread_step`): команда одного потока не меняет, где остановятся
+    остальные. Поток читает своё состояние без блокировок
+    """
+    # имена служебных переменных, которые движок добавляет в программу
+    DEBUG_VARIABLES = ()
+
+    def __init__(self, debugger, record: bool = False, **options):
+        """
+        :param debugger: отладчик
+        :param record: вызывать отладчик на каждой строке программы для
+            записи истории выполнения (см. `History`)
+        :param options: параметры других движков, игнорируются
+        :raise EngineNotAvailable: движок не поддерживается интерпретатором
+        """
+        if not self.is_available():
+            raise EngineNotAvailable(type(self).__name__)
+
+        self._debugger = debugger
+        self._record = record
+        self._filename = None
+        self._conditions = {}
+        # поток -> `_ThreadStep`
+        self._threads = {}
+
+    @staticmethod
+    def is_available() -> bool:
+        """Поддерживается ли движок текущим интерпретатором"""
+        return True
+
+    def set_record(self, record: bool):
+        """Записывать ли историю выполнения, вызывается до `prepare`"""
+        self._record = record
+
+    def compile(
+            self, source: Text, filename: Text,
+            conditions: Mapping[int, Text] = None,
+            compiled_conditions: Mapping[int, CodeType] = None) -> CodeType:
+        """
+        Компилирует исходный код программы
+
+        :param conditions: номер строки -> условие точки остановки
+        :param compiled_conditions: номер строки -> объект кода условия
+        """
+        return compile(source, filename, 'exec')
+
+    def prepare(
+            self, filename: Text,
+            compiled_conditions: Mapping[int, CodeType]):
+        """
+        Готовит движок к новому сеансу отладки
+
+        :param filename: основной файл программы
+        :param compiled_conditions: номер строки основного файла -> объект
+            кода условия
+        """
+        self._filename = filename
+        self._conditions = dict(compiled_conditions or {})
+
+    def run(self, code: CodeType, globals_: dict):
+        """
+        Исполняет программу в потоке отладки
+
+        :raise DebuggerExit: отладка завершена командой
+        """
+        raise NotImplementedError
+
+    def run_module(self, code: CodeType, globals_: dict):
+        """
+        Исполняет модуль проекта, импортированный программой
+
+        Вызывается в потоке отладки во время `run`
+        """
+        exec(code, globals_)
+
+    def update_breakpoints(self):
+        """Вызывается после изменения точек остановки и логирования"""
+
+    def update_threads(self):
+        """
+        Вызывается, когда отладчик останавливает остальные потоки программы
+        (режим all-stop, см. `Debugger._halting`): они должны дойти до
+        следующей строки
+        """
+
+    def _reset_threads(self):
+        """Поток, запускающий программу, останавливается на первой строке"""
+        self._threads = {get_ident(): _ThreadStep(DebugCommand.STEP_IN)}
+
+    def _thread_step(self) -> _ThreadStep:
+        """Состояние пошагового выполнения текущего потока"""
+        ident = get_ident()
+        thread = self._threads.get(ident)
+        if thread is None:
+            # потоки, запущенные программой, выполняются до точки остановки
+            thread = self._threads[ident] = _ThreadStep(DebugCommand.CONTINUE)
+
+        return thread
+
+    def _thread_steps(self):
+        """
+        Состояния живых потоков, состояния завершившихся удаляются
+
+        Вызывается только при смене команды
+        """
+        alive = {thread.ident for thread in threading.enumerate()}
+        for ident in list(self._threads):
+            if ident not in alive:
+                self._threads.pop(ident, None)
+
+        return list(self._threads.values())
+
+    def _condition_holds(self, frame) -> bool:
+        """
+        Выполняется ли условие точки остановки на строке кадра
+
+        Ошибка вычисления условия считается выполненным условием
+        """
+        condition = None
+        if frame.f_code.co_filename == self._filename:
+            condition = self._conditions.get(frame.f_lineno)
+        if condition is None:
+            return True
+
+        try:
+            return bool(eval(condition, frame.f_globals, frame.f_locals))
+        except Exception:
+            return True
+
+    def is_internal_code(self, code: CodeType) -> bool:
+        """
+        Создан ли объект кода движком: такие кадры не показываются в стеке
+        вызовов
+        """
+        return False
+
+
+class BytecodeEngine(Engine):
+    """
+    Модифицирует байткод программы (см. `BytecodeModifier`)
+
+    Строки без точек остановки и кадры, над которыми выполняется step over,
+    стоят одного индексированного чтения, код вне программы исполняется
+    без изменений. Таблица `stop_lines` общая для потоков: пока какой-то
+    поток выполняет step in, функция отладки вызывается на каждой строке
+    всех потоков, и остальные потоки сразу возвращаются из неё по своему
+    состоянию
+    """
+    _TRACE_FUNC = 'trace'
+    _TRACE_RETURN = 'trace_return'
+    _LAZY_BIND = 'lazy_bind'
+    _LAZY_LOAD = 'lazy_load'
+    _STOP_LINES = 'stop_lines'
+    _BREAKPOINT_LINES = 'breakpoint_lines'
+    _STEP = '__step__'
+
+    DEBUG_VARIABLES = (
+        _TRACE_FUNC, _TRACE_RETURN, _LAZY_BIND, _LAZY_LOAD, _STOP_LINES,
+        _BREAKPOINT_LINES, _STEP)
+
+    def __init__(
+            self, debugger, code_cache: CodeCache = None, lazy: bool = False,
+            **options):
+        """
+        :param code_cache: кэш модифицированного байткода, `None` - без кэша
+        :param lazy: модифицировать функции при первом вызове, а не при
+            запуске отладки
+
+        При записи истории функция отладки вызывается на каждой строке,
+        поэтому условия точек остановки проверяются в ней, а не в
+        модифицированном байткоде
+        """
+        super(BytecodeEngine, self).__init__(debugger, **options)
+
+        self._code_cache = code_cache
+        self._lazy = lazy
+        self._lazy_instrumenter = None
+        # пространства имён модулей программы и таблицы строк их файлов
+        self._namespaces = []
+        # включена ли в модулях таблица всех строк: какой-то поток
+        # выполняет step in или остальные потоки останавливаются
+        self._stepping_in = True
+        self._stop_lines_lock = Lock()
+        # номера шагов отладки: поток получает новый при каждой команде;
+        # кадры хранят его как шаг step over (и со знаком минус - step out),
+        # шаги прошлых команд считаются нулевыми (см. `_trace`). Номера
+        # не повторяются в разных потоках, потому что генератор может
+        # продолжиться в другом потоке
+        self._step_generations = count(1)
+
+        self._bytecode_modifier = BytecodeModifier(
+            self._TRACE_FUNC, self._TRACE_RETURN, self._LAZY_BIND,
+            self._LAZY_LOAD, self._STOP_LINES, self._BREAKPOINT_LINES,
+            self._STEP)
+
+    def compile(
+            self, source: Text, filename: Text,
+            conditions: Mapping[int, Text] = None,
+            compiled_conditions: Mapping[int, CodeType] = None) -> CodeType:
+        """
+        Компилирует исходный код программы в модифицированный байткод
+
+        Если задан кэш и исходный код с теми же параметрами модификации уже
+        компилировался, то модификация байткода не выполняется
+        """
+        if self._record:
+            conditions = compiled_conditions = None
+
+        key = None
+        if self._code_cache is not None:
+            key = self._code_cache.make_key(
+                source, filename,
+                version=BytecodeModifier.VERSION,
+                trace_func=self._TRACE_FUNC,
+                trace_return=self._TRACE_RETURN,
+                step=self._STEP,
+                stop_lines=self._STOP_LINES,
+                breakpoint_lines=self._BREAKPOINT_LINES,
+                lazy=self._lazy,
+                conditions=tuple(sorted((conditions or {}).items())))
+            cached_code = self._code_cache.get(key)
+            if cached_code is not None:
+                return cached_code
+
+        code = compile(source, filename, 'exec')
+
+        modified_code = self._bytecode_modifier.modify(
+            code, lazy=self._lazy, conditions=compiled_conditions)
+
+        if key is not None and isinstance(modified_code, CodeType):
+            self._code_cache.put(key, modified_code)
+
+        return modified_code
+
+    def prepare(
+            self, filename: Text,
+            compiled_conditions: Mapping[int, CodeType]):
+        super(BytecodeEngine, self).prepare(filename, compiled_conditions)
+
+        self._lazy_instrumenter = None
+        if self._lazy:
+            self._lazy_instrumenter = LazyInstrumenter(
+                self._bytecode_modifier,
+                None if self._record else compiled_conditions, filename)
+
+    def run(self, code: CodeType, globals_: dict):
+        self._namespaces = []
+        self._stepping_in = True
+        self._reset_threads()
+        self.run_module(code, globals_)
+
+    def run_module(self, code: CodeType, globals_: dict):
+        tables = self._debugger._line_tables[code.co_filename]
+        globals_.update({
+            self._TRACE_FUNC: self._trace,
+            self._TRACE_RETURN: self._trace_return,
+            self._STOP_LINES: (
+                tables.all_lines if self._stepping_in or self._record
+                else tables.breakpoint_lines),
+            self._BREAKPOINT_LINES: tables.breakpoint_lines
+        })
+        if self._lazy_instrumenter is not None:
+            globals_[self._LAZY_BIND] = self._lazy_instrumenter.bind
+            globals_[self._LAZY_LOAD] = self._lazy_instrumenter.load
+        self._namespaces.append((globals_, tables))
+
+        exec(code, globals_)
+
+    def is_internal_code(self, code: CodeType) -> bool:
+        # заглушки ленивой модификации (см. `make_lazy_stub`) и только они
+        # вызывают `lazy_load`
+        return self._LAZY_LOAD in code.co_names
+
+    def update_threads(self):
+        self._update_stop_lines()
+
+    def _update_stop_lines(self):
+        """Выбирает таблицу `stop_lines` по состоянию всех потоков"""
+        with self._stop_lines_lock:
+            self._set_stepping_in(self._debugger._halting or any(
+                thread.command == DebugCommand.STEP_IN
+                for thread in self._thread_steps()))
+
+    def _set_stepping_in(self, stepping_in):
+        """Переключает таблицу `stop_lines` во всех модулях программы"""
+        self._stepping_in = stepping_in
+        for globals_, tables in self._namespaces:
+            globals_[self._STOP_LINES] = (
+                tables.all_lines if stepping_in or self._record
+                else tables.breakpoint_lines)
+
+    def _trace(self, step=0, breakpoint=True):
+        """
+        Вызывается модифицированным кодом перед строкой
+
+        :param step: шаг отладки кадра
+        :param breakpoint: учитывать ли точку остановки на строке
+        :return: новый шаг отладки кадра
+        """
+        debugger = self._debugger
+        if debugger._evaluating and debugger._is_evaluating():
+            return step
+
+        if debugger._halting:
+            debugger._wait_resumed()
+
+        frame = sys._getframe(1)
+        thread = self._thread_step()
+
+        if step and abs(step) != thread.generation:
+            step = 0
+
+        flags = debugger._hit(frame)
+
+        is_stop = (
+            thread.command == DebugCommand.STEP_IN
+            or step and step == thread.generation
+            or breakpoint and flags & LineFlag.BREAKPOINT and (
+                not self._record or self._condition_holds(frame)))
+        if not is_stop:
+            return step
+
+        command = debugger._pause(frame)
+
+        thread.command = command
+        thread.generation = next(self._step_generations)
+        self._update_stop_lines()
+
+        if command == DebugCommand.STEP_OVER:
+            return thread.generation
+
+        if command == DebugCommand.STEP_OUT:
+            return -thread.generation
+
+        return 0
+
+    def _trace_return(self, step):
+        """
+        Вызывается модифицированным кодом при выходе из кадра с ненулевым
+        шагом отладки: step over последней строки и step out завершаются
+        остановкой на следующей строке вызывающего кадра
+        """
+        debugger = self._debugger
+        if debugger._evaluating and debugger._is_evaluating():
+            return
+
+        thread = self._thread_step()
+        if abs(step) == thread.generation:
+            thread.command = DebugCommand.STEP_IN
+            self._update_stop_lines()
+
+
+class _EventEngine(Engine):
+    """
+    Общая часть движков, которые получают события строк от интерпретатора
+
+    Пошаговое выполнение потока хранится как его последняя команда и кадр,
+    в котором она была получена
+    """
+
+    def _line(self, frame):
+        """Обрабатывает событие строки, при необходимости останавливается"""
+        debugger = self._debugger
+        if debugger._evaluating and debugger._is_evaluating():
+            return
+
+        if debugger._halting:
+            debugger._wait_resumed()
+
+        flags = debugger._hit(frame)
+        thread = self._thread_step()
+
+        if not self._is_stop(frame, flags, thread):
+            return
+
+        command = debugger._pause(frame)
+
+        thread.command = command
+        thread.frame = (
+            frame if command in (DebugCommand.STEP_OVER, DebugCommand.STEP_OUT)
+            else None)
+        self._on_command()
+
+    def _return(self, frame):
+        """Обрабатывает выход из кадра (return или yield)"""
+        debugger = self._debugger
+        if debugger._evaluating and debugger._is_evaluating():
+            return
+
+        thread = self._thread_step()
+        if frame is thread.frame:
+            thread.command = DebugCommand.STEP_IN
+            thread.frame = None
+            self._on_command()
+
+    def _is_stop(self, frame, flags, thread):
+        if thread.command == DebugCommand.STEP_IN:
+            return True
+
+        if thread.command == DebugCommand.STEP_OVER:
+            if frame is thread.frame:
+                return True
+
+        if not flags & LineFlag.BREAKPOINT:
+            return False
+
+        return self._condition_holds(frame)
+
+    def _on_command(self):
+        """Вызывается после смены команды пошагового выполнения"""
+
+
+class SettraceEngine(_EventEngine):
+    """
+    Трассирует программу через `sys.settrace`
+
+    Не модифицирует код, но интерпретатор вызывает функцию трассировки на
+    каждой строке и каждом вызове, в том числе вне программы. Потоки,
+    запущенные программой через `threading`, трассируются так же
+    """
+
+    def run(self, code: CodeType, globals_: dict):
+        self._reset_threads()
+        threading.settrace(self._trace_call)
+        sys.settrace(self._trace_call)
+        try:
+            exec(code, globals_)
+        finally:
+            sys.settrace(None)
+            threading.settrace(None)
+
+    def _trace_call(self, frame, event, arg):
+        # трассируются только файлы программы: основной и модули проекта
+        if frame.f_code.co_filename not in self._debugger._line_tables:
+            return None
+
+        return self._trace_event
+
+    def _trace_event(self, frame, event, arg):
+        if event == 'line':
+            self._line(frame)
+        elif event == 'return':
+            self._return(frame)
+
+        return self._trace_event
+
+
+class MonitoringEngine(_EventEngine):
+    """
+    Получает события строк через `sys.monitoring` (PEP 669, python 3.12+)
+
+    События включаются только для объектов кода программы. Строка, на
+    которой не нужно останавливаться до следующей команды, отключается
+    (`sys.monitoring.DISABLE`) и больше не стоит ничего; после команды и
+    изменения точек остановки события включаются снова.
+
+    Выход из кадра с исключением (`PY_UNWIND`) - глобальное событие, его
+    нельзя ни включить для отдельных объектов кода, ни отключить, поэтому
+    его обработчик только сравнивает кадр с кадрами пошагового выполнения
+    """
+    _TOOL_NAME = 'poson'
+
+    def __init__(self, debugger, **options):
+        super(MonitoringEngine, self).__init__(debugger, **options)
+
+        self._code_objects = []
+
+    @staticmethod
+    def is_available() -> bool:
+        return hasattr(sys, 'monitoring')
+
+    def run(self, code: CodeType, globals_: dict):
+        monitoring = sys.monitoring
+        tool_id = monitoring.DEBUGGER_ID
+        events = monitoring.events
+
+        self._reset_threads()
+        monitoring.use_tool_id(tool_id, self._TOOL_NAME)
+        monitoring.register_callback(tool_id, events.LINE, self._line_event)
+        monitoring.register_callback(
+            tool_id, events.PY_RETURN, self._return_event)
+        monitoring.register_callback(
+            tool_id, events.PY_YIELD, self._return_event)
+        monitoring.register_callback(
+            tool_id, events.PY_UNWIND, self._unwind_event)
+        monitoring.set_events(tool_id, events.PY_UNWIND)
+
+        try:
+            self.run_module(code, globals_)
+        finally:
+            monitoring.set_events(tool_id, 0)
+            for code_object in self._code_objects:
+                monitoring.set_local_events(tool_id, code_object, 0)
+            self._code_objects = []
+            for event in (
+                    events.LINE, events.PY_RETURN, events.PY_YIELD,
+                    events.PY_UNWIND):
+                monitoring.register_callback(tool_id, event, None)
+            monitoring.free_tool_id(tool_id)
+
+    def run_module(self, code: CodeType, globals_: dict):
+        monitoring = sys.monitoring
+        events = monitoring.events
+        local_events = events.LINE | events.PY_RETURN | events.PY_YIELD
+
+        for code_object in self._walk_code(code):
+            monitoring.set_local_events(
+                monitoring.DEBUGGER_ID, code_object, local_events)
+            self._code_objects.append(code_object)
+
+        exec(code, globals_)
+
+    def update_breakpoints(self):
+        self._on_command()
+
+    def update_threads(self):
+        self._on_command()
+
+    def _on_command(self):
+        if self._code_objects:
+            sys.monitoring.restart_events()
+
+    def _line_event(self, code, line_no):
+        frame = sys._getframe(1)
+        self._line(frame)
+
+        if self._can_disable(frame):
+            return sys.monitoring.DISABLE
+
+    def _return_event(self, code, instruction_offset, retval):
+        frame = sys._getframe(1)
+        self._return(frame)
+
+        if self._can_disable(frame):
+            return sys.monitoring.DISABLE
+
+    def _unwind_event(self, code, instruction_offset, exception):
+        # событие приходит из любого кода любого потока процесса, поэтому
+        # состояние потока не создаётся, а `DISABLE` не возвращается
+        thread = self._threads.get(get_ident())
+        if thread is not None and thread.frame is not None:
+            self._return(sys._getframe(1))
+
+    def _can_disable(self, frame):
+        """
+        Можно ли отключить событие в этом месте до следующей команды
+
+        Событие отключается для всех потоков, поэтому нельзя при записи
+        истории, остановке остальных потоков, step in любого потока, в
+        объекте кода кадра step over/out любого потока (в том числе в
+        других его кадрах при рекурсии) и на строках с точками
+        """
+        if self._record or self._debugger._halting:
+            return False
+
+        for thread in list(self._threads.values()):
+            if thread.command == DebugCommand.STEP_IN:
+                return False
+
+            step_frame = thread.frame
+            if step_frame is not None and frame.f_code is step_frame.f_code:
+                return False
+
+        tables = self._debugger._line_tables_of(frame)
+
+        return tables is None or not tables.breakpoint_lines[frame.f_lineno]
+
+    @classmethod
+    def _walk_code(cls, code):
+        yield code
+
+        for const in code.co_consts:
+            if isinstance(const, CodeType):
+                yield from cls._walk_code(const)
+
+
+ENGINES = {
+    'bytecode': BytecodeEngine,
+    'settrace': SettraceEngine,
+    'monitoring': MonitoringEngine
+}
@@ -0,0 +1,463 @@
+"""Запись выполнения программы для просмотра прошлых шагов"""
+
+from array import array
+from bisect import bisect_right
+from types import BuiltinFunctionType, FunctionType, ModuleType
+from typing import Dict, Iterable, Text
+
+from .common import HistoryState
+from .rendering import RenderPolicy
+from .spill import SpillStore
+
+# номер области видимости шага без локальных переменных (уровень модуля)
+NO_SCOPE = 0xFFFFFFFF
+# значение переменной в изменении, которое означает её удаление
+_REMOVED = 0xFFFFFFFF
+# типы, значение которых не меняется, пока это тот же объект
+_STABLE_TYPES = frozenset([
+    int, float, complex, bool, str, bytes, type(None), type, FunctionType,
+    BuiltinFunctionType, ModuleType])
+# словарь встроенных имён в globals не меняется программой, а его repr
+# вычислялся бы на каждом шаге
+_ALWAYS_IGNORED = frozenset(['__builtins__'])
+# количество шагов и значений в одной записи хранилища
+_STEPS_CHUNK = 4096
+_VALUES_CHUNK = 1024
+# размер таблицы интернирования значений, после которого она очищается
+_MAX_INTERNED_VALUES = 65536
+# примерный размер в памяти изменения шага и одной его пары (кортежи и
+# ссылки в списке), чтобы учитывать незаписанные изменения
+_DELTA_SIZE = 72
+_PAIR_SIZE = 72
+
+
+class _Scope:
+    """
+    Изменения переменных одной области видимости: globals модуля или
+    locals кадра
+
+    Изменение шага - кортеж пар (номер имени, номер значения). Каждые
+    `interval` изменений образуют часть, которая записывается в хранилище
+    вместе с состоянием на её начало, поэтому восстановление любого шага
+    читает одну часть и применяет не больше `interval` изменений
+    """
+    __slots__ = (
+        'first_steps', 'records', 'start_state', 'steps', 'deltas', 'state',
+        'current')
+
+    def __init__(self):
+        # первые шаги и номера записей записанных частей
+        self.first_steps = array('I')
+        self.records = array('Q')
+        # текущая часть: состояние на начало, шаги и изменения
+        self.start_state = {}
+        self.steps = array('I')
+        self.deltas = []
+        # номер имени -> номер значения после последнего изменения
+        self.state = {}
+        # имя -> (объект, номер значения) на последнем шаге, чтобы не
+        # вычислять repr неизменившихся значений
+        self.current = {}
+
+
+class History:
+    """
+    История выполнения: строка и изменения переменных на каждом шаге
+
+    Строки, файлы и области видимости шагов, изменения переменных и repr
+    значений накапливаются частями в `array('I')` и списках, заполненные
+    части записываются в `SpillStore`: при превышении `max_memory` старые
+    части выгружаются в файл и читаются из него без копирования.
+    Незаписанные изменения областей видимости тоже ограничены долей
+    `max_memory`, а область видимости завершённого кадра записывается в
+    хранилище целиком и не держит ссылок на его переменные.
+    Значения записываются безопасной политикой (`RenderPolicy(safe=True)`):
+    repr объектов программы не вызывается
+    """
+
+    def __init__(
+            self, policy: RenderPolicy = None, ignored: Iterable = (),
+            checkpoint_interval: int = 256,
+            max_memory: int = 64 * 2 ** 20, spill_directory: Text = None):
+        """
+        :param policy: ограничения repr записываемых значений
+        :param ignored: имена служебных переменных, которые не записываются
+        :param checkpoint_interval: количество изменений области видимости
+            между полными состояниями
+        :param max_memory: размер записанных частей в памяти (байты), старые
+            части сверх него выгружаются во временный файл
+        :param spill_directory: каталог временного файла, `None` - системный
+        """
+        self._policy = policy or RenderPolicy(
+            max_string=100, max_items=10, max_depth=2, max_length=200,
+            safe=True)
+        self._ignored = _ALWAYS_IGNORED.union(ignored)
+        self._interval = checkpoint_interval
+        self._store = SpillStore(max_memory, spill_directory)
+
+        self._length = 0
+        # текущая часть шагов, номера записей заполненных частей
+        self._lines = array('I')
+        self._files = array('I')
+        self._local_scopes = array('I')
+        self._global_scopes = array('I')
+        self._step_records = array('Q')
+
+        self._filenames = []
+        self._filename_ids = {}
+        self._names = []
+        self._name_ids = {}
+        # текущая часть значений, номера записей заполненных частей
+        self._values = []
+        self._value_records = array('Q')
+        self._values_count = 0
+        # текст -> номер значения для последних значений, чтобы одинаковые
+        # repr хранились один раз; очищается, чтобы не расти без ограничения
+        self._value_ids = {}
+
+        # области видимости: `_Scope` или, после завершения кадра, номер
+        # записи с номерами записей его частей (см. `_close_scope`),
+        # `None` - у завершённой области не было изменений
+        self._scopes = []
+        # примерный размер незаписанных изменений областей видимости
+        self._pending_memory = 0
+        self._max_pending_memory = max_memory // 4
+        # globals модулей: id -> (globals, номер области видимости)
+        self._globals_scopes = {}
+        # кадры стека вызовов программы с номерами областей видимости,
+        # чтобы отличать новый кадр от завершённого с тем же id
+        self._stack = []
+        self._stack_ids = {}
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def store(self) -> SpillStore:
+        """Хранилище заполненных частей"""
+        return self._store
+
+    def record(self, frame):
+        """Записывает шаг: строку кадра и изменения его переменных"""
+        step = self._length
+
+        global_scope = self._global_scope(frame.f_globals)
+        self._record_scope(global_scope, frame.f_globals, step)
+
+        local_scope = NO_SCOPE
+        f_locals = frame.f_locals
+        if f_locals is not frame.f_globals:
+            local_scope = self._local_scope(frame)
+            self._record_scope(local_scope, f_locals, step)
+
+        self._lines.append(frame.f_lineno)
+        self._files.append(self._intern_filename(frame.f_code.co_filename))
+        self._local_scopes.append(local_scope)
+        self._global_scopes.append(global_scope)
+        self._length += 1
+
+        if len(self._lines) == _STEPS_CHUNK:
+            self._step_records.append(self._store.append(
+                self._lines.tobytes() + self._files.tobytes()
+                + self._local_scopes.tobytes()
+                + self._global_scopes.tobytes()))
+            self._lines = array('I')
+            self._files = array('I')
+            self._local_scopes = array('I')
+            self._global_scopes = array('I')
+
+    def state(self, step: int) -> HistoryState:
+        """
+        Строка и переменные шага
+
+        :raise IndexError: шаг не записан
+        """
+        if not 0 <= step < self._length:
+            raise IndexError(step)
+
+        chunk, position = divmod(step, _STEPS_CHUNK)
+        if chunk < len(self._step_records):
+            columns = self._store[self._step_records[chunk]].cast('I')
+            line_no, file_id, local_scope, global_scope = (
+                columns[position + _STEPS_CHUNK * i] for i in range(4))
+        else:
+            line_no = self._lines[position]
+            file_id = self._files[position]
+            local_scope = self._local_scopes[position]
+            global_scope = self._global_scopes[position]
+
+        local_variables = {}
+        if local_scope != NO_SCOPE:
+            local_variables = self._restore(local_scope, step)
+
+        return HistoryState(
+            step, line_no, self._filenames[file_id],
+            self._restore(global_scope, step), local_variables)
+
+    def close(self):
+        """Освобождает хранилище, история больше не читается"""
+        self._store.close()
+        self._stack = []
+        self._stack_ids = {}
+        self._globals_scopes = {}
+
+    def _global_scope(self, globals_) -> int:
+        entry = self._globals_scopes.get(id(globals_))
+        if entry is None:
+            # globals хранится, чтобы его id не достался другому словарю
+            entry = self._globals_scopes[id(globals_)] = (
+                globals_, self._new_scope())
+
+        return entry[1]
+
+    def _local_scope(self, frame) -> int:
+        stack = self._stack
+        if stack and stack[-1][0] is frame:
+            return stack[-1][1]
+
+        # возврат в кадр, который уже записывался, или вызов нового: кадры
+        # выше ближайшего записанного предка завершены
+        ancestor = frame
+        while ancestor is not None:
+            index = self._stack_ids.get(id(ancestor))
+            if index is not None and stack[index][0] is ancestor:
+                break
+            ancestor = ancestor.f_back
+        else:
+            index = -1
+
+        for entry in stack[index + 1:]:
+            del self._stack_ids[id(entry[0])]
+            self._close_scope(entry[1])
+        del stack[index + 1:]
+
+        if ancestor is frame:
+            return stack[index][1]
+
+        scope = self._new_scope()
+        self._stack_ids[id(frame)] = len(stack)
+        stack.append((frame, scope))
+
+        return scope
+
+    def _new_scope(self) -> int:
+        self._scopes.append(_Scope())
+
+        return len(self._scopes) - 1
+
+    def _close_scope(self, scope_id):
+        """
+        Записывает область видимости завершённого кадра: незаписанную часть
+        и номера записей частей, объекты переменных больше не нужны
+        """
+        scope = self._scopes[scope_id]
+        if scope.deltas:
+            self._write_scope_chunk(scope)
+
+        record = None
+        if scope.records:
+            record = self._store.append(
+                scope.records.tobytes() + scope.first_steps.tobytes())
+        self._scopes[scope_id] = record
+
+    def _flush_scopes(self):
+        """Записывает незаписанные части областей видимости кадров стека"""
+        scopes = [scope_id for _, scope_id in self._stack] + [
+            scope_id for _, scope_id in self._globals_scopes.values()]
+        for scope_id in scopes:
+            scope = self._scopes[scope_id]
+            if scope.deltas:
+                self._write_scope_chunk(scope)
+
+    def _record_scope(self, scope_id, variables, step):
+        scope = self._scopes[scope_id]
+        current = scope.current
+        changes = []
+        count = 0
+
+        for name, value in list(variables.items()):
+            if name in self._ignored:
+                continue
+
+            count += 1
+            previous = current.get(name)
+            if previous is not None and previous[0] is value and (
+                    type(value) in _STABLE_TYPES):
+                continue
+
+            value_id = self._intern_value(value)
+            current[name] = (value, value_id)
+            if previous is None or previous[1] != value_id:
+                changes.append((self._intern_name(name), value_id))
+
+        if count != len(current):
+            for name in [name for name in current if name not in variables]:
+                del current[name]
+                changes.append((self._intern_name(name), _REMOVED))
+
+        if changes:
+            self._add_delta(scope, step, tuple(changes))
+
+    def _add_delta(self, scope, step, delta):
+        scope.steps.append(step)
+        scope.deltas.append(delta)
+        self._apply(scope.state, delta)
+        self._pending_memory += _DELTA_SIZE + _PAIR_SIZE * len(delta)
+
+        if len(scope.deltas) == self._interval:
+            self._write_scope_chunk(scope)
+        elif self._pending_memory > self._max_pending_memory:
+            self._flush_scopes()
+
+    def _write_scope_chunk(self, scope):
+        """
+        Записывает текущую часть изменений области видимости
+
+        Запись - массив `uint32`: количество пар состояния, количество
+        изменений, пары состояния на начало части, шаги изменений, концы
+        изменений (количество пар от начала части) и пары изменений
+        """
+        data = array('I', [len(scope.start_state), len(scope.deltas)])
+        for pair in scope.start_state.items():
+            data.extend(pair)
+        data.extend(scope.steps)
+
+        end = 0
+        for delta in scope.deltas:
+            end += len(delta)
+            data.append(end)
+        for delta in scope.deltas:
+            for pair in delta:
+                data.extend(pair)
+
+        scope.first_steps.append(scope.steps[0])
+        scope.records.append(self._store.append(data.tobytes()))
+        self._pending_memory -= (
+            _DELTA_SIZE * len(scope.deltas) + _PAIR_SIZE * end)
+        scope.start_state = dict(scope.state)
+        scope.steps = array('I')
+        scope.deltas = []
+
+    def _restore(self, scope_id, step) -> Dict[Text, Text]:
+        scope = self._scopes[scope_id]
+
+        if isinstance(scope, _Scope):
+            first_steps, records = scope.first_steps, scope.records
+        elif scope is None:
+            first_steps = records = ()
+        else:
+            # завершённая область (см. `_close_scope`)
+            data = self._store[scope]
+            count = len(data) // 12
+            records = data[:count * 8].cast('Q')
+            first_steps = data[count * 8:].cast('I')
+
+        if isinstance(scope, _Scope) and scope.steps and (
+                scope.steps[0] <= step):
+            state = dict(scope.start_state)
+            for delta in scope.deltas[:bisect_right(scope.steps, step)]:
+                self._apply(state, delta)
+        else:
+            chunk = bisect_right(first_steps, step) - 1
+            state = {}
+            if chunk >= 0:
+                self._restore_chunk(
+                    state, self._store[records[chunk]].cast('I'), step)
+
+        names = self._names
+
+        return {
+            names[name_id]: self._value_text(value_id)
+            for name_id, value_id in state.items()}
+
+    @staticmethod
+    def _restore_chunk(state, data, step):
+        """Состояние шага по записи части (см. `_write_scope_chunk`)"""
+        state_size, count = data[0], data[1]
+        offset = 2
+        for i in range(offset, offset + state_size * 2, 2):
+            state[data[i]] = data[i + 1]
+        offset += state_size * 2
+
+        steps = data[offset:offset + count]
+        applied = bisect_right(steps, step)
+        ends = data[offset + count:offset + count * 2]
+        pairs = offset + count * 2
+
+        end = ends[applied - 1] if applied else 0
+        for i in range(pairs, pairs + end * 2, 2):
+            name_id, value_id = data[i], data[i + 1]
+            if value_id == _REMOVED:
+                state.pop(name_id, None)
+            else:
+                state[name_id] = value_id
+
+    @staticmethod
+    def _apply(state, delta):
+        for name_id, value_id in delta:
+            if value_id == _REMOVED:
+                state.pop(name_id, None)
+            else:
+                state[name_id] = value_id
+
+    def _intern_value(self, value) -> int:
+        text = self._policy.render(value).text
+        value_id = self._value_ids.get(text)
+        if value_id is not None:
+            return value_id
+
+        if len(self._value_ids) >= _MAX_INTERNED_VALUES:
+            self._value_ids = {}
+
+        value_id = self._value_ids[text] = self._values_count
+        self._values.append(text)
+        self._values_count += 1
+
+        if len(self._values) == _VALUES_CHUNK:
+            self._write_values_chunk()
+
+        return value_id
+
+    def _write_values_chunk(self):
+        """
+        Записывает текущую часть значений: концы значений (`uint32`,
+        байты от начала данных) и данные в UTF-8
+        """
+        data = [text.encode('utf-8', 'surrogatepass') for text in self._values]
+        ends = array('I')
+        end = 0
+        for item in data:
+            end += len(item)
+            ends.append(end)
+
+        self._value_records.append(
+            self._store.append(ends.tobytes() + b''.join(data)))
+        self._values = []
+
+    def _value_text(self, value_id) -> Text:
+        chunk, position = divmod(value_id, _VALUES_CHUNK)
+        if chunk >= len(self._value_records):
+            return self._values[position]
+
+        data = self._store[self._value_records[chunk]]
+        ends = data[:_VALUES_CHUNK * 4].cast('I')
+        start = _VALUES_CHUNK * 4 + (ends[position - 1] if position else 0)
+        end = _VALUES_CHUNK * 4 + ends[position]
+
+        return str(data[start:end], 'utf-8', 'surrogatepass')
+
+    def _intern_name(self, name) -> int:
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self._names)
+            self._names.append(name)
+
+        return name_id
+
+    def _intern_filename(self, filename) -> int:
+        file_id = self._filename_ids.get(filename)
+        if file_id is None:
+            file_id = self._filename_ids[filename] = len(self._filenames)
+            self._filenames.append(filename)
+
+        return file_id
@@ -0,0 +1,121 @@
+"""Отладка программ из нескольких файлов через хук импорта"""
+
+import os
+import sys
+import sysconfig
+import threading
+from importlib.abc import MetaPathFinder
+from importlib.machinery import PathFinder, SourceFileLoader
+from importlib.util import decode_source
+from typing import Callable, Iterable, Text
+
+
+def _library_paths():
+    """Каталоги стандартной библиотеки и установленных пакетов"""
+    paths = set()
+    for name in ('stdlib', 'platstdlib', 'purelib', 'platlib'):
+        path = sysconfig.get_paths().get(name)
+        if path:
+            paths.add(os.path.normcase(os.path.abspath(path)))
+
+    return paths
+
+
+class ProjectImporter(MetaPathFinder):
+    """
+    Импортирует модули проекта через отладчик ("just my code")
+
+    Модуль считается модулем проекта, если его файл лежит в одном из
+    каталогов проекта и не лежит в стандартной библиотеке или в
+    site-packages (например, виртуальное окружение внутри проекта).
+    Остальные модули импортируются обычным образом и исполняются без
+    отладки на полной скорости
+
+    Работает только в потоке, в котором был установлен (`install`), чтобы
+    не отлаживать импорты других потоков приложения
+    """
+
+    def __init__(
+            self, project_paths: Iterable[Text],
+            execute: Callable[[Text, Text, dict], None]):
+        """
+        :param project_paths: каталоги проекта
+        :param execute: функция (исходный код, имя файла, пространство имён
+            модуля), которая компилирует и исполняет модуль проекта
+        """
+        self._project_paths = [
+            os.path.normcase(os.path.abspath(path)) for path in project_paths]
+        self._library_paths = _library_paths()
+        self._execute = execute
+        self._thread_id = None
+        self._loaded = []
+
+    def install(self):
+        """Устанавливает хук в `sys.meta_path` для текущего потока"""
+        self._thread_id = threading.get_ident()
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        """
+        Удаляет хук и выгружает импортированные через него модули, чтобы
+        следующий запуск отладки импортировал их заново
+        """
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+        for name in self._loaded:
+            sys.modules.pop(name, None)
+        self._loaded = []
+
+    def is_project_file(self, filename: Text) -> bool:
+        path = os.path.normcase(os.path.abspath(filename))
+        parts = path.split(os.sep)
+
+        if 'site-packages' in parts or 'dist-packages' in parts:
+            return False
+
+        if any(self._is_inside(path, library)
+               for library in self._library_paths):
+            return False
+
+        return any(self._is_inside(path, project)
+                   for project in self._project_paths)
+
+    def find_spec(self, fullname, path=None, target=None):
+        if threading.get_ident() != self._thread_id:
+            return None
+
+        spec = PathFinder.find_spec(fullname, path)
+        if spec is None or not isinstance(spec.loader, SourceFileLoader):
+            return None
+
+        if not self.is_project_file(spec.origin):
+            return None
+
+        spec.loader = _ProjectLoader(fullname, spec.origin, self)
+
+        return spec
+
+    @staticmethod
+    def _is_inside(path, directory):
+        try:
+            return os.path.commonpath([path, directory]) == directory
+        except ValueError:
+            # разные диски в windows
+            return False
+
+
+class _ProjectLoader(SourceFileLoader):
+    """Исполняет модуль проекта через отладчик, минуя кэш .pyc"""
+
+    def __init__(self, fullname, path, importer: ProjectImporter):
+        super(_ProjectLoader, self).__init__(fullname, path)
+
+        self._importer = importer
+
+    def exec_module(self, module):
+        filename = self.get_filename(module.__name__)
+        source = decode_source(self.get_data(filename))
+
+        self._importer._loaded.append(module.__name__)
+        self._importer._execute(source, filename, module.__dict__)
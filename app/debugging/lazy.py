@@ -0,0 +1,79 @@
+"""Откладывает модификацию байткода функций до их первого вызова"""
+
+import sys
+from collections import defaultdict
+from types import CodeType, FunctionType
+from typing import Mapping, Text
+from weakref import WeakSet
+
+from .bytecode_modifier import BytecodeModifier
+
+
+class LazyInstrumenter:
+    """
+    Реестр ленивой модификации функций
+
+    `bind` вызывается модифицированным байткодом сразу после создания каждой
+    функции. Если код функции уже модифицирован, то он подменяется сразу,
+    иначе подменяется заглушкой. При первом вызове заглушка вызывает `load`,
+    который модифицирует код, запоминает результат и подменяет код у всех
+    функций, созданных из того же объекта кода
+    """
+    def __init__(
+            self, bytecode_modifier: BytecodeModifier,
+            conditions: Mapping[int, CodeType] = None, filename: Text = None):
+        """
+        :param bytecode_modifier: модификатор байткода
+        :param conditions: номер строки -> объект кода условия
+        :param filename: файл, к функциям которого относятся условия,
+            `None` - условия относятся к функциям всех файлов
+        """
+        self._bytecode_modifier = bytecode_modifier
+        self._conditions = conditions
+        self._filename = filename
+
+        self._modified = {}
+        self._stubs = {}
+        self._waiting = defaultdict(WeakSet)
+
+    @property
+    def modified_count(self) -> int:
+        """Количество уже модифицированных объектов кода"""
+        return len(self._modified)
+
+    def bind(self, func: FunctionType) -> FunctionType:
+        code = func.__code__
+
+        try:
+            func.__code__ = self._modified[code]
+            return func
+        except KeyError:
+            pass
+
+        stub = self._stubs.get(code)
+        if stub is None:
+            stub = self._bytecode_modifier.make_lazy_stub(code)
+            self._stubs[code] = stub
+
+        func.__code__ = stub
+        self._waiting[code].add(func)
+
+        return func
+
+    def load(self, code: CodeType, closure) -> FunctionType:
+        modified_code = self._modified.get(code)
+        if modified_code is None:
+            conditions = self._conditions
+            if self._filename not in (None, code.co_filename):
+                conditions = None
+
+            modified_code = self._bytecode_modifier.modify(
+                code, inner=True, lazy=True, conditions=conditions)
+            self._modified[code] = modified_code
+
+            for func in self._waiting.pop(code, ()):
+                func.__code__ = modified_code
+
+        return FunctionType(
+            modified_code, sys._getframe(1).f_globals,
+            code.co_name, None, closure)
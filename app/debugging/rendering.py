@@ -0,0 +1,262 @@
+"""Ограниченное по размеру и времени вычисление repr значений программы"""
+
+import time
+from collections import deque
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from itertools import islice
+from queue import Queue, Empty
+from threading import Thread
+from typing import Any, Callable
+
+from .common import Rendered
+
+# обозначение сокращённой части значения
+TRUNCATED = '...'
+# типы, repr которых не выполняет код программы; repr связанного метода
+# вызывает repr объекта, поэтому он описывается без него (см. `_repr_method`)
+_SAFE_REPR_TYPES = frozenset([
+    int, float, complex, bool, type(None), range, type, FunctionType,
+    BuiltinFunctionType, ModuleType])
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class RenderPolicy:
+    """
+    Ограничения repr значения, как у `reprlib.Repr`
+
+    Встроенные коллекции и строки сокращаются до вычисления repr, поэтому
+    их размер не влияет на время. repr остальных объектов вызывается как
+    есть и обрезается, а время всего значения ограничено бюджетом (см.
+    `RenderWorker`)
+    """
+
+    def __init__(
+            self, max_string: int = 200, max_items: int = 100,
+            max_depth: int = 4, max_length: int = 10000,
+            time_budget: float = 0.5, safe: bool = False):
+        """
+        :param max_string: максимальная длина строки и repr объекта
+            невстроенного типа
+        :param max_items: максимальное количество элементов коллекции
+        :param max_depth: максимальная вложенность коллекций
+        :param max_length: максимальная длина результата
+        :param time_budget: время (секунды) на одно значение
+        :param safe: не вызывать repr объектов невстроенных типов (вместо
+            него `object.__repr__`), чтобы не выполнять код программы
+        """
+        self.max_string = max_string
+        self.max_items = max_items
+        self.max_depth = max_depth
+        self.max_length = max_length
+        self.time_budget = time_budget
+        self.safe = safe
+
+    def expanded(self, factor: int = 10) -> 'RenderPolicy':
+        """Политика с увеличенными в `factor` раз ограничениями размера"""
+        return RenderPolicy(
+            self.max_string * factor, self.max_items * factor,
+            self.max_depth + 1, self.max_length * factor, self.time_budget,
+            self.safe)
+
+    def render(self, value) -> Rendered:
+        """
+        Вычисляет ограниченный repr значения в текущем потоке
+
+        Бюджет времени проверяется перед каждым элементом коллекций:
+        по его истечении оставшиеся элементы сокращаются
+        """
+        renderer = _Renderer(self, time.perf_counter() + self.time_budget)
+        try:
+            text = renderer.repr(value, 0)
+        except _BudgetExceeded:
+            return Rendered(TRUNCATED, True)
+
+        if len(text) > self.max_length:
+            text = text[:self.max_length] + TRUNCATED
+            renderer.truncated = True
+
+        return Rendered(text, renderer.truncated)
+
+
+class _Renderer:
+    _SEQUENCES = {
+        list: ('[', ']'),
+        tuple: ('(', ')'),
+        set: ('{', '}'),
+        frozenset: ('frozenset({', '})'),
+        deque: ('deque([', '])')
+    }
+
+    def __init__(self, policy, deadline):
+        self._policy = policy
+        self._deadline = deadline
+        # длина уже сформированных частей, чтобы остановиться на
+        # `max_length`, не формируя весь результат
+        self._length = 0
+        self.truncated = False
+
+    def repr(self, value, level):
+        if time.perf_counter() > self._deadline:
+            raise _BudgetExceeded()
+
+        value_type = type(value)
+
+        if value_type in (str, bytes, bytearray):
+            return self._repr_string(value)
+
+        if value_type in self._SEQUENCES:
+            return self._repr_sequence(value, value_type, level)
+
+        if value_type is dict:
+            return self._repr_dict(value, level)
+
+        if self._policy.safe and value_type not in _SAFE_REPR_TYPES:
+            if value_type is MethodType:
+                return self._repr_method(value)
+            return object.__repr__(value)
+
+        try:
+            text = repr(value)
+        except Exception as e:
+            return '<{}: {}>'.format(type(e).__name__, e)
+
+        return self._cut(text)
+
+    def _repr_method(self, value):
+        # метод может связывать любой вызываемый объект программы
+        function = value.__func__
+        if type(function) in (FunctionType, BuiltinFunctionType):
+            name = function.__qualname__
+        else:
+            name = object.__repr__(function)
+
+        return self._cut('<bound method {} of {}>'.format(
+            name, object.__repr__(value.__self__)))
+
+    def _repr_string(self, value):
+        max_string = self._policy.max_string
+        if len(value) <= max_string:
+            return repr(value)
+
+        self.truncated = True
+
+        return repr(value[:max_string]) + TRUNCATED
+
+    def _repr_sequence(self, value, value_type, level):
+        opening, closing = self._SEQUENCES[value_type]
+        if not value:
+            return 'set()' if value_type is set else opening + closing
+
+        if level >= self._policy.max_depth:
+            self.truncated = True
+            return opening + TRUNCATED + closing
+
+        parts = self._repr_items(
+            (self.repr(item, level + 1) for item in value), len(value))
+        if value_type is tuple and len(value) == 1:
+            parts[0] += ','
+
+        return opening + ', '.join(parts) + closing
+
+    def _repr_dict(self, value, level):
+        if not value:
+            return '{}'
+
+        if level >= self._policy.max_depth:
+            self.truncated = True
+            return '{' + TRUNCATED + '}'
+
+        parts = self._repr_items(
+            ('{}: {}'.format(
+                self.repr(key, level + 1), self.repr(item, level + 1))
+             for key, item in value.items()),
+            len(value))
+
+        return '{' + ', '.join(parts) + '}'
+
+    def _repr_items(self, items, size):
+        parts = []
+        try:
+            for text in islice(items, self._policy.max_items):
+                parts.append(text)
+                self._length += len(text) + 2
+                if self._length > self._policy.max_length:
+                    break
+        except _BudgetExceeded:
+            # после истечения бюджета каждый уровень вложенности
+            # завершается на следующем элементе
+            pass
+
+        if len(parts) < size:
+            self.truncated = True
+            parts.append(TRUNCATED)
+
+        return parts
+
+    def _cut(self, text):
+        max_string = self._policy.max_string
+        if len(text) <= max_string:
+            return text
+
+        self.truncated = True
+
+        return text[:max_string] + TRUNCATED
+
+
+class RenderWorker:
+    """
+    Поток, в котором вычисляется repr с жёстким ограничением времени
+
+    repr объекта программы может выполнять ввод-вывод или зациклиться,
+    такой вызов нельзя прервать. Если результат не получен вовремя, поток
+    бросается (он завершится сам после вызова), а следующий вызов
+    использует новый поток
+    """
+
+    def __init__(self):
+        self._tasks = None
+
+    def call(self, func: Callable[[Any], Any], value, timeout: float):
+        """
+        Вызывает `func(value)` в потоке вычисления
+
+        :param timeout: максимальное время ожидания в секундах
+        :return: результат `func`, `None` - время истекло или `func`
+            завершилась исключением
+        """
+        if self._tasks is None:
+            self._tasks = Queue()
+            Thread(
+                target=self._work, args=(self._tasks, ), daemon=True).start()
+
+        results = Queue()
+        self._tasks.put((func, value, results))
+
+        try:
+            return results.get(timeout=timeout)
+        except Empty:
+            # поток занят зависшим repr: завершится после него
+            self.stop()
+
+            return None
+
+    def stop(self):
+        if self._tasks is not None:
+            self._tasks.put(None)
+            self._tasks = None
+
+    @staticmethod
+    def _work(tasks):
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+
+            func, value, results = task
+            try:
+                results.put(func(value))
+            except Exception:
+                results.put(None)
@@ -0,0 +1,561 @@
+"""Отладка программы в дочернем процессе"""
+
+import mmap
+import multiprocessing
+import os
+import pickle
+import struct
+import tempfile
+from collections import deque
+from threading import Thread, Event, Lock
+from typing import Callable, Text, Iterable, Mapping, List, Dict, Optional
+from queue import Queue, Empty
+
+from .bytecode_modifier import BytecodeModifier
+from .common import (
+    Children, DebugCommand, DebuggerExit, EmptySourceCode, Handle,
+    HistoryState, InvalidBreakpointCondition, InvalidHandle, LogRecord,
+    Rendered)
+from .rendering import RenderPolicy
+from .wire import (
+    ChildrenRequest, Decoder, Encoder, FrameRequest, HistoryRequest,
+    RenderRequest)
+
+# сообщение канала: тип, номер запроса (0 - ответ не нужен) и тело
+_ENVELOPE = struct.Struct('<BI')
+# кадр `wire` в теле сообщения
+_FRAME = 1
+# кадр `wire` в общей памяти, тело - его длина
+_SHARED = 2
+# общая память прочитана и может быть перезаписана
+_RELEASE = 3
+# вызов метода отладчика, тело - pickle (имя метода, аргументы)
+_CALL = 4
+# результат вызова, тело - pickle (исключение ли, значение)
+_RESULT = 5
+# записи точек логирования, тело - pickle (записи, вытесненные записи)
+_LOGS = 6
+
+_LENGTH = struct.Struct('<I')
+# интервал (секунды) выгрузки записей точек логирования в дочернем процессе
+_LOGS_INTERVAL = 0.1
+# время (секунды), которое запрос ждёт остановленную программу в дочернем
+# процессе; клиент может перестать ждать раньше
+_REQUEST_TIMEOUT = 10.0
+# общая память в оперативной памяти, а не на диске, если есть
+_SHARED_DIRECTORY = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+class DebuggerServer:
+    """
+    Отладчик, который исполняет программу в дочернем процессе
+
+    Интерфейс как у `Debugger`. Каждая отладка запускается в новом
+    процессе со своим `Debugger`, поэтому программа не делит GIL с
+    интерфейсом, а её падение завершает только отладку.
+
+    Команды, снимки и ответы на запросы передаются через канал в двоичном
+    формате `wire`, а большие кадры (больше `inline_limit`) - через общую
+    память (`mmap` временного файла), в канал попадает только их длина.
+    Дочерний процесс не пишет в общую память, пока предыдущий кадр не
+    прочитан, в это время кадры идут через канал
+    """
+
+    # максимальное время ожидания ответа на вызов (секунды)
+    CALL_TIMEOUT = 10.0
+    # время на завершение прежнего процесса (секунды)
+    SHUTDOWN_TIMEOUT = 1.0
+
+    def __init__(
+            self, shared_memory: int = 16 * 2 ** 20,
+            inline_limit: int = 64 * 2 ** 10, **options):
+        """
+        :param shared_memory: размер общей памяти (байты), больший кадр
+            передаётся через канал
+        :param inline_limit: размер кадра (байты), до которого он
+            передаётся через канал
+        :param options: параметры `Debugger` (`code_cache`, `lazy`,
+            `engine`, `record`, ...)
+        """
+        self._shared_memory = shared_memory
+        self._inline_limit = inline_limit
+        self._options = options
+        self._context = multiprocessing.get_context('spawn')
+
+        self._process = None
+        self._receiver = None
+        self._connection = None
+        self._shared_file = None
+        self._shared = None
+        self._encoder = None
+        self._send_lock = Lock()
+        # номер запроса -> очередь ответа
+        self._replies = {}
+        self._next_request = 1
+        self._replies_lock = Lock()
+
+        self._snapshots = Queue()
+        self._snapshot_listener = None
+        self._finished = Event()
+        self._finished.set()
+        self._logs = deque(maxlen=options.get('log_size', 10000))
+        self._dropped_logs = 0
+        self._child_dropped_logs = 0
+        # выражения наблюдения переживают отладку и передаются каждому
+        # новому процессу
+        self._watches = {}
+
+    def start(
+            self, source: Text, filename: Text,
+            breakpoints: Iterable[int] = (),
+            conditions: Mapping[int, Text] = None,
+            logpoints: Mapping[int, Text] = None,
+            project_paths: Iterable[Text] = None):
+        """
+        Запускает отладку в новом дочернем процессе (см. `Debugger.start`)
+
+        Процесс предыдущей отладки завершается
+
+        :raise EmptySourceCode: пустой исходный код
+        :raise InvalidBreakpointCondition: некорректное условие или
+            сообщение точки логирования
+        """
+        if not source:
+            raise EmptySourceCode()
+
+        self.close()
+        self._snapshots = Queue()
+        self._logs.clear()
+        self._dropped_logs = 0
+        self._child_dropped_logs = 0
+        self._finished.clear()
+        self._spawn()
+
+        for expression in self._watches:
+            self._notify('add_watch', expression)
+        self._call(
+            'start', source, filename, tuple(breakpoints),
+            dict(conditions or {}), dict(logpoints or {}),
+            None if project_paths is None else tuple(project_paths))
+
+    def add_breakpoint(self, line_no: int, filename: Text = None):
+        self._notify('add_breakpoint', line_no, filename)
+
+    def remove_breakpoint(self, line_no: int, filename: Text = None):
+        self._notify('remove_breakpoint', line_no, filename)
+
+    def add_logpoint(self, line_no: int, message: Text):
+        """:raise InvalidBreakpointCondition: некорректный шаблон"""
+        BytecodeModifier.compile_condition('f' + repr(message))
+        self._notify('add_logpoint', line_no, message)
+
+    def remove_logpoint(self, line_no: int):
+        self._notify('remove_logpoint', line_no)
+
+    def add_watch(self, expression: Text):
+        """:raise InvalidBreakpointCondition: некорректное выражение"""
+        try:
+            compile(expression, '<watch>', 'eval')
+        except (SyntaxError, ValueError) as e:
+            raise InvalidBreakpointCondition(expression) from e
+
+        self._watches[expression] = None
+        self._notify('add_watch', expression)
+
+    def remove_watch(self, expression: Text):
+        self._watches.pop(expression, None)
+        self._notify('remove_watch', expression)
+
+    def drain_logs(self, limit: int = None) -> List[LogRecord]:
+        """Забирает полученные записи точек логирования, не блокирует"""
+        records = []
+
+        while limit is None or len(records) < limit:
+            try:
+                records.append(self._logs.popleft())
+            except IndexError:
+                break
+
+        return records
+
+    @property
+    def dropped_logs(self) -> int:
+        """
+        Количество записей, вытесненных из переполненного буфера в
+        дочернем процессе и в этом
+        """
+        return self._child_dropped_logs + self._dropped_logs
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Идентификатор дочернего процесса, `None` - процесса нет"""
+        return None if self._process is None else self._process.pid
+
+    def get_hit_counts(self, filename: Text = None) -> Dict[int, int]:
+        return self._call('get_hit_counts', filename) or {}
+
+    def set_record(self, record: bool):
+        """Запись истории в процессе следующего запуска отладки"""
+        self._options['record'] = record
+
+    def set_snapshot_listener(self, listener: Optional[Callable[[], None]]):
+        """
+        :param listener: функция без аргументов, которая вызывается потоком
+            приёма после каждого снимка и завершения отладки (см.
+            `Debugger.set_snapshot_listener`)
+        """
+        self._snapshot_listener = listener
+
+    def send_command(self, command: DebugCommand, thread_id: int = None):
+        if thread_id is None:
+            self._send_frame(command)
+        else:
+            self._notify('send_command', command, thread_id)
+
+    def select_thread(self, thread_id: int):
+        """:raise UnknownThread: поток не остановлен"""
+        self._call('select_thread', thread_id)
+
+    def stopped_threads(self) -> Dict[int, Text]:
+        return self._call('stopped_threads') or {}
+
+    def resync(self):
+        self._notify('resync')
+
+    def render(
+            self, handle_id: int, policy: RenderPolicy = None,
+            timeout: float = None) -> Optional[Rendered]:
+        """:raise InvalidHandle: значения нет в текущей остановке"""
+        return self._request(RenderRequest(handle_id, policy), timeout)
+
+    def children(
+            self, handle_id: int, offset: int = 0, limit: int = 100,
+            timeout: float = None) -> Optional[Children]:
+        """:raise InvalidHandle: значения нет в текущей остановке"""
+        return self._request(
+            ChildrenRequest(handle_id, offset, limit), timeout)
+
+    def frame_variables(
+            self, depth: int,
+            timeout: float = None) -> Optional[Dict[str, Handle]]:
+        """:raise InvalidHandle: кадра нет в текущей остановке"""
+        children = self._request(FrameRequest(depth), timeout)
+        if children is None:
+            return None
+
+        return {handle.name: handle for handle in children.handles}
+
+    def history_state(
+            self, step: int, timeout: float = None) -> Optional[HistoryState]:
+        """:raise InvalidHandle: шаг не записан"""
+        return self._request(HistoryRequest(step), timeout)
+
+    def get_snapshot(self, timeout: float = None) -> Optional[dict]:
+        """
+        Снимок состояния (см. `Debugger.get_snapshot`)
+
+        :raise DebuggerExit: отладка закончилась или дочерний процесс
+            завершился
+        """
+        try:
+            snapshot = self._snapshots.get(timeout=timeout)
+        except Empty:
+            return None
+
+        if snapshot is DebuggerExit:
+            raise DebuggerExit('Отладка закончена')
+
+        return snapshot
+
+    def finish(self):
+        """Отправляет команду завершения, процесс остаётся до `close`"""
+        self._send_frame(DebuggerExit)
+
+    def join(self):
+        """Дожидается завершения отладки"""
+        self._finished.wait()
+
+    def close(self):
+        """Завершает дочерний процесс и освобождает общую память"""
+        process = self._process
+        if process is None:
+            return
+
+        self._process = None
+        # дочерний процесс завершается, когда канал закрыт
+        with self._send_lock:
+            self._connection.close()
+        process.join(self.SHUTDOWN_TIMEOUT)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+        # поток приёма завершает отладку и ответы прежнего процесса
+        self._receiver.join()
+        self._shared.close()
+        self._shared_file.close()
+
+    def _spawn(self):
+        self._shared_file = tempfile.NamedTemporaryFile(
+            prefix='poson-', dir=_SHARED_DIRECTORY)
+        self._shared_file.truncate(self._shared_memory)
+        self._shared = mmap.mmap(
+            self._shared_file.fileno(), self._shared_memory,
+            access=mmap.ACCESS_READ)
+
+        self._connection, child_connection = self._context.Pipe()
+        self._encoder = Encoder()
+        self._process = self._context.Process(
+            target=_serve,
+            args=(
+                child_connection, self._shared_file.name,
+                self._shared_memory, self._inline_limit, self._options),
+            daemon=True)
+        self._process.start()
+        child_connection.close()
+
+        self._receiver = Thread(
+            target=self._receive,
+            args=(self._connection, self._shared, self._snapshots),
+            daemon=True)
+        self._receiver.start()
+
+    def _send(self, kind, request_id, body):
+        if self._process is None:
+            return
+
+        try:
+            self._connection.send_bytes(
+                _ENVELOPE.pack(kind, request_id) + body)
+        except (OSError, ValueError):
+            # процесс завершился: об этом сообщит поток приёма
+            pass
+
+    def _send_frame(self, message, request_id=0):
+        with self._send_lock:
+            if self._encoder is not None:
+                self._send(
+                    _FRAME, request_id, self._encoder.encode(message))
+
+    def _notify(self, method, *args):
+        """Вызов метода отладчика без ожидания результата"""
+        with self._send_lock:
+            self._send(_CALL, 0, pickle.dumps((method, args)))
+
+    def _new_reply(self):
+        with self._replies_lock:
+            request_id = self._next_request
+            self._next_request += 1
+            reply = self._replies[request_id] = Queue()
+
+        return request_id, reply
+
+    def _wait_reply(self, request_id, reply, timeout):
+        try:
+            return reply.get(timeout=timeout)
+        except Empty:
+            return None
+        finally:
+            with self._replies_lock:
+                self._replies.pop(request_id, None)
+
+    def _call(self, method, *args):
+        """
+        Вызов метода отладчика с ожиданием результата
+
+        :return: результат, `None` - процесса нет или он не ответил
+        """
+        if self._process is None:
+            return None
+
+        request_id, reply = self._new_reply()
+        with self._send_lock:
+            self._send(_CALL, request_id, pickle.dumps((method, args)))
+
+        result = self._wait_reply(request_id, reply, self.CALL_TIMEOUT)
+        if result is None:
+            return None
+
+        is_error, value = result
+        if is_error:
+            raise value
+
+        return value
+
+    def _request(self, request, timeout):
+        """Запрос к остановленной программе в формате `wire`"""
+        if self._process is None:
+            return None
+
+        request_id, reply = self._new_reply()
+        self._send_frame(request, request_id)
+
+        result = self._wait_reply(request_id, reply, timeout)
+        if isinstance(result, InvalidHandle):
+            raise result
+
+        return result
+
+    def _receive(self, connection, shared, snapshots):
+        """Поток приёма сообщений дочернего процесса"""
+        decoder = Decoder()
+
+        while True:
+            try:
+                data = connection.recv_bytes()
+            except (EOFError, OSError):
+                break
+
+            kind, request_id = _ENVELOPE.unpack_from(data)
+            body = memoryview(data)[_ENVELOPE.size:]
+
+            if kind == _SHARED:
+                length, = _LENGTH.unpack_from(body)
+                # `feed` копирует кадр, после чего память свободна
+                messages = decoder.feed(shared[:length])
+                with self._send_lock:
+                    self._send(_RELEASE, 0, b'')
+            elif kind == _FRAME:
+                messages = decoder.feed(body)
+            elif kind == _LOGS:
+                records, self._child_dropped_logs = pickle.loads(body)
+                overflow = (
+                    len(self._logs) + len(records) - self._logs.maxlen)
+                self._dropped_logs += max(0, overflow)
+                self._logs.extend(records)
+                continue
+            else:
+                messages = [pickle.loads(body)]
+
+            for message in messages:
+                if request_id:
+                    with self._replies_lock:
+                        reply = self._replies.get(request_id)
+                    if reply is not None:
+                        reply.put(message)
+                else:
+                    snapshots.put(message)
+                    if message is DebuggerExit:
+                        self._finished.set()
+                    self._notify_snapshot()
+
+        if not self._finished.is_set():
+            # программа не закончила отладку: процесс упал или завершён
+            snapshots.put(DebuggerExit)
+            self._finished.set()
+            self._notify_snapshot()
+        with self._replies_lock:
+            for reply in self._replies.values():
+                reply.put(None)
+
+    def _notify_snapshot(self):
+        listener = self._snapshot_listener
+        if listener is not None:
+            listener()
+
+
+def _serve(connection, shared_name, shared_size, inline_limit, options):
+    """Точка входа дочернего процесса: `Debugger` за каналом"""
+    from .debugger import Debugger
+
+    with open(shared_name, 'r+b') as shared_file:
+        shared = mmap.mmap(shared_file.fileno(), shared_size)
+
+    send_lock = Lock()
+    encoder = Encoder()
+    shared_free = Event()
+    shared_free.set()
+
+    def send(kind, request_id, body):
+        try:
+            connection.send_bytes(_ENVELOPE.pack(kind, request_id) + body)
+        except (OSError, ValueError):
+            pass
+
+    def send_frame(message, request_id=0):
+        with send_lock:
+            frame = encoder.encode(message)
+            if (len(frame) > inline_limit and len(frame) <= shared_size
+                    and shared_free.is_set()):
+                shared_free.clear()
+                shared[:len(frame)] = frame
+                send(_SHARED, request_id, _LENGTH.pack(len(frame)))
+            else:
+                send(_FRAME, request_id, frame)
+
+    debugger = Debugger(**options)
+
+    def forward():
+        """Пересылает снимки и записи точек логирования"""
+        while True:
+            try:
+                snapshot = debugger.get_snapshot(timeout=_LOGS_INTERVAL)
+            except DebuggerExit:
+                snapshot = DebuggerExit
+
+            # записи до остановки приходят раньше её снимка
+            records = debugger.drain_logs()
+            if records:
+                with send_lock:
+                    send(_LOGS, 0, pickle.dumps(
+                        (records, debugger.dropped_logs)))
+
+            if snapshot is not None:
+                send_frame(snapshot)
+
+    def serve_request(request_id, request):
+        """Запрос ждёт остановленную программу в своём потоке"""
+        timeout = _REQUEST_TIMEOUT
+        try:
+            if isinstance(request, RenderRequest):
+                result = debugger.render(
+                    request.handle_id, request.policy, timeout)
+            elif isinstance(request, ChildrenRequest):
+                result = debugger.children(
+                    request.handle_id, request.offset, request.limit,
+                    timeout)
+            elif isinstance(request, FrameRequest):
+                handles = debugger.frame_variables(request.depth, timeout)
+                result = None if handles is None else Children(
+                    list(handles.values()), len(handles))
+            else:
+                result = debugger.history_state(request.step, timeout)
+        except InvalidHandle as e:
+            result = e
+
+        if result is not None:
+            send_frame(result, request_id)
+
+    Thread(target=forward, daemon=True).start()
+
+    decoder = Decoder()
+    while True:
+        try:
+            data = connection.recv_bytes()
+        except (EOFError, OSError):
+            break
+
+        kind, request_id = _ENVELOPE.unpack_from(data)
+        body = memoryview(data)[_ENVELOPE.size:]
+
+        if kind == _RELEASE:
+            shared_free.set()
+        elif kind == _CALL:
+            method, args = pickle.loads(body)
+            try:
+                result = False, getattr(debugger, method)(*args)
+            except Exception as e:
+                result = True, e
+            if request_id:
+                with send_lock:
+                    send(_RESULT, request_id, pickle.dumps(result))
+        elif kind == _FRAME:
+            for message in decoder.feed(body):
+                if message is DebuggerExit:
+                    debugger.finish()
+                elif isinstance(message, DebugCommand):
+                    debugger.send_command(message)
+                else:
+                    Thread(
+                        target=serve_request, args=(request_id, message),
+                        daemon=True).start()
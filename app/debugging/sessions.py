@@ -0,0 +1,295 @@
+"""Несколько одновременных сеансов отладки"""
+
+import os
+import time
+from itertools import count
+from threading import Thread, Event, Lock
+from typing import List, Optional, Tuple
+from queue import Queue, Empty
+
+from .common import (
+    DebuggerExit, SessionStats, TooManySessions, UnknownSession)
+from .debugger import Debugger
+from .server import DebuggerServer
+
+# методы отладчика, которые можно вызвать через `SessionManager.dispatch`;
+# снимки забирает менеджер (см. `next_event`)
+_SESSION_METHODS = frozenset([
+    'start', 'add_breakpoint', 'remove_breakpoint', 'add_logpoint',
+    'remove_logpoint', 'add_watch', 'remove_watch', 'drain_logs',
+    'get_hit_counts', 'send_command', 'select_thread', 'stopped_threads',
+    'resync', 'render', 'children', 'frame_variables', 'history_state',
+    'finish'])
+# интервал (секунды), с которым поток сеанса проверяет, не закрыт ли сеанс
+_POLL_INTERVAL = 0.1
+
+
+class _Session:
+    """Отладчик сеанса, его поток снимков и счётчики"""
+
+    def __init__(self, session_id, debugger):
+        self.id = session_id
+        self.debugger = debugger
+        self.created = time.monotonic()
+        self.last_active = self.created
+        self.snapshots = 0
+        self.calls = 0
+        # программа сеанса запущена и ещё не закончилась
+        self.running = False
+        # программа остановлена и ждёт команды: снимок получен, команды
+        # после него не было
+        self.waiting = False
+        self.closed = Event()
+        self.pump = None
+
+
+class SessionManager:
+    """
+    Менеджер сеансов отладки
+
+    Создаёт сеансы, передаёт вызовы отладчику нужного сеанса и закрывает
+    их. Отладчик сеанса - `DebuggerServer` (программа в своём дочернем
+    процессе) или `Debugger` в процессе менеджера. Одновременно открыто не
+    больше `max_sessions` сеансов: при нехватке места и периодически
+    закрываются сеансы без вызовов и снимков дольше `idle_timeout`, если
+    их программа остановлена и ждёт команды, закончилась или не
+    запускалась. Выполняющаяся программа (например, долгое вычисление без
+    точек остановки) простаивающей не считается: отладчик в процессе
+    менеджера не может прервать её, пока она не остановится, а
+    `close_session` дочернего процесса приходится вызывать явно.
+
+    Снимки всех сеансов попадают в общую очередь событий с номером сеанса
+    (см. `next_event`), поэтому один поток интерфейса обслуживает все
+    программы
+    """
+
+    def __init__(
+            self, max_sessions: int = 8, idle_timeout: float = 600.0,
+            out_of_process: bool = True, **options):
+        """
+        :param max_sessions: максимальное количество открытых сеансов
+            (дочерних процессов или потоков программ)
+        :param idle_timeout: время (секунды) без вызовов и снимков, после
+            которого сеанс с остановленной или законченной программой
+            закрывается, `None` - не закрывать
+        :param out_of_process: исполнять программы в дочерних процессах
+            (`DebuggerServer`), иначе в потоках этого процесса (`Debugger`)
+        :param options: параметры отладчиков по умолчанию
+        """
+        self._max_sessions = max_sessions
+        self._idle_timeout = idle_timeout
+        self._out_of_process = out_of_process
+        self._options = options
+        self._sessions = {}
+        self._lock = Lock()
+        self._ids = count(1)
+        self._events = Queue()
+        self._closed = Event()
+
+        if idle_timeout is not None:
+            Thread(target=self._reap, daemon=True).start()
+
+    def create(self, **options) -> int:
+        """
+        Создаёт сеанс
+
+        :param options: параметры отладчика сеанса вместо параметров по
+            умолчанию
+        :return: номер сеанса
+        :raise TooManySessions: открыто `max_sessions` сеансов, и ни один
+            не простаивает
+        """
+        if len(self._sessions) >= self._max_sessions:
+            self.reap_idle()
+
+        with self._lock:
+            if len(self._sessions) >= self._max_sessions:
+                raise TooManySessions(self._max_sessions)
+
+            debugger_class = (
+                DebuggerServer if self._out_of_process else Debugger)
+            session = _Session(
+                next(self._ids),
+                debugger_class(**dict(self._options, **options)))
+            self._sessions[session.id] = session
+
+        session.pump = Thread(
+            target=self._pump, args=(session, ), daemon=True)
+        session.pump.start()
+
+        return session.id
+
+    def dispatch(self, session_id: int, method: str, *args, **kwargs):
+        """
+        Вызывает метод отладчика сеанса
+
+        :param method: имя метода `Debugger`, например `start`,
+            `send_command` или `render`
+        :return: результат метода
+        :raise UnknownSession: сеанса нет или он закрыт
+        :raise AttributeError: метод нельзя вызвать через менеджер
+        """
+        if method not in _SESSION_METHODS:
+            raise AttributeError(method)
+
+        session = self._session(session_id)
+        session.calls += 1
+        session.last_active = time.monotonic()
+        if method == 'send_command':
+            # следующий снимок снова отметит остановку
+            session.waiting = False
+        result = getattr(session.debugger, method)(*args, **kwargs)
+        if method == 'start':
+            session.running = True
+
+        return result
+
+    def next_event(
+            self, timeout: float = None) -> Optional[Tuple[int, object]]:
+        """
+        Следующее событие любого сеанса
+
+        :param timeout: максимальное время ожидания в секундах,
+            `None` - без ограничения. По истечении возвращается `None`
+        :return: (номер сеанса, снимок состояния или `DebuggerExit`, если
+            отладка закончилась или сеанс закрыт)
+        """
+        try:
+            return self._events.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def sessions(self) -> List[int]:
+        """Номера открытых сеансов"""
+        return list(self._sessions)
+
+    def stats(self, session_id: int) -> SessionStats:
+        """
+        Ресурсы сеанса
+
+        :raise UnknownSession: сеанса нет или он закрыт
+        """
+        session = self._session(session_id)
+        cpu_time, memory = _process_usage(
+            getattr(session.debugger, 'pid', None))
+
+        return SessionStats(
+            session.created, time.monotonic() - session.last_active,
+            session.snapshots, session.calls, cpu_time, memory)
+
+    def close_session(self, session_id: int):
+        """
+        Завершает отладку и закрывает сеанс
+
+        Программа в процессе менеджера завершается при следующей
+        остановке, до неё выполнение продолжается
+
+        :raise UnknownSession: сеанса нет или он уже закрыт
+        """
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            raise UnknownSession(session_id)
+
+        session.closed.set()
+        session.debugger.finish()
+        if isinstance(session.debugger, DebuggerServer):
+            session.debugger.close()
+        session.pump.join()
+        if session.running:
+            self._events.put((session_id, DebuggerExit))
+
+    def reap_idle(self) -> List[int]:
+        """
+        Закрывает сеансы без вызовов и снимков дольше `idle_timeout`,
+        программа которых остановлена, закончилась или не запускалась
+
+        :return: номера закрытых сеансов
+        """
+        if self._idle_timeout is None:
+            return []
+
+        now = time.monotonic()
+        idle = [
+            session.id for session in list(self._sessions.values())
+            if now - session.last_active >= self._idle_timeout
+            and (session.waiting or not session.running)]
+
+        reaped = []
+        for session_id in idle:
+            try:
+                self.close_session(session_id)
+            except UnknownSession:
+                # закрыт параллельно
+                continue
+            reaped.append(session_id)
+
+        return reaped
+
+    def close(self):
+        """Закрывает все сеансы"""
+        self._closed.set()
+        for session_id in self.sessions():
+            try:
+                self.close_session(session_id)
+            except UnknownSession:
+                pass
+
+    def _session(self, session_id) -> _Session:
+        try:
+            return self._sessions[session_id]
+        except KeyError:
+            raise UnknownSession(session_id) from None
+
+    def _pump(self, session):
+        """Перекладывает снимки сеанса в общую очередь событий"""
+        while not session.closed.is_set():
+            try:
+                snapshot = session.debugger.get_snapshot(
+                    timeout=_POLL_INTERVAL)
+            except DebuggerExit:
+                snapshot = DebuggerExit
+
+            if snapshot is None:
+                continue
+
+            if snapshot is DebuggerExit:
+                session.running = False
+                session.waiting = False
+            else:
+                session.snapshots += 1
+                session.waiting = True
+            session.last_active = time.monotonic()
+            self._events.put((session.id, snapshot))
+
+    def _reap(self):
+        """Поток закрытия простаивающих сеансов"""
+        while not self._closed.wait(self._idle_timeout / 2):
+            self.reap_idle()
+
+
+def _process_usage(pid) -> Tuple[Optional[float], Optional[int]]:
+    """
+    Процессорное время (секунды) и резидентная память (байты) процесса
+    из `/proc`
+
+    :return: `(None, None)` - процесса нет или `/proc` недоступен
+    """
+    if pid is None:
+        return None, None
+
+    try:
+        with open('/proc/{}/stat'.format(pid)) as f:
+            # имя процесса в скобках может содержать пробелы
+            fields = f.read().rpartition(')')[2].split()
+        with open('/proc/{}/statm'.format(pid)) as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None, None
+
+    # utime и stime - 14 и 15 поля, после имени процесса - 12 и 13
+    ticks = int(fields[11]) + int(fields[12])
+
+    return (
+        ticks / os.sysconf('SC_CLK_TCK'),
+        resident_pages * os.sysconf('SC_PAGE_SIZE'))
@@ -0,0 +1,118 @@
+"""Хранилище записей с ограничением памяти и выгрузкой в файл"""
+
+import mmap
+import tempfile
+from array import array
+from typing import Text
+
+
+class SpillStore:
+    """
+    Последовательность двоичных записей, которые только добавляются
+
+    Новые записи хранятся в памяти. Когда их размер превышает `max_memory`,
+    старые записи дописываются во временный файл, а их смещения - в индекс
+    (`array('Q')`). Файл читается через `mmap`: выгруженная запись
+    возвращается как `memoryview` отображения без копирования
+    """
+
+    def __init__(self, max_memory: int = 64 * 2 ** 20, directory: Text = None):
+        """
+        :param max_memory: размер записей в памяти (байты), больше которого
+            старые записи выгружаются в файл
+        :param directory: каталог временного файла, `None` - системный
+        """
+        self._max_memory = max_memory
+        self._directory = directory
+        # записи в памяти, первая - запись с номером `_spilled`
+        self._records = []
+        self._memory_size = 0
+        self._spilled = 0
+        # смещения выгруженных записей в файле, последнее - размер файла
+        self._offsets = array('Q', [0])
+        self._file = None
+        self._map = None
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._records)
+
+    @property
+    def memory_size(self) -> int:
+        """Размер записей в памяти (байты)"""
+        return self._memory_size
+
+    @property
+    def spilled_size(self) -> int:
+        """Размер выгруженных в файл записей (байты)"""
+        return self._offsets[-1]
+
+    def append(self, data: bytes) -> int:
+        """
+        Добавляет запись
+
+        :return: номер записи
+        """
+        data = bytes(data)
+        self._records.append(data)
+        self._memory_size += len(data)
+
+        if self._memory_size > self._max_memory:
+            self._spill()
+
+        return len(self) - 1
+
+    def __getitem__(self, index: int) -> memoryview:
+        """
+        Запись без копирования
+
+        Представление выгруженной записи действительно, пока существует
+        хранилище
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        if index >= self._spilled:
+            return memoryview(self._records[index - self._spilled])
+
+        start = self._offsets[index]
+        end = self._offsets[index + 1]
+        if start == end:
+            return memoryview(b'')
+
+        if self._map is None or end > len(self._map):
+            # прежнее отображение освободится вместе с его представлениями
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return memoryview(self._map)[start:end]
+
+    def close(self):
+        """Удаляет временный файл, записи больше не читаются"""
+        self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._records = []
+        self._memory_size = 0
+
+    def _spill(self):
+        """Выгружает старые записи, пока в памяти не останется половина"""
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(
+                prefix='poson-', dir=self._directory)
+
+        count = 0
+        size = 0
+        target = self._memory_size - self._max_memory // 2
+        while size < target and count < len(self._records):
+            record = self._records[count]
+            size += len(record)
+            self._offsets.append(self._offsets[-1] + len(record))
+            count += 1
+
+        self._file.write(b''.join(self._records[:count]))
+        # mmap читает файл, а не буфер объекта файла
+        self._file.flush()
+        del self._records[:count]
+        self._memory_size -= size
+        self._spilled += count
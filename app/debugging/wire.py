@@ -0,0 +1,516 @@
+"""
+Двоичный формат сообщений отладчика для передачи между процессами
+
+Сообщение передаётся кадром: длина (4 байта, big-endian), версия формата,
+тип сообщения, флаги и тело. Имена переменных, типов, функций и файлов
+передаются индексами таблицы строк, общей для всех кадров потока: строка,
+встретившаяся впервые, передаётся в начале тела своего кадра. Поэтому
+`Encoder` и `Decoder` используются для одного потока каждый, а кадры
+декодируются в порядке кодирования
+"""
+
+import struct
+from collections import namedtuple
+from typing import List, Optional, Tuple
+
+from .common import (
+    Children, DebugCommand, DebuggerExit, Handle, HistoryState,
+    InvalidHandle, Rendered, StackFrame, WireFormatError)
+from .rendering import RenderPolicy
+
+VERSION = 4
+
+RenderRequest = namedtuple('RenderRequest', ['handle_id', 'policy'])
+RenderRequest.__doc__ = '''
+Запрос repr значения (см. `Debugger.render`)
+
+policy - `RenderPolicy` или `None` (политика отладчика)
+'''
+
+ChildrenRequest = namedtuple(
+    'ChildrenRequest', ['handle_id', 'offset', 'limit'])
+ChildrenRequest.__doc__ = '''
+Запрос страницы дочерних значений (см. `Debugger.children`)
+'''
+
+FrameRequest = namedtuple('FrameRequest', ['depth'])
+FrameRequest.__doc__ = '''
+Запрос переменных кадра стека вызовов (см. `Debugger.frame_variables`),
+ответ - `Children`
+'''
+
+HistoryRequest = namedtuple('HistoryRequest', ['step'])
+HistoryRequest.__doc__ = '''
+Запрос записанного состояния шага (см. `Debugger.history_state`), ответ -
+`HistoryState`
+'''
+
+# типы сообщений
+_SNAPSHOT = 1
+_COMMAND = 2
+_EXIT = 3
+_RENDER_REQUEST = 4
+_RENDERED = 5
+_CHILDREN_REQUEST = 6
+_CHILDREN = 7
+_FRAME_REQUEST = 8
+_INVALID_HANDLE = 9
+_HISTORY_REQUEST = 10
+_HISTORY_STATE = 11
+
+# флаги кадра
+_RESET_STRINGS = 1
+
+_LENGTH = struct.Struct('>I')
+_HEADER = struct.Struct('<BBB')
+_COUNT = struct.Struct('<I')
+# имя, имя типа, id, размер (-1 - нет), длина preview (-1 - нет)
+_HANDLE = struct.Struct('<IIQqi')
+# имя, файл, номер строки
+_STACK_FRAME = struct.Struct('<III')
+# полный ли снимок, номер строки, файл, шаг истории (-1 - нет)
+_SNAPSHOT_HEADER = struct.Struct('<BIIqQI')
+_RENDER_REQUEST_BODY = struct.Struct('<QB')
+_POLICY = struct.Struct('<IIIIdB')
+# шаг, номер строки, файл
+_HISTORY_HEADER = struct.Struct('<III')
+_CHILDREN_REQUEST_BODY = struct.Struct('<QII')
+_BYTE = struct.Struct('<B')
+_UNSIGNED = struct.Struct('<Q')
+_SIGNED = struct.Struct('<q')
+
+
+class Encoder:
+    """Кодирует сообщения одного потока в кадры"""
+
+    def __init__(self, max_strings: int = 65536):
+        """
+        :param max_strings: размер таблицы строк, при переполнении таблица
+            очищается с обеих сторон
+        """
+        self._max_strings = max_strings
+        self._strings = {}
+        self._new_strings = []
+
+    def encode(self, message) -> bytes:
+        """
+        Кадр сообщения
+
+        :param message: снимок состояния (dict, см. `Debugger.get_snapshot`),
+            `DebugCommand`, `DebuggerExit`, `Rendered`, `Children`,
+            `InvalidHandle`, `HistoryState`, `RenderRequest`,
+            `ChildrenRequest`, `FrameRequest` или `HistoryRequest`
+        :raise WireFormatError: сообщение не поддерживается
+        """
+        flags = 0
+        strings_before = self._strings
+        if len(self._strings) >= self._max_strings:
+            self._strings = {}
+            flags |= _RESET_STRINGS
+
+        body = bytearray()
+        try:
+            message_type = self._encode_body(message, body)
+        except Exception as e:
+            # кадр не отправлен: таблица должна совпадать с декодером
+            for string in self._new_strings:
+                strings_before.pop(string, None)
+            self._strings = strings_before
+            self._new_strings = []
+            if isinstance(e, (struct.error, KeyError, AttributeError)):
+                raise WireFormatError(
+                    'Некорректное сообщение: {}'.format(e)) from e
+            raise
+
+        strings = bytearray(_COUNT.pack(len(self._new_strings)))
+        for string in self._new_strings:
+            data = string.encode('utf-8', 'surrogatepass')
+            strings += _COUNT.pack(len(data))
+            strings += data
+        self._new_strings = []
+
+        header = _HEADER.pack(VERSION, message_type, flags)
+        length = len(header) + len(strings) + len(body)
+
+        return b''.join((_LENGTH.pack(length), header, strings, body))
+
+    def write(self, stream, message):
+        """Записывает кадр сообщения в поток с методом `write`"""
+        stream.write(self.encode(message))
+
+    def _intern(self, string) -> int:
+        index = self._strings.get(string)
+        if index is None:
+            index = self._strings[string] = len(self._strings)
+            self._new_strings.append(string)
+
+        return index
+
+    def _encode_body(self, message, body) -> int:
+        if isinstance(message, dict):
+            self._encode_snapshot(message, body)
+            return _SNAPSHOT
+
+        if isinstance(message, DebugCommand):
+            body += _BYTE.pack(message)
+            return _COMMAND
+
+        if message is DebuggerExit or isinstance(message, DebuggerExit):
+            return _EXIT
+
+        if isinstance(message, Rendered):
+            body += _BYTE.pack(message.truncated)
+            self._encode_text(message.text, body)
+            return _RENDERED
+
+        if isinstance(message, Children):
+            body += _UNSIGNED.pack(message.total)
+            self._encode_handles(message.handles, body)
+            return _CHILDREN
+
+        if isinstance(message, HistoryState):
+            body += _HISTORY_HEADER.pack(
+                message.step, message.line_no,
+                self._intern(message.filename))
+            self._encode_texts(message.global_variables, body)
+            self._encode_texts(message.local_variables, body)
+            return _HISTORY_STATE
+
+        if isinstance(message, InvalidHandle):
+            body += _SIGNED.pack(message.args[0] if message.args else -1)
+            return _INVALID_HANDLE
+
+        if isinstance(message, RenderRequest):
+            policy = message.policy
+            body += _RENDER_REQUEST_BODY.pack(
+                message.handle_id, policy is not None)
+            if policy is not None:
+                body += _POLICY.pack(
+                    policy.max_string, policy.max_items, policy.max_depth,
+                    policy.max_length, policy.time_budget, policy.safe)
+            return _RENDER_REQUEST
+
+        if isinstance(message, ChildrenRequest):
+            body += _CHILDREN_REQUEST_BODY.pack(*message)
+            return _CHILDREN_REQUEST
+
+        if isinstance(message, FrameRequest):
+            body += _COUNT.pack(message.depth)
+            return _FRAME_REQUEST
+
+        if isinstance(message, HistoryRequest):
+            body += _COUNT.pack(message.step)
+            return _HISTORY_REQUEST
+
+        raise WireFormatError(
+            'Неподдерживаемое сообщение: {}'.format(type(message).__name__))
+
+    def _encode_snapshot(self, snapshot, body):
+        body += _SNAPSHOT_HEADER.pack(
+            snapshot['full'], snapshot['line_no'],
+            self._intern(snapshot['filename']),
+            -1 if snapshot['step'] is None else snapshot['step'],
+            snapshot['thread_id'], self._intern(snapshot['thread_name']))
+        self._encode_handles(snapshot['global_variables'].values(), body)
+        self._encode_names(snapshot['removed_global_variables'], body)
+        self._encode_handles(snapshot['local_variables'].values(), body)
+        self._encode_names(snapshot['removed_local_variables'], body)
+
+        stack = snapshot['stack']
+        intern = self._intern
+        pack = _STACK_FRAME.pack
+        body += _COUNT.pack(len(stack))
+        body += b''.join(
+            pack(intern(frame.name), intern(frame.filename), frame.line_no)
+            for frame in stack)
+        self._encode_handles(snapshot['watches'].values(), body)
+
+    def _encode_handles(self, handles, body):
+        intern = self._intern
+        pack = _HANDLE.pack
+        parts = []
+
+        for handle in handles:
+            size = handle.size
+            preview = handle.preview
+            if preview is None:
+                parts.append(pack(
+                    intern(handle.name), intern(handle.type_name),
+                    handle.id, -1 if size is None else size, -1))
+            else:
+                data = preview.encode('utf-8', 'surrogatepass')
+                parts.append(pack(
+                    intern(handle.name), intern(handle.type_name),
+                    handle.id, -1 if size is None else size, len(data)))
+                parts.append(data)
+
+        body += _COUNT.pack(len(handles))
+        body += b''.join(parts)
+
+    def _encode_names(self, names, body):
+        body += _COUNT.pack(len(names))
+        body += struct.pack(
+            '<{}I'.format(len(names)), *map(self._intern, names))
+
+    @staticmethod
+    def _encode_text(text, body):
+        data = text.encode('utf-8', 'surrogatepass')
+        body += _COUNT.pack(len(data))
+        body += data
+
+    def _encode_texts(self, texts, body):
+        """Имя -> текст: имена индексами таблицы строк, тексты как есть"""
+        body += _COUNT.pack(len(texts))
+        for name, text in texts.items():
+            body += _COUNT.pack(self._intern(name))
+            self._encode_text(text, body)
+
+
+class Decoder:
+    """Декодирует кадры одного потока в сообщения"""
+
+    def __init__(self):
+        self._strings = []
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> list:
+        """
+        Добавляет полученные байты и возвращает сообщения всех полностью
+        полученных кадров; остаток ждёт следующих байтов
+
+        :raise WireFormatError: кадр повреждён или другой версии
+        """
+        buffer = self._buffer
+        buffer += data
+        messages = []
+
+        while len(buffer) >= _LENGTH.size:
+            length, = _LENGTH.unpack_from(buffer)
+            end = _LENGTH.size + length
+            if len(buffer) < end:
+                break
+
+            payload = bytes(buffer[_LENGTH.size:end])
+            del buffer[:end]
+
+            messages.append(self.decode(payload))
+
+        return messages
+
+    def read(self, stream):
+        """
+        Читает одно сообщение из потока с методом `read`
+
+        :return: сообщение, `None` - поток закончился
+        :raise WireFormatError: кадр повреждён, другой версии или поток
+            закончился посреди кадра
+        """
+        header = self._read_exactly(stream, _LENGTH.size)
+        if header is None:
+            return None
+
+        length, = _LENGTH.unpack(header)
+        payload = self._read_exactly(stream, length)
+        if payload is None:
+            raise WireFormatError('Поток закончился посреди кадра')
+
+        return self.decode(payload)
+
+    def decode(self, payload: bytes):
+        """Сообщение из кадра без длины"""
+        try:
+            version, message_type, flags = _HEADER.unpack_from(payload)
+            if version != VERSION:
+                raise WireFormatError(
+                    'Неподдерживаемая версия формата: {}'.format(version))
+
+            if flags & _RESET_STRINGS:
+                self._strings = []
+
+            offset = self._decode_strings(payload, _HEADER.size)
+
+            return self._decode_body(message_type, payload, offset)
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise WireFormatError('Повреждённый кадр: {}'.format(e))
+
+    @staticmethod
+    def _read_exactly(stream, size) -> Optional[bytes]:
+        chunks = []
+        while size:
+            chunk = stream.read(size)
+            if not chunk:
+                if chunks:
+                    raise WireFormatError('Поток закончился посреди кадра')
+                return None
+
+            chunks.append(chunk)
+            size -= len(chunk)
+
+        return b''.join(chunks)
+
+    def _decode_strings(self, payload, offset) -> int:
+        count, = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        strings = self._strings
+
+        for _ in range(count):
+            length, = _COUNT.unpack_from(payload, offset)
+            offset += _COUNT.size
+            strings.append(
+                payload[offset:offset + length].decode(
+                    'utf-8', 'surrogatepass'))
+            offset += length
+
+        return offset
+
+    def _decode_body(self, message_type, payload, offset):
+        if message_type == _SNAPSHOT:
+            return self._decode_snapshot(payload, offset)
+
+        if message_type == _COMMAND:
+            return DebugCommand(_BYTE.unpack_from(payload, offset)[0])
+
+        if message_type == _EXIT:
+            return DebuggerExit
+
+        if message_type == _RENDERED:
+            truncated, = _BYTE.unpack_from(payload, offset)
+            text, _ = self._decode_text(payload, offset + _BYTE.size)
+            return Rendered(text, bool(truncated))
+
+        if message_type == _CHILDREN:
+            total, = _UNSIGNED.unpack_from(payload, offset)
+            handles, _ = self._decode_handles(
+                payload, offset + _UNSIGNED.size)
+            return Children(handles, total)
+
+        if message_type == _HISTORY_STATE:
+            step, line_no, filename = _HISTORY_HEADER.unpack_from(
+                payload, offset)
+            global_variables, offset = self._decode_texts(
+                payload, offset + _HISTORY_HEADER.size)
+            local_variables, _ = self._decode_texts(payload, offset)
+            return HistoryState(
+                step, line_no, self._strings[filename], global_variables,
+                local_variables)
+
+        if message_type == _INVALID_HANDLE:
+            return InvalidHandle(_SIGNED.unpack_from(payload, offset)[0])
+
+        if message_type == _RENDER_REQUEST:
+            handle_id, has_policy = _RENDER_REQUEST_BODY.unpack_from(
+                payload, offset)
+            policy = None
+            if has_policy:
+                values = _POLICY.unpack_from(
+                    payload, offset + _RENDER_REQUEST_BODY.size)
+                policy = RenderPolicy(*values[:-1], safe=bool(values[-1]))
+            return RenderRequest(handle_id, policy)
+
+        if message_type == _CHILDREN_REQUEST:
+            return ChildrenRequest(
+                *_CHILDREN_REQUEST_BODY.unpack_from(payload, offset))
+
+        if message_type == _FRAME_REQUEST:
+            return FrameRequest(_COUNT.unpack_from(payload, offset)[0])
+
+        if message_type == _HISTORY_REQUEST:
+            return HistoryRequest(_COUNT.unpack_from(payload, offset)[0])
+
+        raise WireFormatError(
+            'Неизвестный тип сообщения: {}'.format(message_type))
+
+    def _decode_snapshot(self, payload, offset) -> dict:
+        strings = self._strings
+        full, line_no, filename, step, thread_id, thread_name = (
+            _SNAPSHOT_HEADER.unpack_from(payload, offset))
+        offset += _SNAPSHOT_HEADER.size
+
+        global_variables, offset = self._decode_handles(payload, offset)
+        removed_global_variables, offset = self._decode_names(
+            payload, offset)
+        local_variables, offset = self._decode_handles(payload, offset)
+        removed_local_variables, offset = self._decode_names(
+            payload, offset)
+
+        count, = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        stack = [
+            StackFrame(strings[name], strings[frame_filename], frame_line_no)
+            for name, frame_filename, frame_line_no in
+            _STACK_FRAME.iter_unpack(
+                payload[offset:offset + count * _STACK_FRAME.size])]
+        watches, _ = self._decode_handles(
+            payload, offset + count * _STACK_FRAME.size)
+
+        return {
+            'global_variables': {
+                handle.name: handle for handle in global_variables},
+            'removed_global_variables': removed_global_variables,
+            'local_variables': {
+                handle.name: handle for handle in local_variables},
+            'removed_local_variables': removed_local_variables,
+            'full': bool(full),
+            'line_no': line_no,
+            'filename': strings[filename],
+            'stack': stack,
+            'step': None if step < 0 else step,
+            'watches': {handle.name: handle for handle in watches},
+            'thread_id': thread_id,
+            'thread_name': strings[thread_name]
+        }
+
+    def _decode_handles(self, payload, offset) -> Tuple[List[Handle], int]:
+        strings = self._strings
+        unpack_from = _HANDLE.unpack_from
+        record_size = _HANDLE.size
+
+        count, = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        handles = []
+
+        for _ in range(count):
+            name, type_name, handle_id, size, preview_length = unpack_from(
+                payload, offset)
+            offset += record_size
+
+            preview = None
+            if preview_length >= 0:
+                preview = payload[offset:offset + preview_length].decode(
+                    'utf-8', 'surrogatepass')
+                offset += preview_length
+
+            handles.append(Handle(
+                strings[name], strings[type_name], handle_id,
+                None if size < 0 else size, preview))
+
+        return handles, offset
+
+    def _decode_names(self, payload, offset) -> Tuple[List[str], int]:
+        strings = self._strings
+        count, = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        indexes = struct.unpack_from('<{}I'.format(count), payload, offset)
+
+        return [strings[i] for i in indexes], offset + count * _COUNT.size
+
+    @staticmethod
+    def _decode_text(payload, offset) -> Tuple[str, int]:
+        length, = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        end = offset + length
+
+        return payload[offset:end].decode('utf-8', 'surrogatepass'), end
+
+    def _decode_texts(self, payload, offset) -> Tuple[dict, int]:
+        strings = self._strings
+        count, = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        texts = {}
+
+        for _ in range(count):
+            name, = _COUNT.unpack_from(payload, offset)
+            texts[strings[name]], offset = self._decode_text(
+                payload, offset + _COUNT.size)
+
+        return texts, offset
@@ -1,12 +1,15 @@
 from functools import partial
 
-from PyQt5.QtWidgets import QWidget, QPlainTextEdit, QTextEdit
+from PyQt5.QtWidgets import (
+    QWidget, QPlainTextEdit, QTextEdit, QInputDialog)
 from PyQt5.QtGui import (
     QColor, QTextFormat, QPainter, QTextCursor, QTextDocument, QFontMetricsF,
     QIcon)
 from PyQt5.QtCore import Qt, QRect, QSize, QEvent, QPoint, QObject, pyqtSignal
 
 from . import resources
+from ..debugging import InvalidBreakpointCondition
+from ..debugging.bytecode_modifier import BytecodeModifier
 
 
 class LineNumberArea(QWidget):
@@ -49,14 +52,26 @@ class Breakpoint(QObject):
         except AttributeError:
             return self._position
 
-    def __init__(self, position, icon='', parent=None):
+    def __init__(
+            self, position, icon='', parent=None, condition='',
+            log_message=''):
         super(Breakpoint, self).__init__(parent)
 
         self._position = position
         self._icon = icon
+        self.condition = condition
+        # непустое сообщение - точка логирования, которая не останавливает
+        # программу
+        self.log_message = log_message
 
 
 class BreakpointArea(QWidget):
+    # номер строки (с единицы)
+    breakpoint_added = pyqtSignal(int)
+    breakpoint_removed = pyqtSignal(int)
+    logpoint_added = pyqtSignal(int, str)
+    logpoint_removed = pyqtSignal(int)
+
     def __init__(self, editor):
         super(BreakpointArea, self).__init__()
 
@@ -71,14 +86,27 @@ class BreakpointArea(QWidget):
         block = doc.findBlockByLineNumber(brkpnt._position)
         brkpnt.block = block
         self.repaint()
+        if brkpnt.log_message:
+            self.logpoint_added.emit(brkpnt.position + 1, brkpnt.log_message)
+        else:
+            self.breakpoint_added.emit(brkpnt.position + 1)
 
     def remove_breakpoint(self, brkpnt):
         self.breakpoints.remove(brkpnt)
         self.repaint()
+        self._emit_removed(brkpnt)
 
     def clear_breakpoints(self):
-        self.breakpoints = []
+        breakpoints, self.breakpoints = self.breakpoints, []
         self.repaint()
+        for brkpnt in breakpoints:
+            self._emit_removed(brkpnt)
+
+    def _emit_removed(self, brkpnt):
+        if brkpnt.log_message:
+            self.logpoint_removed.emit(brkpnt.position + 1)
+        else:
+            self.breakpoint_removed.emit(brkpnt.position + 1)
 
     def breakpoint_for_line(self, line):
         for brkpnt in self.breakpoints:
@@ -119,10 +147,63 @@ class BreakpointArea(QWidget):
         if brkpnt is not None:
             if event.button() == Qt.LeftButton:
                 self.remove_breakpoint(brkpnt)
+            elif event.button() == Qt.RightButton:
+                self.edit_condition(brkpnt)
+        elif event.modifiers() & Qt.ShiftModifier:
+            self.add_logpoint(line)
         else:
             self.add_breakpoint(
                 Breakpoint(line, QIcon(':/icons/breakpoint.png'), self))
 
+    def add_logpoint(self, line):
+        # сообщение форматируется как f-строка в кадре программы
+        message = self._ask_expression(
+            'Logpoint', 'Message, expressions in {braces} are evaluated:',
+            '', lambda text: 'f' + repr(text))
+
+        if message:
+            self.add_breakpoint(Breakpoint(
+                line, QIcon(':/icons/help.png'), self,
+                log_message=message))
+
+    def edit_condition(self, brkpnt):
+        # условие встраивается в байткод при запуске отладки,
+        # поэтому изменение вступает в силу при следующем запуске
+        condition = self._ask_expression(
+            'Breakpoint condition', 'Stop only when expression is true:',
+            brkpnt.condition, lambda text: text)
+
+        if condition is not None:
+            brkpnt.condition = condition
+
+    def _ask_expression(self, title, label, text, to_expression):
+        """
+        Запрашивает текст, пока выражение из него не скомпилируется (см.
+        `BytecodeModifier.compile_condition`): отладчик отклонил бы его
+        при запуске или во время отладки
+
+        :param to_expression: функция (текст), которая возвращает выражение
+        :return: текст без пробелов по краям, `None` - ввод отменён
+        """
+        error = ''
+        while True:
+            text, ok = QInputDialog.getText(
+                self, title, error + label, text=text)
+            if not ok:
+                return None
+
+            text = text.strip()
+            if not text:
+                return text
+
+            try:
+                BytecodeModifier.compile_condition(to_expression(text))
+            except InvalidBreakpointCondition:
+                error = 'Invalid expression. '
+                continue
+
+            return text
+
     def line_number_from_position(self, y_pos):
         height = self.editor.fontMetrics().height()
 
@@ -1,8 +1,13 @@
-from PyQt5.QtCore import pyqtSignal, Qt, QSize, QAbstractTableModel, QVariant
+import os
+
+from PyQt5.QtCore import (
+    pyqtSignal, Qt, QSize, QAbstractTableModel, QAbstractListModel, QVariant,
+    QTimer)
 from PyQt5.QtGui import QIcon, QTextCursor, QColor
 from PyQt5.QtWidgets import (
     QMainWindow, QToolBar, QStatusBar, QAction, QFileDialog, QDockWidget,
-    QLabel, qApp, QTableView, QHeaderView)
+    qApp, QTableView, QHeaderView, QPlainTextEdit, QListView, QSlider,
+    QLineEdit, QWidget, QVBoxLayout, QSpinBox, QMessageBox)
 
 from .code_editor import CodeEditor
 from . import resources
@@ -11,24 +16,57 @@ from . import resources
 class WatcherModel(QAbstractTableModel):
     """
     Модель-обёртка над dict для отображения переменных в QTableView
+
+    Значения - строки или описания (`Handle`) из снимка отладчика. repr
+    описания запрашивается через `renderer` только для видимых строк
+    таблицы и запоминается до изменения переменной. Сокращённое значение
+    можно запросить целиком (`expand`)
     """
-    def __init__(self, data=None, parent=None):
+    def __init__(self, data=None, parent=None, renderer=None):
         super(WatcherModel, self).__init__(parent)
 
         self.data_model = data or {}
+        self.renderer = renderer
+        # строки таблицы, чтобы не перебирать словарь на каждую ячейку
+        self._rows = list(self.data_model.items())
+        self._rendered = {}
 
     def update(self, new_data):
         self.layoutAboutToBeChanged.emit()
         self.data_model.update(new_data)
+        self._rows = list(self.data_model.items())
+        self.layoutChanged.emit()
+
+    def apply(self, changed, removed, full=False):
+        """
+        Применяет отличия из снимка состояния отладчика
+
+        :param changed: добавленные и изменившиеся переменные
+        :param removed: имена удалённых переменных
+        :param full: полный снимок, прежние переменные удаляются
+        """
+        self.layoutAboutToBeChanged.emit()
+        if full:
+            self.data_model = {}
+            self._rendered = {}
+        for name in removed:
+            self.data_model.pop(name, None)
+            self._rendered.pop(name, None)
+        for name in changed:
+            self._rendered.pop(name, None)
+        self.data_model.update(changed)
+        self._rows = list(self.data_model.items())
         self.layoutChanged.emit()
 
     def clear(self):
         self.layoutAboutToBeChanged.emit()
         self.data_model = {}
+        self._rows = []
+        self._rendered = {}
         self.layoutChanged.emit()
 
     def rowCount(self, index):
-        return len(self.data_model)
+        return len(self._rows)
 
     def columnCount(self, index):
         return 2
@@ -37,14 +75,48 @@ class WatcherModel(QAbstractTableModel):
         if role == Qt.DisplayRole:
             row = index.row()
 
-            var, value = tuple(self.data_model.items())[row]
+            var, value = self._rows[row]
 
             column = index.column()
 
-            return var if column == 0 else value
+            return var if column == 0 else self._display(var, value)
+
+        if role == Qt.ToolTipRole and index.column() == 1:
+            var, value = self._rows[index.row()]
+            if self._rendered.get(var, (None, False))[1]:
+                return 'значение сокращено, двойной щелчок - показать целиком'
 
         return QVariant()
 
+    def expand(self, index):
+        """Запрашивает сокращённое значение строки `index` целиком"""
+        var, value = self._rows[index.row()]
+        if isinstance(value, str) or self.renderer is None:
+            return
+
+        self._rendered[var] = self.renderer(value, True)
+        self.dataChanged.emit(
+            self.index(index.row(), 1), self.index(index.row(), 1))
+
+    def _display(self, var, value):
+        if isinstance(value, str):
+            return value
+
+        rendered = self._rendered.get(var)
+        if rendered is None:
+            if value.preview is not None:
+                rendered = (value.preview, False)
+            elif self.renderer is not None:
+                rendered = self.renderer(value)
+            elif value.size is not None:
+                rendered = ('<{}, {}>'.format(value.type_name, value.size),
+                            False)
+            else:
+                rendered = ('<{}>'.format(value.type_name), False)
+            self._rendered[var] = rendered
+
+        return rendered[0]
+
     def headerData(self, section, orientation, role):
         if role == Qt.DisplayRole and orientation == Qt.Horizontal:
             return 'variable' if section == 0 else 'value'
@@ -52,18 +124,67 @@ class WatcherModel(QAbstractTableModel):
         return QVariant()
 
 
+class CallStackModel(QAbstractListModel):
+    """
+    Модель стека вызовов из снимка отладчика для QListView
+
+    Текст строки формируется только для видимых кадров, поэтому глубокая
+    рекурсия не замедляет отображение
+    """
+
+    def __init__(self, parent=None):
+        super(CallStackModel, self).__init__(parent)
+
+        self._stack = []
+
+    def set_stack(self, stack):
+        self.beginResetModel()
+        self._stack = stack
+        self.endResetModel()
+
+    def clear(self):
+        self.set_stack([])
+
+    def rowCount(self, index):
+        return len(self._stack)
+
+    def data(self, index, role):
+        if role == Qt.DisplayRole:
+            frame = self._stack[index.row()]
+
+            return '{}, {}:{}'.format(
+                frame.name, os.path.basename(frame.filename), frame.line_no)
+
+        if role == Qt.ToolTipRole:
+            return self._stack[index.row()].filename
+
+        return QVariant()
+
+
 class MainWindow(QMainWindow):
-    start_clicked = pyqtSignal(str)
+    start_clicked = pyqtSignal(str, str, list, dict, dict)
     step_over_clicked = pyqtSignal()
     step_in_clicked = pyqtSignal()
     step_out_clicked = pyqtSignal()
+    continue_clicked = pyqtSignal()
     stop_clicked = pyqtSignal()
+    # записывать ли историю выполнения со следующего запуска
+    record_history_toggled = pyqtSignal(bool)
+    watch_added = pyqtSignal(str)
+    watch_removed = pyqtSignal(str)
+    # интервал между шагами режима анимации (секунды)
+    animate_clicked = pyqtSignal(float)
+    animate_stopped = pyqtSignal()
+    # снимок показан: клиент может отправить следующий шаг анимации
+    snapshot_shown = pyqtSignal()
 
     def __init__(self):
         super(MainWindow, self).__init__()
 
         self.setWindowTitle('Debugger')
 
+        self._filename = '<string>'
+
         self._open_act = self._create_act(
             'Open', 'open.png',
             shortcut='Ctrl+O',
@@ -96,11 +217,55 @@ class MainWindow(QMainWindow):
             status_tip='step to the first line executed after '
                        'returning from this method',
             handler=self._stop_out)
+        self._continue_act = self._create_act(
+            'Continue', 'continue.png',
+            shortcut='F5',
+            status_tip='run to the next breakpoint',
+            handler=self._continue)
         self._stop_debug_act = self._create_act(
             'Stop Debug', 'stop.png',
             shortcut='Ctrl+F2',
             status_tip='stop debugging program',
             handler=self._stop_debug)
+        self._animate_act = self._create_act(
+            'Animate', 'animate.png',
+            shortcut='Ctrl+F7',
+            status_tip='step in automatically at the selected rate')
+        self._animate_act.setCheckable(True)
+        self._animate_act.toggled.connect(self._animate)
+        self._animate_rate = QSpinBox()
+        self._animate_rate.setRange(1, 60)
+        self._animate_rate.setValue(10)
+        self._animate_rate.setSuffix(' steps/s')
+        # строка последнего снимка подсвечивается один раз за итерацию
+        # цикла событий, сколько бы снимков ни пришло
+        self._pending_line_no = None
+        self._flush_scheduled = False
+
+        self._step_back_act = self._create_act(
+            'Step Back', 'step_back.png',
+            shortcut='Shift+F7',
+            status_tip='show the state of the previous executed line',
+            handler=self._step_back)
+        self._step_forward_act = self._create_act(
+            'Step Forward', 'step_forward.png',
+            shortcut='Shift+F8',
+            status_tip='show the state of the next recorded line',
+            handler=self._step_forward)
+
+        # переключается только до запуска: запись замедляет программу
+        self._record_history_act = QAction('Record History', self)
+        self._record_history_act.setStatusTip(
+            'record executed lines for stepping back (slows the program)')
+        self._record_history_act.setCheckable(True)
+        self._record_history_act.toggled.connect(self.record_history_toggled)
+
+        # шаги истории выполнения: от 0 до шага текущей остановки
+        self._history_slider = QSlider(Qt.Horizontal)
+        self._history_slider.setEnabled(False)
+        self._history_slider.valueChanged.connect(self._show_step)
+        self._history_loader = None
+        self._live_line_no = None
 
         self._menu_bar = self.menuBar()
         self._init_menu_bar()
@@ -127,16 +292,92 @@ class MainWindow(QMainWindow):
         self.tabifyDockWidget(
             self._globals_watcher_dock, self._locals_watcher_dock)
 
+        # переменные выбранного в стеке вызовов кадра, кроме текущего
+        self._frame_watcher_model = WatcherModel(parent=self._locals_watcher)
+        self._frame_loader = None
+        # переменные прошлого шага истории
+        self._history_globals_model = WatcherModel(
+            parent=self._globals_watcher)
+        self._history_locals_model = WatcherModel(
+            parent=self._locals_watcher)
+
+        self._watches_input = QLineEdit()
+        self._watches_view = QTableView()
+        self._watches_model = WatcherModel(parent=self._watches_view)
+        self._remove_watch_act = QAction('Remove Watch', self._watches_view)
+        self._watches_dock = QDockWidget('watches', self)
+        self._init_watches_dock()
+
+        self._call_stack_view = QListView()
+        self._call_stack_model = CallStackModel(parent=self._call_stack_view)
         self._call_stack_dock = QDockWidget('call stack', self)
         self._init_call_stack_dock()
 
+        self._logs_view = QPlainTextEdit()
+        self._logs_dock = QDockWidget('logpoints', self)
+        self._init_logs_dock()
+
         self.code_editor = CodeEditor()
         self.setCentralWidget(self.code_editor)
 
-    def update(self, global_variables, local_variables, line_no):
-        self._highlight_line(line_no)
-        self._globals_watcher_model.update(global_variables)
-        self._locals_watcher_model.update(local_variables)
+    def set_renderer(self, renderer):
+        """
+        :param renderer: функция (описание значения, увеличенные ли
+            ограничения), которая возвращает repr значения и сокращён ли он
+            (см. `DebuggerClient.render`)
+        """
+        self._globals_watcher_model.renderer = renderer
+        self._locals_watcher_model.renderer = renderer
+        self._frame_watcher_model.renderer = renderer
+        self._watches_model.renderer = renderer
+
+    def set_frame_loader(self, frame_loader):
+        """
+        :param frame_loader: функция (номер кадра в стеке вызовов), которая
+            возвращает его переменные (см. `DebuggerClient.frame_variables`)
+        """
+        self._frame_loader = frame_loader
+
+    def set_history_loader(self, history_loader):
+        """
+        :param history_loader: функция (номер шага), которая возвращает
+            записанное состояние шага (см. `DebuggerClient.history_state`)
+        """
+        self._history_loader = history_loader
+
+    def update(self, snapshot):
+        self._live_line_no = snapshot['line_no']
+        self._pending_line_no = snapshot['line_no']
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(0, self._flush_update)
+        self._globals_watcher.setModel(self._globals_watcher_model)
+        self._globals_watcher_model.apply(
+            snapshot['global_variables'],
+            snapshot['removed_global_variables'],
+            snapshot['full'])
+        self._locals_watcher_model.apply(
+            snapshot['local_variables'],
+            snapshot['removed_local_variables'],
+            snapshot['full'])
+        self._watches_model.apply(snapshot['watches'], (), full=True)
+        self._call_stack_model.set_stack(snapshot['stack'])
+        self._call_stack_view.setCurrentIndex(
+            self._call_stack_model.index(0))
+
+        step = snapshot['step']
+        # сигнал не нужен: показывается текущая остановка
+        self._history_slider.blockSignals(True)
+        self._history_slider.setEnabled(step is not None)
+        self._history_slider.setRange(0, step or 0)
+        self._history_slider.setValue(step or 0)
+        self._history_slider.blockSignals(False)
+
+    def _flush_update(self):
+        """Подсвечивает строку последнего снимка после обработки событий"""
+        self._flush_scheduled = False
+        self._highlight_line(self._pending_line_no)
+        self.snapshot_shown.emit()
 
     def _create_act(
             self, name, icon, shortcut=None, status_tip=None,
@@ -158,6 +399,7 @@ class MainWindow(QMainWindow):
             with open(file_name[0]) as f:
                 source = f.read()
                 self.code_editor.setPlainText(source)
+                self._filename = file_name[0]
 
     def _start_debug(self):
         source = self.code_editor.toPlainText()
@@ -165,25 +407,95 @@ class MainWindow(QMainWindow):
         if not source:
             return
 
-        self.code_editor.setDisabled(True)
+        # только для чтения, а не disabled: точки остановки можно ставить
+        # и снимать во время отладки
+        self.code_editor.setReadOnly(True)
+        self._record_history_act.setEnabled(False)
+
+        breakpoints = self.code_editor.breakpoint_area.breakpoints
+        logpoints = {
+            brkpnt.position + 1: brkpnt.log_message
+            for brkpnt in breakpoints if brkpnt.log_message}
+        breakpoints = [
+            brkpnt for brkpnt in breakpoints if not brkpnt.log_message]
+        conditions = {
+            brkpnt.position + 1: brkpnt.condition
+            for brkpnt in breakpoints if brkpnt.condition}
+        breakpoints = [brkpnt.position + 1 for brkpnt in breakpoints]
 
-        self.start_clicked.emit(source)
+        self._logs_view.clear()
+
+        self.start_clicked.emit(
+            source, self._filename, breakpoints, conditions, logpoints)
 
     def _step_over(self):
+        self._animate_act.setChecked(False)
         self.step_over_clicked.emit()
 
     def _step_in(self):
+        self._animate_act.setChecked(False)
         self.step_in_clicked.emit()
 
     def _stop_out(self):
+        self._animate_act.setChecked(False)
         self.step_out_clicked.emit()
 
+    def _continue(self):
+        self._animate_act.setChecked(False)
+        self.continue_clicked.emit()
+
+    def _animate(self, checked):
+        if checked:
+            self.animate_clicked.emit(1 / self._animate_rate.value())
+        else:
+            self.animate_stopped.emit()
+
+    def _step_back(self):
+        if self._history_slider.isEnabled():
+            self._history_slider.setValue(self._history_slider.value() - 1)
+
+    def _step_forward(self):
+        if self._history_slider.isEnabled():
+            self._history_slider.setValue(self._history_slider.value() + 1)
+
+    def _show_step(self, step):
+        """
+        Показывает строку и переменные шага истории, последний шаг -
+        текущую остановку
+        """
+        if step == self._history_slider.maximum():
+            self._highlight_line(self._live_line_no)
+            self._globals_watcher.setModel(self._globals_watcher_model)
+            self._select_frame(self._call_stack_view.currentIndex(), None)
+            return
+
+        state = None
+        if self._history_loader is not None:
+            state = self._history_loader(step)
+        if state is None:
+            return
+
+        if state.filename == self._filename:
+            self._highlight_line(state.line_no)
+        self._history_globals_model.apply(
+            state.global_variables, (), full=True)
+        self._history_locals_model.apply(
+            state.local_variables, (), full=True)
+        self._globals_watcher.setModel(self._history_globals_model)
+        self._locals_watcher.setModel(self._history_locals_model)
+
     def _stop_debug(self):
+        self._animate_act.setChecked(False)
         self.stop_clicked.emit()
         self._finish_debug()
 
+    def on_start_failed(self, message):
+        self._finish_debug()
+        QMessageBox.warning(self, 'Start Debug', message)
+
     def _finish_debug(self):
-        self.code_editor.setEnabled(True)
+        self.code_editor.setReadOnly(False)
+        self._record_history_act.setEnabled(True)
         qApp.setCursorFlashTime(qApp.cursorFlashTime())
 
     def _init_menu_bar(self):
@@ -198,7 +510,15 @@ class MainWindow(QMainWindow):
         self._toolbar.addAction(self._step_over_act)
         self._toolbar.addAction(self._step_in_act)
         self._toolbar.addAction(self._step_out_act)
+        self._toolbar.addAction(self._continue_act)
         self._toolbar.addAction(self._stop_debug_act)
+        self._toolbar.addAction(self._animate_act)
+        self._toolbar.addWidget(self._animate_rate)
+        self._toolbar.addSeparator()
+        self._toolbar.addAction(self._record_history_act)
+        self._toolbar.addAction(self._step_back_act)
+        self._toolbar.addWidget(self._history_slider)
+        self._toolbar.addAction(self._step_forward_act)
 
         self.addToolBar(self._toolbar)
 
@@ -213,6 +533,7 @@ class MainWindow(QMainWindow):
         header.setSectionResizeMode(1, QHeaderView.Stretch)
 
         self._globals_watcher.setWordWrap(False)
+        self._globals_watcher.doubleClicked.connect(self._expand_value)
 
     def _init_globals_watcher_dock(self):
         self._globals_watcher_dock.setAllowedAreas(Qt.RightDockWidgetArea)
@@ -229,6 +550,7 @@ class MainWindow(QMainWindow):
         header.setSectionResizeMode(1, QHeaderView.Stretch)
 
         self._locals_watcher.setWordWrap(False)
+        self._locals_watcher.doubleClicked.connect(self._expand_value)
 
     def _init_locals_watcher_dock(self):
         self._locals_watcher_dock.setAllowedAreas(Qt.RightDockWidgetArea)
@@ -237,15 +559,99 @@ class MainWindow(QMainWindow):
 
         self.addDockWidget(Qt.RightDockWidgetArea, self._locals_watcher_dock)
 
+    def _init_watches_dock(self):
+        self._watches_dock.setAllowedAreas(
+            Qt.RightDockWidgetArea | Qt.BottomDockWidgetArea)
+
+        self._watches_input.setPlaceholderText('add watch expression')
+        self._watches_input.returnPressed.connect(self._add_watch)
+
+        self._watches_view.setModel(self._watches_model)
+        header = self._watches_view.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        self._watches_view.setWordWrap(False)
+        self._watches_view.doubleClicked.connect(self._expand_value)
+
+        self._remove_watch_act.setShortcut('Delete')
+        self._remove_watch_act.setShortcutContext(Qt.WidgetShortcut)
+        self._remove_watch_act.triggered.connect(self._remove_watch)
+        self._watches_view.addAction(self._remove_watch_act)
+        self._watches_view.setContextMenuPolicy(Qt.ActionsContextMenu)
+
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self._watches_input)
+        layout.addWidget(self._watches_view)
+        self._watches_dock.setWidget(widget)
+
+        self.addDockWidget(Qt.RightDockWidgetArea, self._watches_dock)
+
+    def _add_watch(self):
+        expression = self._watches_input.text().strip()
+        if not expression:
+            return
+
+        self._watches_input.clear()
+        # результат будет в снимке следующей остановки
+        self._watches_model.update({expression: '<не вычислено>'})
+        self.watch_added.emit(expression)
+
+    def _remove_watch(self):
+        index = self._watches_view.currentIndex()
+        if not index.isValid():
+            return
+
+        expression = self._watches_model.data(
+            self._watches_model.index(index.row(), 0), Qt.DisplayRole)
+        self._watches_model.apply({}, [expression])
+        self.watch_removed.emit(expression)
+
     def _init_call_stack_dock(self):
         self._call_stack_dock.setAllowedAreas(
             Qt.RightDockWidgetArea | Qt.BottomDockWidgetArea)
 
-        label = QLabel('This is call trace dock widget')
-        self._call_stack_dock.setWidget(label)
+        self._call_stack_view.setModel(self._call_stack_model)
+        # строки одной высоты: представление не измеряет каждую
+        self._call_stack_view.setUniformItemSizes(True)
+        self._call_stack_view.selectionModel().currentChanged.connect(
+            self._select_frame)
+        self._call_stack_dock.setWidget(self._call_stack_view)
 
         self.addDockWidget(Qt.RightDockWidgetArea, self._call_stack_dock)
 
+    def _select_frame(self, current, previous):
+        """Показывает переменные выбранного кадра стека вызовов"""
+        depth = current.row()
+        if depth <= 0 or self._frame_loader is None:
+            self._locals_watcher.setModel(self._locals_watcher_model)
+            return
+
+        variables = self._frame_loader(depth)
+        self._frame_watcher_model.apply(variables or {}, (), full=True)
+        self._locals_watcher.setModel(self._frame_watcher_model)
+
+    @staticmethod
+    def _expand_value(index):
+        index.model().expand(index)
+
+    def _init_logs_dock(self):
+        self._logs_dock.setAllowedAreas(
+            Qt.RightDockWidgetArea | Qt.BottomDockWidgetArea)
+
+        self._logs_view.setReadOnly(True)
+        # ограничение, чтобы долгие циклы не съедали память виджета
+        self._logs_view.setMaximumBlockCount(10000)
+        self._logs_dock.setWidget(self._logs_view)
+
+        self.addDockWidget(Qt.BottomDockWidgetArea, self._logs_dock)
+
+    def on_logs(self, records):
+        self._logs_view.appendPlainText('\n'.join(
+            '{}:{} {}'.format(record.line_no, record.hit_count, record.message)
+            for record in records))
+
     def _highlight_line(self, line_no):
         if not line_no:
             return
@@ -257,10 +663,26 @@ class MainWindow(QMainWindow):
         self.code_editor.highlight_line(cursor, QColor(255, 0, 0))
 
     def on_finish(self):
-        self.code_editor.setEnabled(True)
+        self.code_editor.setReadOnly(False)
+        self._record_history_act.setEnabled(True)
+        self._animate_act.setChecked(False)
 
         self.code_editor.highlight_line(
             self.code_editor.textCursor(), QColor(255, 255, 0))
 
         self._globals_watcher_model.clear()
         self._locals_watcher_model.clear()
+        self._frame_watcher_model.clear()
+        self._history_globals_model.clear()
+        self._history_locals_model.clear()
+        # выражения наблюдения остаются для следующего запуска
+        self._watches_model.apply(
+            dict.fromkeys(self._watches_model.data_model, '<не вычислено>'),
+            ())
+        self._call_stack_model.clear()
+        self._globals_watcher.setModel(self._globals_watcher_model)
+        self._locals_watcher.setModel(self._locals_watcher_model)
+        self._history_slider.blockSignals(True)
+        self._history_slider.setRange(0, 0)
+        self._history_slider.setEnabled(False)
+        self._history_slider.blockSignals(False)
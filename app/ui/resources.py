@@ -9,34 +9,60 @@
 from PyQt5 import QtCore
 
 qt_resource_data = b"\
-\x00\x00\x01\x9b\
+\x00\x00\x03\x3f\
 \x89\
 \x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
 \x00\x00\x10\x00\x00\x00\x10\x08\x06\x00\x00\x00\x1f\xf3\xff\x61\
 \x00\x00\x00\x19\x74\x45\x58\x74\x53\x6f\x66\x74\x77\x61\x72\x65\
 \x00\x41\x64\x6f\x62\x65\x20\x49\x6d\x61\x67\x65\x52\x65\x61\x64\
-\x79\x71\xc9\x65\x3c\x00\x00\x01\x3d\x49\x44\x41\x54\x78\xda\xc4\
-\x53\x3b\x52\xc3\x30\x10\x7d\x42\x06\x8c\x13\x68\x98\x0c\x05\x3d\
-\x15\x9d\x4b\x0a\x4a\xce\x90\x16\x0a\x0e\xc0\x39\x38\x40\x0a\xe8\
-\x39\x03\x15\x05\x25\x25\x05\x54\x50\x30\x24\x64\x60\xc6\xb1\xf1\
-\x47\x92\x25\xd6\x76\x70\xd0\x60\x87\xcc\xa4\x40\x33\xfa\xac\xf4\
-\xf6\xe9\x69\x77\xc5\x8c\x31\x58\xa6\xad\x60\xc9\xe6\x14\xc3\xe1\
-\xe5\x08\x8c\xb1\x01\x2d\xfd\x05\x7c\xee\x48\xf5\xe9\xcd\xf1\xce\
-\x8c\x20\x57\xaa\x98\xfc\xfe\xd1\xae\x2f\xa5\xfd\xa4\x9f\x2f\x74\
-\x1c\x86\xab\xeb\x97\xdf\x0a\x64\x96\x95\x46\x1c\xe7\x08\x02\xd5\
-\x7a\x75\xb7\xcb\x6b\xac\x45\x20\xd2\xb4\x34\xd2\x54\x61\x32\x11\
-\xf5\xa1\x94\x12\x59\x26\xa0\x94\x84\xd6\x1a\xbd\x5e\xa7\xc6\x5a\
-\x04\x59\x92\x94\x86\x10\x9a\x48\x24\xa2\x28\x42\x18\x86\xe4\x9c\
-\xc1\xce\x92\xa8\xb1\x36\x41\x1c\x97\x46\x94\xa4\x78\x7a\x1d\x42\
-\xd0\xcd\x55\x8e\xb8\x05\x4e\xf4\x0c\xdb\xa8\xe0\xf9\x53\x60\xe8\
-\xb8\xb4\xeb\x36\x07\x81\xaf\xcd\x57\x30\xe2\x1e\xc6\x9d\xd5\xd6\
-\x20\x8a\x75\x3e\x5f\xc1\x9b\xe3\xe1\xc3\x6d\xaf\x4c\x41\xdc\xb2\
-\x49\xc1\x77\x6a\x0c\xe7\xd8\xf4\x00\x6d\xa6\x1d\xd5\x6c\xa6\xf5\
-\x20\x59\x85\xd5\xe3\x07\xda\xe9\x97\x3e\xac\x88\x32\x55\x21\xe7\
-\x07\x67\x17\xd8\xde\xdb\xff\xb3\x0e\xdf\x1f\xef\xf3\xdb\xf3\x13\
-\xf2\x53\x16\x01\xad\xb7\xa8\x6f\x2c\x50\xca\x85\xdc\xc0\x22\xf8\
-\xd7\xdf\xf8\x25\xc0\x00\x38\xeb\xad\x82\xf1\x67\xf9\xc8\x00\x00\
-\x00\x00\x49\x45\x4e\x44\xae\x42\x60\x82\
+\x79\x71\xc9\x65\x3c\x00\x00\x02\xe1\x49\x44\x41\x54\x78\xda\x4c\
+\x53\x4b\x4f\x13\x51\x18\x3d\xf3\x90\x4e\xed\xcc\x30\x02\x35\x96\
+\x47\x0d\x2d\x15\x44\xf0\x11\x4a\x90\xa8\x54\x62\xd4\x85\x91\x85\
+\x2b\xfe\x01\x0b\x71\xc3\x8e\x3f\xe1\x02\xb7\xb8\x35\x71\x87\x46\
+\x36\x46\x49\x30\x61\x63\x34\x36\x68\xa4\xc6\x52\x29\xe5\x21\x04\
+\x68\xa7\xa5\xef\x97\xdf\x77\xa1\x89\x93\x9c\xcc\x9d\x3b\xf7\x9c\
+\x7b\xbe\xf3\xdd\x2b\x81\x9e\x80\x05\x3c\xf1\x02\x1d\xcd\x80\xa2\
+\x40\xa2\xa9\x31\xc2\x38\xa1\x95\xd0\x44\x58\xae\xd7\xf1\xaa\x56\
+\x03\xaa\x55\x60\x6d\x13\xf8\xb0\x05\xc4\xe8\x87\x34\x77\x07\xff\
+\x3f\x92\x24\xe1\x99\xd5\xea\x9e\xba\x3e\x1a\xea\x30\x5b\xda\xf4\
+\xa5\x37\xaf\xd7\x32\xa9\xe4\x43\x22\xef\xf0\x02\x12\x02\x0b\xf1\
+\xf3\x9e\x44\xe4\x72\x19\x68\xa0\x52\xc1\xb8\x61\xb9\xa7\x6e\xde\
+\x7f\x7c\xc9\xdd\xde\xd5\x5c\xab\x43\xe9\xee\x1d\x68\xa5\x5d\xdf\
+\x12\xf1\x0b\x81\xdf\xf7\x1a\xbb\x3d\xe8\x04\xd4\x42\xe1\xe4\x43\
+\x96\x05\x26\xfb\x83\xa3\x1d\x90\x64\xb5\x42\x6a\x05\xfa\xd9\x7b\
+\x6d\xc8\xe3\xeb\xbf\xea\x51\x55\x15\x9b\xeb\xeb\x81\xe5\xc5\x77\
+\xec\xe0\x63\xc3\x85\xcc\x96\x18\xb4\xcb\xb4\xd3\x3c\x17\x52\x1d\
+\x9a\x51\x2c\x16\x71\x7c\x7c\x4c\x73\x55\xa4\xd3\x69\x01\xdb\xb6\
+\xa1\x19\x86\x49\x6b\xfa\x78\x6d\x83\x27\xe7\x72\xc0\x29\x26\x83\
+\xa1\x31\xff\x46\x3c\x4e\x73\x39\xb0\x88\x42\x89\xb2\x0b\x99\xac\
+\xa5\x52\x29\xc4\x62\x31\xdc\xb8\x7d\xcb\xc7\x6b\x1b\x3c\x95\xe6\
+\x1b\xf6\x35\xc3\x34\x14\x02\x2c\xcb\x42\x3e\x9f\x87\xd3\xe9\x14\
+\x3b\x9b\xa6\x29\xd2\x75\xbb\xdd\x2c\xa4\x90\x39\x8d\x4b\x60\xc8\
+\x5c\x07\x0d\xa6\x5d\x96\xcb\x3c\x3c\x3c\x44\x26\x93\xc1\xc6\x46\
+\x1c\xf3\xf3\x2f\xc1\x39\x38\x1c\x0e\xcc\xcd\xbd\xc0\xfe\xfe\x3e\
+\x8e\x8e\x8e\x84\x20\xaf\x65\x8e\xc8\xe0\x34\xd0\xc9\xe1\xbb\x83\
+\xbe\x48\x24\x02\xb6\x5f\xa6\x96\x94\x4a\x10\x19\x70\x19\x3c\xae\
+\xd7\x25\x24\x93\x49\x44\xa3\x51\x04\x43\x57\x7c\xcc\x61\xa2\x7a\
+\x2a\xa0\xb9\xf4\xb3\xca\x90\x77\x08\x7e\xbf\x1f\x7b\x7b\x7b\x98\
+\x9d\x9d\x11\x04\x2e\x63\x66\xe6\x29\x09\xd4\x61\x18\x06\x3c\x1e\
+\x0f\x39\xdc\x50\x98\xd3\x70\x30\xad\x19\xaa\xb0\xcf\x75\xb2\xc5\
+\x95\x95\x55\x44\x22\x7f\x84\x32\x97\x11\x8d\x6e\x62\x69\xe9\xb3\
+\x10\xe4\xef\x93\x8e\xa8\x26\x73\x95\x61\x17\x9e\x07\x82\x1d\x83\
+\x3b\x3b\xdb\x32\x5b\xe7\x1d\x35\xcd\x49\x84\xaf\x58\x58\xf8\x24\
+\xde\xb6\x9d\xc3\xc0\x40\x37\x54\x55\x42\x38\x1c\x46\x22\x91\x80\
+\xe7\xa2\xdb\x3a\x48\xa4\x2d\x35\x5b\x46\x45\x92\xe4\xba\xd7\xeb\
+\x45\x5b\x5b\x1b\xdb\x43\x5f\x5f\x1f\x26\x26\x46\x84\x5d\x0e\x4e\
+\xd7\x75\xec\xee\xee\x8a\x56\x72\xa8\x81\x40\x40\x74\x23\x57\x86\
+\xa6\x6e\x17\x10\xbb\xb0\x99\xbe\xdc\xed\x93\xcf\x73\xd2\x5c\x46\
+\x3c\x1e\x17\x56\xf9\x30\xf1\x79\x60\x57\x5c\x62\x8d\xa2\xcf\x66\
+\xb3\x22\x8f\x4c\x3a\x5f\x3a\x2a\xc0\x56\xc3\x45\x2c\xca\x3f\x6c\
+\x5f\x0d\x0a\x02\x3d\x4d\x2d\x96\xa5\x53\xb0\x12\x9d\x66\x47\x69\
+\xed\xd7\x41\x3a\x91\x48\x92\x4e\xa1\xc2\x64\x5d\x3f\xe3\xec\x6c\
+\x6f\x6a\xa9\x56\x4b\xea\xf7\x9f\xf6\x56\xa2\x88\x6f\x7c\x75\xdb\
+\xe9\xce\x8e\xf6\x00\x8f\x9c\x00\xb7\x47\x3f\xed\x4c\x8e\xba\xf7\
+\x77\x17\x58\xa5\xb3\xf6\x9b\xc6\x15\x37\xdd\xfc\x2e\x60\x84\x92\
+\x37\x6c\x20\x1c\x01\x16\xfe\x09\x30\x00\x7c\x03\x7b\x5b\xea\xaa\
+\x44\xbd\x00\x00\x00\x00\x49\x45\x4e\x44\xae\x42\x60\x82\
 \x00\x00\x01\xf8\
 \x89\
 \x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
@@ -71,6 +97,31 @@ qt_resource_data = b"\
 \x38\x58\xf0\xd5\xff\x85\x53\x31\x10\x0a\xa2\x46\xda\xfd\xce\x1f\
 \x02\x0c\x00\xe5\xb5\x24\xf9\xc0\x00\x02\x71\x00\x00\x00\x00\x49\
 \x45\x4e\x44\xae\x42\x60\x82\
+\x00\x00\x01\x6b\
+\x89\
+\x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
+\x00\x00\x10\x00\x00\x00\x10\x08\x06\x00\x00\x00\x1f\xf3\xff\x61\
+\x00\x00\x00\x09\x70\x48\x59\x73\x00\x00\x0f\x61\x00\x00\x0f\x61\
+\x01\xa8\x3f\xa7\x69\x00\x00\x01\x1d\x49\x44\x41\x54\x38\x8d\x63\
+\x60\xa0\x35\x90\x2e\xd8\x65\x20\x5d\xb0\xc7\x12\x97\x3c\x13\x21\
+\x03\x18\x19\x18\xfd\x19\x19\xff\xef\x96\x29\xdc\x65\x4f\x96\x01\
+\x0c\x0c\x0c\x0c\x32\x92\xfc\xdc\x2c\x2c\xcc\x5b\xb1\x19\x42\x94\
+\x01\xa2\xc2\xdc\x0c\x2e\x76\xaa\xdc\x2c\xcc\x98\x86\x30\x32\x30\
+\x30\x30\xc8\x16\xee\xfe\xc0\xc0\xc0\xc0\x8f\xcb\x00\x23\x3d\x19\
+\x06\x4d\x55\x31\x86\x97\xaf\x3f\x33\xec\x3f\x7a\xf7\xeb\x9f\xbf\
+\x7f\xbd\x9f\xf4\xbb\x1d\x44\x36\xe0\x7f\x98\x9f\x3e\x31\x8e\x61\
+\x78\xf5\xe6\x0b\xc3\xe1\x93\xf7\xe1\x86\xc0\xbd\xf0\xfb\xf7\x5f\
+\xa2\xb0\x20\x3f\x27\x83\xa5\xb1\x1c\x37\x0b\x33\xd3\x56\xe9\xa2\
+\xdd\x16\x2c\xc8\x06\x10\x0b\xfe\xfe\xfd\x07\x67\x23\x19\xf0\x87\
+\x28\xcd\xef\x3e\x7c\x67\x38\x7b\xe5\xe9\xd7\xbf\x7f\xff\x79\x3f\
+\xed\x77\x3b\x01\x33\xe0\xe3\xce\x83\xb7\x71\x06\xa2\xaa\x82\x30\
+\x83\xac\x14\x3f\xc3\x87\x4f\x3f\x18\x2e\x5c\x7b\xfe\xf5\xef\xbf\
+\x7f\xa8\x81\x88\x0f\xc8\x14\xec\xae\x97\x97\xe6\x6f\x10\xe0\xe3\
+\x60\xb8\x72\xeb\x15\x8a\x66\x14\x2f\xe0\x03\x1f\x3f\xff\x60\x78\
+\xf2\xe2\x13\x86\x66\xa2\x0d\xf8\xf0\xf9\xe7\x57\x06\x86\xff\x18\
+\x9a\x89\x32\xe0\x3f\xc3\xff\x8d\x0c\x8c\x8c\x3b\x9f\xf6\xb9\x9d\
+\x20\xc6\x32\x92\x01\x00\x71\x08\x95\xb1\xe0\xd4\x11\xb1\x00\x00\
+\x00\x00\x49\x45\x4e\x44\xae\x42\x60\x82\
 \x00\x00\x02\x82\
 \x89\
 \x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
@@ -167,6 +218,69 @@ qt_resource_data = b"\
 \x00\xe6\x4b\xe6\x46\xd7\x4a\xe8\x25\x8d\x2b\xc1\x96\x34\x15\x20\
 \x80\x62\x8e\x0f\x7d\x1a\xff\x08\x30\x00\x20\x20\x9b\x31\x60\x42\
 \xb8\x3a\x00\x00\x00\x00\x49\x45\x4e\x44\xae\x42\x60\x82\
+\x00\x00\x01\x79\
+\x89\
+\x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
+\x00\x00\x10\x00\x00\x00\x10\x08\x06\x00\x00\x00\x1f\xf3\xff\x61\
+\x00\x00\x00\x09\x70\x48\x59\x73\x00\x00\x0f\x61\x00\x00\x0f\x61\
+\x01\xa8\x3f\xa7\x69\x00\x00\x01\x2b\x49\x44\x41\x54\x38\x8d\x63\
+\x60\xa0\x15\x90\x2e\xda\x6d\x21\x5d\xb0\xcb\x80\x90\x3a\x26\x6c\
+\x82\x32\x85\xbb\xec\x19\xff\x33\xec\x61\x64\x60\xf4\x27\xd9\x00\
+\x99\xc2\x5d\xf6\x2c\x2c\xcc\x5b\x65\x24\xf9\xb9\x89\x71\x29\x8a\
+\x01\x32\x85\xbb\xec\x59\x98\x99\xb7\xba\xd8\xa9\x72\x8b\x0a\x13\
+\xa5\x9f\x81\x11\x5d\xb3\xa3\xb5\x32\xb7\xb8\x28\x2f\xc3\xf5\xdb\
+\xaf\x18\xce\x5d\x7a\x82\x4f\xef\xc7\xc7\xfd\xae\x02\x2c\xc8\x9a\
+\x6d\xcd\x15\xb9\x85\x04\xb8\x18\x7e\xff\xfe\xcb\xa0\xa2\x20\xcc\
+\xa0\xa2\x20\x8c\x53\xf7\xaa\x4d\x17\xf9\x19\x18\x18\x18\x58\xa4\
+\x8b\x76\x5b\xb0\x30\x31\x6e\xb5\x34\x96\xe3\x16\xe4\xe7\x64\xf8\
+\xfd\xfb\x2f\x51\x4e\x87\x01\x16\x18\xe3\xef\xdf\x7f\x24\x6b\x66\
+\x60\x60\x60\x60\x7a\xda\xe7\x7a\xe2\xcf\xdf\x7f\xde\x27\x2f\x3c\
+\xfe\xfa\xf2\xf5\x67\x86\xdf\xbf\xff\x10\x85\x61\x00\x25\x10\x99\
+\x99\x98\xb6\x1a\x68\x49\x72\x0b\xf0\x71\x30\x3c\x7e\xf6\x91\xe1\
+\xf6\x83\xb7\xf8\x2c\xff\xf8\xb8\xdf\x55\x80\x11\x59\x04\x66\x88\
+\x8e\x9a\x18\xf7\x87\x4f\x3f\x18\x1e\x3e\xfd\xd8\xf0\x64\x82\x6b\
+\x23\x5e\x2f\x20\x73\x9e\xf4\xbb\x1d\xfc\xfb\xef\x9f\xf7\x95\x5b\
+\xaf\xbe\x7e\xfc\xfc\x83\xb8\x30\x40\x17\x80\x19\xf2\xe1\xf3\xcf\
+\xaf\x64\x19\x00\x33\xe4\x3f\x23\x83\xcb\x7f\x86\xff\x1b\x89\x72\
+\x06\x25\x00\x00\x0a\xaf\x87\xbc\x9b\x9c\x11\xc4\x00\x00\x00\x00\
+\x49\x45\x4e\x44\xae\x42\x60\x82\
+\x00\x00\x02\x2c\
+\x89\
+\x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
+\x00\x00\x10\x00\x00\x00\x10\x08\x06\x00\x00\x00\x1f\xf3\xff\x61\
+\x00\x00\x00\x09\x70\x48\x59\x73\x00\x00\x0f\x61\x00\x00\x0f\x61\
+\x01\xa8\x3f\xa7\x69\x00\x00\x01\xde\x49\x44\x41\x54\x38\x8d\xcd\
+\x91\x3f\x4c\x53\x51\x18\xc5\xcf\x7d\xbc\xb4\x05\x4a\x0b\x31\x05\
+\x9a\xbe\x8a\x22\xc5\xc8\x40\x4c\x80\x84\x7f\x62\x88\x02\x0b\xd1\
+\x41\x66\x17\x53\x12\x16\xfa\x60\x73\xd1\xcd\xb8\x68\xc0\xc5\xd0\
+\xc4\xd5\x85\x30\x40\x58\xda\x42\x9a\x10\xa2\x83\x92\x18\xd1\xa0\
+\x12\x43\x02\x2d\x7f\x6c\x41\x5f\x2c\xa5\xf4\xbd\x7b\x3f\x07\x03\
+\x5c\x10\x9c\x39\xcb\x97\x7c\xe7\x9c\x5f\xee\x97\x0b\x9c\x0b\x69\
+\xa1\x58\xd0\xdb\x3f\x55\x74\x72\xef\xd3\xa3\xd7\xfd\xa1\x48\xc7\
+\xff\xba\x0a\x00\x30\x05\xe1\x82\xa2\xc2\xb7\xda\x60\x34\x20\x9b\
+\x0c\xec\x2e\x29\xca\xac\x4f\x9f\x79\x08\x10\x3b\x13\x00\x00\xad\
+\x4d\x55\xf5\xaa\xad\xe0\x9d\x16\x8a\xdd\x93\x03\x57\xab\x3d\x6a\
+\xa5\xa7\xf8\x89\x36\x34\x33\xe5\x1e\x98\x2e\x3b\x13\x50\x5d\x75\
+\x01\x5d\x37\x6b\xdd\x4e\xa7\x6d\xdc\xaf\x47\x9f\xe1\x71\x5c\x05\
+\x00\xbb\x5d\xc5\xad\x1b\x01\x5c\xab\x29\xef\x75\x39\x6c\x0b\xde\
+\xc1\x48\xc3\xa9\x00\xd3\xe4\x70\x39\xed\xe8\xea\x08\x30\x6f\x85\
+\x6b\xd8\x6f\x58\x71\x30\xf8\x84\x10\xe0\x5c\xa0\xbe\xce\x8b\x96\
+\xc6\x4b\x97\x1d\x76\x75\xde\xa7\x47\xfa\x4f\x05\x98\x26\x07\x63\
+\x0c\xcd\x0d\x17\x51\x57\x5b\xde\xce\x80\x20\xe7\x74\xe8\x55\x7a\
+\x4a\xd0\xd9\x7a\xc5\x51\x5a\x52\x38\xa6\xe9\xb1\x57\x00\xa0\xca\
+\x80\x23\x11\x04\x11\x00\x40\x08\x71\xcc\xb3\x2c\x01\x92\x92\x12\
+\xc0\xfa\x3b\x2d\x81\xc5\x2f\x9b\x48\xa5\x77\xe7\x89\x89\x25\xce\
+\x45\xf0\xc0\xdb\x4a\x67\xf0\xe9\xeb\x56\x2e\x6f\x5a\xa1\xe4\x48\
+\x4f\xf8\x9f\x13\x76\x7e\x65\xf1\xe6\xfd\x2a\xa5\xd2\x99\xe7\x6b\
+\x6e\xb5\x13\xa4\x24\x85\x20\xe4\xf3\x1c\x4b\xcb\x3f\xf0\xe1\xf3\
+\xfa\xca\xbe\x89\xb6\x83\xf2\xb1\x17\xac\xad\x1b\xf8\xbe\xba\x63\
+\x70\x8b\x1e\x24\x46\xbb\x27\x00\x00\x7a\x0c\x7b\x39\x13\x0b\x8b\
+\x49\x18\x99\xfd\xe9\xdf\xb9\xfc\x7d\xe3\x65\xef\x4f\xf9\x17\x0e\
+\x01\xdf\x56\xb6\x3f\x42\x50\x5f\xe2\x45\xf7\xb2\x1c\xd8\x48\x65\
+\x2c\x22\xf6\x28\x39\x72\xfb\x29\xc0\xe4\xf3\x8f\x00\x44\x4a\x90\
+\x67\x77\x5f\x6f\x84\xef\x64\x65\x93\x40\x93\x8a\xa0\x78\x62\xb4\
+\x67\xee\x64\xf1\xfc\xe8\x0f\xa7\xe4\xd3\xa8\x44\x84\xb9\x51\x00\
+\x00\x00\x00\x49\x45\x4e\x44\xae\x42\x60\x82\
 \x00\x00\x02\xfe\
 \x89\
 \x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
@@ -217,93 +331,6 @@ qt_resource_data = b"\
 \x62\x8b\x72\x71\x4d\x80\xf5\x42\xad\x42\xfa\xc7\x0d\xa6\x57\x11\
 \x0c\x56\x18\xe5\x92\x3f\x02\x0c\x00\xa3\x80\x2c\x26\x09\xee\xf9\
 \x88\x00\x00\x00\x00\x49\x45\x4e\x44\xae\x42\x60\x82\
-\x00\x00\x02\x94\
-\x89\
-\x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
-\x00\x00\x10\x00\x00\x00\x10\x08\x06\x00\x00\x00\x1f\xf3\xff\x61\
-\x00\x00\x00\x19\x74\x45\x58\x74\x53\x6f\x66\x74\x77\x61\x72\x65\
-\x00\x41\x64\x6f\x62\x65\x20\x49\x6d\x61\x67\x65\x52\x65\x61\x64\
-\x79\x71\xc9\x65\x3c\x00\x00\x02\x36\x49\x44\x41\x54\x78\xda\x8c\
-\x53\x4d\x6b\x13\x51\x14\x3d\x99\x8c\x92\x31\x5f\xa5\x13\x34\x69\
-\x88\x92\xb4\x50\xb1\x05\x0d\x0a\x0a\x2e\x84\x10\xc4\x2e\xa2\xd9\
-\x08\xf9\x05\x76\x21\x2e\x03\xfe\x86\x2e\xdc\x08\x2e\xb2\x70\xe5\
-\x22\x8b\x12\x37\x82\x06\x82\xcb\x82\x81\x52\x02\xa9\x8b\xea\x42\
-\x62\x42\x28\x71\xd4\xb6\xc9\x4c\x26\x2f\x99\xf8\xee\x4b\x26\x1f\
-\xa5\x50\x2f\xdc\x79\x6f\xee\xdc\x73\xde\x79\xe7\xcd\x73\xbc\x7e\
-\x80\x49\x38\x80\x15\x3e\x3c\x1b\x0e\x91\x90\x24\x9c\x17\xbb\xbc\
-\x6f\x53\x1e\xbf\x08\xa0\xcb\xe3\xdb\x58\x59\x8b\x87\x02\x4b\x57\
-\xd5\xfd\xfd\xaf\x30\xee\xbf\x80\xa2\x28\x23\x72\x87\x03\x12\x67\
-\xb5\xf3\xe7\xab\xb4\xa8\x13\xc1\x96\xe2\xf6\x6d\x2c\xaf\xdd\x0a\
-\x79\x16\x2f\xab\xb5\x5a\x0d\x07\x3b\x3b\xf0\x78\x17\x04\x58\x55\
-\xd5\x39\xb0\xd3\xe9\x14\xf9\xc3\x1a\xad\x2c\x59\x16\x12\xf7\x1e\
-\x3e\x59\xd7\x4e\x0c\xb5\x5a\xad\xa2\x5e\xaf\x23\x1a\x8d\xc2\x1a\
-\x37\x9c\x05\xa6\xf9\x80\x7f\xa7\x94\xe8\xc1\x18\x43\xa3\xd1\x40\
-\x38\x1c\x46\x30\x18\xc4\x90\x6f\x8e\xea\xa7\xc1\x9a\xa6\xa1\xdd\
-\x6e\x8b\x79\x7f\x00\x91\xb2\x60\x1a\x0c\xe0\xf5\x7a\xf9\xaa\x96\
-\x00\xd3\x28\xd8\x4f\xad\x6c\x18\x86\x48\x9b\x40\x78\xc0\xb1\x02\
-\x40\x8d\xb3\x04\xd4\x40\xb5\x56\xab\x05\xd3\x34\x27\xd6\x67\x32\
-\x19\xe4\xf3\x79\x7c\x63\x8b\x5f\x8e\x7a\xd6\x54\x01\x49\x23\xd3\
-\x68\x3e\xab\x80\xea\xe9\x74\x7a\x42\xd0\xe9\x74\x90\x4a\xa5\x90\
-\xcd\x66\x2b\xfc\x75\x49\x16\x7b\xe9\xf7\xb1\xfa\xfc\x2d\x2a\x6f\
-\x36\x71\xc5\x77\x69\xa2\x80\xa4\xba\x5c\x2e\x14\x0a\x85\x09\x41\
-\x32\x99\x44\xa9\x54\xc2\x6d\xb9\x75\xd3\x94\x2e\xe6\x04\x01\xad\
-\xfa\xe1\xe5\x63\x44\x23\xc1\xa9\x07\xe3\x2d\xc4\x62\x31\xc8\xb2\
-\x2c\xc8\xca\xe5\x32\x8a\xc5\xa2\xa8\xad\x2a\xec\x2e\xb7\x1f\x82\
-\x80\x00\x77\xd6\x97\xe1\x76\xbb\x85\x64\xa1\xc0\x1a\x29\xb0\xc1\
-\x44\x46\x46\x07\x02\x01\x44\x22\x11\x30\xdb\x44\x5b\x01\x85\x35\
-\x3e\x7c\x72\x9a\xb1\x0b\x73\xe7\x4e\x63\x3c\x1e\x17\x47\x4b\x69\
-\xb2\xf1\x8f\x34\x4b\xd0\xed\x76\x45\xfa\xfd\x7e\x1c\xeb\x98\x03\
-\x53\xda\x60\x8a\xbf\x27\xc0\xfb\x26\xa6\x5b\xd0\x75\x1d\xa1\x50\
-\x08\xc7\x47\x43\x6d\x7b\x7b\xb7\x79\xd8\xd2\x2b\x7b\x8f\x12\x37\
-\x48\xd8\x59\x37\xe9\xcf\x10\x07\x87\x0c\xd7\x64\xc3\x1c\x99\xc5\
-\x98\x8b\x03\xf7\x9a\xbf\x7e\xeb\x1f\x39\x5f\xee\x53\x0f\x1a\xef\
-\x53\xce\xb9\x91\xba\xe3\xe9\x02\xde\xf5\x18\xae\xf7\xfa\xf8\xcc\
-\xcf\x3e\xc7\x05\x7e\x27\x95\x9c\xe0\xbf\xe2\x9f\x00\x03\x00\xd8\
-\x67\x23\x44\x6b\x8c\x5c\x2a\x00\x00\x00\x00\x49\x45\x4e\x44\xae\
-\x42\x60\x82\
-\x00\x00\x02\x86\
-\x89\
-\x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
-\x00\x00\x10\x00\x00\x00\x10\x08\x06\x00\x00\x00\x1f\xf3\xff\x61\
-\x00\x00\x00\x19\x74\x45\x58\x74\x53\x6f\x66\x74\x77\x61\x72\x65\
-\x00\x41\x64\x6f\x62\x65\x20\x49\x6d\x61\x67\x65\x52\x65\x61\x64\
-\x79\x71\xc9\x65\x3c\x00\x00\x02\x28\x49\x44\x41\x54\x78\xda\x7c\
-\x52\x4d\x68\x13\x41\x14\x7e\x3b\x9d\x36\xcd\x0f\x58\xb4\x98\xd6\
-\xb4\x87\x50\x11\x44\x3c\x94\x15\x3c\x16\x54\x6c\xb4\x8a\x14\x3c\
-\x68\xef\x52\xd0\x93\xf7\x1e\x0a\xee\xb9\x9e\xf4\xa2\x27\xbd\x78\
-\xae\x15\x8b\x7a\x50\x14\x0f\x6a\x2c\x55\x5a\x29\xa5\x4a\x21\x7f\
-\x0b\x8d\x26\x31\xfb\x93\x9d\xc9\xae\xef\x2d\x6e\xba\xa9\x5b\x1f\
-\x0c\xf3\xbe\xef\xcd\xfb\xde\xbc\x37\xa3\x78\x9e\x07\x64\xc3\xe7\
-\x6f\xc1\xc8\xd4\x6d\xe8\xed\xeb\x03\xce\x39\xf4\x70\x9e\x43\x5a\
-\xc3\x35\xd7\x96\x72\x59\x4a\x09\xc2\x71\xa0\xf0\xec\x2e\x94\x5f\
-\xdc\x83\xc0\x58\xe0\x0c\x9d\xbb\x09\x21\xcb\x61\x92\x76\x7d\xf2\
-\xb0\x4a\x3b\xe1\x7d\xce\xed\x0a\x74\xcc\xf3\x72\x58\x4d\x9b\xb9\
-\x70\x44\x2d\x14\x04\x5c\x9b\x1c\x56\x09\x13\x0f\x11\xc6\xf6\x26\
-\x0b\x21\x30\x79\x54\xdd\xdc\x34\xc0\x30\x1c\xd8\xda\x32\xe1\xea\
-\xd9\x8c\x4a\x7c\x94\x08\xdb\xcd\xc5\xca\x8e\xa3\xcd\x5c\xcc\xaa\
-\xe5\xb2\x85\xd8\x05\xd3\x14\xe0\xba\x2e\xe8\xba\x0d\x57\x26\x46\
-\x55\x8a\x7b\x7b\x44\x78\xe0\x48\x21\xa6\x69\xa0\x0f\x9f\xac\xe6\
-\x09\x4f\x4d\x1c\x53\x5d\xd7\x03\xc6\x14\x58\x7a\xbd\x91\x0f\xce\
-\x29\x8a\x32\x8d\xdb\xf2\x3f\x02\x98\x3c\x4b\xd5\x3c\x5c\xae\x94\
-\x9f\x6c\xdb\x81\x7a\xbd\x81\x6d\xb8\x20\x6c\x1b\x18\xe7\xa7\x14\
-\xc6\x50\xb0\xbb\x6b\x1e\x06\x6d\x21\xc0\x36\x0d\xdf\x2f\x95\x2a\
-\x28\x60\x41\x22\x11\x03\xdb\x32\x7d\xae\x3f\x91\x04\x16\x8b\x45\
-\x0b\x34\xaa\x55\x68\xd6\x6a\x9d\x80\x84\x0c\xf0\x78\x0c\xda\xd8\
-\xc2\xef\x9f\xbf\x7c\x8e\xf6\xd4\xc0\x40\xb4\xc0\x4e\xb1\x18\x7a\
-\x0c\x2f\xff\x7c\xf1\x7d\x07\xe3\xd5\xf3\xd8\xbb\xef\xdb\x86\x11\
-\x2d\x10\x4f\xa5\xc2\xfc\x6c\xf0\x43\xff\x0e\xae\xe3\x3b\xc5\x2f\
-\xd1\x02\xfd\xc9\x64\xb8\x62\x06\x93\xe6\xd1\x1d\xc7\xb5\x82\x62\
-\xf3\x38\x5c\xff\x8a\xb2\xfe\xbd\x4b\x40\x09\x2a\x51\x95\x03\x97\
-\x34\xe8\x1d\x3a\x41\xf0\xc1\xe9\x33\x27\x2f\xf3\xa3\xd9\x74\x73\
-\xe3\x87\xbe\xfa\xe6\xeb\x53\xe4\x6e\x88\xca\x1a\xd4\x97\xe6\x20\
-\x7c\xbb\xae\x37\xa1\xa0\xb5\xfd\x19\x5a\x96\x35\xde\xc8\x8e\xa5\
-\x17\x2b\x0c\x4a\x23\x63\x69\xc2\xc4\x53\xfc\x7f\x5f\x99\xfc\xb8\
-\xf1\xf2\xce\x21\xd1\xac\xad\x15\x3f\xae\xeb\x83\xf8\x62\x3b\x2b\
-\xeb\x3a\x61\xe4\x07\x31\x4e\x7d\xf6\xec\xf7\x0f\x68\x52\x71\x5c\
-\x07\x5b\x6f\x17\x1e\x6d\xb7\x6c\x06\xaf\xde\x1d\x07\xc7\xf8\xe6\
-\x7e\xb8\xff\x18\x79\x12\xa8\xd2\x1c\xe9\xcb\x04\x49\x7f\x04\x18\
-\x00\x2a\x2d\x12\x92\xf2\x2e\x70\xe1\x00\x00\x00\x00\x49\x45\x4e\
-\x44\xae\x42\x60\x82\
 \x00\x00\x02\x11\
 \x89\
 \x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
@@ -340,60 +367,39 @@ qt_resource_data = b"\
 \x0f\xac\xf1\x62\x04\xff\x76\x1b\x3f\x05\x18\x00\x19\x24\xc7\xd0\
 \x71\x6d\x1e\x99\x00\x00\x00\x00\x49\x45\x4e\x44\xae\x42\x60\x82\
 \
-\x00\x00\x03\x3f\
+\x00\x00\x01\xf0\
 \x89\
 \x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
 \x00\x00\x10\x00\x00\x00\x10\x08\x06\x00\x00\x00\x1f\xf3\xff\x61\
-\x00\x00\x00\x19\x74\x45\x58\x74\x53\x6f\x66\x74\x77\x61\x72\x65\
-\x00\x41\x64\x6f\x62\x65\x20\x49\x6d\x61\x67\x65\x52\x65\x61\x64\
-\x79\x71\xc9\x65\x3c\x00\x00\x02\xe1\x49\x44\x41\x54\x78\xda\x4c\
-\x53\x4b\x4f\x13\x51\x18\x3d\xf3\x90\x4e\xed\xcc\x30\x02\x35\x96\
-\x47\x0d\x2d\x15\x44\xf0\x11\x4a\x90\xa8\x54\x62\xd4\x85\x91\x85\
-\x2b\xfe\x01\x0b\x71\xc3\x8e\x3f\xe1\x02\xb7\xb8\x35\x71\x87\x46\
-\x36\x46\x49\x30\x61\x63\x34\x36\x68\xa4\xc6\x52\x29\xe5\x21\x04\
-\x68\xa7\xa5\xef\x97\xdf\x77\xa1\x89\x93\x9c\xcc\x9d\x3b\xf7\x9c\
-\x7b\xbe\xf3\xdd\x2b\x81\x9e\x80\x05\x3c\xf1\x02\x1d\xcd\x80\xa2\
-\x40\xa2\xa9\x31\xc2\x38\xa1\x95\xd0\x44\x58\xae\xd7\xf1\xaa\x56\
-\x03\xaa\x55\x60\x6d\x13\xf8\xb0\x05\xc4\xe8\x87\x34\x77\x07\xff\
-\x3f\x92\x24\xe1\x99\xd5\xea\x9e\xba\x3e\x1a\xea\x30\x5b\xda\xf4\
-\xa5\x37\xaf\xd7\x32\xa9\xe4\x43\x22\xef\xf0\x02\x12\x02\x0b\xf1\
-\xf3\x9e\x44\xe4\x72\x19\x68\xa0\x52\xc1\xb8\x61\xb9\xa7\x6e\xde\
-\x7f\x7c\xc9\xdd\xde\xd5\x5c\xab\x43\xe9\xee\x1d\x68\xa5\x5d\xdf\
-\x12\xf1\x0b\x81\xdf\xf7\x1a\xbb\x3d\xe8\x04\xd4\x42\xe1\xe4\x43\
-\x96\x05\x26\xfb\x83\xa3\x1d\x90\x64\xb5\x42\x6a\x05\xfa\xd9\x7b\
-\x6d\xc8\xe3\xeb\xbf\xea\x51\x55\x15\x9b\xeb\xeb\x81\xe5\xc5\x77\
-\xec\xe0\x63\xc3\x85\xcc\x96\x18\xb4\xcb\xb4\xd3\x3c\x17\x52\x1d\
-\x9a\x51\x2c\x16\x71\x7c\x7c\x4c\x73\x55\xa4\xd3\x69\x01\xdb\xb6\
-\xa1\x19\x86\x49\x6b\xfa\x78\x6d\x83\x27\xe7\x72\xc0\x29\x26\x83\
-\xa1\x31\xff\x46\x3c\x4e\x73\x39\xb0\x88\x42\x89\xb2\x0b\x99\xac\
-\xa5\x52\x29\xc4\x62\x31\xdc\xb8\x7d\xcb\xc7\x6b\x1b\x3c\x95\xe6\
-\x1b\xf6\x35\xc3\x34\x14\x02\x2c\xcb\x42\x3e\x9f\x87\xd3\xe9\x14\
-\x3b\x9b\xa6\x29\xd2\x75\xbb\xdd\x2c\xa4\x90\x39\x8d\x4b\x60\xc8\
-\x5c\x07\x0d\xa6\x5d\x96\xcb\x3c\x3c\x3c\x44\x26\x93\xc1\xc6\x46\
-\x1c\xf3\xf3\x2f\xc1\x39\x38\x1c\x0e\xcc\xcd\xbd\xc0\xfe\xfe\x3e\
-\x8e\x8e\x8e\x84\x20\xaf\x65\x8e\xc8\xe0\x34\xd0\xc9\xe1\xbb\x83\
-\xbe\x48\x24\x02\xb6\x5f\xa6\x96\x94\x4a\x10\x19\x70\x19\x3c\xae\
-\xd7\x25\x24\x93\x49\x44\xa3\x51\x04\x43\x57\x7c\xcc\x61\xa2\x7a\
-\x2a\xa0\xb9\xf4\xb3\xca\x90\x77\x08\x7e\xbf\x1f\x7b\x7b\x7b\x98\
-\x9d\x9d\x11\x04\x2e\x63\x66\xe6\x29\x09\xd4\x61\x18\x06\x3c\x1e\
-\x0f\x39\xdc\x50\x98\xd3\x70\x30\xad\x19\xaa\xb0\xcf\x75\xb2\xc5\
-\x95\x95\x55\x44\x22\x7f\x84\x32\x97\x11\x8d\x6e\x62\x69\xe9\xb3\
-\x10\xe4\xef\x93\x8e\xa8\x26\x73\x95\x61\x17\x9e\x07\x82\x1d\x83\
-\x3b\x3b\xdb\x32\x5b\xe7\x1d\x35\xcd\x49\x84\xaf\x58\x58\xf8\x24\
-\xde\xb6\x9d\xc3\xc0\x40\x37\x54\x55\x42\x38\x1c\x46\x22\x91\x80\
-\xe7\xa2\xdb\x3a\x48\xa4\x2d\x35\x5b\x46\x45\x92\xe4\xba\xd7\xeb\
-\x45\x5b\x5b\x1b\xdb\x43\x5f\x5f\x1f\x26\x26\x46\x84\x5d\x0e\x4e\
-\xd7\x75\xec\xee\xee\x8a\x56\x72\xa8\x81\x40\x40\x74\x23\x57\x86\
-\xa6\x6e\x17\x10\xbb\xb0\x99\xbe\xdc\xed\x93\xcf\x73\xd2\x5c\x46\
-\x3c\x1e\x17\x56\xf9\x30\xf1\x79\x60\x57\x5c\x62\x8d\xa2\xcf\x66\
-\xb3\x22\x8f\x4c\x3a\x5f\x3a\x2a\xc0\x56\xc3\x45\x2c\xca\x3f\x6c\
-\x5f\x0d\x0a\x02\x3d\x4d\x2d\x96\xa5\x53\xb0\x12\x9d\x66\x47\x69\
-\xed\xd7\x41\x3a\x91\x48\x92\x4e\xa1\xc2\x64\x5d\x3f\xe3\xec\x6c\
-\x6f\x6a\xa9\x56\x4b\xea\xf7\x9f\xf6\x56\xa2\x88\x6f\x7c\x75\xdb\
-\xe9\xce\x8e\xf6\x00\x8f\x9c\x00\xb7\x47\x3f\xed\x4c\x8e\xba\xf7\
-\x77\x17\x58\xa5\xb3\xf6\x9b\xc6\x15\x37\xdd\xfc\x2e\x60\x84\x92\
-\x37\x6c\x20\x1c\x01\x16\xfe\x09\x30\x00\x7c\x03\x7b\x5b\xea\xaa\
-\x44\xbd\x00\x00\x00\x00\x49\x45\x4e\x44\xae\x42\x60\x82\
+\x00\x00\x00\x09\x70\x48\x59\x73\x00\x00\x0f\x61\x00\x00\x0f\x61\
+\x01\xa8\x3f\xa7\x69\x00\x00\x01\xa2\x49\x44\x41\x54\x38\x8d\xb5\
+\x92\xbd\x6b\x14\x41\x18\x87\x9f\x59\xe2\x92\x13\x8f\x05\x49\xd0\
+\xb0\x27\x17\xb2\x41\x09\x24\xde\x15\x42\x44\x0b\x3f\x38\x63\x4a\
+\xd3\x8b\xa4\x12\xac\x82\x56\xde\x0a\x96\x67\x1b\xb4\xf2\x8f\x10\
+\x3b\x11\x6b\x2b\x63\xa1\x31\xa0\xe4\xe3\xf0\xfc\x48\x0c\x5e\x30\
+\x21\x4a\x72\x3b\x3b\xf3\x5a\xed\xb9\x9a\xbd\x23\x0a\xfe\x60\x8a\
+\xe1\x9d\x79\x78\xf8\xf1\xc2\xff\xc8\x60\xe8\x97\x83\xd0\xbf\xb0\
+\x9f\xb7\x0a\x20\xa8\x16\x36\x95\xc2\x03\xb0\x22\x37\x1d\xa5\x3c\
+\x41\xee\x8a\x30\xeb\x7c\xff\x1c\x2e\x3f\xa0\xd5\x09\xe0\x00\x28\
+\x85\x37\x73\xe3\x1a\xe3\xa7\x4a\x38\x4a\x79\x00\xe5\xb1\x11\xe7\
+\x78\x50\xbc\x25\x79\xff\x45\x10\x1e\x19\xed\x0a\x00\xd0\x46\x63\
+\xc5\xb4\x07\xae\xdb\xc3\x44\xe5\x0c\x17\xcf\x8d\x9f\x74\x0f\xe4\
+\xe6\x86\xc2\xc2\x4c\x62\x9c\x09\x88\xe2\x08\x63\x7f\x01\x8c\x35\
+\x44\xb1\x26\x08\x8e\x31\x75\xa5\xd2\x7b\xb4\xff\xf0\xec\x70\xb5\
+\xf0\xb4\x18\xf6\x0d\x64\x03\x8c\xc6\x58\x9b\x02\x58\x22\xa3\x89\
+\x8c\xa6\xf7\xa0\xcb\xe5\xc9\xb3\x94\xca\x27\x26\x5c\x27\x37\x1f\
+\xdc\x19\x98\xca\x30\xd0\x99\x06\xc9\xd1\x36\x66\x64\x74\x88\xca\
+\xa5\xd3\x7d\xf9\x43\xf9\x47\x41\xe8\x3f\x04\xe8\x49\x77\x60\x24\
+\x65\x20\x16\x6d\xf4\x9e\xd2\x62\x1b\x23\x48\xfb\xde\x06\x74\x32\
+\x48\x22\x22\x2c\xbd\xfb\xc0\xe2\xdb\xf7\x4d\x2b\xe6\xfa\x4a\x6d\
+\xed\xf1\xef\x80\x0e\x1d\x00\xec\xfc\xd8\x65\xfe\xe5\x12\x9b\x1b\
+\xdb\xcf\xb4\xda\x9d\x6e\xd4\x9a\x6b\xfb\x34\x88\xf8\xf2\x71\x83\
+\xc5\x85\xc6\x8e\x8e\x6d\xb5\x7e\xef\xd3\x7d\x48\xf9\xff\xd9\x81\
+\x4d\x75\xd0\x6a\x45\xbc\x99\x5b\xa6\xb9\xfe\xed\xb5\x48\x7c\xb5\
+\x5e\x5b\x5f\xd8\x53\x48\x02\x10\x61\xeb\xf9\x93\x57\xc9\x2a\x6f\
+\x39\x4a\x79\xab\x8d\xaf\x36\x59\xe5\x95\x2e\xab\x9c\x99\xc1\xd0\
+\x2f\x0f\xdf\x2e\x9c\xff\xab\x4f\xff\x9a\x9f\x96\x89\xe6\xa3\x39\
+\x09\x62\x02\x00\x00\x00\x00\x49\x45\x4e\x44\xae\x42\x60\x82\
 \x00\x00\x02\xc0\
 \x89\
 \x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
@@ -440,6 +446,121 @@ qt_resource_data = b"\
 \xd0\xf9\x26\x6b\x13\x89\xb8\xb0\x48\x20\xe1\x40\x1f\x2d\x3f\xb8\
 \x46\xf6\xc4\xb5\x93\x9c\xe0\xaf\x00\x03\x00\x3e\x1c\x3e\xd9\xf8\
 \x12\xd2\x74\x00\x00\x00\x00\x49\x45\x4e\x44\xae\x42\x60\x82\
+\x00\x00\x02\x86\
+\x89\
+\x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
+\x00\x00\x10\x00\x00\x00\x10\x08\x06\x00\x00\x00\x1f\xf3\xff\x61\
+\x00\x00\x00\x19\x74\x45\x58\x74\x53\x6f\x66\x74\x77\x61\x72\x65\
+\x00\x41\x64\x6f\x62\x65\x20\x49\x6d\x61\x67\x65\x52\x65\x61\x64\
+\x79\x71\xc9\x65\x3c\x00\x00\x02\x28\x49\x44\x41\x54\x78\xda\x7c\
+\x52\x4d\x68\x13\x41\x14\x7e\x3b\x9d\x36\xcd\x0f\x58\xb4\x98\xd6\
+\xb4\x87\x50\x11\x44\x3c\x94\x15\x3c\x16\x54\x6c\xb4\x8a\x14\x3c\
+\x68\xef\x52\xd0\x93\xf7\x1e\x0a\xee\xb9\x9e\xf4\xa2\x27\xbd\x78\
+\xae\x15\x8b\x7a\x50\x14\x0f\x6a\x2c\x55\x5a\x29\xa5\x4a\x21\x7f\
+\x0b\x8d\x26\x31\xfb\x93\x9d\xc9\xae\xef\x2d\x6e\xba\xa9\x5b\x1f\
+\x0c\xf3\xbe\xef\xcd\xfb\xde\xbc\x37\xa3\x78\x9e\x07\x64\xc3\xe7\
+\x6f\xc1\xc8\xd4\x6d\xe8\xed\xeb\x03\xce\x39\xf4\x70\x9e\x43\x5a\
+\xc3\x35\xd7\x96\x72\x59\x4a\x09\xc2\x71\xa0\xf0\xec\x2e\x94\x5f\
+\xdc\x83\xc0\x58\xe0\x0c\x9d\xbb\x09\x21\xcb\x61\x92\x76\x7d\xf2\
+\xb0\x4a\x3b\xe1\x7d\xce\xed\x0a\x74\xcc\xf3\x72\x58\x4d\x9b\xb9\
+\x70\x44\x2d\x14\x04\x5c\x9b\x1c\x56\x09\x13\x0f\x11\xc6\xf6\x26\
+\x0b\x21\x30\x79\x54\xdd\xdc\x34\xc0\x30\x1c\xd8\xda\x32\xe1\xea\
+\xd9\x8c\x4a\x7c\x94\x08\xdb\xcd\xc5\xca\x8e\xa3\xcd\x5c\xcc\xaa\
+\xe5\xb2\x85\xd8\x05\xd3\x14\xe0\xba\x2e\xe8\xba\x0d\x57\x26\x46\
+\x55\x8a\x7b\x7b\x44\x78\xe0\x48\x21\xa6\x69\xa0\x0f\x9f\xac\xe6\
+\x09\x4f\x4d\x1c\x53\x5d\xd7\x03\xc6\x14\x58\x7a\xbd\x91\x0f\xce\
+\x29\x8a\x32\x8d\xdb\xf2\x3f\x02\x98\x3c\x4b\xd5\x3c\x5c\xae\x94\
+\x9f\x6c\xdb\x81\x7a\xbd\x81\x6d\xb8\x20\x6c\x1b\x18\xe7\xa7\x14\
+\xc6\x50\xb0\xbb\x6b\x1e\x06\x6d\x21\xc0\x36\x0d\xdf\x2f\x95\x2a\
+\x28\x60\x41\x22\x11\x03\xdb\x32\x7d\xae\x3f\x91\x04\x16\x8b\x45\
+\x0b\x34\xaa\x55\x68\xd6\x6a\x9d\x80\x84\x0c\xf0\x78\x0c\xda\xd8\
+\xc2\xef\x9f\xbf\x7c\x8e\xf6\xd4\xc0\x40\xb4\xc0\x4e\xb1\x18\x7a\
+\x0c\x2f\xff\x7c\xf1\x7d\x07\xe3\xd5\xf3\xd8\xbb\xef\xdb\x86\x11\
+\x2d\x10\x4f\xa5\xc2\xfc\x6c\xf0\x43\xff\x0e\xae\xe3\x3b\xc5\x2f\
+\xd1\x02\xfd\xc9\x64\xb8\x62\x06\x93\xe6\xd1\x1d\xc7\xb5\x82\x62\
+\xf3\x38\x5c\xff\x8a\xb2\xfe\xbd\x4b\x40\x09\x2a\x51\x95\x03\x97\
+\x34\xe8\x1d\x3a\x41\xf0\xc1\xe9\x33\x27\x2f\xf3\xa3\xd9\x74\x73\
+\xe3\x87\xbe\xfa\xe6\xeb\x53\xe4\x6e\x88\xca\x1a\xd4\x97\xe6\x20\
+\x7c\xbb\xae\x37\xa1\xa0\xb5\xfd\x19\x5a\x96\x35\xde\xc8\x8e\xa5\
+\x17\x2b\x0c\x4a\x23\x63\x69\xc2\xc4\x53\xfc\x7f\x5f\x99\xfc\xb8\
+\xf1\xf2\xce\x21\xd1\xac\xad\x15\x3f\xae\xeb\x83\xf8\x62\x3b\x2b\
+\xeb\x3a\x61\xe4\x07\x31\x4e\x7d\xf6\xec\xf7\x0f\x68\x52\x71\x5c\
+\x07\x5b\x6f\x17\x1e\x6d\xb7\x6c\x06\xaf\xde\x1d\x07\xc7\xf8\xe6\
+\x7e\xb8\xff\x18\x79\x12\xa8\xd2\x1c\xe9\xcb\x04\x49\x7f\x04\x18\
+\x00\x2a\x2d\x12\x92\xf2\x2e\x70\xe1\x00\x00\x00\x00\x49\x45\x4e\
+\x44\xae\x42\x60\x82\
+\x00\x00\x02\x94\
+\x89\
+\x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
+\x00\x00\x10\x00\x00\x00\x10\x08\x06\x00\x00\x00\x1f\xf3\xff\x61\
+\x00\x00\x00\x19\x74\x45\x58\x74\x53\x6f\x66\x74\x77\x61\x72\x65\
+\x00\x41\x64\x6f\x62\x65\x20\x49\x6d\x61\x67\x65\x52\x65\x61\x64\
+\x79\x71\xc9\x65\x3c\x00\x00\x02\x36\x49\x44\x41\x54\x78\xda\x8c\
+\x53\x4d\x6b\x13\x51\x14\x3d\x99\x8c\x92\x31\x5f\xa5\x13\x34\x69\
+\x88\x92\xb4\x50\xb1\x05\x0d\x0a\x0a\x2e\x84\x10\xc4\x2e\xa2\xd9\
+\x08\xf9\x05\x76\x21\x2e\x03\xfe\x86\x2e\xdc\x08\x2e\xb2\x70\xe5\
+\x22\x8b\x12\x37\x82\x06\x82\xcb\x82\x81\x52\x02\xa9\x8b\xea\x42\
+\x62\x42\x28\x71\xd4\xb6\xc9\x4c\x26\x2f\x99\xf8\xee\x4b\x26\x1f\
+\xa5\x50\x2f\xdc\x79\x6f\xee\xdc\x73\xde\x79\xe7\xcd\x73\xbc\x7e\
+\x80\x49\x38\x80\x15\x3e\x3c\x1b\x0e\x91\x90\x24\x9c\x17\xbb\xbc\
+\x6f\x53\x1e\xbf\x08\xa0\xcb\xe3\xdb\x58\x59\x8b\x87\x02\x4b\x57\
+\xd5\xfd\xfd\xaf\x30\xee\xbf\x80\xa2\x28\x23\x72\x87\x03\x12\x67\
+\xb5\xf3\xe7\xab\xb4\xa8\x13\xc1\x96\xe2\xf6\x6d\x2c\xaf\xdd\x0a\
+\x79\x16\x2f\xab\xb5\x5a\x0d\x07\x3b\x3b\xf0\x78\x17\x04\x58\x55\
+\xd5\x39\xb0\xd3\xe9\x14\xf9\xc3\x1a\xad\x2c\x59\x16\x12\xf7\x1e\
+\x3e\x59\xd7\x4e\x0c\xb5\x5a\xad\xa2\x5e\xaf\x23\x1a\x8d\xc2\x1a\
+\x37\x9c\x05\xa6\xf9\x80\x7f\xa7\x94\xe8\xc1\x18\x43\xa3\xd1\x40\
+\x38\x1c\x46\x30\x18\xc4\x90\x6f\x8e\xea\xa7\xc1\x9a\xa6\xa1\xdd\
+\x6e\x8b\x79\x7f\x00\x91\xb2\x60\x1a\x0c\xe0\xf5\x7a\xf9\xaa\x96\
+\x00\xd3\x28\xd8\x4f\xad\x6c\x18\x86\x48\x9b\x40\x78\xc0\xb1\x02\
+\x40\x8d\xb3\x04\xd4\x40\xb5\x56\xab\x05\xd3\x34\x27\xd6\x67\x32\
+\x19\xe4\xf3\x79\x7c\x63\x8b\x5f\x8e\x7a\xd6\x54\x01\x49\x23\xd3\
+\x68\x3e\xab\x80\xea\xe9\x74\x7a\x42\xd0\xe9\x74\x90\x4a\xa5\x90\
+\xcd\x66\x2b\xfc\x75\x49\x16\x7b\xe9\xf7\xb1\xfa\xfc\x2d\x2a\x6f\
+\x36\x71\xc5\x77\x69\xa2\x80\xa4\xba\x5c\x2e\x14\x0a\x85\x09\x41\
+\x32\x99\x44\xa9\x54\xc2\x6d\xb9\x75\xd3\x94\x2e\xe6\x04\x01\xad\
+\xfa\xe1\xe5\x63\x44\x23\xc1\xa9\x07\xe3\x2d\xc4\x62\x31\xc8\xb2\
+\x2c\xc8\xca\xe5\x32\x8a\xc5\xa2\xa8\xad\x2a\xec\x2e\xb7\x1f\x82\
+\x80\x00\x77\xd6\x97\xe1\x76\xbb\x85\x64\xa1\xc0\x1a\x29\xb0\xc1\
+\x44\x46\x46\x07\x02\x01\x44\x22\x11\x30\xdb\x44\x5b\x01\x85\x35\
+\x3e\x7c\x72\x9a\xb1\x0b\x73\xe7\x4e\x63\x3c\x1e\x17\x47\x4b\x69\
+\xb2\xf1\x8f\x34\x4b\xd0\xed\x76\x45\xfa\xfd\x7e\x1c\xeb\x98\x03\
+\x53\xda\x60\x8a\xbf\x27\xc0\xfb\x26\xa6\x5b\xd0\x75\x1d\xa1\x50\
+\x08\xc7\x47\x43\x6d\x7b\x7b\xb7\x79\xd8\xd2\x2b\x7b\x8f\x12\x37\
+\x48\xd8\x59\x37\xe9\xcf\x10\x07\x87\x0c\xd7\x64\xc3\x1c\x99\xc5\
+\x98\x8b\x03\xf7\x9a\xbf\x7e\xeb\x1f\x39\x5f\xee\x53\x0f\x1a\xef\
+\x53\xce\xb9\x91\xba\xe3\xe9\x02\xde\xf5\x18\xae\xf7\xfa\xf8\xcc\
+\xcf\x3e\xc7\x05\x7e\x27\x95\x9c\xe0\xbf\xe2\x9f\x00\x03\x00\xd8\
+\x67\x23\x44\x6b\x8c\x5c\x2a\x00\x00\x00\x00\x49\x45\x4e\x44\xae\
+\x42\x60\x82\
+\x00\x00\x01\x9b\
+\x89\
+\x50\x4e\x47\x0d\x0a\x1a\x0a\x00\x00\x00\x0d\x49\x48\x44\x52\x00\
+\x00\x00\x10\x00\x00\x00\x10\x08\x06\x00\x00\x00\x1f\xf3\xff\x61\
+\x00\x00\x00\x19\x74\x45\x58\x74\x53\x6f\x66\x74\x77\x61\x72\x65\
+\x00\x41\x64\x6f\x62\x65\x20\x49\x6d\x61\x67\x65\x52\x65\x61\x64\
+\x79\x71\xc9\x65\x3c\x00\x00\x01\x3d\x49\x44\x41\x54\x78\xda\xc4\
+\x53\x3b\x52\xc3\x30\x10\x7d\x42\x06\x8c\x13\x68\x98\x0c\x05\x3d\
+\x15\x9d\x4b\x0a\x4a\xce\x90\x16\x0a\x0e\xc0\x39\x38\x40\x0a\xe8\
+\x39\x03\x15\x05\x25\x25\x05\x54\x50\x30\x24\x64\x60\xc6\xb1\xf1\
+\x47\x92\x25\xd6\x76\x70\xd0\x60\x87\xcc\xa4\x40\x33\xfa\xac\xf4\
+\xf6\xe9\x69\x77\xc5\x8c\x31\x58\xa6\xad\x60\xc9\xe6\x14\xc3\xe1\
+\xe5\x08\x8c\xb1\x01\x2d\xfd\x05\x7c\xee\x48\xf5\xe9\xcd\xf1\xce\
+\x8c\x20\x57\xaa\x98\xfc\xfe\xd1\xae\x2f\xa5\xfd\xa4\x9f\x2f\x74\
+\x1c\x86\xab\xeb\x97\xdf\x0a\x64\x96\x95\x46\x1c\xe7\x08\x02\xd5\
+\x7a\x75\xb7\xcb\x6b\xac\x45\x20\xd2\xb4\x34\xd2\x54\x61\x32\x11\
+\xf5\xa1\x94\x12\x59\x26\xa0\x94\x84\xd6\x1a\xbd\x5e\xa7\xc6\x5a\
+\x04\x59\x92\x94\x86\x10\x9a\x48\x24\xa2\x28\x42\x18\x86\xe4\x9c\
+\xc1\xce\x92\xa8\xb1\x36\x41\x1c\x97\x46\x94\xa4\x78\x7a\x1d\x42\
+\xd0\xcd\x55\x8e\xb8\x05\x4e\xf4\x0c\xdb\xa8\xe0\xf9\x53\x60\xe8\
+\xb8\xb4\xeb\x36\x07\x81\xaf\xcd\x57\x30\xe2\x1e\xc6\x9d\xd5\xd6\
+\x20\x8a\x75\x3e\x5f\xc1\x9b\xe3\xe1\xc3\x6d\xaf\x4c\x41\xdc\xb2\
+\x49\xc1\x77\x6a\x0c\xe7\xd8\xf4\x00\x6d\xa6\x1d\xd5\x6c\xa6\xf5\
+\x20\x59\x85\xd5\xe3\x07\xda\xe9\x97\x3e\xac\x88\x32\x55\x21\xe7\
+\x07\x67\x17\xd8\xde\xdb\xff\xb3\x0e\xdf\x1f\xef\xf3\xdb\xf3\x13\
+\xf2\x53\x16\x01\xad\xb7\xa8\x6f\x2c\x50\xca\x85\xdc\xc0\x22\xf8\
+\xd7\xdf\xf8\x25\xc0\x00\x38\xeb\xad\x82\xf1\x67\xf9\xc8\x00\x00\
+\x00\x00\x49\x45\x4e\x44\xae\x42\x60\x82\
 "
 
 qt_resource_name = b"\
@@ -448,13 +569,17 @@ qt_resource_name = b"\
 \x00\x69\
 \x00\x63\x00\x6f\x00\x6e\x00\x73\
 \x00\x08\
-\x0b\x63\x58\x07\
-\x00\x73\
-\x00\x74\x00\x6f\x00\x70\x00\x2e\x00\x70\x00\x6e\x00\x67\
+\x05\xe2\x59\x27\
+\x00\x6c\
+\x00\x6f\x00\x67\x00\x6f\x00\x2e\x00\x70\x00\x6e\x00\x67\
 \x00\x08\
 \x06\xc1\x59\x87\
 \x00\x6f\
 \x00\x70\x00\x65\x00\x6e\x00\x2e\x00\x70\x00\x6e\x00\x67\
+\x00\x10\
+\x04\x23\x2f\xe7\
+\x00\x73\
+\x00\x74\x00\x65\x00\x70\x00\x5f\x00\x66\x00\x6f\x00\x72\x00\x77\x00\x61\x00\x72\x00\x64\x00\x2e\x00\x70\x00\x6e\x00\x67\
 \x00\x0b\
 \x05\x34\x0f\x87\
 \x00\x73\
@@ -463,72 +588,96 @@ qt_resource_name = b"\
 \x09\x9d\x9a\x67\
 \x00\x73\
 \x00\x74\x00\x65\x00\x70\x00\x5f\x00\x6f\x00\x76\x00\x65\x00\x72\x00\x2e\x00\x70\x00\x6e\x00\x67\
+\x00\x0d\
+\x02\xc6\x9d\xa7\
+\x00\x73\
+\x00\x74\x00\x65\x00\x70\x00\x5f\x00\x62\x00\x61\x00\x63\x00\x6b\x00\x2e\x00\x70\x00\x6e\x00\x67\
+\x00\x0b\
+\x08\x78\xf7\x27\
+\x00\x61\
+\x00\x6e\x00\x69\x00\x6d\x00\x61\x00\x74\x00\x65\x00\x2e\x00\x70\x00\x6e\x00\x67\
 \x00\x08\
 \x0c\x33\x5a\x87\
 \x00\x68\
 \x00\x65\x00\x6c\x00\x70\x00\x2e\x00\x70\x00\x6e\x00\x67\
-\x00\x08\
-\x0f\x07\x5a\xc7\
-\x00\x65\
-\x00\x78\x00\x69\x00\x74\x00\x2e\x00\x70\x00\x6e\x00\x67\
-\x00\x0c\
-\x09\x92\xdb\x87\
-\x00\x73\
-\x00\x74\x00\x65\x00\x70\x00\x5f\x00\x6f\x00\x75\x00\x74\x00\x2e\x00\x70\x00\x6e\x00\x67\
 \x00\x0e\
 \x01\x27\x03\xa7\
 \x00\x62\
 \x00\x72\x00\x65\x00\x61\x00\x6b\x00\x70\x00\x6f\x00\x69\x00\x6e\x00\x74\x00\x2e\x00\x70\x00\x6e\x00\x67\
-\x00\x08\
-\x05\xe2\x59\x27\
-\x00\x6c\
-\x00\x6f\x00\x67\x00\x6f\x00\x2e\x00\x70\x00\x6e\x00\x67\
+\x00\x0c\
+\x08\xfc\xe1\x47\
+\x00\x63\
+\x00\x6f\x00\x6e\x00\x74\x00\x69\x00\x6e\x00\x75\x00\x65\x00\x2e\x00\x70\x00\x6e\x00\x67\
 \x00\x09\
 \x09\xba\x82\x27\
 \x00\x64\
 \x00\x65\x00\x62\x00\x75\x00\x67\x00\x2e\x00\x70\x00\x6e\x00\x67\
+\x00\x0c\
+\x09\x92\xdb\x87\
+\x00\x73\
+\x00\x74\x00\x65\x00\x70\x00\x5f\x00\x6f\x00\x75\x00\x74\x00\x2e\x00\x70\x00\x6e\x00\x67\
+\x00\x08\
+\x0f\x07\x5a\xc7\
+\x00\x65\
+\x00\x78\x00\x69\x00\x74\x00\x2e\x00\x70\x00\x6e\x00\x67\
+\x00\x08\
+\x0b\x63\x58\x07\
+\x00\x73\
+\x00\x74\x00\x6f\x00\x70\x00\x2e\x00\x70\x00\x6e\x00\x67\
 "
 
 qt_resource_struct_v1 = b"\
 \x00\x00\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00\x01\
-\x00\x00\x00\x00\x00\x02\x00\x00\x00\x0a\x00\x00\x00\x02\
-\x00\x00\x00\xc2\x00\x00\x00\x00\x00\x01\x00\x00\x11\x78\
-\x00\x00\x00\x3c\x00\x00\x00\x00\x00\x01\x00\x00\x03\x9b\
-\x00\x00\x00\xe4\x00\x00\x00\x00\x00\x01\x00\x00\x13\x8d\
-\x00\x00\x00\x26\x00\x00\x00\x00\x00\x01\x00\x00\x01\x9f\
-\x00\x00\x00\xa4\x00\x00\x00\x00\x00\x01\x00\x00\x0e\xee\
-\x00\x00\x00\x58\x00\x00\x00\x00\x00\x01\x00\x00\x06\x21\
-\x00\x00\x00\xfa\x00\x00\x00\x00\x00\x01\x00\x00\x16\xd0\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x0e\x00\x00\x00\x02\
+\x00\x00\x00\xf0\x00\x00\x00\x00\x00\x01\x00\x00\x13\x16\
+\x00\x00\x00\x9e\x00\x00\x00\x00\x00\x01\x00\x00\x0c\x67\
+\x00\x00\x00\x3c\x00\x00\x00\x00\x00\x01\x00\x00\x05\x3f\
+\x00\x00\x00\x62\x00\x00\x00\x00\x00\x01\x00\x00\x06\xae\
 \x00\x00\x00\x10\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\
-\x00\x00\x00\x78\x00\x00\x00\x00\x00\x01\x00\x00\x09\x54\
-\x00\x00\x00\x8e\x00\x00\x00\x00\x00\x01\x00\x00\x0c\x56\
+\x00\x00\x00\x26\x00\x00\x00\x00\x00\x01\x00\x00\x03\x43\
+\x00\x00\x00\xbe\x00\x00\x00\x00\x00\x01\x00\x00\x0d\xe4\
+\x00\x00\x01\x12\x00\x00\x00\x00\x00\x01\x00\x00\x15\x2b\
+\x00\x00\x01\x48\x00\x00\x00\x00\x00\x01\x00\x00\x19\xe3\
+\x00\x00\x00\x7e\x00\x00\x00\x00\x00\x01\x00\x00\x09\x34\
+\x00\x00\x01\x30\x00\x00\x00\x00\x00\x01\x00\x00\x17\x1f\
+\x00\x00\x01\x7c\x00\x00\x00\x00\x00\x01\x00\x00\x1f\x05\
+\x00\x00\x00\xda\x00\x00\x00\x00\x00\x01\x00\x00\x10\x14\
+\x00\x00\x01\x66\x00\x00\x00\x00\x00\x01\x00\x00\x1c\x6d\
 "
 
 qt_resource_struct_v2 = b"\
 \x00\x00\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00\x01\
 \x00\x00\x00\x00\x00\x00\x00\x00\
-\x00\x00\x00\x00\x00\x02\x00\x00\x00\x0a\x00\x00\x00\x02\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x0e\x00\x00\x00\x02\
 \x00\x00\x00\x00\x00\x00\x00\x00\
-\x00\x00\x00\xc2\x00\x00\x00\x00\x00\x01\x00\x00\x11\x78\
-\x00\x00\x01\x69\xc6\x52\xec\x75\
-\x00\x00\x00\x3c\x00\x00\x00\x00\x00\x01\x00\x00\x03\x9b\
-\x00\x00\x01\x69\xc6\x48\x91\x8f\
-\x00\x00\x00\xe4\x00\x00\x00\x00\x00\x01\x00\x00\x13\x8d\
-\x00\x00\x01\x69\xc6\x5e\x7a\x1e\
-\x00\x00\x00\x26\x00\x00\x00\x00\x00\x01\x00\x00\x01\x9f\
-\x00\x00\x01\x69\xc6\x53\xc1\x17\
-\x00\x00\x00\xa4\x00\x00\x00\x00\x00\x01\x00\x00\x0e\xee\
-\x00\x00\x01\x69\xc6\x48\x91\x9f\
-\x00\x00\x00\x58\x00\x00\x00\x00\x00\x01\x00\x00\x06\x21\
-\x00\x00\x01\x69\xc6\x48\x91\x97\
-\x00\x00\x00\xfa\x00\x00\x00\x00\x00\x01\x00\x00\x16\xd0\
-\x00\x00\x01\x69\xc6\x48\xdd\x78\
+\x00\x00\x00\xf0\x00\x00\x00\x00\x00\x01\x00\x00\x13\x16\
+\x00\x00\x01\xa1\x4b\x9a\x0f\x4c\
+\x00\x00\x00\x9e\x00\x00\x00\x00\x00\x01\x00\x00\x0c\x67\
+\x00\x00\x01\xa1\x4b\x9a\x0f\x4c\
+\x00\x00\x00\x3c\x00\x00\x00\x00\x00\x01\x00\x00\x05\x3f\
+\x00\x00\x01\xa1\x4b\x9a\x0f\x4d\
+\x00\x00\x00\x62\x00\x00\x00\x00\x00\x01\x00\x00\x06\xae\
+\x00\x00\x01\xa1\x4b\x9a\x0f\x4c\
 \x00\x00\x00\x10\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\
-\x00\x00\x01\x69\xc6\x53\x3b\x07\
-\x00\x00\x00\x78\x00\x00\x00\x00\x00\x01\x00\x00\x09\x54\
-\x00\x00\x01\x69\xc6\x5b\xac\x3d\
-\x00\x00\x00\x8e\x00\x00\x00\x00\x00\x01\x00\x00\x0c\x56\
-\x00\x00\x01\x69\xc6\x56\x9a\x57\
+\x00\x00\x01\xa1\x4b\x9a\x0f\x4c\
+\x00\x00\x00\x26\x00\x00\x00\x00\x00\x01\x00\x00\x03\x43\
+\x00\x00\x01\xa1\x4b\x9a\x0f\x4c\
+\x00\x00\x00\xbe\x00\x00\x00\x00\x00\x01\x00\x00\x0d\xe4\
+\x00\x00\x01\xa1\x4b\x9a\x0f\x4d\
+\x00\x00\x01\x12\x00\x00\x00\x00\x00\x01\x00\x00\x15\x2b\
+\x00\x00\x01\xa1\x4b\x9a\x0f\x4d\
+\x00\x00\x01\x48\x00\x00\x00\x00\x00\x01\x00\x00\x19\xe3\
+\x00\x00\x01\xa1\x4b\x9a\x0f\x4d\
+\x00\x00\x00\x7e\x00\x00\x00\x00\x00\x01\x00\x00\x09\x34\
+\x00\x00\x01\xa1\x4b\x9a\x0f\x4d\
+\x00\x00\x01\x30\x00\x00\x00\x00\x00\x01\x00\x00\x17\x1f\
+\x00\x00\x01\xa1\x4b\x9a\x0f\x4c\
+\x00\x00\x01\x7c\x00\x00\x00\x00\x00\x01\x00\x00\x1f\x05\
+\x00\x00\x01\xa1\x4b\x9a\x0f\x4d\
+\x00\x00\x00\xda\x00\x00\x00\x00\x00\x01\x00\x00\x10\x14\
+\x00\x00\x01\xa1\x4b\x9a\x0f\x4c\
+\x00\x00\x01\x66\x00\x00\x00\x00\x00\x01\x00\x00\x1c\x6d\
+\x00\x00\x01\xa1\x4b\x9a\x0f\x4c\
 "
 
 qt_version = [int(v) for v in QtCore.qVersion().split('.')]
@@ -0,0 +1,97 @@
+"""
+Сравнивает накладные расходы движков трассировки на строку
+
+Пример запуска: `python benchmarks/engines.py`
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.pardir))
+
+from app.debugging import Debugger, DebugCommand, ENGINES
+
+ITERATIONS = 200000
+# количество строк, исполняемых программой (тело цикла из двух строк)
+LINES = ITERATIONS * 2
+SOURCE = '''def work(n):
+    total = 0
+    for i in range({iterations}):
+        total += i
+        n = total - n
+    return total
+result = work(1)
+done = True'''.format(iterations=ITERATIONS)
+# строка вне цикла, чтобы движки проверяли таблицу точек остановки
+BREAKPOINT = 8
+
+
+def measure_plain():
+    code = compile(SOURCE, '<benchmark>', 'exec')
+
+    start = time.perf_counter()
+    exec(code, {})
+
+    return time.perf_counter() - start
+
+
+def measure_engine(engine, command):
+    """
+    Время от первой остановки до остановки на `BREAKPOINT`
+
+    :param command: команда после первой остановки (step over на строке
+        вызова или continue)
+    """
+    debugger = Debugger(engine=engine)
+    debugger.start(SOURCE, '<benchmark>', breakpoints=[BREAKPOINT])
+
+    debugger.get_snapshot()
+    if command == DebugCommand.STEP_OVER:
+        # первая остановка - строка с def, затем строка вызова
+        debugger.send_command(DebugCommand.STEP_OVER)
+        debugger.get_snapshot()
+
+    start = time.perf_counter()
+    debugger.send_command(command)
+    snapshot = debugger.get_snapshot()
+    elapsed = time.perf_counter() - start
+    assert snapshot['line_no'] == BREAKPOINT
+
+    debugger.finish()
+    debugger.join()
+
+    return elapsed
+
+
+def main():
+    plain = measure_plain()
+    print('python {}, {} строк'.format(sys.version.split()[0], LINES))
+    print('{:<12}{:>12}{:>18}{:>18}'.format(
+        'движок', 'continue, с', 'continue, нс/стр', 'step over, нс/стр'))
+    print('{:<12}{:>12.3f}'.format('exec', plain))
+
+    for name, engine in sorted(ENGINES.items()):
+        if not engine.is_available():
+            print('{:<12}{:>12}'.format(name, 'недоступен'))
+            continue
+
+        try:
+            continue_ = measure_engine(name, DebugCommand.CONTINUE)
+            step_over = measure_engine(name, DebugCommand.STEP_OVER)
+        except Exception as e:
+            # например, `bytecode` не поддерживает байткод интерпретатора
+            print('{:<12}{:>12} {}: {}'.format(
+                name, 'ошибка', type(e).__name__, e))
+            continue
+
+        print('{:<12}{:>12.3f}{:>18.1f}{:>18.1f}'.format(
+            name, continue_,
+            (continue_ - plain) / LINES * 1e9,
+            (step_over - plain) / LINES * 1e9))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,358 @@
+"""
+Бенчмарки модификации байткода и пошагового выполнения
+
+Результаты сохраняются в JSON, чтобы сравнивать их между коммитами
+
+Примеры запуска:
+    `python benchmarks/suite.py -o results.json`
+    `python benchmarks/suite.py --quick`
+    `python benchmarks/suite.py --compare old.json new.json`
+"""
+
+import argparse
+import json
+import os
+import pickle
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.pardir))
+
+from app.debugging import Debugger, DebugCommand, DebuggerExit, ENGINES
+from app.debugging.bytecode_modifier import BytecodeModifier
+from app.debugging.wire import Encoder, Decoder
+
+# модули стандартной библиотеки как пример реального кода
+REAL_WORLD_MODULES = ('argparse', 'inspect', 'typing')
+
+
+def measure(func, repeat):
+    """
+    Минимальное время вызова `func` из `repeat` попыток
+
+    Минимум меньше всего зависит от фоновой нагрузки
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def generate_module(functions):
+    """Исходный код модуля из `functions` функций и классов"""
+    chunks = []
+    for i in range(functions):
+        chunks.append('''def function_{i}(n, *args, key=None):
+    total = 0
+    for j in range(n):
+        if j % 3 == 0:
+            total += j
+        else:
+            total -= 1
+    return total, [x * 2 for x in args]
+
+
+class Class_{i}:
+    def method(self, value):
+        try:
+            return value + {i}
+        except TypeError:
+            return None
+'''.format(i=i))
+
+    return '\n\n'.join(chunks)
+
+
+def real_world_sources():
+    for name in REAL_WORLD_MODULES:
+        module = __import__(name)
+        with open(module.__file__, encoding='utf-8') as f:
+            yield name, f.read()
+
+
+def bench_modify(results, quick):
+    """Пропускная способность `BytecodeModifier.modify` (строк в секунду)"""
+    modifier = BytecodeModifier(
+        'trace', 'trace_return', 'lazy_bind', 'lazy_load')
+    repeat = 1 if quick else 3
+
+    sources = [
+        ('generated_{}'.format(n), generate_module(n))
+        for n in ((50, ) if quick else (50, 500))]
+    sources.extend(real_world_sources())
+
+    for name, source in sources:
+        code = compile(source, name, 'exec')
+        lines = source.count('\n') + 1
+
+        for lazy in (False, True):
+            elapsed = measure(
+                lambda: modifier.modify(code, lazy=lazy), repeat)
+            results.append(result(
+                'modify', {'source': name, 'lines': lines, 'lazy': lazy},
+                lines / elapsed, 'lines/s'))
+
+
+def run_to_end(debugger, source, engine):
+    """Время исполнения программы от первой остановки до конца"""
+    debugger.start(source, '<benchmark-{}>'.format(engine))
+    debugger.get_snapshot()
+
+    start = time.perf_counter()
+    debugger.send_command(DebugCommand.CONTINUE)
+    try:
+        while True:
+            debugger.get_snapshot()
+    except DebuggerExit:
+        pass
+
+    return time.perf_counter() - start
+
+
+def bench_slowdown(results, quick):
+    """Замедление программы без точек остановки относительно `exec`"""
+    iterations = 20000 if quick else 200000
+    source = '''def work(n):
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+result = work({})'''.format(iterations)
+    repeat = 1 if quick else 3
+
+    code = compile(source, '<benchmark>', 'exec')
+    plain = measure(lambda: exec(code, {}), repeat)
+    results.append(result(
+        'exec', {'iterations': iterations}, plain, 's'))
+
+    for engine, engine_class in sorted(ENGINES.items()):
+        if not engine_class.is_available():
+            continue
+
+        try:
+            elapsed = min(
+                run_to_end(Debugger(engine=engine), source, engine)
+                for _ in range(repeat))
+        except Exception:
+            # например, `bytecode` не поддерживает байткод интерпретатора
+            continue
+
+        results.append(result(
+            'slowdown', {'engine': engine, 'iterations': iterations},
+            elapsed / plain, 'x'))
+
+
+def make_frame(variables):
+    """Кадр уровня модуля с глобальными переменными `variables`"""
+    globals_ = dict(variables)
+    exec('import sys\nframe = sys._getframe()', globals_)
+    frame = globals_.pop('frame')
+    del globals_['sys']
+
+    return frame
+
+
+def bench_snapshot(results, quick):
+    """
+    Стоимость остановки (снимок + `_sanitize`) от размера globals
+
+    Полный снимок (`full`, после `resync`) и снимок отличий от предыдущего
+    измеряются отдельно
+    """
+    debugger = Debugger()
+    counts = (10, 100) if quick else (10, 100, 1000)
+    value_sizes = (1, 1000) if quick else (1, 100, 10000)
+    stops = 20 if quick else 100
+
+    for count in counts:
+        for value_size in value_sizes:
+            frame = make_frame({
+                'variable_{}'.format(i): list(range(value_size))
+                for i in range(count)})
+
+            for full in (True, False):
+                def stop():
+                    for _ in range(stops):
+                        if full:
+                            debugger.resync()
+                        debugger._commands.put(DebugCommand.STEP_IN)
+                        debugger._pause(frame)
+                        debugger._snapshots.get()
+
+                elapsed = measure(stop, 1 if quick else 3)
+                results.append(result(
+                    'snapshot',
+                    {'variables': count, 'value_size': value_size,
+                     'full': full},
+                    elapsed / stops, 's'))
+
+
+def bench_round_trip(results, quick):
+    """Задержка `send_command` -> `get_snapshot` при пошаговом выполнении"""
+    steps = 200 if quick else 2000
+    source = '''x = 0
+while True:
+    x += 1'''
+
+    for engine, engine_class in sorted(ENGINES.items()):
+        if not engine_class.is_available():
+            continue
+
+        debugger = Debugger(engine=engine)
+        try:
+            debugger.start(source, '<round-trip-{}>'.format(engine))
+        except Exception:
+            continue
+
+        debugger.get_snapshot()
+        timings = []
+        for _ in range(steps):
+            start = time.perf_counter()
+            debugger.send_command(DebugCommand.STEP_IN)
+            debugger.get_snapshot()
+            timings.append(time.perf_counter() - start)
+
+        debugger.finish()
+        debugger.join()
+
+        timings.sort()
+        params = {'engine': engine, 'steps': steps}
+        results.append(result(
+            'round_trip_median', params, statistics.median(timings), 's'))
+        results.append(result(
+            'round_trip_p95', params,
+            timings[int(len(timings) * 0.95)], 's'))
+
+
+def bench_wire(results, quick):
+    """Стоимость и размер снимка в двоичном формате и в pickle"""
+    debugger = Debugger()
+    counts = (100, 1000) if quick else (100, 1000, 10000)
+    repeat = 3 if quick else 10
+
+    for count in counts:
+        frame = make_frame({
+            'variable_{}'.format(i): [i] if i % 2 else i
+            for i in range(count)})
+        debugger.resync()
+        debugger._commands.put(DebugCommand.STEP_IN)
+        debugger._pause(frame)
+        snapshot = debugger._snapshots.get()
+
+        encoder = Encoder()
+        first = encoder.encode(snapshot)
+        # повторный снимок: имена уже в таблице строк
+        data = encoder.encode(snapshot)
+        decoder = Decoder()
+        decoder.feed(first)
+
+        params = {'variables': count}
+        results.append(result(
+            'wire_encode', params,
+            measure(lambda: encoder.encode(snapshot), repeat), 's'))
+        results.append(result(
+            'wire_decode', params,
+            measure(lambda: decoder.decode(data[4:]), repeat), 's'))
+        results.append(result('wire_size', params, len(data), 'bytes'))
+        results.append(result(
+            'wire_size_first', params, len(first), 'bytes'))
+        results.append(result(
+            'pickle_size', params, len(pickle.dumps(snapshot)), 'bytes'))
+
+
+BENCHMARKS = {
+    'modify': bench_modify,
+    'slowdown': bench_slowdown,
+    'snapshot': bench_snapshot,
+    'round_trip': bench_round_trip,
+    'wire': bench_wire
+}
+
+
+def result(name, params, value, unit):
+    return {'name': name, 'params': params, 'value': value, 'unit': unit}
+
+
+def metadata():
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'date': datetime.now().isoformat(timespec='seconds')
+    }
+
+
+def result_key(item):
+    return item['name'], json.dumps(item['params'], sort_keys=True)
+
+
+def compare(old_path, new_path):
+    """Печатает изменение результатов `new_path` относительно `old_path`"""
+    with open(old_path, encoding='utf-8') as f:
+        old = {result_key(item): item for item in json.load(f)['results']}
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)['results']
+
+    for item in new:
+        base = old.get(result_key(item))
+        if base is None or not base['value']:
+            continue
+
+        print('{:<20}{:<60}{:>10.2f}x'.format(
+            item['name'], json.dumps(item['params'], sort_keys=True),
+            item['value'] / base['value']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '-o', '--output', help='файл для результатов (JSON)')
+    parser.add_argument(
+        '--quick', action='store_true', help='уменьшенные размеры')
+    parser.add_argument(
+        '--only', choices=sorted(BENCHMARKS), action='append',
+        help='запустить только указанные бенчмарки')
+    parser.add_argument(
+        '--compare', nargs=2, metavar=('OLD', 'NEW'),
+        help='сравнить два файла результатов')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = []
+    for name in args.only or sorted(BENCHMARKS):
+        BENCHMARKS[name](results, args.quick)
+
+    report = {'meta': metadata(), 'results': results}
+    for item in results:
+        print('{:<20}{:<60}{:>14.6g} {}'.format(
+            item['name'], json.dumps(item['params'], sort_keys=True),
+            item['value'], item['unit']))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,12 +14,32 @@ def main():
 
     debugger_client.update.connect(window.update)
     debugger_client.debugging_finished.connect(window.on_finish)
+    debugger_client.start_failed.connect(window.on_start_failed)
+    debugger_client.logs.connect(window.on_logs)
+    window.set_renderer(debugger_client.render)
+    window.set_frame_loader(debugger_client.frame_variables)
+    window.set_history_loader(debugger_client.history_state)
+    window.watch_added.connect(debugger_client.add_watch)
+    window.watch_removed.connect(debugger_client.remove_watch)
 
     window.start_clicked.connect(debugger_client.start)
     window.step_over_clicked.connect(debugger_client.step_over)
     window.step_in_clicked.connect(debugger_client.step_in)
     window.step_out_clicked.connect(debugger_client.step_out)
+    window.continue_clicked.connect(debugger_client.continue_)
     window.stop_clicked.connect(debugger_client.finish)
+    window.record_history_toggled.connect(
+        debugger_client.set_record_history)
+    window.animate_clicked.connect(debugger_client.animate)
+    window.animate_stopped.connect(debugger_client.stop_animation)
+    window.snapshot_shown.connect(debugger_client.snapshot_shown)
+
+    breakpoint_area = window.code_editor.breakpoint_area
+    breakpoint_area.breakpoint_added.connect(debugger_client.add_breakpoint)
+    breakpoint_area.breakpoint_removed.connect(
+        debugger_client.remove_breakpoint)
+    breakpoint_area.logpoint_added.connect(debugger_client.add_logpoint)
+    breakpoint_area.logpoint_removed.connect(debugger_client.remove_logpoint)
 
     # window.showMaximized()
     window.show()
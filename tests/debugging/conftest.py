@@ -8,13 +8,15 @@ sys.path.append(os.path.join(
     os.path.pardir,
     os.path.pardir))
 from app.debugging.bytecode_modifier import BytecodeModifier
+from app.debugging.debugger import Debugger
+from app.debugging.engines import ENGINES
 
 
 @pytest.fixture()
-def command():
-    cmd = 'command'
+def trace_return():
+    trace = 'trace_return'
 
-    return cmd
+    return trace
 
 
 @pytest.fixture()
@@ -25,8 +27,8 @@ def trace_func():
 
 
 @pytest.fixture()
-def bytecode_modifier(trace_func, command):
-    modifier = BytecodeModifier(trace_func, command)
+def bytecode_modifier(trace_func, trace_return):
+    modifier = BytecodeModifier(trace_func, trace_return)
 
     return modifier
 
@@ -50,3 +52,23 @@ def sample_code(sample_source):
     sample = compile(sample_source, '<string>', 'exec')
 
     return sample
+
+
+ENGINE_OPTIONS = {
+    'bytecode': {},
+    'bytecode-lazy': {'lazy': True},
+    'settrace': {'engine': 'settrace'},
+    'monitoring': {'engine': 'monitoring'}
+}
+
+
+@pytest.fixture(params=sorted(ENGINE_OPTIONS))
+def make_debugger(request):
+    options = ENGINE_OPTIONS[request.param]
+    if not ENGINES[options.get('engine', 'bytecode')].is_available():
+        pytest.skip('{} is not available'.format(request.param))
+
+    def make(**kwargs):
+        return Debugger(**options, **kwargs)
+
+    return make
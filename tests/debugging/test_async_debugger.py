@@ -0,0 +1,126 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.pardir,
+    os.path.pardir))
+
+from app.debugging.async_debugger import AsyncDebugger
+from app.debugging.common import DebugCommand, InvalidHandle
+from app.debugging.debugger import Debugger
+from app.debugging.server import DebuggerServer
+
+
+SOURCE = 'a = 1\nb = [a, 2]\nc = 3\n'
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(
+        asyncio.wait_for(coroutine, 10))
+
+
+def test_snapshots_stream():
+    debugger = AsyncDebugger()
+
+    async def session():
+        await debugger.start(SOURCE, '<string>')
+        lines = []
+        async for snapshot in debugger.snapshots():
+            lines.append(snapshot['line_no'])
+            await debugger.send_command(DebugCommand.STEP_OVER)
+        return lines
+
+    assert run(session()) == [1, 2, 3]
+
+
+def test_requests_to_stopped_program():
+    debugger = AsyncDebugger()
+
+    async def session():
+        await debugger.start(SOURCE, '<string>', breakpoints=[3])
+        await debugger.get_snapshot()
+        await debugger.send_command(DebugCommand.CONTINUE)
+        snapshot = await debugger.get_snapshot()
+        handle = snapshot['global_variables']['b']
+
+        rendered = await debugger.render(handle.id)
+        children = await debugger.children(handle.id)
+        with pytest.raises(InvalidHandle):
+            await debugger.render(0)
+        await debugger.finish()
+
+        return rendered.text, children.total
+
+    assert run(session()) == ('[1, 2]', 2)
+
+
+def test_request_to_running_program_times_out():
+    debugger = AsyncDebugger()
+    debugger.REQUEST_TIMEOUT = 0.1
+
+    async def session():
+        await debugger.start('''import time
+a = [1]
+end = time.monotonic() + 0.5
+while time.monotonic() < end:
+    pass
+''', '<string>', breakpoints=[3])
+        await debugger.get_snapshot()
+        await debugger.send_command(DebugCommand.CONTINUE)
+        snapshot = await debugger.get_snapshot()
+        handle = snapshot['global_variables']['a']
+        await debugger.send_command(DebugCommand.CONTINUE)
+
+        # программа выполняется: ответа нет, поток пула не остаётся занят
+        rendered = await debugger.render(handle.id)
+        await debugger.finish()
+
+        return rendered
+
+    assert run(session()) is None
+
+
+def test_cancelled_wait_keeps_snapshot():
+    debugger = AsyncDebugger(Debugger())
+
+    async def session():
+        waiting = asyncio.ensure_future(debugger.get_snapshot())
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        await debugger.start(SOURCE, '<string>')
+        await asyncio.sleep(0.1)
+        snapshot = await debugger.get_snapshot()
+        await debugger.finish()
+
+        return snapshot['line_no']
+
+    assert run(session()) == 1
+
+
+def test_one_loop_serves_many_sessions():
+    debuggers = [AsyncDebugger(Debugger()) for _ in range(3)]
+    debuggers.append(AsyncDebugger(DebuggerServer()))
+
+    async def session(debugger):
+        async with debugger:
+            await debugger.start(SOURCE, '<string>')
+            count = 0
+            async for _ in debugger.snapshots():
+                count += 1
+                await debugger.send_command(DebugCommand.STEP_OVER)
+            return count
+
+    async def sessions():
+        return await asyncio.gather(*map(session, debuggers))
+
+    try:
+        assert run(sessions()) == [3, 3, 3, 3]
+    finally:
+        debuggers[-1].debugger.close()
@@ -4,7 +4,7 @@ from collections import defaultdict
 from types import CodeType
 
 import pytest
-from bytecode import Bytecode, Compare, Instr
+from bytecode import Bytecode, Instr
 
 sys.path.append(os.path.join(
     os.path.dirname(os.path.abspath(__file__)),
@@ -12,29 +12,29 @@ sys.path.append(os.path.join(
     os.path.pardir))
 
 from app.debugging.bytecode_modifier import BytecodeModifier
-from app.debugging import DebugCommand
 
 
 def test_bytecode_modifier_created_correctly():
     trace_name = 'trace'
-    command_name = 'command'
+    trace_return_name = 'trace_return'
 
-    modifier = BytecodeModifier(trace_name, command_name)
+    modifier = BytecodeModifier(trace_name, trace_return_name)
 
     assert modifier._trace_func == trace_name
-    assert modifier._command == command_name
+    assert modifier._trace_return == trace_return_name
 
 
 def test_get_trace_func_call_instructions(bytecode_modifier, trace_func):
     line_no = 42
     expected = [
         Instr('LOAD_GLOBAL', arg=trace_func, lineno=line_no),
-        Instr('CALL_FUNCTION', arg=0, lineno=line_no),
-        Instr('POP_TOP', lineno=line_no)
+        Instr('LOAD_FAST', arg=bytecode_modifier._step, lineno=line_no),
+        Instr('CALL_FUNCTION', arg=1, lineno=line_no),
+        Instr('STORE_FAST', arg=bytecode_modifier._step, lineno=line_no)
     ]
 
-    assert (bytecode_modifier._get_trace_func_call_instructions(line_no)
-            == expected)
+    assert (bytecode_modifier._get_trace_func_call_instructions(
+        line_no, is_function=True) == expected)
 
 
 def test_modified_code_has_saved_properties(bytecode_modifier, sample_code):
@@ -96,47 +96,67 @@ def sample_inner():
     return sample_inner
 
 
-def test_every_inner_setup_is_over_variable(bytecode_modifier, sample_inner):
+def test_every_inner_setup_step_variable(bytecode_modifier, sample_inner):
     modified = bytecode_modifier.modify(sample_inner, inner=True)
     bc = Bytecode.from_code(modified)
-    is_over_setup_instructions = bc[:4]
+    step_setup_instructions = bc[:2]
 
-    assert is_over_setup_instructions[0].name == 'LOAD_NAME'
-    assert is_over_setup_instructions[0].arg == bytecode_modifier._command
+    assert step_setup_instructions[0].name == 'LOAD_CONST'
+    assert step_setup_instructions[0].arg == 0
 
-    assert is_over_setup_instructions[1].name == 'LOAD_CONST'
-    assert is_over_setup_instructions[1].arg == DebugCommand.STEP_OVER
+    assert step_setup_instructions[1].name == 'STORE_FAST'
+    assert step_setup_instructions[1].arg == bytecode_modifier._step
 
-    assert is_over_setup_instructions[2].name == 'COMPARE_OP'
-    assert is_over_setup_instructions[2].arg == Compare.EQ
 
-    assert is_over_setup_instructions[3].name == 'STORE_NAME'
-    assert is_over_setup_instructions[3].arg == 'is_over'
-
-
-def test_every_inner_check_is_over(bytecode_modifier, sample_inner):
+def test_every_inner_line_checks_step(bytecode_modifier, sample_inner):
     modified = bytecode_modifier.modify(sample_inner, inner=True)
-    groups = group_instructions_by_line(modified, skip=4)
+    lines = defaultdict(list)
+    for instr in Bytecode.from_code(modified)[2:]:
+        if isinstance(instr, Instr):
+            lines[instr.lineno].append(instr)
 
-    for line_instructions in groups.values():
-        assert line_instructions[0].name == 'LOAD_NAME'
-        assert line_instructions[0].arg == 'is_over'
+    for line_no, line_instructions in lines.items():
+        if line_no == sample_inner.co_firstlineno:
+            continue
+
+        assert line_instructions[0].name == 'LOAD_FAST'
+        assert line_instructions[0].arg == bytecode_modifier._step
 
         assert line_instructions[1].name == 'POP_JUMP_IF_TRUE'
 
 
-def test_every_inner_check_step_out(bytecode_modifier, sample_inner):
+def test_inner_return_calls_trace_return(bytecode_modifier, sample_inner):
     modified = bytecode_modifier.modify(sample_inner, inner=True)
-    groups = group_instructions_by_line(modified, skip=6)
-
-    for line_instructions in groups.values():
-        assert line_instructions[0].name == 'LOAD_NAME'
-        assert line_instructions[0].arg == bytecode_modifier._trace_func
-
-        assert line_instructions[1].name == 'LOAD_CONST'
-        assert line_instructions[1].arg == DebugCommand.STEP_OUT
-
-        assert line_instructions[2].name == 'COMPARE_OP'
-        assert line_instructions[2].arg == Compare.EQ
-
-        assert line_instructions[3].name == 'POP_JUMP_IF_TRUE'
+    instructions = [
+        instr for instr in Bytecode.from_code(modified)
+        if isinstance(instr, Instr)]
+    return_index = [instr.name for instr in instructions].index(
+        'RETURN_VALUE')
+
+    assert instructions[return_index - 6].name == 'LOAD_FAST'
+    assert instructions[return_index - 6].arg == bytecode_modifier._step
+    assert instructions[return_index - 5].name == 'POP_JUMP_IF_FALSE'
+    assert instructions[return_index - 4].name == 'LOAD_GLOBAL'
+    assert (instructions[return_index - 4].arg
+            == bytecode_modifier._trace_return)
+
+
+def test_every_line_checks_stop_lines_flag(bytecode_modifier):
+    code = compile('''a = 1
+b = 2''', '<string>', 'exec')
+    modified = bytecode_modifier.modify(code)
+    second_line = [
+        instr for instr in Bytecode.from_code(modified)
+        if isinstance(instr, Instr) and instr.lineno == 2]
+
+    assert second_line[0].name == 'LOAD_NAME'
+    assert second_line[0].arg == bytecode_modifier._step
+    assert second_line[1].name == 'POP_JUMP_IF_TRUE'
+    assert second_line[2].name == 'LOAD_GLOBAL'
+    assert second_line[2].arg == bytecode_modifier._stop_lines
+    assert second_line[3].name == 'LOAD_CONST'
+    assert second_line[3].arg == 2
+    assert second_line[4].name == 'BINARY_SUBSCR'
+    assert second_line[5].name == 'POP_JUMP_IF_FALSE'
+    assert second_line[6].name == 'LOAD_GLOBAL'
+    assert second_line[6].arg == bytecode_modifier._trace_func
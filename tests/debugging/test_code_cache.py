@@ -0,0 +1,102 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.pardir,
+    os.path.pardir))
+
+from app.debugging.code_cache import CodeCache
+from app.debugging.debugger import Debugger
+from app.debugging.bytecode_modifier import BytecodeModifier
+
+
+@pytest.fixture()
+def code_cache(tmpdir):
+    return CodeCache(str(tmpdir), maxsize=2)
+
+
+def test_key_depends_on_source_filename_and_options():
+    key = CodeCache.make_key('a = 1', '<string>', breakpoints=(1, ))
+
+    assert key == CodeCache.make_key('a = 1', '<string>', breakpoints=(1, ))
+    assert key != CodeCache.make_key('a = 2', '<string>', breakpoints=(1, ))
+    assert key != CodeCache.make_key('a = 1', 'other.py', breakpoints=(1, ))
+    assert key != CodeCache.make_key('a = 1', '<string>', breakpoints=(2, ))
+
+
+def test_get_missing_returns_none(code_cache):
+    assert code_cache.get('missing') is None
+
+
+def test_put_get_from_memory(code_cache, sample_code):
+    code_cache.put('key', sample_code)
+
+    assert code_cache.get('key') is sample_code
+
+
+def test_get_from_disk_after_memory_clear(code_cache, sample_code):
+    code_cache.put('key', sample_code)
+    code_cache.clear()
+
+    assert code_cache.get('key') == sample_code
+
+
+def test_memory_lru_eviction(sample_code):
+    code_cache = CodeCache(None, maxsize=2)
+    code_cache.put('first', sample_code)
+    code_cache.put('second', sample_code)
+    code_cache.get('first')
+    code_cache.put('third', sample_code)
+
+    assert code_cache.get('second') is None
+    assert code_cache.get('first') is sample_code
+
+
+def test_disk_eviction_keeps_recently_used(sample_code, tmpdir):
+    code_cache = CodeCache(str(tmpdir), maxsize=1, max_files=2)
+    for age, key in enumerate(['first', 'second']):
+        code_cache.put(key, sample_code)
+        os.utime(str(tmpdir.join(key + CodeCache._SUFFIX)), (age, age))
+    code_cache.clear()
+    code_cache.get('first')
+    code_cache.put('third', sample_code)
+
+    assert sorted(os.listdir(str(tmpdir))) == [
+        'first' + CodeCache._SUFFIX, 'third' + CodeCache._SUFFIX]
+
+
+def test_corrupted_file_is_ignored(code_cache, tmpdir):
+    tmpdir.join('key' + CodeCache._SUFFIX).write_binary(b'garbage')
+
+    assert code_cache.get('key') is None
+
+
+@pytest.fixture()
+def count_modify(monkeypatch):
+    original_modify = BytecodeModifier.modify
+
+    def counted_modify(self, code, **kwargs):
+        if not kwargs.get('inner'):
+            counted_modify.calls += 1
+        return original_modify(self, code, **kwargs)
+    counted_modify.calls = 0
+
+    monkeypatch.setattr(BytecodeModifier, 'modify', counted_modify)
+
+    yield counted_modify
+
+
+def test_debugger_compile_skips_modify_on_restart(
+        tmpdir, count_modify, sample_source):
+    first = Debugger(code_cache=CodeCache(str(tmpdir)))
+    first._compile(sample_source, '<string>')
+
+    second = Debugger(code_cache=CodeCache(str(tmpdir)))
+    second._compile(sample_source, '<string>')
+    assert count_modify.calls == 1
+
+    second._compile(sample_source, 'other.py')
+    assert count_modify.calls == 2
@@ -0,0 +1,322 @@
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.pardir,
+    os.path.pardir))
+
+from app.debugging.dap import DapServer, encode_message
+from app.debugging.debugger import Debugger
+from app.debugging.server import DebuggerServer
+
+
+SOURCE = '''def f(x):
+    y = x * 2
+    return y
+
+items = [1, 2, 3]
+z = f(10)
+w = z + 1
+'''
+
+
+class Client:
+    """Клиент протокола для тестов"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.seq = 0
+        self.events = []
+
+    async def read(self):
+        header = await self.reader.readuntil(b'\r\n\r\n')
+        length = int(header.split(b':')[1])
+        return json.loads((await self.reader.readexactly(length)).decode())
+
+    async def request(self, command, **arguments):
+        self.seq += 1
+        self.writer.write(encode_message({
+            'seq': self.seq, 'type': 'request', 'command': command,
+            'arguments': arguments}))
+        while True:
+            message = await self.read()
+            if message['type'] == 'event':
+                self.events.append(message)
+            elif message['request_seq'] == self.seq:
+                return message
+
+    async def event(self, name):
+        for i, message in enumerate(self.events):
+            if message['event'] == name:
+                return self.events.pop(i)
+        while True:
+            message = await self.read()
+            if message['type'] == 'event' and message['event'] == name:
+                return message
+            self.events.append(message)
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(
+        asyncio.wait_for(coroutine, 10))
+
+
+async def tcp_client(server):
+    host, port = await server.serve_tcp()
+    return Client(*await asyncio.open_connection(host, port))
+
+
+def test_launch_step_and_inspect():
+    async def session():
+        server = DapServer()
+        client = await tcp_client(server)
+
+        await client.request('initialize')
+        await client.event('initialized')
+        response = await client.request(
+            'setBreakpoints', source={'path': '<string>'},
+            breakpoints=[{'line': 2}, {'line': 6, 'logMessage': 'z'}])
+        assert [b['verified'] for b in response['body']['breakpoints']] == [
+            True, True]
+        assert (await client.request('launch', source=SOURCE))['success']
+        stopped = await client.event('stopped')
+        assert stopped['body']['reason'] == 'entry'
+
+        await client.request('continue')
+        output = await client.event('output')
+        assert output['body']['output'] == 'z\n'
+        stopped = await client.event('stopped')
+        assert stopped['body']['reason'] == 'breakpoint'
+        thread_id = stopped['body']['threadId']
+
+        trace = (await client.request(
+            'stackTrace', threadId=thread_id))['body']
+        assert [(frame['name'], frame['line'])
+                for frame in trace['stackFrames']] == [
+                    ('f', 2), ('<module>', 6)]
+        frame_ids = [frame['id'] for frame in trace['stackFrames']]
+
+        scopes = (await client.request(
+            'scopes', frameId=frame_ids[1]))['body']
+        globals_reference = scopes['scopes'][1]['variablesReference']
+        variables = (await client.request(
+            'variables', variablesReference=globals_reference))['body']
+        items = {
+            variable['name']: variable
+            for variable in variables['variables']}['items']
+        assert items['value'] == '[1, 2, 3]'
+
+        children = (await client.request(
+            'variables',
+            variablesReference=items['variablesReference']))['body']
+        assert [v['value'] for v in children['variables']] == ['1', '2', '3']
+
+        scopes = (await client.request(
+            'scopes', frameId=frame_ids[0]))['body']
+        locals_ = (await client.request(
+            'variables',
+            variablesReference=scopes['scopes'][0]['variablesReference']))
+        assert [v['name'] for v in locals_['body']['variables']] == ['x']
+
+        await client.request('stepOut', threadId=thread_id)
+        await client.event('stopped')
+        response = await client.request('stackTrace', threadId=thread_id)
+        assert response['body']['stackFrames'][0]['line'] == 7
+
+        await client.request('continue', threadId=thread_id)
+        await client.event('terminated')
+        response = await client.request('stackTrace', threadId=thread_id)
+        assert not response['success']
+
+        await server.close()
+
+    run(session())
+
+
+def test_session_survives_reconnect(tmpdir):
+    path = str(tmpdir.join('dap.sock'))
+
+    async def session():
+        server = DapServer()
+        await server.serve_unix(path)
+
+        client = Client(*await asyncio.open_unix_connection(path))
+        await client.request('launch', source='a = 1\nb = 2\n')
+        await client.event('stopped')
+        await client.request('disconnect')
+
+        client = Client(*await asyncio.open_unix_connection(path))
+        assert (await client.request('attach'))['success']
+        assert (await client.event('stopped'))['body']['reason'] == 'entry'
+        await client.request('next')
+        await client.event('stopped')
+        trace = (await client.request('stackTrace', threadId=1))['body']
+        assert trace['stackFrames'][0]['line'] == 2
+
+        await client.request('disconnect', terminateDebuggee=True)
+        await server.close()
+
+    run(session())
+
+
+def test_requests_follow_thread_id():
+    source = '''import threading
+def worker(n):
+    x = n
+    y = x + 1
+threads = [
+    threading.Thread(target=worker, args=(i, ), name='worker-{}'.format(i))
+    for i in range(2)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+'''
+
+    async def session():
+        server = DapServer(Debugger(lazy=True, non_stop=True))
+        client = await tcp_client(server)
+
+        await client.request(
+            'setBreakpoints', source={'path': '<string>'},
+            breakpoints=[{'line': 3}])
+        await client.request('launch', source=source)
+        await client.event('stopped')
+        await client.request('continue')
+        workers = [
+            (await client.event('stopped'))['body']['threadId']
+            for _ in range(2)]
+
+        threads = (await client.request('threads'))['body']['threads']
+        names = {thread['id']: thread['name'] for thread in threads}
+        assert sorted(names[thread_id] for thread_id in workers) == [
+            'worker-0', 'worker-1']
+
+        # шаг одного потока не трогает остановку другого
+        await client.request('next', threadId=workers[0])
+        stopped = await client.event('stopped')
+        assert stopped['body'] == {'reason': 'step', 'threadId': workers[0]}
+
+        async def local_n(thread_id):
+            trace = (await client.request(
+                'stackTrace', threadId=thread_id))['body']
+            frame = trace['stackFrames'][0]
+            scopes = (await client.request(
+                'scopes', frameId=frame['id']))['body']
+            variables = (await client.request(
+                'variables',
+                variablesReference=scopes['scopes'][0][
+                    'variablesReference']))['body']['variables']
+            values = {v['name']: v['value'] for v in variables}
+            return frame['line'], values['n']
+
+        first_line, first_n = await local_n(workers[0])
+        second_line, second_n = await local_n(workers[1])
+        assert (first_line, second_line) == (4, 3)
+        assert {first_n, second_n} == {'0', '1'}
+
+        response = await client.request('continue', threadId=workers[0])
+        assert not response['body']['allThreadsContinued']
+        response = await client.request('continue', threadId=workers[1])
+        assert response['body']['allThreadsContinued']
+        await client.event('terminated')
+
+        await server.close()
+
+    run(session())
+
+
+def test_rejected_launch_and_breakpoints_keep_connection():
+    async def session():
+        server = DapServer()
+        client = await tcp_client(server)
+
+        response = await client.request('launch', source='x = (\n')
+        assert not response['success']
+        assert (await client.request('launch', source=''))['message']
+
+        await client.request(
+            'setBreakpoints', source={'path': '<string>'},
+            breakpoints=[{'line': 1, 'condition': 'x >'}])
+        response = await client.request('launch', source='x = 1\n')
+        assert not response['success']
+        assert 'x >' in response['message']
+
+        # сообщение не объект: пропускается
+        client.writer.write(encode_message([1, 2]))
+        await client.request(
+            'setBreakpoints', source={'path': '<string>'}, breakpoints=[])
+        assert (await client.request('launch', source='x = 1\ny = 2\n'))[
+            'success']
+        await client.event('stopped')
+
+        response = await client.request(
+            'setBreakpoints', source={'path': '<string>'},
+            breakpoints=[{'line': 2, 'logMessage': 'value {'}])
+        assert response['success']
+        assert not response['body']['breakpoints'][0]['verified']
+
+        await client.request('disconnect', terminateDebuggee=True)
+        await server.close()
+
+    run(session())
+
+
+def test_out_of_process_backend(tmpdir):
+    program = tmpdir.join('program.py')
+    program.write(SOURCE)
+    backend = DebuggerServer()
+
+    async def session():
+        server = DapServer(backend)
+        client = await tcp_client(server)
+
+        await client.request(
+            'setBreakpoints', source={'path': str(program)},
+            breakpoints=[{'line': 2}])
+        await client.request('launch', program=str(program))
+        await client.event('stopped')
+        await client.request('continue')
+        thread_id = (await client.event('stopped'))['body']['threadId']
+
+        threads = (await client.request('threads'))['body']['threads']
+        assert thread_id in [thread['id'] for thread in threads]
+        trace = (await client.request(
+            'stackTrace', threadId=thread_id))['body']
+        scopes = (await client.request(
+            'scopes', frameId=trace['stackFrames'][1]['id']))['body']
+        variables = (await client.request(
+            'variables',
+            variablesReference=scopes['scopes'][0]['variablesReference']))
+        values = {
+            variable['name']: variable['value']
+            for variable in variables['body']['variables']}
+        assert values['items'] == '[1, 2, 3]'
+
+        await client.request('disconnect', terminateDebuggee=True)
+        await server.close()
+
+    try:
+        run(session())
+    finally:
+        backend.close()
+
+
+def test_unsupported_command_and_not_stopped():
+    async def session():
+        server = DapServer()
+        client = await tcp_client(server)
+
+        response = await client.request('evaluate', expression='1')
+        assert not response['success']
+        response = await client.request('next')
+        assert not response['success']
+        assert not (await client.request('attach'))['success']
+
+        await server.close()
+
+    run(session())
@@ -1,6 +1,7 @@
 import os
 import sys
 import threading
+import time
 from queue import Queue
 
 import pytest
@@ -12,7 +13,11 @@ sys.path.append(os.path.join(
 
 from app.debugging.debugger import Debugger
 from app.debugging.bytecode_modifier import BytecodeModifier
-from app.debugging.common import EmptySourceCode, DebugCommand, DebuggerExit
+from app.debugging.common import (
+    EmptySourceCode, DebugCommand, DebuggerExit, Handle,
+    HistoryState, InvalidBreakpointCondition, InvalidHandle, Rendered,
+    Children, StackFrame, UnknownThread)
+from app.debugging.rendering import RenderPolicy
 
 
 @pytest.fixture()
@@ -95,7 +100,7 @@ def test_finish(debugger, sample_source):
 
 @pytest.fixture()
 def patch_modify(monkeypatch):
-    def patched_modify(source, filename):
+    def patched_modify(source, filename, **kwargs):
         patched_modify.is_called = True
 
     monkeypatch.setattr(BytecodeModifier, 'modify', patched_modify)
@@ -149,13 +154,819 @@ def test_bootstrap_set_finished(patch_run, debugger, sample_code):
     assert debugger._finished.is_set()
 
 
-def test_sanitize_contain_only_str(debugger, sample_code):
+def test_continue_stops_only_at_breakpoints(make_debugger):
+    debugger = make_debugger()
+    source = '''a = 1
+b = 2
+for i in range(3):
+    c = i
+d = 4'''
+    debugger.start(source, '<string>', breakpoints=[4])
+
+    line_numbers = []
+    try:
+        while True:
+            line_numbers.append(debugger.get_snapshot()['line_no'])
+            debugger.send_command(DebugCommand.CONTINUE)
+    except DebuggerExit:
+        pass
+
+    assert line_numbers == [1, 4, 4, 4]
+
+
+def test_breakpoint_added_during_session(make_debugger):
+    debugger = make_debugger()
+    source = '''a = 1
+for i in range(3):
+    b = i
+c = 2'''
+    debugger.start(source, '<string>')
+
+    assert debugger.get_snapshot()['line_no'] == 1
+    debugger.add_breakpoint(3)
+    debugger.send_command(DebugCommand.CONTINUE)
+    assert debugger.get_snapshot()['line_no'] == 3
+
+    debugger.remove_breakpoint(3)
+    debugger.add_breakpoint(4)
+    debugger.send_command(DebugCommand.CONTINUE)
+    assert debugger.get_snapshot()['line_no'] == 4
+
+    debugger.send_command(DebugCommand.CONTINUE)
+    with pytest.raises(DebuggerExit):
+        debugger.get_snapshot()
+
+
+def test_breakpoint_out_of_source_is_ignored(debugger, sample_source):
+    debugger.start(sample_source, '<string>')
+
+    debugger.add_breakpoint(1000)
+    debugger.remove_breakpoint(-1)
+
+    debugger.finish()
+    debugger.join()
+
+
+@pytest.fixture()
+def loop_source():
+    source = '''def f(n):
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+r = f(1000)
+for j in range(5):
+    k = j'''
+
+    return source
+
+
+def preview(variables, name):
+    handle = variables.get(name)
+
+    return None if handle is None else handle.preview
+
+
+def run_with_continue(debugger):
+    stops = []
+    try:
+        while True:
+            snapshot = debugger.get_snapshot()
+            stops.append((
+                snapshot['line_no'],
+                preview(snapshot['local_variables'], 'i'),
+                preview(snapshot['global_variables'], 'j')))
+            debugger.send_command(DebugCommand.CONTINUE)
+    except DebuggerExit:
+        pass
+
+    return stops
+
+
+def test_conditional_breakpoint_in_function(make_debugger, loop_source):
+    debugger = make_debugger()
+    debugger.start(loop_source, '<string>', conditions={4: 'i == 998'})
+
+    assert run_with_continue(debugger) == [(1, None, None), (4, '998', None)]
+
+
+def test_conditional_breakpoint_error_stops(make_debugger, loop_source):
+    debugger = make_debugger()
+    debugger.start(
+        loop_source, '<string>', conditions={8: 'j > 2 if j else missing'})
+
+    assert run_with_continue(debugger) == [
+        (1, None, None), (8, None, '0'), (8, None, '3'), (8, None, '4')]
+
+
+def test_conditional_breakpoint_does_not_affect_stepping(
+        make_debugger, loop_source):
+    debugger = make_debugger()
+    debugger.start(loop_source, '<string>', conditions={8: 'False'})
+
+    lines = []
+    try:
+        while True:
+            lines.append(debugger.get_snapshot()['line_no'])
+            debugger.send_command(DebugCommand.STEP_OVER)
+    except DebuggerExit:
+        pass
+
+    assert lines.count(8) == 5
+
+
+@pytest.fixture()
+def recursive_source():
+    source = '''def fact(n):
+    if n <= 1:
+        return 1
+    result = n * fact(n - 1)
+    return result
+a = fact(3)
+b = a'''
+
+    return source
+
+
+def run_with_commands(debugger, commands):
+    lines = []
+    commands = iter(commands)
+    try:
+        while True:
+            lines.append(debugger.get_snapshot()['line_no'])
+            debugger.send_command(next(commands, DebugCommand.CONTINUE))
+    except DebuggerExit:
+        pass
+
+    return lines
+
+
+def test_step_over_skips_call(make_debugger, loop_source):
+    debugger = make_debugger()
+    debugger.start(loop_source, '<string>')
+    lines = run_with_commands(debugger, [DebugCommand.STEP_OVER] * 3)
+
+    assert lines == [1, 6, 7, 8]
+    assert debugger.get_hit_counts() == {}
+
+
+def test_step_over_stops_at_breakpoint_in_call(make_debugger, loop_source):
+    debugger = make_debugger()
+    debugger.start(loop_source, '<string>', breakpoints=[5])
+    lines = run_with_commands(debugger, [DebugCommand.STEP_OVER] * 3)
+
+    assert lines == [1, 6, 5, 7]
+
+
+def test_step_over_in_recursion_stays_in_frame(
+        make_debugger, recursive_source):
+    debugger = make_debugger()
+    debugger.start(recursive_source, '<string>')
+    commands = [DebugCommand.STEP_OVER, DebugCommand.STEP_IN] + [
+        DebugCommand.STEP_OVER] * 4
+    lines = run_with_commands(debugger, commands)
+
+    assert lines == [1, 6, 2, 4, 5, 7]
+
+
+def test_step_over_last_line_stops_in_caller(
+        make_debugger, recursive_source):
+    debugger = make_debugger()
+    debugger.start(recursive_source, '<string>')
+    commands = [DebugCommand.STEP_OVER, DebugCommand.STEP_IN] + [
+        DebugCommand.STEP_IN] * 3 + [DebugCommand.STEP_OVER] * 3
+    lines = run_with_commands(debugger, commands)
+
+    assert lines == [1, 6, 2, 4, 2, 4, 5, 5, 7]
+
+
+def test_step_out_stops_in_caller(make_debugger, recursive_source):
+    debugger = make_debugger()
+    debugger.start(recursive_source, '<string>')
+    commands = [
+        DebugCommand.STEP_OVER, DebugCommand.STEP_IN, DebugCommand.STEP_IN,
+        DebugCommand.STEP_IN, DebugCommand.STEP_OUT, DebugCommand.STEP_OUT]
+    lines = run_with_commands(debugger, commands)
+
+    assert lines == [1, 6, 2, 4, 2, 5, 7]
+
+
+@pytest.mark.parametrize('command', [
+    DebugCommand.STEP_OVER, DebugCommand.STEP_OUT])
+def test_step_from_raising_call_stops_in_handler(make_debugger, command):
+    debugger = make_debugger()
+    debugger.start('''def f():
+    raise ValueError
+try:
+    f()
+except ValueError:
+    x = 1
+y = 2
+''', '<string>')
+    commands = [DebugCommand.STEP_IN] * 3 + [command]
+    lines = run_with_commands(debugger, commands)
+
+    assert lines[:5] == [1, 3, 4, 2, 5]
+
+
+def test_invalid_condition_raise_exception(debugger, loop_source):
+    with pytest.raises(InvalidBreakpointCondition):
+        debugger.start(loop_source, '<string>', conditions={8: 'j >'})
+
+    with pytest.raises(InvalidBreakpointCondition):
+        debugger.start(
+            loop_source, '<string>', conditions={8: 'any(x for x in [j])'})
+
+
+def test_logpoint_records_without_stopping(make_debugger, loop_source):
+    debugger = make_debugger(log_size=3)
+    debugger.start(
+        loop_source, '<string>', logpoints={4: 'i={i} total={total}'})
+
+    assert [stop[0] for stop in run_with_continue(debugger)] == [1]
+
+    records = debugger.drain_logs()
+    assert [record.message for record in records] == [
+        'i=997 total=496506', 'i=998 total=497503', 'i=999 total=498501']
+    assert [record.hit_count for record in records] == [998, 999, 1000]
+    assert debugger.dropped_logs == 997
+    assert debugger.drain_logs() == []
+
+
+def test_hit_counts_and_drain_limit(make_debugger, loop_source):
+    debugger = make_debugger()
+    debugger.start(
+        loop_source, '<string>',
+        breakpoints=[8], logpoints={4: '{undefined}'})
+    run_with_continue(debugger)
+
+    assert debugger.get_hit_counts() == {4: 1000, 8: 5}
+    records = debugger.drain_logs(limit=2)
+    assert len(records) == 2
+    assert records[0].message == "<NameError: name 'undefined' is not defined>"
+
+
+def test_get_snapshot_timeout_returns_none(debugger):
+    assert debugger.get_snapshot(timeout=0.01) is None
+
+
+def test_snapshots_contain_only_differences(make_debugger):
+    debugger = make_debugger()
+    debugger.start('''a = 1
+b = [1]
+b.append(2)
+del a
+c = 3''', '<string>')
+
+    snapshots = []
+    try:
+        while True:
+            snapshots.append(debugger.get_snapshot())
+            debugger.send_command(DebugCommand.STEP_IN)
+    except DebuggerExit:
+        pass
+
+    assert snapshots[0]['full']
+    assert [
+        ({name: (handle.preview, handle.size)
+          for name, handle in s['global_variables'].items()
+          if not name.startswith('__')},
+         s['removed_global_variables'], s['full'])
+        for s in snapshots[1:]] == [
+        ({'a': ('1', None)}, [], False),
+        ({'b': (None, 1)}, [], False),
+        ({'b': (None, 2)}, [], False),
+        ({'b': (None, 2)}, ['a'], False)]
+
+
+def test_resync_sends_full_snapshot(debugger):
+    debugger.start('''a = 1
+b = 2
+c = 3
+d = 4''', '<string>')
+
+    debugger.get_snapshot()
+    debugger.send_command(DebugCommand.STEP_IN)
+    debugger.get_snapshot()
+    debugger.send_command(DebugCommand.STEP_IN)
+    assert [
+        name for name in debugger.get_snapshot()['global_variables']
+        if not name.startswith('__')] == ['b']
+
+    debugger.resync()
+    debugger.send_command(DebugCommand.STEP_IN)
+    snapshot = debugger.get_snapshot()
+    debugger.finish()
+
+    assert snapshot['full']
+    assert {
+        name: handle.preview
+        for name, handle in snapshot['global_variables'].items()
+        if name in 'abc'} == {'a': '1', 'b': '2', 'c': '3'}
+
+
+def test_undrained_snapshots_replaced_by_full(debugger):
+    debugger.start('''a = 1
+b = 2
+c = 3
+d = 4''', '<string>')
+    debugger.get_snapshot()
+
+    for _ in range(3):
+        debugger.send_command(DebugCommand.STEP_IN)
+    debugger.finish()
+    debugger.join()
+
+    snapshot = debugger.get_snapshot()
+    assert snapshot['full']
+    assert snapshot['line_no'] == 4
+    assert {'a', 'b', 'c'} <= set(snapshot['global_variables'])
+    with pytest.raises(DebuggerExit):
+        debugger.get_snapshot()
+
+
+def test_sanitize_makes_handles_without_repr(debugger, sample_code):
     d = {
         'int': 42,
         'tuple': (42, 73),
         'code': sample_code,
-        'dict': {'int': 42}
+        'dict': {'int': 42},
+        'text': 'x' * 1000
     }
 
-    for v in debugger._sanitize(d).values():
-        assert isinstance(v, str)
+    handles = debugger._sanitize(d)
+
+    assert handles['int'] == Handle('int', 'int', id(42), None, '42')
+    assert handles['tuple'].size == 2
+    assert handles['tuple'].preview is None
+    assert handles['code'].type_name == 'code'
+    assert handles['code'].size is None
+    assert handles['dict'].size == 1
+    assert handles['text'].preview is None
+    assert handles['text'].size == 1000
+
+
+def test_render_handle_while_stopped(debugger):
+    debugger.start('''data = list(range(1000))
+broken = type('Broken', (), {'__repr__': lambda self: 1 / 0})()
+a = 1
+b = 2''', '<string>')
+    for _ in range(2):
+        debugger.get_snapshot()
+        debugger.send_command(DebugCommand.STEP_IN)
+    variables = debugger.get_snapshot()['global_variables']
+
+    data_id = variables['data'].id
+    rendered = debugger.render(data_id)
+    assert rendered.truncated
+    assert rendered.text.startswith('[0, 1, 2')
+    assert debugger.render(data_id, RenderPolicy(max_items=1000)) == (
+        Rendered(repr(list(range(1000))), False))
+    assert debugger.render(variables['broken'].id) == Rendered(
+        '<ZeroDivisionError: division by zero>', False)
+
+    debugger.send_command(DebugCommand.STEP_IN)
+    debugger.get_snapshot()
+    with pytest.raises(InvalidHandle):
+        debugger.render(id(object()))
+
+    debugger.finish()
+
+
+def test_render_program_repr_does_not_stop(make_debugger):
+    debugger = make_debugger()
+    debugger.start('''class Point:
+    def __repr__(self):
+        text = 'Point'
+        return text
+
+
+point = Point()
+a = 1
+b = 2''', '<string>')
+    snapshot = debugger.get_snapshot()
+    while 'point' not in snapshot['global_variables']:
+        debugger.send_command(DebugCommand.STEP_IN)
+        snapshot = debugger.get_snapshot()
+
+    point_id = snapshot['global_variables']['point'].id
+    assert debugger.render(point_id, timeout=5) == Rendered('Point', False)
+    assert debugger.get_snapshot(timeout=0.1) is None
+
+    debugger.send_command(DebugCommand.STEP_IN)
+    assert debugger.get_snapshot()['line_no'] == 9
+
+    debugger.finish()
+    debugger.join()
+
+
+def test_render_time_budget():
+    debugger = Debugger(render_policy=RenderPolicy(time_budget=0.05))
+    debugger.start('''import time
+slow = type('Slow', (), {'__repr__': lambda self: time.sleep(1)})()
+a = 1
+b = 2''', '<string>')
+    for _ in range(2):
+        debugger.get_snapshot()
+        debugger.send_command(DebugCommand.STEP_IN)
+    variables = debugger.get_snapshot()['global_variables']
+
+    rendered = debugger.render(variables['slow'].id)
+    assert rendered.truncated
+    assert 'Slow' in rendered.text
+
+    debugger.finish()
+    debugger.join()
+
+
+@pytest.fixture()
+def stopped_on_containers(debugger):
+    debugger.start('''class Point:
+    __slots__ = ('x', '__y')
+
+    def __init__(self):
+        self.x = 1
+        self.__y = 2
+
+
+items = list(range(1000))
+table = {i: str(i) for i in range(1000)}
+point = Point()
+a = 1
+b = 2''', '<string>')
+    snapshot = debugger.get_snapshot()
+    variables = {}
+    while 'point' not in variables:
+        debugger.send_command(DebugCommand.STEP_IN)
+        snapshot = debugger.get_snapshot()
+        variables.update(snapshot['global_variables'])
+
+    yield debugger, variables
+
+    debugger.finish()
+    debugger.join()
+
+
+def test_children_pages_list_and_dict(stopped_on_containers):
+    debugger, variables = stopped_on_containers
+
+    page = debugger.children(variables['items'].id, 10, 3)
+    assert page.total == 1000
+    assert [(h.name, h.preview) for h in page.handles] == [
+        ('[10]', '10'), ('[11]', '11'), ('[12]', '12')]
+
+    table_id = variables['table'].id
+    pages = [debugger.children(table_id, offset, 100).handles
+             for offset in range(0, 1000, 100)]
+    assert [h.name for page in pages for h in page] == [
+        '[{}]'.format(i) for i in range(1000)]
+    assert debugger.children(table_id, 5, 1).handles[0].preview == '5'
+    last = debugger.children(table_id, 995, 100)
+    assert last.total == 1000
+    assert [h.preview for h in last.handles] == [
+        '995', '996', '997', '998', '999']
+
+
+def test_children_attributes_and_nested(stopped_on_containers):
+    debugger, variables = stopped_on_containers
+
+    page = debugger.children(variables['point'].id)
+    assert page.total == 2
+    assert {h.name: h.preview for h in page.handles} == {
+        'x': '1', '_Point__y': '2'}
+
+    row = debugger.children(variables['items'].id, 0, 1).handles[0]
+    assert debugger.render(row.id) == Rendered('0', False)
+    assert debugger.children(row.id) == Children([], 0)
+
+    debugger.send_command(DebugCommand.STEP_IN)
+    debugger.get_snapshot()
+    with pytest.raises(InvalidHandle):
+        debugger.children(row.id)
+
+
+def test_stack_and_frame_variables(make_debugger, recursive_source):
+    debugger = make_debugger()
+    debugger.start(recursive_source, '<string>', breakpoints=[3])
+    debugger.get_snapshot()
+    debugger.send_command(DebugCommand.CONTINUE)
+    snapshot = debugger.get_snapshot()
+
+    assert snapshot['stack'] == [
+        StackFrame('fact', '<string>', 3),
+        StackFrame('fact', '<string>', 4),
+        StackFrame('fact', '<string>', 4),
+        StackFrame('<module>', '<string>', 6)]
+    assert preview(debugger.frame_variables(0), 'n') == '1'
+    assert preview(debugger.frame_variables(2), 'n') == '3'
+    assert 'fact' in debugger.frame_variables(3)
+    with pytest.raises(InvalidHandle):
+        debugger.frame_variables(4)
+
+    debugger.finish()
+    debugger.join()
+
+
+def test_stack_of_deep_recursion(debugger):
+    debugger.start('''import sys
+sys.setrecursionlimit(10000)
+
+
+def down(n):
+    if n:
+        return down(n - 1)
+    return n
+
+
+down(5000)''', '<string>', breakpoints=[8])
+    debugger.get_snapshot()
+    debugger.send_command(DebugCommand.CONTINUE)
+    stack = debugger.get_snapshot()['stack']
+
+    assert len(stack) == 5002
+    assert stack[-1] == StackFrame('<module>', '<string>', 11)
+
+    debugger.finish()
+    debugger.join()
+
+
+def test_history_of_steps(make_debugger, loop_source):
+    debugger = make_debugger(record=True)
+    debugger.start(loop_source, '<string>', conditions={4: 'i == 2'})
+    assert debugger.get_snapshot()['step'] == 0
+    debugger.send_command(DebugCommand.CONTINUE)
+    snapshot = debugger.get_snapshot()
+
+    assert snapshot['line_no'] == 4
+    step = snapshot['step']
+    assert debugger.history_state(0) == HistoryState(0, 1, '<string>', {}, {})
+
+    current = debugger.history_state(step)
+    assert current.line_no == 4
+    assert current.local_variables == {'n': '1000', 'total': '1', 'i': '2'}
+    assert 'f' in current.global_variables
+
+    previous = [debugger.history_state(i) for i in range(step)]
+    assert [state.local_variables.get('i') for state in previous].count(
+        '1') > 0
+    assert previous[-1].local_variables['total'] in ('0', '1')
+    with pytest.raises(InvalidHandle):
+        debugger.history_state(step + 1)
+
+    debugger.send_command(DebugCommand.CONTINUE)
+    with pytest.raises(DebuggerExit):
+        debugger.get_snapshot()
+    debugger.join()
+    assert debugger.get_hit_counts() == {4: 1000}
+
+
+def test_history_disabled(debugger, sample_source):
+    debugger.start(sample_source, '<string>')
+
+    assert debugger.get_snapshot()['step'] is None
+    with pytest.raises(InvalidHandle):
+        debugger.history_state(0)
+
+    debugger.finish()
+    debugger.join()
+
+
+def test_watches_in_snapshots(make_debugger):
+    debugger = make_debugger()
+    debugger.add_watch('x * 2')
+    debugger.add_watch('len(items)')
+    debugger.add_watch('missing')
+    with pytest.raises(InvalidBreakpointCondition):
+        debugger.add_watch('x +')
+    debugger.start('''x = 1
+items = [1]
+items.append(x)
+pass''', '<string>')
+
+    watches = []
+    try:
+        while True:
+            snapshot = debugger.get_snapshot()
+            watches.append({
+                expression: handle.preview
+                for expression, handle in snapshot['watches'].items()})
+            debugger.send_command(DebugCommand.STEP_IN)
+    except DebuggerExit:
+        pass
+
+    error = "<NameError: name 'missing' is not defined>"
+    assert [watch['missing'] for watch in watches] == [error] * 4
+    assert [watch['x * 2'] for watch in watches] == [
+        "<NameError: name 'x' is not defined>", '2', '2', '2']
+    assert [watch['len(items)'] for watch in watches][2:] == ['1', '2']
+
+
+def test_watch_result_reused_for_same_values(debugger):
+    debugger.add_watch('x + y')
+    debugger.start('''x = 1000
+y = 2000
+z = 0
+x = 1000 + z
+pass''', '<string>')
+    results = []
+    for _ in range(5):
+        results.append(debugger.get_snapshot()['watches']['x + y'])
+        debugger.send_command(DebugCommand.STEP_IN)
+    debugger.finish()
+    debugger.join()
+
+    assert [result.preview for result in results[2:]] == ['3000'] * 3
+    # те же значения: результат - тот же объект
+    assert results[2].id == results[3].id
+    # x - новый объект с тем же значением: выражение вычислено заново
+    assert results[3].id != results[4].id
+
+
+def test_watch_budget_does_not_stop_stepping():
+    debugger = Debugger(watch_budget=0.1)
+    debugger.add_watch('__import__("time").sleep(0.5)')
+    debugger.add_watch('x')
+    debugger.start('''x = 1
+x = 2
+x = 3''', '<string>')
+
+    lines = []
+    try:
+        while True:
+            snapshot = debugger.get_snapshot()
+            lines.append(snapshot['line_no'])
+            debugger.send_command(DebugCommand.STEP_IN)
+    except DebuggerExit:
+        pass
+
+    assert lines == [1, 2, 3]
+    assert snapshot['watches']['x'].type_name in ('int', 'TimeoutError')
+
+
+def test_threads_stop_and_step_separately(make_debugger):
+    debugger = make_debugger(non_stop=True)
+    debugger.start('''import threading
+def worker():
+    x = 1
+    y = 2
+threads = [
+    threading.Thread(target=worker, name='worker-{}'.format(i))
+    for i in range(2)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()''', '<string>', breakpoints=[3])
+
+    main = debugger.get_snapshot()['thread_id']
+    debugger.send_command(DebugCommand.CONTINUE)
+    first = debugger.get_snapshot(timeout=5)
+    second = debugger.get_snapshot(timeout=5)
+
+    assert {first['thread_name'], second['thread_name']} == {
+        'worker-0', 'worker-1'}
+    assert first['line_no'] == second['line_no'] == 3
+    assert main not in (first['thread_id'], second['thread_id'])
+    assert debugger.stopped_threads() == {
+        first['thread_id']: first['thread_name'],
+        second['thread_id']: second['thread_name']}
+    with pytest.raises(UnknownThread):
+        debugger.select_thread(main)
+
+    # команда одному потоку не продолжает другой
+    debugger.send_command(DebugCommand.STEP_OVER, first['thread_id'])
+    snapshot = debugger.get_snapshot(timeout=5)
+    assert (snapshot['thread_id'], snapshot['line_no']) == (
+        first['thread_id'], 4)
+    assert second['thread_id'] in debugger.stopped_threads()
+
+    debugger.select_thread(second['thread_id'])
+    debugger.send_command(DebugCommand.STEP_OVER)
+    snapshot = debugger.get_snapshot(timeout=5)
+    assert (snapshot['thread_id'], snapshot['line_no']) == (
+        second['thread_id'], 4)
+
+    debugger.send_command(DebugCommand.CONTINUE, first['thread_id'])
+    debugger.send_command(DebugCommand.CONTINUE, second['thread_id'])
+    with pytest.raises(DebuggerExit):
+        debugger.get_snapshot(timeout=5)
+
+
+def test_step_in_does_not_stop_other_threads(make_debugger):
+    debugger = make_debugger(non_stop=True)
+    debugger.start('''import threading
+def worker():
+    for i in range(1000):
+        x = i
+t = threading.Thread(target=worker)
+t.start()
+t.join()
+y = 1''', '<string>')
+
+    stops = []
+    try:
+        while True:
+            snapshot = debugger.get_snapshot(timeout=5)
+            stops.append((snapshot['thread_id'], snapshot['line_no']))
+            debugger.send_command(DebugCommand.STEP_IN)
+    except DebuggerExit:
+        pass
+
+    assert [line_no for _, line_no in stops] == [1, 2, 5, 6, 7, 8]
+    assert len({thread_id for thread_id, _ in stops}) == 1
+
+
+@pytest.mark.parametrize('non_stop', [False, True])
+def test_all_stop_halts_other_threads(make_debugger, non_stop):
+    debugger = make_debugger(non_stop=non_stop)
+    debugger.start('''import threading
+import time
+progress = []
+def worker():
+    while not done:
+        progress.append(1)
+        time.sleep(0.001)
+done = False
+t = threading.Thread(target=worker)
+t.start()
+time.sleep(0.05)
+done = True
+t.join()''', '<string>', breakpoints=[12])
+
+    debugger.get_snapshot()
+    debugger.send_command(DebugCommand.CONTINUE)
+    progress = debugger.get_snapshot(timeout=5)['global_variables'][
+        'progress']
+    # поток мог быть посередине строки
+    time.sleep(0.05)
+    before = debugger.children(progress.id, 0, 0).total
+    time.sleep(0.2)
+    after = debugger.children(progress.id, 0, 0).total
+
+    assert (after > before) == non_stop
+
+    debugger.send_command(DebugCommand.CONTINUE)
+    with pytest.raises(DebuggerExit):
+        debugger.get_snapshot(timeout=5)
+
+
+def test_set_record_applies_to_next_start(make_debugger, loop_source):
+    debugger = make_debugger()
+    debugger.set_record(True)
+    debugger.start(loop_source, '<string>', conditions={4: 'i == 2'})
+    assert debugger.get_snapshot()['step'] == 0
+    debugger.send_command(DebugCommand.CONTINUE)
+    assert debugger.get_snapshot()['step'] > 0
+    debugger.finish()
+    debugger.join()
+
+    debugger.set_record(False)
+    debugger.start(loop_source, '<string>', conditions={4: 'i == 2'})
+    assert debugger.get_snapshot()['step'] is None
+    debugger.send_command(DebugCommand.CONTINUE)
+    snapshot = debugger.get_snapshot()
+    assert (snapshot['line_no'], snapshot['step']) == (4, None)
+    debugger.finish()
+
+
+def test_history_does_not_call_program_repr(make_debugger):
+    debugger = make_debugger(record=True)
+    debugger.start('''class A:
+    def f(self):
+        pass
+    def __repr__(self):
+        return 'A()'
+m = A().f
+n = 1''', '<string>')
+
+    snapshot = debugger.get_snapshot(timeout=5)
+    while snapshot['line_no'] != 7:
+        debugger.send_command(DebugCommand.STEP_IN)
+        snapshot = debugger.get_snapshot(timeout=5)
+
+    method = debugger.history_state(snapshot['step']).global_variables['m']
+    assert method.startswith('<bound method A.f of <')
+
+    debugger.send_command(DebugCommand.CONTINUE)
+    with pytest.raises(DebuggerExit):
+        debugger.get_snapshot(timeout=5)
+
+
+def test_watch_of_class_attribute_is_not_cached(debugger):
+    debugger.add_watch('C.n')
+    debugger.start('''class C:
+    n = 0
+C.n = 1
+C.n = 2
+C.n = 3
+pass''', '<string>')
+
+    previews = []
+    try:
+        while True:
+            previews.append(
+                debugger.get_snapshot()['watches']['C.n'].preview)
+            debugger.send_command(DebugCommand.STEP_IN)
+    except DebuggerExit:
+        pass
+
+    assert previews[-4:] == ['0', '1', '2', '3']
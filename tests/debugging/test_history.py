@@ -0,0 +1,150 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.pardir,
+    os.path.pardir))
+
+from app.debugging.history import History, _Scope
+
+
+def record_lines(history, source, expected=None, **namespace):
+    """
+    Исполняет `source`, записывая каждую строку через `sys.settrace`
+
+    :param expected: список, в который добавляются repr глобальных
+        переменных каждого шага
+    """
+    def trace(frame, event, arg):
+        if frame.f_code.co_filename != '<history>':
+            return None
+        if event == 'line':
+            history.record(frame)
+            if expected is not None:
+                expected.append({
+                    name: repr(value)
+                    for name, value in frame.f_globals.items()
+                    if name != '__builtins__'})
+
+        return trace
+
+    code = compile(source, '<history>', 'exec')
+    sys.settrace(trace)
+    try:
+        exec(code, namespace)
+    finally:
+        sys.settrace(None)
+
+
+def test_states_of_all_steps():
+    history = History()
+    record_lines(history, '''x = 1
+x = [x]
+del x
+y = 'a' * 1000''')
+
+    assert len(history) == 4
+    assert [history.state(i).global_variables for i in range(4)] == [
+        {}, {'x': '1'}, {'x': '[1]'}, {}]
+    assert history.state(3).line_no == 4
+    assert history.state(3).filename == '<history>'
+    with pytest.raises(IndexError):
+        history.state(4)
+
+
+def test_checkpoints():
+    history = History(checkpoint_interval=4)
+    expected = []
+    record_lines(history, '''for i in range(50):
+    if i % 7 == 0:
+        k = i
+        del i''', expected=expected)
+
+    assert len(history) > 100
+    assert [
+        history.state(step).global_variables
+        for step in range(len(history))] == expected
+
+
+def test_local_scopes_of_recursion():
+    history = History()
+    record_lines(history, '''def fact(n):
+    if n <= 1:
+        return 1
+    return n * fact(n - 1)
+r = fact(3)''')
+
+    locals_by_line = [
+        (state.line_no, state.local_variables.get('n'))
+        for state in map(history.state, range(len(history)))]
+
+    assert locals_by_line == [
+        (1, None), (5, None),
+        (2, '3'), (4, '3'),
+        (2, '2'), (4, '2'),
+        (2, '1'), (3, '1')]
+
+
+def test_program_repr_is_not_called():
+    class Unsafe:
+        def __repr__(self):
+            raise AssertionError('repr вызван')
+
+    history = History(ignored=['Unsafe'])
+    record_lines(history, '''value = Unsafe()
+values = [value]
+pass''', Unsafe=Unsafe)
+
+    state = history.state(2)
+    assert state.global_variables['value'].startswith('<')
+    assert state.global_variables['values'] == (
+        '[' + state.global_variables['value'] + ']')
+
+
+def test_values_are_interned():
+    history = History()
+    record_lines(history, '''a = 'x' * 50
+b = 'x' * 50
+c = 'x' * 50
+pass''')
+
+    assert len(history._values) == 1
+
+
+def test_spilled_history():
+    history = History(checkpoint_interval=16, max_memory=4096)
+    expected = []
+    record_lines(history, '''for i in range(3000):
+    x = str(i) * 3''', expected=expected)
+
+    assert history.store.spilled_size > 0
+    assert len(history) == len(expected)
+    assert [
+        history.state(step).global_variables
+        for step in range(0, len(history), 7)] == expected[::7]
+
+    history.close()
+
+
+def test_finished_frames_are_released():
+    history = History(max_memory=2 ** 16)
+    record_lines(history, '''def f(i):
+    items = list(range(1000))
+    return i
+for i in range(2000):
+    f(i)''')
+
+    # globals и последний вызов, после которого строк не было
+    assert sum(isinstance(scope, _Scope) for scope in history._scopes) == 2
+    assert history.store.spilled_size > 0
+
+    # шаг `return i` первого вызова
+    state = history.state(4)
+    assert state.line_no == 3
+    assert state.local_variables['i'] == '0'
+    assert state.local_variables['items'].startswith('[0, 1, 2')
+
+    history.close()
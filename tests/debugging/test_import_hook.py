@@ -0,0 +1,125 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.pardir,
+    os.path.pardir))
+
+from app.debugging.common import DebugCommand, DebuggerExit
+from app.debugging.debugger import Debugger
+from app.debugging.import_hook import ProjectImporter
+
+
+@pytest.fixture()
+def project(tmpdir):
+    main = tmpdir.join('main.py')
+    main.write('''import poson_helper
+import poson_dependency
+a = poson_helper.double(2)
+b = poson_dependency.triple(a)''')
+    tmpdir.join('poson_helper.py').write('''def double(x):
+    y = x * 2
+    return y''')
+    site_packages = tmpdir.mkdir('venv').mkdir('site-packages')
+    site_packages.join('poson_dependency.py').write('''def triple(x):
+    y = x * 3
+    return y''')
+    sys.path.append(str(site_packages))
+
+    yield tmpdir
+
+    sys.path.remove(str(site_packages))
+    sys.modules.pop('poson_dependency', None)
+
+
+def test_is_project_file(project):
+    importer = ProjectImporter([str(project)], None)
+
+    assert importer.is_project_file(str(project.join('poson_helper.py')))
+    assert not importer.is_project_file(
+        str(project.join('venv', 'site-packages', 'poson_dependency.py')))
+    assert not importer.is_project_file(os.__file__)
+
+
+def run_with_step_in(debugger):
+    stops = []
+    try:
+        while True:
+            snapshot = debugger.get_snapshot()
+            stops.append((
+                os.path.basename(snapshot['filename']), snapshot['line_no']))
+            debugger.send_command(DebugCommand.STEP_IN)
+    except DebuggerExit:
+        pass
+
+    return stops
+
+
+def test_step_in_project_module_only(make_debugger, project):
+    main = project.join('main.py')
+    debugger = make_debugger()
+    debugger.start(
+        main.read(), str(main), project_paths=[str(project)])
+
+    assert run_with_step_in(debugger) == [
+        ('main.py', 1), ('poson_helper.py', 1), ('main.py', 2),
+        ('main.py', 3), ('poson_helper.py', 2), ('poson_helper.py', 3),
+        ('main.py', 4)]
+    assert 'poson_helper' not in sys.modules
+
+
+def test_stack_of_imported_module(make_debugger, project):
+    main = project.join('main.py')
+    debugger = make_debugger()
+    debugger.start(
+        main.read(), str(main), project_paths=[str(project)])
+    debugger.get_snapshot()
+    debugger.send_command(DebugCommand.STEP_IN)
+    stack = debugger.get_snapshot()['stack']
+
+    assert [
+        (frame.name, os.path.basename(frame.filename), frame.line_no)
+        for frame in stack] == [
+            ('<module>', 'poson_helper.py', 1), ('<module>', 'main.py', 1)]
+
+    debugger.finish()
+    debugger.join()
+
+
+def test_breakpoint_in_module_before_import(make_debugger, project):
+    main = project.join('main.py')
+    helper = str(project.join('poson_helper.py'))
+    debugger = make_debugger()
+    debugger.start(
+        main.read(), str(main), project_paths=[str(project)])
+    debugger.add_breakpoint(3, helper)
+
+    stops = []
+    try:
+        while True:
+            snapshot = debugger.get_snapshot()
+            stops.append((snapshot['filename'], snapshot['line_no']))
+            debugger.send_command(DebugCommand.CONTINUE)
+    except DebuggerExit:
+        pass
+
+    assert stops == [(str(main), 1), (helper, 3)]
+    assert debugger.get_hit_counts(helper) == {3: 1}
+
+
+def test_without_project_paths_imports_are_not_debugged(project):
+    main = project.join('main.py')
+    sys.path.append(str(project))
+    try:
+        debugger = Debugger()
+        debugger.start(main.read(), str(main))
+        stops = run_with_step_in(debugger)
+    finally:
+        sys.path.remove(str(project))
+        sys.modules.pop('poson_helper', None)
+
+    assert stops == [
+        ('main.py', 1), ('main.py', 2), ('main.py', 3), ('main.py', 4)]
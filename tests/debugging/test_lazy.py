@@ -0,0 +1,93 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.pardir,
+    os.path.pardir))
+
+from app.debugging.bytecode_modifier import BytecodeModifier
+from app.debugging.debugger import Debugger
+
+
+@pytest.fixture()
+def lazy_source():
+    source = '''def used(n, *args, k=2, **kwargs):
+    x = n + k
+    return x + len(args) + len(kwargs)
+def unused():
+    return 1
+def outer(q):
+    def inner(z):
+        return z + q
+    return inner(1)
+def gen(n):
+    for i in range(n):
+        yield i
+class C:
+    def method(self):
+        return super().__repr__()
+a = used(1, 2, 3, k=5, j=1)
+b = used(1)
+c = outer(3)
+d = list(gen(3))
+e = C().method()'''
+
+    return source
+
+
+def run_without_stops(debugger, source):
+    code = debugger._compile(source, '<string>')
+    engine = debugger._engine
+    engine.prepare('<string>', {})
+    engine._trace = lambda step=0, breakpoint=True: step
+    engine._trace_return = lambda step: None
+    debugger._make_line_tables(source, '<string>')
+    debugger._run(code)
+
+    return debugger._globals_
+
+
+def test_lazy_run_has_same_results_as_eager(lazy_source):
+    lazy = run_without_stops(Debugger(lazy=True), lazy_source)
+    eager = run_without_stops(Debugger(), lazy_source)
+
+    for name in 'abcd':
+        assert lazy[name] == eager[name]
+    assert lazy['e'].startswith('<C object')
+
+
+def test_only_called_functions_are_modified(lazy_source):
+    debugger = Debugger(lazy=True)
+    run_without_stops(debugger, lazy_source)
+
+    assert debugger._engine._lazy_instrumenter.modified_count == 5
+    assert debugger._globals_['unused'].__code__.co_name == 'unused'
+    assert (debugger._globals_['unused'].__code__
+            is not debugger._globals_['used'].__code__)
+
+
+def test_bind_uses_already_modified_code(lazy_source):
+    debugger = Debugger(lazy=True)
+    globals_ = run_without_stops(debugger, lazy_source)
+    instrumenter = debugger._engine._lazy_instrumenter
+
+    used_code = globals_['used'].__code__
+    original_code = next(
+        const for const in compile(lazy_source, '<string>', 'exec').co_consts
+        if getattr(const, 'co_name', None) == 'used')
+    new_func = instrumenter.bind(
+        type(globals_['used'])(original_code, globals_))
+
+    assert new_func.__code__ is used_code
+
+
+def test_lazy_modify_keeps_function_code(sample_code):
+    bytecode_modifier = BytecodeModifier(
+        'trace', 'trace_return', 'lazy_bind', 'lazy_load')
+    modified = bytecode_modifier.modify(sample_code, lazy=True)
+
+    assert sample_code.co_consts[0] in modified.co_consts
+    assert 'lazy_bind' in modified.co_names
@@ -0,0 +1,109 @@
+import os
+import sys
+from collections import deque
+
+import pytest
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.pardir,
+    os.path.pardir))
+
+from app.debugging.common import Rendered
+from app.debugging.rendering import RenderPolicy, RenderWorker
+
+
+@pytest.mark.parametrize('value', [
+    42, 'text', b'bytes', [1, 2], (1, ), (), set(), {1}, frozenset([1]),
+    deque([1, 2]), {'a': [1, {'b': (2, 3)}]}, None])
+def test_short_values_same_as_repr(value):
+    assert RenderPolicy().render(value) == Rendered(repr(value), False)
+
+
+def test_long_string_truncated():
+    rendered = RenderPolicy(max_string=5).render('x' * 100)
+
+    assert rendered == Rendered(repr('xxxxx') + '...', True)
+
+
+def test_items_truncated():
+    rendered = RenderPolicy(max_items=3).render(list(range(100)))
+
+    assert rendered == Rendered('[0, 1, 2, ...]', True)
+
+
+def test_dict_items_truncated():
+    rendered = RenderPolicy(max_items=1).render({'a': 1, 'b': 2})
+
+    assert rendered == Rendered("{'a': 1, ...}", True)
+
+
+def test_depth_truncated():
+    rendered = RenderPolicy(max_depth=2).render([[[[1]]]])
+
+    assert rendered == Rendered('[[[...]]]', True)
+
+
+def test_length_truncated():
+    rendered = RenderPolicy(max_length=20).render(list(range(1000)))
+
+    assert rendered.truncated
+    assert len(rendered.text) <= 23
+
+
+def test_other_repr_truncated_and_errors():
+    class Long:
+        def __repr__(self):
+            return 'y' * 1000
+
+    class Broken:
+        def __repr__(self):
+            raise ValueError('broken')
+
+    policy = RenderPolicy(max_string=10)
+
+    assert policy.render(Long()) == Rendered('y' * 10 + '...', True)
+    assert policy.render(Broken()) == Rendered(
+        '<ValueError: broken>', False)
+
+
+def test_expanded_policy_renders_more():
+    policy = RenderPolicy(max_items=3)
+    value = list(range(10))
+
+    assert policy.render(value).truncated
+    assert policy.expanded().render(value) == Rendered(repr(value), False)
+
+
+def test_time_budget_truncates_items():
+    rendered = RenderPolicy(time_budget=0).render([[1], [2]])
+
+    assert rendered.truncated
+
+
+def test_worker_returns_on_timeout():
+    worker = RenderWorker()
+
+    def hang(value):
+        import time
+        time.sleep(1)
+
+    assert worker.call(hang, [1], 0.01) is None
+
+    assert worker.call(RenderPolicy().render, 1, 1) == Rendered('1', False)
+    worker.stop()
+
+
+def test_safe_policy_does_not_call_repr_of_method_object():
+    class A:
+        def f(self):
+            pass
+
+        def __repr__(self):
+            raise AssertionError('repr вызван')
+
+    value = A()
+    rendered = RenderPolicy(safe=True).render(value.f)
+
+    assert rendered.text == '<bound method {} of {}>'.format(
+        A.f.__qualname__, object.__repr__(value))
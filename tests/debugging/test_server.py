@@ -0,0 +1,137 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.pardir,
+    os.path.pardir))
+
+from app.debugging.server import DebuggerServer
+from app.debugging.common import (
+    DebugCommand, DebuggerExit, EmptySourceCode, InvalidBreakpointCondition,
+    InvalidHandle)
+
+
+@pytest.fixture()
+def make_server():
+    servers = []
+
+    def make_server(**options):
+        server = DebuggerServer(**options)
+        servers.append(server)
+        return server
+
+    yield make_server
+
+    for server in servers:
+        server.close()
+
+
+def run_to_end(server):
+    while True:
+        try:
+            server.get_snapshot(timeout=5)
+        except DebuggerExit:
+            return
+        server.send_command(DebugCommand.CONTINUE)
+
+
+def test_snapshots_and_requests(make_server):
+    server = make_server(record=True)
+    server.start('x = [1, 2, 3]\ny = 2\n', '<string>')
+
+    assert server.get_snapshot(timeout=5)['line_no'] == 1
+    server.send_command(DebugCommand.STEP_OVER)
+    snapshot = server.get_snapshot(timeout=5)
+    assert snapshot['line_no'] == 2
+
+    handle = snapshot['global_variables']['x']
+    assert server.render(handle.id, timeout=5).text == '[1, 2, 3]'
+    assert server.children(handle.id, 1, 1, timeout=5).handles[0].preview == (
+        '2')
+    assert 'x' in server.frame_variables(0, timeout=5)
+    assert server.history_state(0, timeout=5).line_no == 1
+    with pytest.raises(InvalidHandle):
+        server.render(0, timeout=5)
+
+    server.send_command(DebugCommand.STEP_OVER)
+    with pytest.raises(DebuggerExit):
+        server.get_snapshot(timeout=5)
+
+
+def test_set_record_applies_to_next_process(make_server):
+    server = make_server()
+    server.start('x = 1\n', '<string>')
+    assert server.get_snapshot(timeout=5)['step'] is None
+    run_to_end(server)
+
+    server.set_record(True)
+    server.start('x = 1\n', '<string>')
+    assert server.get_snapshot(timeout=5)['step'] == 0
+    run_to_end(server)
+
+
+def test_large_snapshot_through_shared_memory(make_server):
+    server = make_server(inline_limit=0)
+    server.start(
+        "globals().update(('v%d' % i, i) for i in range(2000))\npass\n",
+        '<string>')
+
+    server.get_snapshot(timeout=5)
+    server.send_command(DebugCommand.STEP_OVER)
+    snapshot = server.get_snapshot(timeout=5)
+
+    assert snapshot['line_no'] == 2
+    assert snapshot['global_variables']['v998'].preview == '998'
+    # длина последнего кадра в начале общей памяти
+    assert server._shared[:4] != bytes(4)
+
+
+def test_breakpoints_logpoints_and_watches(make_server):
+    server = make_server()
+    server.add_watch('x * 2')
+    source = 'x = 1\nx = 2\nx = 3\n'
+    server.start(source, '<string>', breakpoints=[3], logpoints={2: 'x={x}'})
+
+    server.get_snapshot(timeout=5)
+    server.send_command(DebugCommand.CONTINUE)
+    snapshot = server.get_snapshot(timeout=5)
+
+    assert snapshot['line_no'] == 3
+    assert snapshot['watches']['x * 2'].preview == '4'
+    assert [record.message for record in server.drain_logs()] == ['x=1']
+    assert server.get_hit_counts() == {2: 1, 3: 1}
+
+    server.send_command(DebugCommand.CONTINUE)
+    run_to_end(server)
+
+    # выражения наблюдения остаются для следующей отладки
+    server.start(source, '<string>')
+    assert 'x * 2' in server.get_snapshot(timeout=5)['watches']
+
+
+def test_invalid_arguments_raise(make_server):
+    server = make_server()
+
+    with pytest.raises(EmptySourceCode):
+        server.start('', '<string>')
+    with pytest.raises(InvalidBreakpointCondition):
+        server.start('x = 1\n', '<string>', conditions={1: 'x +'})
+    with pytest.raises(InvalidBreakpointCondition):
+        server.add_watch('x +')
+    with pytest.raises(InvalidBreakpointCondition):
+        server.add_logpoint(1, '{x')
+
+
+def test_crash_finishes_debugging(make_server):
+    server = make_server()
+    server.start('import os\nos._exit(3)\n', '<string>')
+
+    server.send_command(DebugCommand.CONTINUE)
+    with pytest.raises(DebuggerExit):
+        while True:
+            server.get_snapshot(timeout=5)
+
+    server.join()
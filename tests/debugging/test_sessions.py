@@ -0,0 +1,130 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.pardir,
+    os.path.pardir))
+
+from app.debugging.sessions import SessionManager
+from app.debugging.common import (
+    DebugCommand, DebuggerExit, TooManySessions, UnknownSession)
+
+
+@pytest.fixture()
+def make_manager():
+    managers = []
+
+    def make_manager(**options):
+        manager = SessionManager(**options)
+        managers.append(manager)
+        return manager
+
+    yield make_manager
+
+    for manager in managers:
+        manager.close()
+
+
+def next_event(manager):
+    event = manager.next_event(timeout=5)
+    assert event is not None
+
+    return event
+
+
+def test_sessions_routed_independently(make_manager):
+    manager = make_manager(out_of_process=False)
+    first = manager.create()
+    second = manager.create()
+
+    manager.dispatch(first, 'start', 'a = 1\nb = 2\n', '<first>')
+    manager.dispatch(second, 'start', 'c = 3\n', '<second>')
+    snapshots = dict([next_event(manager), next_event(manager)])
+
+    assert snapshots[first]['filename'] == '<first>'
+    assert snapshots[second]['filename'] == '<second>'
+
+    manager.dispatch(second, 'send_command', DebugCommand.STEP_OVER)
+    assert next_event(manager) == (second, DebuggerExit)
+
+    manager.dispatch(first, 'send_command', DebugCommand.STEP_OVER)
+    session_id, snapshot = next_event(manager)
+    assert (session_id, snapshot['line_no']) == (first, 2)
+
+    stats = manager.stats(first)
+    assert (stats.snapshots, stats.calls) == (2, 2)
+    assert stats.cpu_time is None
+
+
+def test_unknown_session_and_method(make_manager):
+    manager = make_manager(out_of_process=False)
+    session_id = manager.create()
+
+    with pytest.raises(AttributeError):
+        manager.dispatch(session_id, 'get_snapshot')
+
+    manager.close_session(session_id)
+
+    assert manager.sessions() == []
+    with pytest.raises(UnknownSession):
+        manager.dispatch(session_id, 'resync')
+    with pytest.raises(UnknownSession):
+        manager.close_session(session_id)
+
+
+def test_session_limit_and_idle_reaping(make_manager):
+    manager = make_manager(
+        max_sessions=1, idle_timeout=0.2, out_of_process=False)
+    first = manager.create()
+    manager.dispatch(first, 'start', 'a = 1\n', '<string>')
+    assert next_event(manager)[0] == first
+
+    with pytest.raises(TooManySessions):
+        manager.create()
+
+    time.sleep(0.3)
+    second = manager.create()
+
+    assert manager.sessions() == [second]
+    assert next_event(manager) == (first, DebuggerExit)
+
+
+def test_running_session_is_not_reaped(make_manager):
+    manager = make_manager(
+        max_sessions=1, idle_timeout=0.2, out_of_process=False)
+    first = manager.create()
+    manager.dispatch(first, 'start', '''import time
+end = time.monotonic() + 1
+while time.monotonic() < end:
+    pass
+''', '<string>')
+    assert next_event(manager)[0] == first
+    manager.dispatch(first, 'send_command', DebugCommand.CONTINUE)
+
+    time.sleep(0.4)
+    assert manager.reap_idle() == []
+    with pytest.raises(TooManySessions):
+        manager.create()
+
+    assert next_event(manager) == (first, DebuggerExit)
+    time.sleep(0.3)
+    assert manager.sessions() == []
+
+
+def test_out_of_process_session_stats(make_manager):
+    manager = make_manager(idle_timeout=None)
+    session_id = manager.create()
+    manager.dispatch(session_id, 'start', 'a = 1\n', '<string>')
+    next_event(manager)
+
+    stats = manager.stats(session_id)
+
+    assert stats.cpu_time > 0
+    assert stats.memory > 0
+
+    manager.close_session(session_id)
+    assert next_event(manager) == (session_id, DebuggerExit)
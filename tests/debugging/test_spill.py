@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.pardir,
+    os.path.pardir))
+
+from app.debugging.spill import SpillStore
+
+
+def test_records_in_memory():
+    store = SpillStore(max_memory=1000)
+
+    assert store.append(b'abc') == 0
+    assert store.append(b'') == 1
+    assert bytes(store[0]) == b'abc'
+    assert bytes(store[1]) == b''
+    assert store.spilled_size == 0
+    with pytest.raises(IndexError):
+        store[2]
+
+
+def test_old_records_spilled_to_file(tmpdir):
+    store = SpillStore(max_memory=100, directory=str(tmpdir))
+    records = [bytes([i % 256]) * (i % 37) for i in range(500)]
+    for record in records:
+        store.append(record)
+
+    assert store.memory_size <= 100
+    assert store.spilled_size + store.memory_size == sum(map(len, records))
+    assert [bytes(store[i]) for i in range(len(records))] == records
+
+    store.close()
+
+
+def test_spilled_records_are_not_copied():
+    store = SpillStore(max_memory=10)
+    for i in range(10):
+        store.append(bytes([i]) * 8)
+
+    view = store[0]
+    assert isinstance(view.obj, type(store._map))
+    # отображение файла переживает новые выгрузки
+    for i in range(100):
+        store.append(bytes([i]) * 8)
+    assert bytes(view) == b'\x00' * 8
+    assert bytes(store[109]) == bytes([99]) * 8
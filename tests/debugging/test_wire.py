@@ -0,0 +1,158 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.pardir,
+    os.path.pardir))
+
+from app.debugging.common import (
+    Children, DebugCommand, DebuggerExit, Handle, HistoryState,
+    InvalidHandle, Rendered, StackFrame, WireFormatError)
+from app.debugging.debugger import Debugger
+from app.debugging.rendering import RenderPolicy
+from app.debugging.wire import (
+    Encoder, Decoder, RenderRequest, ChildrenRequest, FrameRequest,
+    HistoryRequest)
+
+
+def make_snapshot(count, full=True, step=None):
+    handles = {
+        'variable_{}'.format(i): Handle(
+            'variable_{}'.format(i), 'list', 2 ** 40 + i, i, None)
+        for i in range(count)}
+    handles['text'] = Handle('text', 'str', 1, 5, 'текст')
+
+    return {
+        'global_variables': handles,
+        'removed_global_variables': ['old'],
+        'local_variables': {'n': Handle('n', 'int', 7, None, '-1')},
+        'removed_local_variables': [],
+        'full': full,
+        'line_no': 12,
+        'filename': '/project/main.py',
+        'stack': [StackFrame('f', '/project/main.py', 3)] * 100 + [
+            StackFrame('<module>', '/project/main.py', 12)],
+        'step': step,
+        'watches': {
+            'len(a)': Handle('len(a)', 'int', 9, None, '3'),
+            'b': Handle('b', 'NameError', 10, None, '<NameError: b>')},
+        'thread_id': 2 ** 47 + 1,
+        'thread_name': 'Thread-1'
+    }
+
+
+@pytest.mark.parametrize('message', [
+    make_snapshot(10),
+    make_snapshot(10, step=2 ** 33),
+    DebugCommand.STEP_OVER,
+    DebuggerExit,
+    Rendered('[1, 2, ...]', True),
+    Children([Handle('[0]', 'int', 5, None, '0')], 10 ** 7),
+    RenderRequest(42, None),
+    RenderRequest(42, RenderPolicy(max_items=7)),
+    RenderRequest(42, RenderPolicy(safe=True)),
+    ChildrenRequest(42, 100, 50),
+    FrameRequest(3),
+    HistoryRequest(1000),
+    HistoryState(
+        1000, 12, '/project/main.py', {'x': '[1, 2, ...]', 'y': "'текст'"},
+        {})])
+def test_round_trip(message):
+    decoded = Decoder().decode(Encoder().encode(message)[4:])
+
+    if isinstance(message, RenderRequest) and message.policy is not None:
+        assert decoded.handle_id == 42
+        assert vars(decoded.policy) == vars(message.policy)
+    else:
+        assert decoded == message
+
+
+def test_invalid_handle_round_trip():
+    decoded = Decoder().decode(Encoder().encode(InvalidHandle(42))[4:])
+
+    assert isinstance(decoded, InvalidHandle)
+    assert decoded.args == (42, )
+
+
+def test_streaming_decode_in_chunks():
+    encoder = Encoder()
+    messages = [make_snapshot(50), DebugCommand.CONTINUE, make_snapshot(50)]
+    data = b''.join(encoder.encode(message) for message in messages)
+
+    decoder = Decoder()
+    decoded = []
+    for i in range(0, len(data), 7):
+        decoded.extend(decoder.feed(data[i:i + 7]))
+
+    assert decoded == messages
+
+
+def test_stream_read_write():
+    stream = io.BytesIO()
+    encoder = Encoder()
+    encoder.write(stream, DebugCommand.STEP_IN)
+    encoder.write(stream, make_snapshot(3))
+    stream.seek(0)
+
+    decoder = Decoder()
+    assert decoder.read(stream) == DebugCommand.STEP_IN
+    assert decoder.read(stream) == make_snapshot(3)
+    assert decoder.read(stream) is None
+
+
+def test_repeated_names_are_interned():
+    encoder = Encoder()
+    first = encoder.encode(make_snapshot(1000))
+    second = encoder.encode(make_snapshot(1000, full=False))
+
+    assert len(second) < len(first) - 1000 * len('variable_000')
+
+
+def test_string_table_reset():
+    encoder = Encoder(max_strings=10)
+    decoder = Decoder()
+
+    for count in (20, 5, 30):
+        snapshot = make_snapshot(count)
+        assert decoder.feed(encoder.encode(snapshot)) == [snapshot]
+
+
+def test_unsupported_message_keeps_tables_in_sync():
+    encoder = Encoder()
+    decoder = Decoder()
+
+    with pytest.raises(WireFormatError):
+        encoder.encode({'full': True, 'line_no': 1, 'filename': 'new'})
+    with pytest.raises(WireFormatError):
+        encoder.encode(object())
+
+    snapshot = make_snapshot(2)
+    assert decoder.feed(encoder.encode(snapshot)) == [snapshot]
+
+
+def test_other_version_rejected():
+    frame = bytearray(Encoder().encode(DebugCommand.STEP_IN))
+    frame[4] = 99
+
+    with pytest.raises(WireFormatError):
+        Decoder().feed(bytes(frame))
+
+
+def test_debugger_snapshot_round_trip():
+    debugger = Debugger()
+    debugger.start('''items = [1, 2]
+text = 'текст'
+a = 1''', '<string>')
+    encoder = Encoder()
+    decoder = Decoder()
+    try:
+        while True:
+            snapshot = debugger.get_snapshot()
+            assert decoder.feed(encoder.encode(snapshot)) == [snapshot]
+            debugger.send_command(DebugCommand.STEP_IN)
+    except DebuggerExit:
+        pass
@@ -1,7 +1,11 @@
 import os
 import sys
+import time
+from queue import Queue, Empty
+from threading import Thread
 
 import pytest
+from PyQt5.QtCore import Qt
 
 sys.path.append(os.path.join(
     os.path.dirname(os.path.abspath(__file__)),
@@ -10,17 +14,37 @@ sys.path.append(os.path.join(
 
 from app.debugger_client import DebuggerClient
 from app.debugging.debugger import Debugger
-from app.debugging.common import DebugCommand
+from app.debugging.common import (
+    DebugCommand, Handle, InvalidHandle, Rendered)
 
 
 @pytest.fixture()
-def client():
+def client(monkeypatch):
+    # отладчик в процессе теста, чтобы его методы можно было подменить
+    monkeypatch.setattr(DebuggerClient, 'OUT_OF_PROCESS', False)
     return DebuggerClient()
 
 
+@pytest.fixture()
+def running_client(client):
+    """Клиент, цикл которого выполняется в отдельном потоке"""
+    # сигналы доставляются напрямую: в тестах нет цикла событий Qt
+    snapshots = Queue()
+    client.update.connect(snapshots.put, Qt.DirectConnection)
+    client.debugging_finished.connect(
+        lambda: snapshots.put(None), Qt.DirectConnection)
+    Thread(target=client.run, daemon=True).start()
+
+    yield client, snapshots
+
+    client.finish()
+
+
 @pytest.fixture()
 def debugger_patched_start(monkeypatch):
-    def patched_start(self, source, filename):
+    def patched_start(
+            self, source, filename, breakpoints=(), conditions=None,
+            logpoints=None, project_paths=None):
         patched_start.is_called = True
 
     monkeypatch.setattr(Debugger, 'start', patched_start)
@@ -74,3 +98,167 @@ def test_step_out_called(debugger_patched_send_command, client):
 
     assert debugger_patched_send_command.is_called
     assert debugger_patched_send_command.command == DebugCommand.STEP_OUT
+
+
+def test_continue_called(debugger_patched_send_command, client):
+    client.continue_()
+
+    assert debugger_patched_send_command.is_called
+    assert debugger_patched_send_command.command == DebugCommand.CONTINUE
+
+
+def test_add_remove_breakpoint_called(monkeypatch, client):
+    calls = []
+    monkeypatch.setattr(
+        Debugger, 'add_breakpoint',
+        lambda self, line_no: calls.append(('add', line_no)))
+    monkeypatch.setattr(
+        Debugger, 'remove_breakpoint',
+        lambda self, line_no: calls.append(('remove', line_no)))
+
+    client.add_breakpoint(3)
+    client.remove_breakpoint(3)
+
+    assert calls == [('add', 3), ('remove', 3)]
+
+
+def test_emit_logs_in_batches(monkeypatch, client):
+    records = list(range(5))
+    monkeypatch.setattr(DebuggerClient, 'LOGS_BATCH', 2)
+    monkeypatch.setattr(
+        Debugger, 'drain_logs',
+        lambda self, limit: [records.pop(0) for _ in records[:limit]])
+
+    batches = []
+    client.logs.connect(batches.append)
+    client._emit_logs()
+
+    assert batches == [[0, 1], [2, 3], [4]]
+
+
+def test_resync_called(monkeypatch, client):
+    calls = []
+    monkeypatch.setattr(Debugger, 'resync', lambda self: calls.append(True))
+
+    client.resync()
+
+    assert calls == [True]
+
+
+def test_render_uses_preview_or_debugger(monkeypatch, client):
+    monkeypatch.setattr(
+        Debugger, 'render',
+        lambda self, handle_id, policy=None, timeout=None: Rendered(
+            'rendered', policy is not None))
+
+    assert client.render(Handle('a', 'int', 1, None, '1')) == (
+        Rendered('1', False))
+    assert client.render(Handle('b', 'list', 2, 3, None)) == (
+        Rendered('rendered', False))
+    assert client.render(Handle('b', 'list', 2, 3, None), expanded=True) == (
+        Rendered('rendered', True))
+
+
+def test_children_none_for_invalid_handle(monkeypatch, client):
+    def children(self, handle_id, offset=0, limit=100, timeout=None):
+        raise InvalidHandle(handle_id)
+
+    monkeypatch.setattr(Debugger, 'children', children)
+
+    assert client.children(Handle('b', 'list', 2, 3, None)) is None
+
+
+def test_frame_variables_none_for_invalid_frame(monkeypatch, client):
+    def frame_variables(self, depth, timeout=None):
+        raise InvalidHandle(depth)
+
+    monkeypatch.setattr(Debugger, 'frame_variables', frame_variables)
+
+    assert client.frame_variables(3) is None
+
+
+def test_history_state_none_for_unrecorded_step(monkeypatch, client):
+    def history_state(self, step, timeout=None):
+        raise InvalidHandle(step)
+
+    monkeypatch.setattr(Debugger, 'history_state', history_state)
+
+    assert client.history_state(10) is None
+
+
+def test_invalid_watch_ignored(client):
+    client.add_watch('x +')
+    client.add_watch('len(x)')
+
+    assert list(client._debugger._watches) == ['len(x)']
+
+
+ANIMATED_SOURCE = """a = 1
+b = 2
+c = 3
+d = 4
+"""
+
+
+def test_animate_steps_through_program(running_client):
+    client, snapshots = running_client
+    client.animate(interval=0)
+    client.start(ANIMATED_SOURCE, '<string>')
+
+    lines = []
+    while True:
+        snapshot = snapshots.get(timeout=5)
+        if snapshot is None:
+            break
+        lines.append(snapshot['line_no'])
+        client.snapshot_shown()
+
+    assert lines == [1, 2, 3, 4]
+
+
+def test_animate_waits_until_snapshot_shown(running_client):
+    client, snapshots = running_client
+    client.animate(interval=0)
+    client.start(ANIMATED_SOURCE, '<string>')
+
+    assert snapshots.get(timeout=5)['line_no'] == 1
+    time.sleep(3 * client.LOGS_INTERVAL)
+    with pytest.raises(Empty):
+        snapshots.get_nowait()
+
+    client.snapshot_shown()
+
+    assert snapshots.get(timeout=5)['line_no'] == 2
+
+
+def test_manual_step_stops_animation(
+        debugger_patched_send_command, client):
+    client.animate()
+    client.step_over()
+
+    assert client._animate_command is None
+    assert debugger_patched_send_command.command == DebugCommand.STEP_OVER
+
+
+def test_out_of_process_client(monkeypatch):
+    monkeypatch.setattr(DebuggerClient, 'OUT_OF_PROCESS', True)
+    client = DebuggerClient()
+    snapshots = Queue()
+    client.update.connect(snapshots.put, Qt.DirectConnection)
+    client.debugging_finished.connect(
+        lambda: snapshots.put(None), Qt.DirectConnection)
+    Thread(target=client.run, daemon=True).start()
+
+    client.add_watch('a + 1')
+    client.start(ANIMATED_SOURCE, '<string>', breakpoints=[3])
+    assert snapshots.get(timeout=5)['line_no'] == 1
+    client.continue_()
+    snapshot = snapshots.get(timeout=5)
+
+    assert snapshot['line_no'] == 3
+    assert snapshot['watches']['a + 1'].preview == '2'
+    assert client.render(snapshot['global_variables']['b']).text == '2'
+
+    client.continue_()
+    assert snapshots.get(timeout=5) is None
+    client._debugger.close()